@@ -9,6 +9,11 @@ from alembic import context
 # access to the values within the .ini file in use.
 config = context.config
 
+# alembic.ini의 sqlalchemy.url 대신 앱과 같은 DB URL 사용 (rxconfig.db_url / REFLEX_DB_URL)
+from ecojourney.db.engine import get_database_url
+
+config.set_main_option("sqlalchemy.url", get_database_url().replace("%", "%%"))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
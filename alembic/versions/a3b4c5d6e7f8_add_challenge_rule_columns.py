@@ -0,0 +1,54 @@
+"""add challenge rule columns
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3b4c5d6e7f8'
+down_revision: Union[str, Sequence[str], None] = 'f2a3b4c5d6e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('challenge', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('trigger_event', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('counter_window', sqlmodel.sql.sqltypes.AutoString(), server_default='daily', nullable=False))
+        batch_op.add_column(sa.Column('window_days', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('distinct_days', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    with op.batch_alter_table('challengeprogress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('window_start', sa.Date(), nullable=True))
+        batch_op.add_column(sa.Column('day_mask', sa.Integer(), server_default='0', nullable=False))
+
+    # 기존 기본 챌린지를 규칙으로 변환
+    op.execute("UPDATE challenge SET trigger_event = 'article_read' WHERE type = 'DAILY_INFO'")
+    op.execute("UPDATE challenge SET trigger_event = 'quiz_solved' WHERE type = 'DAILY_QUIZ'")
+    op.execute(
+        "UPDATE challenge SET trigger_event = 'carbon_logged', counter_window = 'weekly', distinct_days = TRUE "
+        "WHERE type = 'WEEKLY_STREAK'"
+    )
+    # 진행 중인 카운터는 데이터 보정(2026_10_challenge_rule_counters)이 앱 시작 시 이번 기간 기준으로 맞춤
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('challengeprogress', schema=None) as batch_op:
+        batch_op.drop_column('day_mask')
+        batch_op.drop_column('window_start')
+
+    with op.batch_alter_table('challenge', schema=None) as batch_op:
+        batch_op.drop_column('distinct_days')
+        batch_op.drop_column('window_days')
+        batch_op.drop_column('counter_window')
+        batch_op.drop_column('trigger_event')
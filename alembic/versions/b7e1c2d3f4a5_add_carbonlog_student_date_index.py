@@ -0,0 +1,30 @@
+"""add carbonlog (student_id, log_date) index
+
+Revision ID: b7e1c2d3f4a5
+Revises: 28b3cc8f713d
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c2d3f4a5'
+down_revision: Union[str, Sequence[str], None] = '28b3cc8f713d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('carbonlog', schema=None) as batch_op:
+        batch_op.create_index('ix_carbonlog_student_id_log_date', ['student_id', 'log_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('carbonlog', schema=None) as batch_op:
+        batch_op.drop_index('ix_carbonlog_student_id_log_date')
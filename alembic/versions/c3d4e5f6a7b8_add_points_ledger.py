@@ -0,0 +1,58 @@
+"""add points ledger and snapshot tables
+
+Revision ID: c3d4e5f6a7b8
+Revises: b7e1c2d3f4a5
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, Sequence[str], None] = 'b7e1c2d3f4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pointsledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('delta', sa.Integer(), nullable=False),
+    sa.Column('balance_after', sa.Integer(), nullable=False),
+    sa.Column('source', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pointsledger_student_id_id', 'pointsledger', ['student_id', 'id'], unique=False)
+    op.create_table('pointssnapshot',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=False),
+    sa.Column('ledger_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pointssnapshot_student_id_ledger_id', 'pointssnapshot', ['student_id', 'ledger_id'], unique=False)
+
+    # 원장 도입 시점의 잔액을 기초 잔액(opening_balance)으로 기록
+    op.execute(
+        "INSERT INTO pointsledger (student_id, delta, balance_after, source, description, created_at) "
+        "SELECT student_id, current_points, current_points, 'opening_balance', '원장 도입 시점 잔액', CURRENT_TIMESTAMP "
+        "FROM \"user\""
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pointssnapshot_student_id_ledger_id', table_name='pointssnapshot')
+    op.drop_table('pointssnapshot')
+    op.drop_index('ix_pointsledger_student_id_id', table_name='pointsledger')
+    op.drop_table('pointsledger')
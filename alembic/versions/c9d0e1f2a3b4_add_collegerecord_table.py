@@ -0,0 +1,46 @@
+"""add collegerecord table and battle status/start_date index
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, Sequence[str], None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('collegerecord',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('season', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('college', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('battles', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('draws', sa.Integer(), nullable=False),
+    sa.Column('points_for', sa.Integer(), nullable=False),
+    sa.Column('points_against', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_collegerecord_season_college', 'collegerecord', ['season', 'college'], unique=True)
+    op.create_index('ix_battle_status_start_date', 'battle', ['status', 'start_date'], unique=False)
+    # 기존 대결의 전적은 데이터 보정(2026_10_college_record_backfill)이 앱 시작 시 채움
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_battle_status_start_date', table_name='battle')
+    op.drop_index('ix_collegerecord_season_college', table_name='collegerecord')
+    op.drop_table('collegerecord')
@@ -0,0 +1,40 @@
+"""add rankingcounter table
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, Sequence[str], None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rankingcounter',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('period', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('student_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('reduction_g', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_rankingcounter_period_student_id', 'rankingcounter', ['period', 'student_id'], unique=True)
+    # 이번 주/이번 달 카운터는 데이터 보정(2026_10_ranking_counter_backfill)이 앱 시작 시 채움
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rankingcounter_period_student_id', table_name='rankingcounter')
+    op.drop_table('rankingcounter')
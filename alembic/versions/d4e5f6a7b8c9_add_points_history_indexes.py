@@ -0,0 +1,42 @@
+"""add points history (student_id, created_at) indexes
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('carbonlog', schema=None) as batch_op:
+        batch_op.create_index('ix_carbonlog_student_id_created_at', ['student_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('pointslog', schema=None) as batch_op:
+        batch_op.create_index('ix_pointslog_student_id_created_at', ['student_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('mileagerequest', schema=None) as batch_op:
+        batch_op.create_index('ix_mileagerequest_student_id_processed_at', ['student_id', 'processed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('mileagerequest', schema=None) as batch_op:
+        batch_op.drop_index('ix_mileagerequest_student_id_processed_at')
+
+    with op.batch_alter_table('pointslog', schema=None) as batch_op:
+        batch_op.drop_index('ix_pointslog_student_id_created_at')
+
+    with op.batch_alter_table('carbonlog', schema=None) as batch_op:
+        batch_op.drop_index('ix_carbonlog_student_id_created_at')
@@ -0,0 +1,40 @@
+"""add collegeemissiondaily table
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f2a3b4c5d6'
+down_revision: Union[str, Sequence[str], None] = 'd0e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('collegeemissiondaily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('log_date', sa.Date(), nullable=False),
+    sa.Column('college', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('emission_g', sa.Integer(), nullable=False),
+    sa.Column('active_users', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_collegeemissiondaily_log_date_college', 'collegeemissiondaily', ['log_date', 'college'], unique=True)
+    # 기존 탄소 입력 집계는 데이터 보정(2026_10_college_emission_backfill)이 앱 시작 시 채움
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_collegeemissiondaily_log_date_college', table_name='collegeemissiondaily')
+    op.drop_table('collegeemissiondaily')
@@ -0,0 +1,42 @@
+"""add streakrecord table
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a3b4c5d6e7'
+down_revision: Union[str, Sequence[str], None] = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('streakrecord',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('day_mask', sa.Integer(), nullable=False),
+    sa.Column('current_streak', sa.Integer(), nullable=False),
+    sa.Column('best_streak', sa.Integer(), nullable=False),
+    sa.Column('last_log_date', sa.Date(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_streakrecord_student_id', 'streakrecord', ['student_id'], unique=True)
+    # 기존 탄소 입력의 연속 기록은 데이터 보정(2026_10_streak_record_backfill)이 앱 시작 시 채움
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_streakrecord_student_id', table_name='streakrecord')
+    op.drop_table('streakrecord')
@@ -0,0 +1,42 @@
+"""add carbonlogmonthly rollup table
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, Sequence[str], None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('carbonlogmonthly',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('source', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('log_count', sa.Integer(), nullable=False),
+    sa.Column('total_emission', sa.Float(), nullable=False),
+    sa.Column('points_earned', sa.Integer(), nullable=False),
+    sa.Column('category_counts_json', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_carbonlogmonthly_student_id_month_source', 'carbonlogmonthly', ['student_id', 'month', 'source'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_carbonlogmonthly_student_id_month_source', table_name='carbonlogmonthly')
+    op.drop_table('carbonlogmonthly')
@@ -1,11 +1,17 @@
 # 파일 경로: ecojourney/ai/ai_main.py
 from fastapi import FastAPI
 
+from ecojourney.db.session_hooks import register_session_hooks
+
 # 로그인 관련 라우터
 from ecojourney.api.auth import router as auth_router
 
 # AI 코칭 라우터 (지금 방금 보여준 coaching_api.py의 router)
 from ecojourney.ai.coaching_api import router as coaching_router
+
+# 탄소 입력/포인트 로그 flush 시 파생 집계를 갱신하는 Session 훅 등록
+register_session_hooks()
+
 app = FastAPI(
     title="EcoJourney - Carbon AI Coach API",
     description="개인 맞춤형 탄소 라이프스타일 진단 및 코칭 리포트를 제공하는 백엔드 API",
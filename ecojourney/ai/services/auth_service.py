@@ -1,21 +1,20 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 import hashlib
 import sqlite3
 from datetime import datetime
-from sqlmodel import Session, create_engine, select
-import os
+from sqlmodel import Session, SQLModel, select
 
 from ecojourney.models import User as UserModel
 from ecojourney.schemas.user import UserCreate, User
-from ecojourney.db.init_db import init_db
+from ecojourney.db import get_connection as get_db_connection
+from ecojourney.db.engine import get_engine, require_tables
+from ecojourney.service.leaderboard import stage_points
 
 
 # DB 연결 설정 (Reflex와 동일한 DB 사용)
 def _get_engine():
-    """SQLModel 엔진 생성 (Reflex DB와 동일)"""
-    db_path = os.path.join(os.getcwd(), "reflex.db")
-    db_url = f"sqlite:///{db_path}"
-    return create_engine(db_url, echo=False)
+    """SQLModel 엔진 (rxconfig.db_url, Reflex와 같은 공용 엔진)"""
+    return get_engine()
 
 
 # 전역 엔진 (SQLModel용)
@@ -26,20 +25,17 @@ _db_ready = False
 
 
 def _ensure_db():
-    """DB 스키마가 준비되었는지 확인하고 없으면 생성."""
+    """DB 스키마가 준비되었는지 확인 (테이블은 alembic 마이그레이션으로만 생성, 없으면 SchemaNotReadyError)."""
     global _db_ready
     if _db_ready:
         return
-    init_db()  # reflex.db에 user 테이블 등 생성
+    require_tables(_get_engine(), SQLModel.metadata.tables, "회원가입/로그인을 처리할 수 없습니다")
     _db_ready = True
 
 
 def get_connection():
-    """sqlite3 커넥션 반환 (Row 접근 용이하게 설정)"""
-    db_path = os.path.join(os.getcwd(), "reflex.db")
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """DBAPI 커넥션 반환 (SQLite는 Row 접근 용이하게 설정)"""
+    return get_db_connection()
 
 
 def _hash_password(password: str) -> str:
@@ -50,16 +46,12 @@ def _hash_password(password: str) -> str:
 # ======================================================
 # 비밀번호 해싱 (SHA256 - Reflex AuthState와 동일)
 # ======================================================
-def _get_user_row(student_id: str) -> Optional[sqlite3.Row]:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT * FROM users WHERE student_id = ?",
-        (student_id,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
+def _get_user_row(student_id: str) -> Optional[Dict[str, Any]]:
+    # DB 종류와 관계없이 동작하도록 SQLAlchemy 식으로 조회 (user는 PostgreSQL 예약어)
+    table = UserModel.__table__
+    with _get_engine().connect() as conn:
+        row = conn.execute(table.select().where(table.c.student_id == student_id)).mappings().first()
+    return dict(row) if row else None
 
 
 # ======================================================
@@ -74,12 +66,18 @@ def create_user(user: UserCreate) -> None:
 
     try:
         with Session(engine) as session:
+            # 학번 중복 확인 (모델로 만든 DB에는 student_id UNIQUE 제약이 없음)
+            existing_user = session.exec(
+                select(UserModel.id).where(UserModel.student_id == user.student_id)
+            ).first()
+            if existing_user:
+                raise sqlite3.IntegrityError("이미 존재하는 학번입니다.")
+
             # 닉네임 중복 확인
             existing_nickname = session.exec(
                 select(UserModel).where(UserModel.nickname == user.nickname)
             ).first()
             if existing_nickname:
-                import sqlite3
                 raise sqlite3.IntegrityError("이미 사용 중인 닉네임입니다.")
             
             new_user = UserModel(
@@ -91,6 +89,8 @@ def create_user(user: UserCreate) -> None:
                 created_at=datetime.now()
             )
             session.add(new_user)
+            # 개인 포인트 리더보드에 0점으로 추가 (commit 이후 반영)
+            stage_points(session, user.student_id, 0)
             session.commit()
     except sqlite3.IntegrityError:
         raise
@@ -98,7 +98,6 @@ def create_user(user: UserCreate) -> None:
         # student_id 중복 등의 오류는 상위에서 처리
         error_str = str(e).lower()
         if "unique" in error_str or "duplicate" in error_str or "constraint" in error_str:
-            import sqlite3
             raise sqlite3.IntegrityError("이미 존재하는 학번입니다.")
         raise
 
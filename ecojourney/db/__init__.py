@@ -1,18 +1,32 @@
 from pathlib import Path
 import sqlite3
-import os
 
 # 프로젝트 루트 경로 (Reflex 프로젝트 루트)
 # ecojourney/db/__init__.py 위치에서 두 단계 위로 이동하면 프로젝트 루트
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
-# Reflex가 사용하는 DB 파일과 동일한 경로 사용
-DB_PATH = BASE_DIR / "reflex.db"
+
+def get_db_path():
+    """SQLite DB 파일 경로 (설정된 DB가 SQLite가 아니면 None)"""
+    from sqlalchemy.engine import make_url
+    from .engine import get_database_url, is_sqlite
+
+    url = get_database_url()
+    if not is_sqlite(url):
+        return None
+    return Path(make_url(url).database or "").resolve()
 
 
 def get_connection():
-    """SQLite 연결을 만들어서 반환 (Reflex DB와 동일한 파일 사용)"""
-    conn = sqlite3.connect(str(DB_PATH))
-    # row["student_id"] 이런 식으로 쓰려고
+    """
+    설정된 DB(rxconfig.db_url)의 DBAPI 연결 반환
+    - SQLite: row["student_id"] 이런 식으로 쓰려고 sqlite3.Row 사용
+    - 그 외: 공용 엔진 풀의 연결 (close() 시 풀로 반환)
+    """
+    db_path = get_db_path()
+    if db_path is None:
+        from .engine import get_engine
+        return get_engine().raw_connection()
+    conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
     return conn
@@ -0,0 +1,107 @@
+"""
+비동기 DB 접근 모듈 (SQLAlchemy asyncio)
+
+Reflex의 async 이벤트 핸들러에서 동기 Session.exec()를 호출하면
+쿼리가 끝날 때까지 이벤트 루프 전체(접속한 모든 클라이언트)가 멈춥니다.
+이 모듈의 AsyncSession을 사용하면 쿼리 대기 중에도 다른 이벤트를 처리할 수 있습니다.
+
+- SQLite는 aiosqlite, PostgreSQL은 asyncpg 드라이버를 사용합니다.
+- 다른 DB/드라이버는 register_async_driver() 또는
+  ECOJOURNEY_ASYNC_DB_URL 환경변수로 지정할 수 있습니다.
+- 쓰기는 계속 db.write_queue.submit_write()를 사용합니다 (SQLite 쓰기 직렬화).
+
+사용 예:
+    from ..db.async_session import async_session
+
+    async with async_session() as session:
+        battles = (await session.exec(select(Battle))).all()
+        balance = await session.run_sync(get_balance, student_id)
+"""
+
+from contextlib import asynccontextmanager
+from typing import Dict
+import logging
+import os
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .engine import engine_options, get_database_url
+from .session_hooks import register_session_hooks
+
+logger = logging.getLogger(__name__)
+
+# DB 종류별 비동기 드라이버 (dialect -> drivername)
+ASYNC_DRIVERS: Dict[str, str] = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+_async_engine = None
+
+
+def register_async_driver(dialect: str, drivername: str) -> None:
+    """DB 종류별 비동기 드라이버 등록/교체 (예: register_async_driver("postgresql", "postgresql+psycopg"))"""
+    global _async_engine
+    ASYNC_DRIVERS[dialect] = drivername
+    _async_engine = None
+
+
+def to_async_url(db_url: str) -> str:
+    """동기 DB URL을 비동기 드라이버 URL로 변환"""
+    url = make_url(db_url)
+    dialect = url.get_backend_name()
+    drivername = ASYNC_DRIVERS.get(dialect)
+    if drivername is None:
+        raise ValueError(f"비동기 드라이버가 등록되지 않은 DB입니다: {dialect}")
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_async_database_url() -> str:
+    """
+    비동기 DB URL
+    ECOJOURNEY_ASYNC_DB_URL → rxconfig.async_db_url(REFLEX_ASYNC_DB_URL) → 설정된 db_url을 변환한 URL 순
+    """
+    override = os.getenv("ECOJOURNEY_ASYNC_DB_URL")
+    if override:
+        return override
+    from reflex.config import get_config
+
+    return get_config().async_db_url or to_async_url(get_database_url())
+
+
+def get_async_engine():
+    """프로세스 전역 비동기 엔진 (최초 호출 시 생성, 풀 설정은 동기 엔진과 동일)"""
+    global _async_engine
+    if _async_engine is None:
+        register_session_hooks()
+        url = get_async_database_url()
+        options = engine_options(url)
+        # check_same_thread는 pysqlite 전용 옵션
+        options.pop("connect_args", None)
+        _async_engine = create_async_engine(url, **options)
+    return _async_engine
+
+
+def async_session(engine=None) -> AsyncSession:
+    """비동기 세션 생성 (async with로 사용)"""
+    return AsyncSession(engine or get_async_engine(), expire_on_commit=False)
+
+
+async def dispose_async_engine() -> None:
+    """비동기 엔진 연결 정리 (aiosqlite 연결 스레드가 프로세스 종료를 막지 않도록)"""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+@asynccontextmanager
+async def async_engine_lifespan():
+    """앱 수명주기 작업: 종료 시 비동기 엔진 정리 (app.register_lifespan_task로 등록)"""
+    try:
+        yield
+    finally:
+        await dispose_async_engine()
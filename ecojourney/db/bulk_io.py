@@ -0,0 +1,468 @@
+"""
+대량 내보내기/가져오기 (CSV, Parquet)
+
+carbonlog, pointslog, battle, user 테이블을 서버 측 커서(stream_results)로
+청크 단위로 읽어 CSV/Parquet로 기록하므로, 테이블 크기와 관계없이
+메모리 사용량은 청크 크기(기본 10,000행)로 제한됩니다.
+
+가져오기는 파일을 청크 단위로 읽어 컬럼 타입을 검증/변환한 뒤
+배치마다 INSERT 한 번(executemany)으로 추가하고 commit합니다.
+
+- user 테이블의 password(해시)는 include_password=True(CLI --include-password)일 때만 내보냅니다.
+- id는 기본적으로 새로 부여합니다. 백업 복원처럼 원래 id를 유지하려면 keep_ids=True.
+- 가져오기는 Core INSERT라 apply_points()와 flush 훅을 거치지 않으므로, 끝난 뒤 rebuild_derived()가
+  파생 데이터(기간별 랭킹 카운터, 단과대 일별 배출량, 연속 기록, 단과대 전적, 포인트 리더보드)를 다시 계산하고
+  가져온 사용자의 잔액을 포인트 원장 시작 잔액으로 기록합니다.
+  가져온 carbonlog/pointslog의 포인트는 이력이므로 잔액(원장)에 더하지 않습니다.
+- HTTP API로는 제공하지 않습니다 (관리자 CLI 전용).
+
+사용 예:
+    python -m ecojourney.db.bulk_io export carbonlog carbonlog.parquet
+    python -m ecojourney.db.bulk_io export user users.csv
+    python -m ecojourney.db.bulk_io import carbonlog carbonlog.parquet
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+import csv
+import logging
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, exists, insert, literal, select
+from ..models import Battle, CarbonLog, PointsLedger, PointsLog, User
+from .engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+# 내보내기/가져오기를 허용하는 테이블
+TABLES = {
+    "carbonlog": CarbonLog,
+    "pointslog": PointsLog,
+    "battle": Battle,
+    "user": User,
+}
+
+FORMATS = ("csv", "parquet")
+
+# 기본적으로 내보내지 않는 컬럼
+_SECRET_COLUMNS = {"user": {"password"}}
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+
+class BulkImportError(ValueError):
+    """가져오기 파일 검증 오류 (행 번호 포함)"""
+
+
+def _table(name: str):
+    model = TABLES.get(name)
+    if model is None:
+        raise ValueError(f"지원하지 않는 테이블입니다: {name} (가능: {', '.join(TABLES)})")
+    return model.__table__
+
+
+def _format_of(path: Union[str, Path], fmt: Optional[str] = None) -> str:
+    fmt = (fmt or Path(path).suffix.lstrip(".")).lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (가능: {', '.join(FORMATS)})")
+    return fmt
+
+
+def export_columns(table_name: str, include_password: bool = False) -> List[str]:
+    """내보낼 컬럼 목록 (테이블 정의 순서)"""
+    hidden = set() if include_password else _SECRET_COLUMNS.get(table_name, set())
+    return [column.name for column in _table(table_name).columns if column.name not in hidden]
+
+
+def _arrow_schema(table_name: str, columns: List[str]):
+    import pyarrow as pa
+
+    table = _table(table_name)
+    fields = []
+    for name in columns:
+        column_type = table.columns[name].type
+        if isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(column_type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append((name, arrow_type))
+    return pa.schema(fields)
+
+
+def iter_chunks(
+    engine,
+    table_name: str,
+    columns: List[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[List[tuple]]:
+    """서버 측 커서로 테이블을 id 순으로 chunk_size 행씩 읽기"""
+    table = _table(table_name)
+    statement = select(*[table.columns[name] for name in columns]).order_by(table.columns["id"])
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(statement)
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def write_csv(chunks: Iterable[List[tuple]], columns: List[str], out: TextIO) -> int:
+    """청크를 CSV로 기록 (헤더 포함). 기록한 행 수 반환"""
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    rows = 0
+    for chunk in chunks:
+        writer.writerows([[_csv_value(value) for value in row] for row in chunk])
+        rows += len(chunk)
+    return rows
+
+
+def write_parquet(chunks: Iterable[List[tuple]], table_name: str, columns: List[str], out: Union[str, BinaryIO]) -> int:
+    """청크마다 Parquet row group 하나로 기록. 기록한 행 수 반환"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(table_name, columns)
+    rows = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in chunks:
+            arrays = [pa.array([row[i] for row in chunk], type=schema.field(i).type) for i in range(len(columns))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+def export_table(
+    engine,
+    table_name: str,
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    include_password: bool = False,
+) -> int:
+    """
+    테이블을 파일로 내보내기
+
+    Args:
+        engine: 읽기 엔진
+        table_name: carbonlog, pointslog, battle, user
+        path: 출력 파일 경로
+        fmt: "csv" 또는 "parquet" (생략 시 확장자로 판단)
+        chunk_size: 한 번에 읽을 행 수
+        include_password: user 테이블의 password 해시 포함 여부
+
+    Returns:
+        내보낸 행 수
+    """
+    fmt = _format_of(path, fmt)
+    columns = export_columns(table_name, include_password)
+    chunks = iter_chunks(engine, table_name, columns, chunk_size)
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as out:
+            return write_csv(chunks, columns, out)
+    return write_parquet(chunks, table_name, columns, str(path))
+
+
+# -----------------------------------------------------------------------------
+# 가져오기
+# -----------------------------------------------------------------------------
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "t", "yes", "y"):
+        return True
+    if text in ("0", "false", "f", "no", "n"):
+        return False
+    raise ValueError(f"불리언 값이 아닙니다: {value}")
+
+
+def _parse_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+def _converters(table) -> Dict[str, Callable[[Any], Any]]:
+    converters: Dict[str, Callable[[Any], Any]] = {}
+    for column in table.columns:
+        column_type = column.type
+        if isinstance(column_type, Boolean):
+            converters[column.name] = _parse_bool
+        elif isinstance(column_type, Integer):
+            converters[column.name] = int
+        elif isinstance(column_type, Float):
+            converters[column.name] = float
+        elif isinstance(column_type, DateTime):
+            converters[column.name] = _parse_datetime
+        elif isinstance(column_type, Date):
+            converters[column.name] = _parse_date
+        else:
+            converters[column.name] = str
+    return converters
+
+
+def _required_columns(model, keep_ids: bool) -> List[str]:
+    """값이 반드시 있어야 하는 컬럼 (모델에 기본값이 없는 필드)"""
+    required = [name for name, field in model.model_fields.items() if name != "id" and field.is_required()]
+    if keep_ids:
+        required.insert(0, "id")
+    return required
+
+
+def _defaults(model) -> Dict[str, Any]:
+    """모델 필드 기본값 (파일에 없거나 빈 값인 컬럼에 사용)"""
+    defaults = {}
+    for name, field in model.model_fields.items():
+        if name == "id" or field.is_required():
+            continue
+        default = field.get_default(call_default_factory=True)
+        # created_at 등 모델 로드 시점으로 고정된 기본값 대신 가져오는 시점 사용
+        defaults[name] = datetime.now() if isinstance(default, datetime) else default
+    return defaults
+
+
+def _validate_rows(
+    records: Iterable[Dict[str, Any]],
+    defaults: Dict[str, Any],
+    converters: Dict[str, Callable[[Any], Any]],
+    required: List[str],
+    keep_ids: bool,
+    first_row_number: int,
+) -> List[Dict[str, Any]]:
+    rows = []
+    for offset, record in enumerate(records):
+        row_number = first_row_number + offset
+        row = {}
+        for name, converter in converters.items():
+            if name == "id" and not keep_ids:
+                continue
+            value = record.get(name)
+            if value is None or value == "":
+                if name in required:
+                    raise BulkImportError(f"{row_number}행: 필수 컬럼 '{name}' 값이 없습니다.")
+                row[name] = defaults.get(name)
+                continue
+            try:
+                row[name] = converter(value)
+            except (TypeError, ValueError) as e:
+                raise BulkImportError(f"{row_number}행: '{name}' 값이 올바르지 않습니다 ({value!r}): {e}") from e
+        rows.append(row)
+    return rows
+
+
+def _iter_csv_records(path: Union[str, Path], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        chunk: List[Dict[str, Any]] = []
+        for record in reader:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _iter_parquet_records(path: Union[str, Path, BinaryIO], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+def _read_header(path: Union[str, Path], fmt: str) -> List[str]:
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            return next(csv.reader(f), [])
+    import pyarrow.parquet as pq
+
+    return list(pq.ParquetFile(path).schema_arrow.names)
+
+
+def import_table(
+    engine,
+    table_name: str,
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    keep_ids: bool = False,
+    rebuild: bool = True,
+) -> int:
+    """
+    파일을 검증한 뒤 배치 단위로 테이블에 추가 (배치마다 executemany + commit, 끝나면 파생 데이터 재계산)
+
+    Args:
+        engine: 쓰기 엔진 (create_writer_engine 권장)
+        table_name: carbonlog, pointslog, battle, user
+        path: 입력 파일 경로
+        fmt: "csv" 또는 "parquet" (생략 시 확장자로 판단)
+        chunk_size: 배치 크기
+        keep_ids: 파일의 id를 그대로 사용할지 여부
+        rebuild: 가져온 뒤 rebuild_derived() 실행 여부 (테스트/벤치마크에서만 끔)
+
+    Returns:
+        추가한 행 수
+
+    Raises:
+        BulkImportError: 헤더/값 검증 실패 (실패한 배치 이전까지는 이미 commit됨)
+    """
+    fmt = _format_of(path, fmt)
+    table = _table(table_name)
+    model = TABLES[table_name]
+
+    header = _read_header(path, fmt)
+    unknown = [name for name in header if name not in table.columns]
+    if unknown:
+        raise BulkImportError(f"알 수 없는 컬럼: {', '.join(unknown)}")
+    required = _required_columns(model, keep_ids)
+    missing = [name for name in required if name not in header]
+    if missing:
+        raise BulkImportError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    converters = _converters(table)
+    defaults = _defaults(model)
+    records = _iter_csv_records(path, chunk_size) if fmt == "csv" else _iter_parquet_records(path, chunk_size)
+
+    inserted = 0
+    student_ids = set()
+    try:
+        for chunk in records:
+            # 헤더가 1행이므로 데이터는 2행부터 (CSV 기준)
+            rows = _validate_rows(chunk, defaults, converters, required, keep_ids, inserted + 2)
+            with engine.begin() as conn:
+                conn.execute(table.insert(), rows)
+            inserted += len(rows)
+            if table_name == "user":
+                student_ids.update(row["student_id"] for row in rows)
+            logger.info(f"{table_name} 가져오기: {inserted}행")
+    finally:
+        # 검증 오류로 중단되어도 이미 commit된 배치의 파생 데이터는 맞춤
+        if inserted and rebuild:
+            rebuilt = rebuild_derived(engine, table_name, student_ids)
+            logger.info(f"{table_name} 가져오기 후 재계산: {rebuilt}")
+    return inserted
+
+
+# 파생 데이터 재계산 기준 ID 배치 크기 (IN 목록 길이)
+_ID_BATCH = 1000
+
+
+def _record_opening_balances(session, student_ids: Iterable[str]) -> int:
+    """원장 기록이 없는 가져온 사용자의 current_points를 시작 잔액 원장 행으로 기록"""
+    ledger = PointsLedger.__table__
+    user = User.__table__
+    student_ids = sorted(student_ids)
+    now = datetime.now()
+    recorded = 0
+    for offset in range(0, len(student_ids), _ID_BATCH):
+        result = session.execute(
+            insert(ledger).from_select(
+                ["student_id", "delta", "balance_after", "source", "description", "created_at"],
+                select(
+                    user.c.student_id,
+                    user.c.current_points,
+                    user.c.current_points,
+                    literal("bulk_import"),
+                    literal("대량 가져오기 시작 잔액"),
+                    literal(now),
+                ).where(
+                    user.c.student_id.in_(student_ids[offset:offset + _ID_BATCH]),
+                    user.c.current_points != 0,
+                    ~exists().where(ledger.c.student_id == user.c.student_id),
+                ),
+            )
+        )
+        recorded += result.rowcount or 0
+    return recorded
+
+
+def rebuild_derived(engine, table_name: str, student_ids: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    가져오기 후 파생 데이터 재계산 (한 트랜잭션)
+
+    - carbonlog: 기간별 랭킹 카운터, 단과대 일별 배출량, 연속 기록
+    - pointslog: 기간별 랭킹 카운터
+    - user: 포인트 원장 시작 잔액(student_ids 중 원장이 없는 사용자), 단과대 일별 배출량, 포인트 리더보드
+    - battle: 단과대 전적
+
+    Returns:
+        {재계산 대상: 행 수}
+    """
+    from sqlmodel import Session
+    from ..service.battle_archive import rebuild_records
+    from ..service.college_emissions import rebuild_emissions
+    from ..service.leaderboard import rebuild_leaderboard
+    from ..service.ranking_windows import rebuild_windows
+    from ..service.streaks import rebuild_streaks
+
+    rebuilt: Dict[str, int] = {}
+    with Session(engine) as session:
+        if table_name in ("carbonlog", "pointslog"):
+            rebuilt["rankingcounter"] = rebuild_windows(session)
+        if table_name in ("carbonlog", "user"):
+            rebuilt["collegeemissiondaily"] = rebuild_emissions(session)
+        if table_name == "carbonlog":
+            rebuilt["streakrecord"] = rebuild_streaks(session)
+        if table_name == "user":
+            rebuilt["pointsledger"] = _record_opening_balances(session, student_ids)
+        if table_name == "battle":
+            rebuilt["collegerecord"] = rebuild_records(session)
+        session.commit()
+
+    if table_name == "user":
+        with Session(engine) as session:
+            rebuilt["leaderboard"] = rebuild_leaderboard(session)
+    return rebuilt
+
+
+if __name__ == "__main__":
+    import argparse
+    from .write_queue import create_writer_engine
+
+    parser = argparse.ArgumentParser(description="대량 내보내기/가져오기 (CSV, Parquet)")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("table", choices=list(TABLES))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="생략 시 확장자로 판단")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--include-password", action="store_true", help="user 내보내기에 password 해시 포함")
+    parser.add_argument("--keep-ids", action="store_true", help="가져오기 시 파일의 id 유지")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        count = export_table(
+            get_engine(), args.table, args.path, args.format, args.chunk_size, args.include_password
+        )
+        print(f"✅ {args.table} {count}행 내보내기 완료 -> {args.path}")
+    else:
+        count = import_table(
+            create_writer_engine(), args.table, args.path, args.format, args.chunk_size, args.keep_ids
+        )
+        print(f"✅ {args.table} {count}행 가져오기 완료 <- {args.path}")
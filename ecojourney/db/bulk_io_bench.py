@@ -0,0 +1,110 @@
+"""
+대량 내보내기/가져오기 처리량 벤치마크
+
+임시 SQLite DB에 합성 탄소 로그를 채운 뒤 CSV/Parquet 내보내기와 가져오기의
+초당 처리 행 수와 최대 메모리 사용량(ru_maxrss)을 측정합니다.
+10,000,000행 기준 측정은 --rows 10000000으로 실행합니다 (디스크 수 GB 필요).
+
+사용 예:
+    python -m ecojourney.db.bulk_io_bench
+    python -m ecojourney.db.bulk_io_bench --rows 10000000 --formats parquet
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from sqlmodel import SQLModel, create_engine
+
+from ..models import CarbonLog
+from .bulk_io import DEFAULT_CHUNK_SIZE, export_table, import_table
+from .write_queue import create_writer_engine
+
+
+def _populate(db_url: str, rows: int, users: int, chunk_size: int) -> None:
+    engine = create_writer_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    table = CarbonLog.__table__
+    start = date.today() - timedelta(days=365)
+    now = datetime.now()
+    for offset in range(0, rows, chunk_size):
+        with engine.begin() as conn:
+            conn.execute(
+                table.insert(),
+                [
+                    {
+                        "student_id": f"bench{i % users}",
+                        "log_date": start + timedelta(days=i % 365),
+                        "source": "carbon_input",
+                        "transport_km": float(i % 30),
+                        "cup_count": i % 4,
+                        "ac_hours": float(i % 8),
+                        "activities_json": '[{"category": "교통", "activity_type": "버스", "value": 3}]',
+                        "total_emission": float(i % 17),
+                        "points_earned": i % 5,
+                        "ai_feedback": None,
+                        "created_at": now,
+                    }
+                    for i in range(offset, min(offset + chunk_size, rows))
+                ],
+            )
+    engine.dispose()
+
+
+def _max_rss_mb() -> float:
+    # Linux는 KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(func, rows_hint: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    rows = func()
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "elapsed_s": round(elapsed, 2),
+        "rows_per_s": int(rows / elapsed) if elapsed else rows_hint,
+        "max_rss_mb": round(_max_rss_mb(), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대량 내보내기/가져오기 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--formats", nargs="+", choices=["csv", "parquet"], default=["csv", "parquet"])
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    source_url = f"sqlite:///{os.path.join(work_dir, 'source.db')}"
+    started = time.perf_counter()
+    _populate(source_url, args.rows, args.users, args.chunk_size)
+    print(f"[setup ] {args.rows}행 생성 {time.perf_counter() - started:.1f}s, 위치 {work_dir}")
+
+    read_engine = create_engine(source_url, echo=False)
+    for fmt in args.formats:
+        path = os.path.join(work_dir, f"carbonlog.{fmt}")
+        result = _measure(
+            lambda: export_table(read_engine, "carbonlog", path, fmt, args.chunk_size), args.rows
+        )
+        result["file_mb"] = round(os.path.getsize(path) / 1024 / 1024, 1)
+        print(f"[export {fmt:7}] " + ", ".join(f"{k}={v}" for k, v in result.items()))
+
+        target_url = f"sqlite:///{os.path.join(work_dir, f'target_{fmt}.db')}"
+        target_engine = create_writer_engine(target_url)
+        SQLModel.metadata.create_all(target_engine)
+        result = _measure(
+            lambda: import_table(target_engine, "carbonlog", path, fmt, args.chunk_size, rebuild=False), args.rows
+        )
+        print(f"[import {fmt:7}] " + ", ".join(f"{k}={v}" for k, v in result.items()))
+        target_engine.dispose()
+    read_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+1회성 데이터 보정(Data Repair) 모듈
+
+잘못 저장된 기존 데이터를 고치는 작업을 요청 처리 경로(저장 등)에서 매번 실행하지 않고,
+보정 ID별로 한 번만 실행한 뒤 datarepair 테이블에 적용 이력을 남깁니다.
+
+- 보정은 @register_repair("ID", "설명", tables=(...))로 등록하며, 등록 순서대로 실행됩니다.
+  tables는 보정이 쓰는 테이블로, 미적용 보정의 테이블이 하나라도 없으면 아무 보정도 실행하지 않습니다.
+- 보정 함수는 Session을 받아 보정한 행 수를 반환합니다 (commit 금지).
+- 실행 시 잠금을 잡고(SQLite: BEGIN IMMEDIATE, PostgreSQL: advisory lock)
+  적용 여부를 다시 확인하므로 여러 프로세스가 동시에 시작해도 한 번만 적용됩니다.
+- 앱 시작 시 lifespan 작업으로 자동 실행되며, 배포 시 직접 실행할 수도 있습니다.
+- 테이블은 alembic 마이그레이션으로만 만듭니다. datarepair 또는 보정에 필요한 테이블이 없으면
+  (alembic upgrade 전) SchemaNotReadyError로 중단하며, 앱 시작 시에는 오류를 기록하고 보정을 건너뜁니다.
+
+사용 예:
+    python -m ecojourney.db.data_repairs          # 미적용 보정 실행
+    python -m ecojourney.db.data_repairs list     # 보정 목록/적용 여부 조회
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Tuple
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from .engine import SchemaNotReadyError, require_tables
+from ..models import CollegeEmissionDaily, CollegeRecord, DataRepair, RankingCounter, StreakRecord
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL advisory lock 키 (임의의 고정값)
+_PG_LOCK_KEY = 720_032
+
+
+@dataclass(frozen=True)
+class Repair:
+    repair_id: str
+    description: str
+    apply: Callable[[Session], int]
+    tables: Tuple[str, ...] = ()
+
+
+_REPAIRS: Dict[str, Repair] = {}
+
+
+def register_repair(repair_id: str, description: str, tables: Iterable[str] = ()):
+    """
+    데이터 보정 등록 데코레이터 (repair_id는 한 번 배포되면 변경하지 않음)
+
+    Args:
+        tables: 보정이 읽고 쓰는 테이블 중 alembic 마이그레이션으로 추가된 테이블 (실행 전 존재 확인)
+    """
+
+    def decorator(func: Callable[[Session], int]):
+        if repair_id in _REPAIRS:
+            raise ValueError(f"이미 등록된 보정 ID입니다: {repair_id}")
+        _REPAIRS[repair_id] = Repair(repair_id, description, func, tuple(tables))
+        return func
+
+    return decorator
+
+
+def get_repairs() -> List[Repair]:
+    """등록된 보정 목록 (등록 순서)"""
+    return list(_REPAIRS.values())
+
+
+def _lock(session) -> None:
+    """보정 실행 잠금 (트랜잭션 종료 시 해제)"""
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PG_LOCK_KEY})
+    # SQLite는 쓰기 엔진의 BEGIN IMMEDIATE가 DB 전체 쓰기 잠금 역할을 함
+
+
+def get_applied_ids(session) -> Dict[str, DataRepair]:
+    """적용된 보정 이력 조회"""
+    return {row.repair_id: row for row in session.exec(select(DataRepair)).all()}
+
+
+def _require_schema(engine, tables: Iterable[str] = (DataRepair.__tablename__,)) -> None:
+    """보정에 필요한 테이블 존재 확인 (없으면 SchemaNotReadyError, 테이블은 만들지 않음)"""
+    require_tables(engine, tables, "데이터 보정을 건너뜁니다")
+
+
+def run_pending_repairs(engine=None) -> List[str]:
+    """
+    미적용 보정을 순서대로 실행 (보정 하나당 트랜잭션 1개)
+
+    Returns:
+        이번에 적용된 보정 ID 목록
+    """
+    if engine is None:
+        from .write_queue import create_writer_engine
+        engine = create_writer_engine()
+
+    _require_schema(engine)
+
+    applied: List[str] = []
+    with Session(engine) as session:
+        applied_ids = get_applied_ids(session)
+        pending = [repair for repair in get_repairs() if repair.repair_id not in applied_ids]
+        if not pending:
+            return applied
+        session.rollback()
+        # 보정을 하나라도 적용하기 전에 필요한 테이블 확인 (일부만 적용된 상태로 멈추지 않도록)
+        _require_schema(engine, [table for repair in pending for table in repair.tables])
+
+        for repair in get_repairs():
+            with session.begin():
+                _lock(session)
+                # 잠금을 잡은 뒤 다시 확인 (다른 프로세스가 먼저 적용했을 수 있음)
+                if session.exec(
+                    select(DataRepair.id).where(DataRepair.repair_id == repair.repair_id)
+                ).first():
+                    continue
+
+                rows = repair.apply(session) or 0
+                session.add(
+                    DataRepair(
+                        repair_id=repair.repair_id,
+                        description=repair.description,
+                        rows_affected=rows,
+                        applied_at=datetime.now(),
+                    )
+                )
+            applied.append(repair.repair_id)
+            logger.info(f"데이터 보정 적용: {repair.repair_id} ({rows}행)")
+    return applied
+
+
+@asynccontextmanager
+async def data_repair_lifespan():
+    """앱 수명주기 작업: 시작 시 미적용 보정 실행 (app.register_lifespan_task로 등록)"""
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, run_pending_repairs)
+    except SchemaNotReadyError as e:
+        logger.error(str(e))
+    except Exception as e:
+        logger.error(f"데이터 보정 실행 오류: {e}", exc_info=True)
+    yield
+
+
+# -----------------------------------------------------------------------------
+# 등록된 보정 (추가만 하고 기존 항목은 수정/삭제하지 않음)
+# -----------------------------------------------------------------------------
+@register_repair(
+    "2025_11_challenge_log_source",
+    "챌린지 보상 CarbonLog의 source를 'challenge'로 정정",
+)
+def _fix_challenge_log_source(session) -> int:
+    result = session.execute(
+        text(
+            "UPDATE carbonlog "
+            "SET source = 'challenge' "
+            "WHERE (source IS NULL OR source = 'carbon_input') "
+            "AND ai_feedback LIKE '챌린지 보상:%'"
+        )
+    )
+    return result.rowcount or 0
+
+
+@register_repair(
+    "2026_10_college_record_backfill",
+    "종료된 대결로 단과대 전적(collegerecord) 채우기",
+    tables=(CollegeRecord.__tablename__,),
+)
+def _backfill_college_records(session) -> int:
+    from ..service.battle_archive import rebuild_records
+
+    return rebuild_records(session)
+
+
+@register_repair(
+    "2026_10_ranking_counter_backfill",
+    "이번 주/이번 달 탄소 입력·포인트 로그로 기간별 랭킹 카운터(rankingcounter) 채우기",
+    tables=(RankingCounter.__tablename__,),
+)
+def _backfill_ranking_counters(session) -> int:
+    from ..service.ranking_windows import rebuild_windows
+
+    return rebuild_windows(session)
+
+
+@register_repair(
+    "2026_10_college_emission_backfill",
+    "남아 있는 탄소 입력 로그로 단과대 일별 배출량 집계(collegeemissiondaily) 채우기",
+    tables=(CollegeEmissionDaily.__tablename__,),
+)
+def _backfill_college_emissions(session) -> int:
+    from ..service.college_emissions import rebuild_emissions
+
+    return rebuild_emissions(session)
+
+
+@register_repair(
+    "2026_10_streak_record_backfill",
+    "탄소 입력 로그로 사용자별 연속 기록(streakrecord) 채우기",
+    tables=(StreakRecord.__tablename__,),
+)
+def _backfill_streak_records(session) -> int:
+    from ..service.streaks import rebuild_streaks
+
+    return rebuild_streaks(session)
+
+
+@register_repair(
+    "2026_10_challenge_rule_counters",
+    "챌린지 진행도에 집계 기간(window_start)을 채우고 이번 주 연속 기록 챌린지를 연속 기록 요일로 맞추기",
+)
+def _migrate_challenge_counters(session) -> int:
+    from ..service.challenge_rules import migrate_progress_counters
+
+    return migrate_progress_counters(session)
+
+
+if __name__ == "__main__":
+    import sys
+    from .write_queue import create_writer_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    engine = create_writer_engine()
+    try:
+        if command == "run":
+            done = run_pending_repairs(engine)
+            print(f"✅ 데이터 보정 {len(done)}건 적용: {', '.join(done) if done else '없음'}")
+        elif command == "list":
+            _require_schema(engine)
+            with Session(engine) as session:
+                applied_rows = get_applied_ids(session)
+            for repair in get_repairs():
+                row = applied_rows.get(repair.repair_id)
+                status = f"적용됨 {row.applied_at:%Y-%m-%d %H:%M} ({row.rows_affected}행)" if row else "미적용"
+                print(f"{repair.repair_id}: {status} - {repair.description}")
+        else:
+            print("사용법: python -m ecojourney.db.data_repairs [run|list]")
+            sys.exit(1)
+    except SchemaNotReadyError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -1,8 +1,69 @@
+"""
+새 DB 초기화 (기본 스키마 생성 + alembic 리비전 기록)
+
+테이블/인덱스/컬럼 변경은 alembic 마이그레이션으로만 적용합니다.
+init_db는 alembic 리비전이 없는 DB에만 기본 스키마를 만들고 리비전을 기록하며,
+이후 `alembic upgrade head`로 최신 스키마까지 올립니다.
+
+- SQLite: schema.sql(BASE_REVISION 시점 스키마) 실행 후 BASE_REVISION으로 stamp
+- 그 외 DB: 기존 마이그레이션 이력이 SQLite 기준이라 처음부터 실행할 수 없으므로,
+  테이블이 하나도 없는 DB에서만 모델 정의로 전체 스키마를 만들고 head로 stamp
+
+사용 예:
+    python -m ecojourney.db.init_db
+    alembic upgrade head
+"""
+
 from pathlib import Path
-from . import get_connection, DB_PATH
+from sqlalchemy import inspect
+from sqlalchemy.engine import make_url
+from sqlmodel import SQLModel
+
+from . import BASE_DIR, get_connection
+from .engine import SchemaNotReadyError, get_database_url, get_engine, is_sqlite
+
+# schema.sql이 나타내는 스키마의 alembic 리비전
+BASE_REVISION = "28b3cc8f713d"
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    return Config(str(BASE_DIR / "alembic.ini"))
+
+
+def _current_revision(engine):
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
 
 
 def init_db():
+    from alembic import command
+
+    url = get_database_url()
+    engine = get_engine(url)
+    display_url = make_url(url).render_as_string(hide_password=True)
+
+    revision = _current_revision(engine)
+    if revision is not None:
+        print(f"ℹ️ 이미 alembic 리비전({revision})이 기록된 DB입니다. `alembic upgrade head`로 최신화하세요: {display_url}")
+        return
+
+    if not is_sqlite(url):
+        if inspect(engine).get_table_names():
+            raise SchemaNotReadyError(
+                "alembic 리비전이 없는 기존 DB입니다. 현재 스키마에 맞는 리비전으로 "
+                "`alembic stamp` 후 `alembic upgrade head`를 실행하세요."
+            )
+        # 빈 DB에만 모델 정의로 최신 스키마를 만들고 head로 기록 (이후 변경은 마이그레이션으로 적용)
+        from .. import models  # noqa: F401 (테이블 등록)
+        SQLModel.metadata.create_all(engine)
+        command.stamp(_alembic_config(), "head")
+        print(f"✅ DB 초기화 완료 (alembic head): {display_url}")
+        return
+
     # 같은 폴더에 있는 schema.sql 경로
     schema_path = Path(__file__).with_name("schema.sql")
 
@@ -15,7 +76,8 @@ def init_db():
     conn.commit()
     conn.close()
 
-    print(f"✅ DB 초기화 완료: {DB_PATH}")
+    command.stamp(_alembic_config(), BASE_REVISION)
+    print(f"✅ DB 초기화 완료 (alembic {BASE_REVISION}, 이어서 `alembic upgrade head` 실행): {display_url}")
 
 
 if __name__ == "__main__":
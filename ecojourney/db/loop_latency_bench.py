@@ -0,0 +1,126 @@
+"""
+이벤트 루프 지연 벤치마크 (동기 Session vs AsyncSession)
+
+임시 SQLite DB에 탄소 로그를 채운 뒤, 여러 핸들러가 동시에 조회하는 동안
+1ms 간격 타이머가 얼마나 늦게 깨어나는지(이벤트 루프 지연)를 측정합니다.
+동기 Session.exec()는 쿼리 동안 루프를 막으므로 지연이 크게 나타납니다.
+
+사용 예:
+    python -m ecojourney.db.loop_latency_bench
+    python -m ecojourney.db.loop_latency_bench --rows 200000 --clients 50
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from ..models import CarbonLog
+from .async_session import async_session, to_async_url
+
+
+def _populate(db_url: str, rows: int, users: int) -> None:
+    engine = create_engine(db_url, echo=False)
+    SQLModel.metadata.create_all(engine)
+    start = date.today() - timedelta(days=365)
+    with Session(engine) as session:
+        session.bulk_insert_mappings(
+            CarbonLog,
+            [
+                {
+                    "student_id": f"bench{i % users}",
+                    "log_date": start + timedelta(days=i % 365),
+                    "total_emission": float(i % 17),
+                    "activities_json": "[]",
+                    "points_earned": i % 5,
+                    "source": "carbon_input",
+                }
+                for i in range(rows)
+            ],
+        )
+        session.commit()
+    engine.dispose()
+
+
+def _statement(student_id: str):
+    # 인덱스가 없는 컬럼 조건을 섞어 실제 페이지 조회처럼 수 ms 걸리는 쿼리
+    return select(func.count(CarbonLog.id), func.sum(CarbonLog.total_emission)).where(
+        CarbonLog.student_id == student_id,
+        CarbonLog.points_earned >= 0,
+    )
+
+
+async def _measure_lag(stop: asyncio.Event, samples: List[float], interval: float = 0.001) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+
+async def _run(mode: str, db_url: str, clients: int, requests: int, users: int) -> Dict[str, float]:
+    sync_engine = create_engine(db_url, echo=False)
+    async_engine = None
+    if mode == "async":
+        from sqlalchemy.ext.asyncio import create_async_engine
+        async_engine = create_async_engine(to_async_url(db_url), echo=False)
+
+    async def handler(client: int) -> None:
+        for n in range(requests):
+            student_id = f"bench{(client * requests + n) % users}"
+            if mode == "sync":
+                with Session(sync_engine) as session:
+                    session.exec(_statement(student_id)).one()
+            else:
+                async with async_session(async_engine) as session:
+                    (await session.exec(_statement(student_id))).one()
+            await asyncio.sleep(0)
+
+    samples: List[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_measure_lag(stop, samples))
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(c) for c in range(clients)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    sync_engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+    samples.sort()
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "lag_p50_ms": round(statistics.median(samples), 2) if samples else 0.0,
+        "lag_p99_ms": round(samples[int(len(samples) * 0.99) - 1], 2) if samples else 0.0,
+        "lag_max_ms": round(samples[-1], 2) if samples else 0.0,
+        "ticks": len(samples),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="이벤트 루프 지연 벤치마크")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=10)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    db_url = f"sqlite:///{db_path}"
+    _populate(db_url, args.rows, args.users)
+
+    for mode in ("sync", "async"):
+        result = asyncio.run(_run(mode, db_url, args.clients, args.requests, args.users))
+        print(f"[{mode:5}] " + ", ".join(f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
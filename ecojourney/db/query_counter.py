@@ -0,0 +1,63 @@
+"""
+SQL 문 수 측정 (Query Counter)
+
+이벤트 핸들러/배치 작업이 실행하는 SQL 문 수를 측정하고, 테스트에서 고정합니다.
+N+1 조회가 다시 생기면 테스트가 실패하므로 어떤 문이 추가되었는지 바로 알 수 있습니다.
+
+사용 예:
+    with count_queries(engine) as counter:
+        ...
+    print(counter.count)
+
+    with assert_query_count(engine, 2):   # tests/test_query_counts.py 참고
+        ...
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 기록"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine) -> Iterator[QueryCounter]:
+    """
+    블록 안에서 실행된 SQL 문 수 측정 (AsyncEngine도 지원)
+
+    사용 예:
+        with count_queries(engine) as counter:
+            ...
+        print(counter.count, counter.statements)
+    """
+    target = getattr(engine, "sync_engine", engine)
+    counter = QueryCounter()
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def assert_query_count(engine, expected: int) -> Iterator[QueryCounter]:
+    """블록 안에서 실행된 SQL 문 수가 expected와 다르면 AssertionError"""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count != expected:
+        executed = "\n".join(f"  {i}. {statement}" for i, statement in enumerate(counter.statements, 1))
+        raise AssertionError(f"쿼리 {expected}회 예상, 실제 {counter.count}회 실행:\n{executed}")
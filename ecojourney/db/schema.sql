@@ -1,3 +1,5 @@
+-- 기본 스키마 (alembic 리비전 28b3cc8f713d 시점, init_db.BASE_REVISION)
+-- 이후 추가된 테이블/인덱스/컬럼은 alembic 마이그레이션에만 둔다 (여기에 추가하면 alembic upgrade가 실패).
 -- SQLModel User 모델과 일치하도록 컬럼명/테이블명을 맞춘다.
 CREATE TABLE IF NOT EXISTS user (
     id INTEGER PRIMARY KEY AUTOINCREMENT,        -- 내부 PK (SQLModel 기본)
@@ -0,0 +1,38 @@
+"""
+Session 이벤트 훅 등록
+
+CarbonLog/PointsLog를 쓰는 세션이 같은 트랜잭션에서 파생 집계를 갱신하도록
+서비스 모듈의 after_flush 훅을 한 곳에서 명시적으로 등록합니다.
+
+- 앱 설정(ecojourney.py, ai/ai_main.py)에서 호출하고, 이 저장소의 엔진 생성 함수
+  (db.engine.get_engine, db.write_queue.create_writer_engine, db.async_session.get_async_engine)도 호출하므로
+  CLI/쓰기 큐/비동기 세션에서도 등록됩니다. 여러 번 호출해도 한 번만 등록됩니다.
+- 엔진을 직접 만드는 코드(테스트, 벤치마크)는 세션을 열기 전에 register_session_hooks()를 호출합니다.
+
+등록되는 훅:
+- service.ranking_windows: 기간별 랭킹 카운터(rankingcounter)
+- service.college_emissions: 단과대 일별 배출량 집계(collegeemissiondaily)
+- service.streaks: 사용자별 연속 기록(streakrecord)
+"""
+
+import threading
+
+_registered = False
+_lock = threading.Lock()
+
+
+def register_session_hooks() -> None:
+    """서비스 모듈의 Session 훅 등록 (프로세스당 한 번)"""
+    global _registered
+    if _registered:
+        return
+    with _lock:
+        if _registered:
+            return
+        # 서비스 모듈이 db 모듈을 import하므로 호출 시점에 import
+        from ..service import college_emissions, ranking_windows, streaks
+
+        ranking_windows.register_hooks()
+        college_emissions.register_hooks()
+        streaks.register_hooks()
+        _registered = True
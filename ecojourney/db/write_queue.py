@@ -0,0 +1,312 @@
+"""
+단일 쓰기 큐 (Single-Writer Queue)
+
+SQLite는 파일 전체에 쓰기 잠금이 하나뿐이라 여러 세션이 동시에 쓰면
+"database is locked" 오류나 busy wait이 발생합니다.
+이 모듈은 프로세스 내 모든 쓰기 작업을 하나의 asyncio 큐로 모아
+전용 스레드 하나에서 순서대로 실행하고, 짧은 시간 동안 모인 작업을
+한 트랜잭션(한 번의 commit)으로 묶어 처리합니다.
+
+- 각 작업은 SAVEPOINT 안에서 실행되므로 한 작업이 실패해도 같은 배치의
+  다른 작업에는 영향을 주지 않습니다.
+- 여러 워커(프로세스)의 배치 트랜잭션이 같은 행(점수 샤드, 사용자)을 다른 순서로 잠가
+  교착/직렬화 실패(PostgreSQL)가 나면 해당 작업만 되돌리고 배치 commit 후 새 트랜잭션에서 다시 실행합니다.
+- 작업 함수는 session.commit()을 호출하지 않습니다 (배치 commit은 큐가 수행).
+- 작업 함수의 반환값은 commit 이후 호출자에게 전달되므로
+  ORM 객체 대신 값(int, dict 등)을 반환하는 것을 권장합니다.
+
+사용 예:
+    from ..db.write_queue import submit_write
+
+    def _write(session):
+        return apply_points(session, student_id, 10, source="quiz")
+
+    new_balance = await submit_write(_write)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import logging
+import time
+
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+
+from .engine import engine_options, get_database_url
+from .session_hooks import register_session_hooks
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 한 배치에 묶을 최대 작업 수 / 첫 작업 이후 추가 작업을 기다리는 최대 시간(초)
+DEFAULT_MAX_BATCH = 32
+DEFAULT_MAX_WAIT = 0.005
+
+# 교착/직렬화 실패 시 작업 재시도 횟수 (PostgreSQL SQLSTATE 40P01, 40001)
+MAX_RETRIES = 3
+_RETRYABLE_SQLSTATES = ("40P01", "40001")
+
+
+def _configure_sqlite(engine) -> None:
+    """
+    SQLite 쓰기 엔진 설정
+    - WAL 모드: 쓰기 중에도 다른 연결의 읽기가 막히지 않음 (DB 파일에 영구 적용)
+    - BEGIN IMMEDIATE: 트랜잭션 시작 시 쓰기 잠금을 바로 잡아 잠금 승격 교착을 방지
+    - pysqlite의 자동 BEGIN을 끄고 SQLAlchemy가 직접 BEGIN/SAVEPOINT를 관리
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _is_retryable(error: Exception) -> bool:
+    """다시 실행하면 성공할 수 있는 오류(교착, 직렬화 실패)인지 여부"""
+    return getattr(getattr(error, "orig", None), "pgcode", None) in _RETRYABLE_SQLSTATES
+
+
+def create_writer_engine(db_url: Optional[str] = None):
+    """쓰기 큐 전용 엔진 생성 (SQLite인 경우 WAL/BEGIN IMMEDIATE 설정 적용)"""
+    register_session_hooks()
+    db_url = db_url or get_database_url()
+    engine = create_engine(db_url, **engine_options(db_url))
+    if engine.dialect.name == "sqlite":
+        _configure_sqlite(engine)
+    return engine
+
+
+class WriteQueueMetrics:
+    """쓰기 큐 지표 (큐 길이, 배치 크기, commit 지연시간)"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+        self.max_batch_size = 0
+        self.total_batch_size = 0
+        self.max_queue_depth = 0
+        self.last_commit_ms = 0.0
+        self.max_commit_ms = 0.0
+        self.total_commit_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.total_wait_ms = 0.0
+
+    def record_batch(self, size: int, commit_ms: float, wait_ms: List[float]) -> None:
+        self.batches += 1
+        self.total_batch_size += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.last_commit_ms = commit_ms
+        self.total_commit_ms += commit_ms
+        self.max_commit_ms = max(self.max_commit_ms, commit_ms)
+        for waited in wait_ms:
+            self.total_wait_ms += waited
+            self.max_wait_ms = max(self.max_wait_ms, waited)
+
+    def snapshot(self, queue_depth: int) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "queue_depth": queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "batches": self.batches,
+            "avg_batch_size": round(self.total_batch_size / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "last_commit_ms": round(self.last_commit_ms, 2),
+            "avg_commit_ms": round(self.total_commit_ms / self.batches, 2) if self.batches else 0.0,
+            "max_commit_ms": round(self.max_commit_ms, 2),
+            "avg_wait_ms": round(self.total_wait_ms / finished, 2) if finished else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+        }
+
+
+class WriteQueue:
+    """
+    프로세스 내 단일 쓰기 큐
+
+    submit()으로 받은 작업을 전용 스레드 하나에서 순서대로 실행하고,
+    max_wait 동안 모인 작업(최대 max_batch개)을 한 번에 commit합니다.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait: float = DEFAULT_MAX_WAIT,
+    ):
+        self._engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.metrics = WriteQueueMetrics()
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = create_writer_engine()
+        return self._engine
+
+    def _ensure_worker(self) -> None:
+        """현재 이벤트 루프에서 워커 태스크 시작 (루프가 바뀌면 새로 시작)"""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run())
+
+    async def submit(self, operation: Callable[[Session], T]) -> T:
+        """
+        쓰기 작업 제출 후 commit 완료까지 대기
+
+        Args:
+            operation: Session을 받아 쓰기를 수행하는 함수 (commit 호출 금지)
+
+        Returns:
+            operation의 반환값 (commit 성공 후)
+
+        Raises:
+            operation에서 발생한 예외, 또는 배치 commit 실패 시 해당 예외
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((operation, future, time.perf_counter()))
+        self.metrics.submitted += 1
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self._queue.qsize())
+        return await future
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """현재 지표 조회"""
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return self.metrics.snapshot(depth)
+
+    async def _collect_batch(self) -> List[Tuple[Callable, asyncio.Future, float]]:
+        """첫 작업을 기다린 뒤 max_wait 동안 추가 작업을 모음"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # 이미 쌓여 있는 작업은 기다리지 않고 함께 처리
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            operations = [operation for operation, _, _ in batch]
+            try:
+                outcomes, commit_ms = await self._loop.run_in_executor(
+                    self._executor, self._execute_batch, operations
+                )
+            except Exception as e:
+                logger.error(f"쓰기 배치 commit 실패 ({len(batch)}건): {e}", exc_info=True)
+                outcomes = [(False, e)] * len(batch)
+                commit_ms = 0.0
+
+            finished_at = time.perf_counter()
+            self.metrics.record_batch(
+                len(batch),
+                commit_ms,
+                [(finished_at - submitted_at) * 1000 for _, _, submitted_at in batch],
+            )
+            for (_, future, _), (ok, value) in zip(batch, outcomes):
+                if ok:
+                    self.metrics.completed += 1
+                    if not future.done():
+                        future.set_result(value)
+                else:
+                    self.metrics.failed += 1
+                    if not future.done():
+                        future.set_exception(value)
+
+    def _execute_batch(self, operations: List[Callable[[Session], Any]]):
+        """
+        전용 스레드에서 배치 실행 (작업별 SAVEPOINT, 배치당 commit 1회)
+
+        교착/직렬화 실패로 되돌린 작업은 배치를 commit한 뒤 새 트랜잭션에서 다시 실행합니다.
+        같은 트랜잭션에서 다시 실행하면 앞선 작업이 잡은 잠금 때문에 같은 교착이 반복되기 때문입니다.
+        commit이 실패하면 그 트랜잭션에서 실행한 작업만 실패로 돌려줍니다.
+
+        Returns:
+            ([(성공 여부, 반환값 또는 예외), ...], commit 소요시간(ms))
+        """
+        outcomes: List[Optional[Tuple[bool, Any]]] = [None] * len(operations)
+        pending = list(enumerate(operations))
+        started = time.perf_counter()
+        for attempt in range(MAX_RETRIES + 1):
+            retry = []
+            try:
+                with Session(self.engine, expire_on_commit=False) as session:
+                    session.begin()
+                    for index, operation in pending:
+                        savepoint = session.begin_nested()
+                        try:
+                            result = operation(session)
+                            session.flush()
+                            savepoint.commit()
+                            outcomes[index] = (True, result)
+                        except Exception as e:
+                            savepoint.rollback()
+                            if attempt < MAX_RETRIES and _is_retryable(e):
+                                retry.append((index, operation))
+                            else:
+                                outcomes[index] = (False, e)
+                    session.commit()
+            except Exception as e:
+                # 이번 시도의 작업만 실패 처리 (앞선 시도에서 commit된 작업의 결과는 유지)
+                logger.error(f"쓰기 배치 commit 실패 ({len(pending)}건, 시도 {attempt + 1}): {e}", exc_info=True)
+                for index, _ in pending:
+                    outcomes[index] = (False, e)
+                break
+            if not retry:
+                break
+            self.metrics.retries += len(retry)
+            logger.warning(f"교착/직렬화 실패로 쓰기 작업 {len(retry)}건 재실행 ({attempt + 1}/{MAX_RETRIES})")
+            pending = retry
+        return outcomes, (time.perf_counter() - started) * 1000
+
+
+_write_queue: Optional[WriteQueue] = None
+
+
+def get_write_queue() -> WriteQueue:
+    """프로세스 전역 쓰기 큐"""
+    global _write_queue
+    if _write_queue is None:
+        _write_queue = WriteQueue()
+    return _write_queue
+
+
+async def submit_write(operation: Callable[[Session], T]) -> T:
+    """전역 쓰기 큐에 작업 제출 (commit 완료 후 결과 반환)"""
+    return await get_write_queue().submit(operation)
+
+
+def get_write_metrics() -> Dict[str, Any]:
+    """전역 쓰기 큐 지표 조회"""
+    return get_write_queue().get_metrics()
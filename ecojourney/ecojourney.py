@@ -23,6 +23,20 @@ from .pages.ranking import ranking_page
 # _state 파라미터를 사용하여 Reflex가 AppState를 인식하도록 함
 app = rx.App()
 
+# 탄소 입력/포인트 로그 flush 시 파생 집계를 갱신하는 Session 훅 등록 (rx.session() 포함)
+from .db.session_hooks import register_session_hooks
+register_session_hooks()
+
+# 앱 시작 시 미적용 1회성 데이터 보정 실행 / 종료 시 비동기 DB 엔진 정리 / 주간 대결 교체 스케줄러 / 개인 포인트 리더보드
+from .db.data_repairs import data_repair_lifespan
+from .db.async_session import async_engine_lifespan
+from .service.battle_rollover import battle_rollover_lifespan
+from .service.leaderboard import leaderboard_lifespan
+app.register_lifespan_task(data_repair_lifespan)
+app.register_lifespan_task(async_engine_lifespan)
+app.register_lifespan_task(battle_rollover_lifespan)
+app.register_lifespan_task(leaderboard_lifespan)
+
 # 1. 메인 홈 화면 라우팅 (EcoJourney.py 파일 내 home_page 함수 사용)
 app.add_page(home_page, route="/", title="EcoJourney | 시작", on_load=AppState.hydrate_auth)
 
@@ -55,7 +69,7 @@ app.add_page(report_page, route="/report", title="EcoJourney | 결과 리포트"
 app.add_page(mypage_page, route="/mypage", title="EcoJourney | 마이페이지", on_load=[AppState.hydrate_auth, AppState.load_mypage_data])
 
 # 6. 단과대 대결 페이지 라우팅
-app.add_page(battle_page, route="/battle", title="EcoJourney | 단과대 대결", on_load=[AppState.hydrate_auth, AppState.load_current_battle])
+app.add_page(battle_page, route="/battle", title="EcoJourney | 단과대 대결", on_load=[AppState.hydrate_auth, AppState.load_current_battle, AppState.watch_battle_scores])
 
 # 7. 저번주 랭킹 페이지 라우팅
 app.add_page(
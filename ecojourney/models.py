@@ -2,6 +2,8 @@ import reflex as rx
 from datetime import datetime, date
 from typing import Optional, Dict, List, Any
 import json
+from sqlalchemy import Index
+from sqlmodel import Field
 
 # -----------------------------------------------------------------------------
 # 1. 사용자 (User)
@@ -14,6 +16,11 @@ class User(rx.Model, table=True):
     - college: 대항전 매칭을 위한 소속 단과대
     - current_points: 베팅 및 마일리지 환산에 사용할 잔액
     """
+    # 학번 조인(대항전 집계/정산)용 인덱스 (schema.sql에서는 UNIQUE 제약이 같은 역할)
+    __table_args__ = (
+        Index("ix_user_student_id", "student_id"),
+    )
+
     # Primary Key는 필드 이름이 id이거나 첫 번째 필드로 정의
     student_id: str  # Primary Key로 사용 (Reflex가 자동 처리)
     password: str
@@ -29,6 +36,12 @@ class CarbonLog(rx.Model, table=True):
     """
     일일 행동 데이터와 계산된 탄소 배출량, AI 피드백 저장
     """
+    # 사용자별 기간 집계(대시보드/통계)용 복합 인덱스
+    __table_args__ = (
+        Index("ix_carbonlog_student_id_log_date", "student_id", "log_date"),
+        Index("ix_carbonlog_student_id_created_at", "student_id", "created_at"),
+    )
+
     student_id: str  # User 테이블 참조 (수동 조인)
     log_date: date = date.today()
     source: str = "carbon_input"  # 포인트 발생 출처: carbon_input, challenge 등
@@ -91,6 +104,10 @@ class Battle(rx.Model, table=True):
     """
     # Primary Key는 Reflex가 자동으로 생성하지만, 명시적으로 id를 추가할 수도 있음
     # id: int = rx.Field(primary_key=True)  # 필요시 주석 해제
+    __table_args__ = (
+        # 주간 교체/지난 대결 기록 조회 (status + start_date 범위)
+        Index("ix_battle_status_start_date", "status", "start_date"),
+    )
     
     start_date: date
     end_date: date
@@ -109,6 +126,11 @@ class BattleParticipant(rx.Model, table=True):
     """
     대항전 참가 및 베팅 내역 (승자 독식 로직용)
     """
+    # 대결별 참가자 집계/정산 (battle_id 조건 + 학번별 그룹화)
+    __table_args__ = (
+        Index("ix_battleparticipant_battle_id_student_id", "battle_id", "student_id"),
+    )
+
     battle_id: int  # Battle 테이블 ID 참조
     student_id: str  # User 테이블 ID 참조
     
@@ -123,6 +145,10 @@ class MileageRequest(rx.Model, table=True):
     """
     앱 내 포인트를 학교 BeCome 마일리지로 환산 신청한 내역
     """
+    __table_args__ = (
+        Index("ix_mileagerequest_student_id_processed_at", "student_id", "processed_at"),
+    )
+
     student_id: str
     request_points: int        # 차감할 포인트
     converted_mileage: int     # 실제 적립될 마일리지
@@ -135,6 +161,8 @@ class MileageRequest(rx.Model, table=True):
 class Challenge(rx.Model, table=True):
     """
     주간 미션 마스터 데이터 (관리자가 생성하거나 미리 넣어둠)
+    - 규칙(trigger_event, counter_window, window_days, distinct_days)을 데이터로 선언하면
+      service/challenge_rules.py가 이벤트마다 해당 규칙의 진행도만 갱신 (코드 변경 없이 새 챌린지 추가)
     """
     # Primary Key는 Reflex가 자동으로 생성하지만, 명시적으로 id를 추가할 수도 있음
     # id: int = rx.Field(primary_key=True)  # 필요시 주석 해제
@@ -145,6 +173,10 @@ class Challenge(rx.Model, table=True):
     reward_points: int = 500
     is_active: bool = True  # 챌린지 활성화 여부
     created_at: datetime = datetime.now()
+    trigger_event: Optional[str] = None  # 진행도를 올리는 이벤트: carbon_logged, article_read, quiz_solved, bet_placed
+    counter_window: str = "daily"  # 집계 기간: daily(하루), weekly(월~일), rolling(최근 window_days일)
+    window_days: int = 1  # rolling 기간(일, 최대 62)
+    distinct_days: bool = False  # True이면 하루에 한 번만 셈 (rolling은 항상 True)
 
 class ChallengeProgress(rx.Model, table=True):
     """
@@ -157,6 +189,8 @@ class ChallengeProgress(rx.Model, table=True):
     is_completed: bool = False # 보상 지급 여부
     completed_at: Optional[datetime] = None  # 완료 시점
     last_updated: datetime = datetime.now()
+    window_start: Optional[date] = None  # 집계 기간 시작일 (daily/weekly), rolling은 마지막 이벤트 날짜
+    day_mask: int = 0  # distinct_days 규칙의 기록한 날 비트 (daily/weekly: 시작일부터, rolling: 마지막 이벤트 날짜부터 거꾸로)
 
 # -----------------------------------------------------------------------------
 # 6. 포인트 로그 (Points Log)
@@ -165,9 +199,186 @@ class PointsLog(rx.Model, table=True):
     """
     포인트 획득 내역을 기록하는 테이블
     """
+    __table_args__ = (
+        Index("ix_pointslog_student_id_created_at", "student_id", "created_at"),
+    )
+
     student_id: str  # User 테이블 참조
     log_date: date = date.today()
     points: int = 0  # 획득한 포인트
     source: str  # 포인트 출처: "리포트", "OX퀴즈", "아티클 읽기", "챌린지" 등
     description: Optional[str] = None  # 추가 설명 (선택사항)
-    created_at: datetime = datetime.now()
\ No newline at end of file
+    created_at: datetime = datetime.now()
+
+# -----------------------------------------------------------------------------
+# 7. 포인트 원장 (Points Ledger)
+# -----------------------------------------------------------------------------
+class PointsLedger(rx.Model, table=True):
+    """
+    포인트 변동 원장 (append-only)
+    - 모든 포인트 변동을 한 행씩 추가하며 수정/삭제하지 않음
+    - balance_after: 해당 변동이 반영된 직후의 잔액 (잔액 조회는 최신 행 1건으로 O(1))
+    """
+    __table_args__ = (
+        Index("ix_pointsledger_student_id_id", "student_id", "id"),
+    )
+
+    student_id: str  # User 테이블 참조
+    delta: int  # 변동량 (획득: 양수, 차감: 음수)
+    balance_after: int  # 변동 후 잔액
+    source: str  # 변동 출처: carbon_input, challenge, battle_participation, battle_reward, mileage_conversion 등
+    description: Optional[str] = None
+    created_at: datetime = datetime.now()
+
+class PointsSnapshot(rx.Model, table=True):
+    """
+    사용자별 잔액 스냅샷 (주기적으로 생성)
+    - 정합성 검사 시 스냅샷 이후 원장만 확인하면 되도록 기준점 역할
+    """
+    __table_args__ = (
+        Index("ix_pointssnapshot_student_id_ledger_id", "student_id", "ledger_id"),
+    )
+
+    student_id: str
+    balance: int  # 스냅샷 시점 잔액
+    ledger_id: int  # 스냅샷에 포함된 마지막 원장 id
+    created_at: datetime = datetime.now()
+
+# -----------------------------------------------------------------------------
+# 8. 데이터 보정 이력 (Data Repair)
+# -----------------------------------------------------------------------------
+class DataRepair(rx.Model, table=True):
+    """
+    1회성 데이터 보정(repair) 적용 이력
+    - repair_id별로 한 번만 실행되도록 적용 여부를 기록
+    """
+    repair_id: str = Field(unique=True)  # 보정 ID (예: "2025_11_challenge_log_source")
+    description: Optional[str] = None
+    rows_affected: int = 0  # 보정된 행 수
+    applied_at: datetime = datetime.now()
+
+# -----------------------------------------------------------------------------
+# 9. 탄소 로그 월별 집계 (Carbon Log Monthly Rollup)
+# -----------------------------------------------------------------------------
+class CarbonLogMonthly(rx.Model, table=True):
+    """
+    Parquet로 보관(archive)된 CarbonLog의 사용자별 월별 집계
+    - 원본 행은 라이브 DB에서 삭제되고, 누적 통계는 이 테이블로 유지
+    - category_counts_json: {"카테고리": 활동 개수} (처음 등장한 순서)
+    """
+    __table_args__ = (
+        Index("ix_carbonlogmonthly_student_id_month_source", "student_id", "month", "source", unique=True),
+    )
+
+    student_id: str
+    month: date  # 해당 월 1일
+    source: str = "carbon_input"
+    log_count: int = 0
+    total_emission: float = 0.0
+    points_earned: int = 0  # 양수 포인트 합계
+    category_counts_json: str = "{}"
+    archived_at: datetime = datetime.now()
+
+# -----------------------------------------------------------------------------
+# 10. 대항전 점수 샤드 (Battle Score Shard)
+# -----------------------------------------------------------------------------
+class BattleScoreShard(rx.Model, table=True):
+    """
+    대결 팀별 점수 증분을 여러 행(샤드)에 나눠 누적하는 카운터
+    - 베팅은 임의의 샤드 1행만 원자적으로 증가시키므로 인기 대결에서도 battle 행 잠금 경합이 없음
+    - 현재 점수 = Battle.score_a/score_b + 해당 팀 샤드 합계
+    - 주기 작업/정산 시 샤드 합계를 Battle 행에 합치고(fold) 샤드 행은 삭제
+    """
+    __table_args__ = (
+        Index("ix_battlescoreshard_battle_id_side_shard", "battle_id", "side", "shard", unique=True),
+    )
+
+    battle_id: int  # Battle 테이블 ID 참조
+    side: str  # 'A' 또는 'B'
+    shard: int  # 샤드 번호 (0 ~ SCORE_SHARDS-1)
+    score: int = 0  # 아직 Battle 행에 합쳐지지 않은 점수 증분
+
+# -----------------------------------------------------------------------------
+# 11. 단과대 전적 (College Record)
+# -----------------------------------------------------------------------------
+class CollegeRecord(rx.Model, table=True):
+    """
+    단과대별 대항전 누적 전적 (시즌별 + 전체 기간)
+    - 정산 시 같은 트랜잭션에서 증가시키므로 순위표는 대결 전체를 집계하지 않고 단과대 수만큼의 행만 읽음
+    - season: 학기 키("YYYY-1", "YYYY-2") 또는 전체 기간 "ALL"
+    """
+    __table_args__ = (
+        Index("ix_collegerecord_season_college", "season", "college", unique=True),
+    )
+
+    season: str
+    college: str
+    battles: int = 0
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    points_for: int = 0  # 득점 (자기 팀 점수 합계)
+    points_against: int = 0  # 실점 (상대 팀 점수 합계)
+    updated_at: datetime = datetime.now()
+
+# -----------------------------------------------------------------------------
+# 12. 기간별 랭킹 카운터 (Ranking Counter)
+# -----------------------------------------------------------------------------
+class RankingCounter(rx.Model, table=True):
+    """
+    사용자별 주간/월간 누적 카운터 (기간 버킷)
+    - CarbonLog/PointsLog를 쓰는 트랜잭션에서 증분 갱신하므로 기간별 랭킹은 원본 로그를 집계하지 않음
+    - period: 주 "W" + 월요일 날짜("W2026-10-19") 또는 월 "M" + 연월("M2026-10")
+    - 기간이 바뀌면 새 버킷에 쌓이므로 지난 기간 만료에 재계산이 필요 없음
+    """
+    __table_args__ = (
+        Index("ix_rankingcounter_period_student_id", "period", "student_id", unique=True),
+    )
+
+    period: str
+    student_id: str
+    points: int = 0  # 기간 내 획득 포인트 (탄소 입력, 챌린지 등 / 대항전 베팅·보상 제외)
+    reduction_g: int = 0  # 기간 내 탄소 절감량 (g, 평균 일일 배출량 대비)
+    updated_at: datetime = datetime.now()
+
+# -----------------------------------------------------------------------------
+# 13. 단과대 일별 배출량 집계 (College Emission Daily)
+# -----------------------------------------------------------------------------
+class CollegeEmissionDaily(rx.Model, table=True):
+    """
+    단과대별 일별 탄소 입력 집계
+    - 탄소 입력(CarbonLog, source='carbon_input')을 저장하는 트랜잭션에서 증분 갱신 (같은 날 기록 수정은 이전 값을 빼고 반영)
+    - 단과대 순위/추이는 원본 로그 대신 (단과대 수 × 일수)만큼의 행만 읽음
+    - 1인당 평균 배출량 = emission_g / active_users
+    """
+    __table_args__ = (
+        Index("ix_collegeemissiondaily_log_date_college", "log_date", "college", unique=True),
+    )
+
+    log_date: date
+    college: str
+    emission_g: int = 0  # 배출량 합계 (g, 정수로 누적해 증감 시 오차 없음)
+    active_users: int = 0  # 탄소 입력을 한 사용자 수
+    updated_at: datetime = datetime.now()
+
+# -----------------------------------------------------------------------------
+# 14. 연속 기록 (Streak Record)
+# -----------------------------------------------------------------------------
+class StreakRecord(rx.Model, table=True):
+    """
+    사용자별 탄소 입력 연속 기록 (사용자당 1행)
+    - 탄소 입력(CarbonLog, source='carbon_input')을 저장하는 트랜잭션에서 O(1)로 갱신
+    - day_mask: week_start(월요일) 주의 기록 요일 비트 (월=1, 화=2, ... 일=64)
+    - 주간 챌린지 진행도와 마이페이지는 로그를 다시 세지 않고 이 행만 읽음
+    """
+    __table_args__ = (
+        Index("ix_streakrecord_student_id", "student_id", unique=True),
+    )
+
+    student_id: str
+    week_start: date  # day_mask가 가리키는 주의 월요일
+    day_mask: int = 0  # 이번 주 기록 요일 (7비트)
+    current_streak: int = 0  # last_log_date까지 이어진 연속 기록 일수
+    best_streak: int = 0  # 최장 연속 기록 일수
+    last_log_date: Optional[date] = None  # 마지막 기록 날짜
+    updated_at: datetime = datetime.now()
@@ -313,7 +313,7 @@ def quiz_card():
 
             # O/X 버튼 (텍스트 오른쪽에 와도 어색하지 않도록 크기 축소)
             rx.hstack(
-                # O 버튼 (정답)
+                # O 버튼
                 rx.button(
                     "O",
                     on_click=lambda: AppState.answer_quiz(True),
@@ -335,7 +335,7 @@ def quiz_card():
                     is_disabled=AppState.quiz_is_correct,
                 ),
 
-                # X 버튼 (오답)
+                # X 버튼
                 rx.button(
                     "X",
                     on_click=lambda: AppState.answer_quiz(False),
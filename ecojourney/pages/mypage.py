@@ -303,7 +303,7 @@ def mypage_page() -> rx.Component:
                                     ),
                                     # 더보기 버튼
                                     rx.cond(
-                                        AppState.points_log.length() > AppState.points_log_display_limit,
+                                        AppState.points_log_has_more,
                                         rx.button(
                                             "더보기",
                                             on_click=AppState.load_more_points_log,
@@ -328,6 +328,12 @@ def mypage_page() -> rx.Component:
                             rx.card(
                                 rx.vstack(
                                     rx.heading("🎯 참여 중인 챌린지", size="6", color="#333333", margin_bottom="20px"),
+                                    rx.text(
+                                        f"🔥 연속 기록 {AppState.current_streak}일 (최장 {AppState.best_streak}일)",
+                                        color="#4DAB75",
+                                        size="4",
+                                        font_weight="bold",
+                                    ),
                                     rx.cond(
                                         AppState.user_challenge_progress.length() > 0,
                                         rx.vstack(
@@ -610,6 +616,100 @@ def mypage_page() -> rx.Component:
                             margin_bottom="30px",
                         ),
 
+                        # 보관된 지난 기록 (요청 시에만 보관 파일에서 조회)
+                        rx.card(
+                            rx.vstack(
+                                rx.heading("🗄️ 지난 탄소 기록", size="6", color="#333333", margin_bottom="10px"),
+                                rx.text(
+                                    "오래된 기록은 보관 파일로 옮겨져 있어 요청할 때만 불러옵니다.",
+                                    color="gray.600",
+                                    size="3",
+                                ),
+                                rx.cond(
+                                    AppState.archived_logs_loaded,
+                                    rx.cond(
+                                        AppState.archived_logs_history.length() > 0,
+                                        rx.vstack(
+                                            rx.foreach(
+                                                AppState.archived_logs_history,
+                                                lambda log: rx.hstack(
+                                                    rx.vstack(
+                                                        rx.text(
+                                                            log["log_date"],
+                                                            color="#333333",
+                                                            size="4",
+                                                            font_weight="normal",
+                                                        ),
+                                                        rx.text(
+                                                            rx.cond(
+                                                                log["source"] == "carbon_input",
+                                                                f"탄소 입력 · 활동 {log['activities_count']}개",
+                                                                "챌린지 보상",
+                                                            ),
+                                                            color="gray.600",
+                                                            size="3",
+                                                        ),
+                                                        spacing="1",
+                                                        align="start",
+                                                    ),
+                                                    rx.vstack(
+                                                        rx.text(
+                                                            f"{log['total_emission']} kgCO₂e",
+                                                            color="#333333",
+                                                            size="4",
+                                                            font_weight="bold",
+                                                        ),
+                                                        rx.text(
+                                                            f"+{log['points_earned']} 포인트",
+                                                            color="#4DAB75",
+                                                            size="3",
+                                                        ),
+                                                        spacing="1",
+                                                        align="end",
+                                                    ),
+                                                    spacing="4",
+                                                    justify="between",
+                                                    width="100%",
+                                                    padding="10px",
+                                                    border_radius="8px",
+                                                    background="rgba(0, 0, 0, 0.03)",
+                                                    margin_bottom="8px",
+                                                ),
+                                            ),
+                                            spacing="2",
+                                            width="100%",
+                                            max_height="400px",
+                                            overflow_y="auto",
+                                        ),
+                                        rx.text(
+                                            "보관된 기록이 없습니다.",
+                                            color="gray.600",
+                                            size="5",
+                                            font_weight="normal",
+                                        ),
+                                    ),
+                                    rx.button(
+                                        "오래된 기록 불러오기",
+                                        on_click=AppState.load_archived_logs_history,
+                                        color_scheme="green",
+                                        variant="outline",
+                                        size="3",
+                                        width="100%",
+                                        margin_top="10px",
+                                    ),
+                                ),
+                                spacing="3",
+                                width="100%",
+                            ),
+                            width="100%",
+                            background="white",
+                            border="1px solid rgba(0,0,0,0.1)",
+                            box_shadow="0 4px 12px rgba(0,0,0,0.1)",
+                            padding="30px",
+                            border_radius="16px",
+                            margin_bottom="30px",
+                        ),
+
                         spacing="6",
                         width="100%",
                         max_width="1400px",
@@ -5,6 +5,297 @@ from ..states import AppState
 from .common_header import header, footer_bar
 
 
+def _standings_table(standings) -> rx.Component:
+    """단과대 순위표 (승/무/패, 득실점)"""
+    return rx.cond(
+        standings.length() > 0,
+        rx.table.root(
+            rx.table.header(
+                rx.table.row(
+                    rx.table.column_header_cell("순위", width="80px"),
+                    rx.table.column_header_cell("단과대", width="200px"),
+                    rx.table.column_header_cell("전적"),
+                    rx.table.column_header_cell("승률"),
+                    rx.table.column_header_cell("득점 / 실점"),
+                ),
+            ),
+            rx.table.body(
+                rx.foreach(
+                    standings,
+                    lambda record: rx.table.row(
+                        rx.table.cell(rx.text(record["rank"], size="4", color="#333333", font_weight="bold")),
+                        rx.table.cell(
+                            rx.text(
+                                record["college"],
+                                size="4",
+                                color=rx.cond(record["college"] == AppState.current_user_college, "#4DAB75", "#333333"),
+                                font_weight="bold",
+                            ),
+                        ),
+                        rx.table.cell(rx.text(f"{record['wins']}승 {record['draws']}무 {record['losses']}패", size="4", color="#333333")),
+                        rx.table.cell(rx.text(f"{record['win_rate']}%", size="4", color="#333333")),
+                        rx.table.cell(rx.text(f"{record['points_for']:,} / {record['points_against']:,}", size="3", color="gray.600")),
+                    ),
+                ),
+            ),
+            width="100%",
+        ),
+        rx.text("아직 종료된 대결이 없습니다.", size="4", color="gray.600"),
+    )
+
+
+def _archive_section() -> rx.Component:
+    """지난 대결 기록 (주 단위 커서 페이지)"""
+    return rx.card(
+        rx.vstack(
+            rx.cond(
+                AppState.battle_archive.length() > 0,
+                rx.table.root(
+                    rx.table.header(
+                        rx.table.row(
+                            rx.table.column_header_cell("주"),
+                            rx.table.column_header_cell("대결"),
+                            rx.table.column_header_cell("점수"),
+                            rx.table.column_header_cell("승리"),
+                        ),
+                    ),
+                    rx.table.body(
+                        rx.foreach(
+                            AppState.battle_archive,
+                            lambda battle: rx.table.row(
+                                rx.table.cell(rx.text(battle["week"], size="3", color="gray.600")),
+                                rx.table.cell(rx.text(f"{battle['college_a']} vs {battle['college_b']}", size="4", color="#333333")),
+                                rx.table.cell(rx.text(f"{battle['score_a']} : {battle['score_b']}", size="4", color="#333333")),
+                                rx.table.cell(
+                                    rx.cond(
+                                        battle["winner"] == None,
+                                        rx.badge("무승부", color_scheme="gray", size="2"),
+                                        rx.badge(battle["winner"], color_scheme="green", size="2"),
+                                    ),
+                                ),
+                            ),
+                        ),
+                    ),
+                    width="100%",
+                ),
+                rx.text("지난 대결 기록이 없습니다.", size="4", color="gray.600"),
+            ),
+            rx.cond(
+                AppState.battle_archive_cursor != "",
+                rx.button(
+                    "더 보기",
+                    on_click=AppState.load_more_battle_archive,
+                    variant="outline",
+                    color_scheme="green",
+                ),
+            ),
+            spacing="4",
+            align="center",
+            width="100%",
+        ),
+        width="100%",
+        padding="20px",
+        background="white",
+        border="1px solid rgba(0, 0, 0, 0.1)",
+        box_shadow="0 4px 12px rgba(0,0,0,0.1)",
+    )
+
+
+def _my_ranking_section() -> rx.Component:
+    """내 순위와 앞뒤 순위 (리더보드에 없으면 표시하지 않음)"""
+    return rx.cond(
+        AppState.my_ranking.contains("rank"),
+        rx.vstack(
+            rx.text(
+                f"내 순위: {AppState.my_ranking['rank']}등 / {AppState.ranking_total}명 ({AppState.my_ranking['points']:,}점)",
+                size="4",
+                color="#4DAB75",
+                font_weight="bold",
+            ),
+            rx.foreach(
+                AppState.ranking_neighbors,
+                lambda ranking: rx.hstack(
+                    rx.text(f"{ranking['rank']}등", size="3", color="#333333", width="80px"),
+                    rx.text(
+                        ranking["nickname"],
+                        size="3",
+                        color=rx.cond(ranking["student_id"] == AppState.current_user_id, "#4DAB75", "#333333"),
+                        font_weight="bold",
+                        width="200px",
+                    ),
+                    rx.text(ranking["college"], size="3", color="gray.600", width="200px"),
+                    rx.text(f"{ranking['points']:,}점", size="3", color="#333333"),
+                    width="100%",
+                ),
+            ),
+            spacing="2",
+            width="100%",
+            padding_top="10px",
+            border_top="1px solid rgba(0, 0, 0, 0.1)",
+        ),
+    )
+
+
+def _window_ranking_section() -> rx.Component:
+    """기간별 랭킹 (이번 주/이번 달 × 획득 포인트/탄소 절감량)"""
+    return rx.card(
+        rx.vstack(
+            rx.hstack(
+                rx.heading("기간별 랭킹", size="6", color="#333333"),
+                rx.text(AppState.window_label, size="3", color="gray.600"),
+                align="center",
+                spacing="3",
+            ),
+            rx.hstack(
+                rx.segmented_control.root(
+                    rx.segmented_control.item("이번 주", value="week"),
+                    rx.segmented_control.item("이번 달", value="month"),
+                    value=AppState.ranking_window,
+                    on_change=AppState.set_ranking_window,
+                ),
+                rx.segmented_control.root(
+                    rx.segmented_control.item("획득 포인트", value="points"),
+                    rx.segmented_control.item("탄소 절감량", value="reduction"),
+                    value=AppState.ranking_metric,
+                    on_change=AppState.set_ranking_metric,
+                ),
+                spacing="3",
+                wrap="wrap",
+            ),
+            rx.cond(
+                AppState.window_rankings.length() > 0,
+                rx.table.root(
+                    rx.table.header(
+                        rx.table.row(
+                            rx.table.column_header_cell("순위", width="80px"),
+                            rx.table.column_header_cell("닉네임", width="150px"),
+                            rx.table.column_header_cell("단과대", width="200px"),
+                            rx.table.column_header_cell("기록", width="150px"),
+                        ),
+                    ),
+                    rx.table.body(
+                        rx.foreach(
+                            AppState.window_rankings,
+                            lambda ranking: rx.table.row(
+                                rx.table.cell(rx.text(ranking["rank"], size="4", color="#333333", font_weight="bold")),
+                                rx.table.cell(
+                                    rx.text(
+                                        ranking["nickname"],
+                                        size="4",
+                                        color=rx.cond(ranking["student_id"] == AppState.current_user_id, "#4DAB75", "#333333"),
+                                        font_weight="bold",
+                                    ),
+                                ),
+                                rx.table.cell(rx.text(ranking["college"], size="4", color="#333333")),
+                                rx.table.cell(rx.text(ranking["value"], size="4", color="#4DAB75", font_weight="bold")),
+                            ),
+                        ),
+                    ),
+                    width="100%",
+                ),
+                rx.text("이 기간의 기록이 아직 없습니다.", size="4", color="gray.600"),
+            ),
+            rx.cond(
+                AppState.window_my_ranking.contains("rank"),
+                rx.text(
+                    f"내 순위: {AppState.window_my_ranking['rank']}등 ({AppState.window_my_ranking['value']})",
+                    size="4",
+                    color="#4DAB75",
+                    font_weight="bold",
+                ),
+            ),
+            spacing="4",
+            padding="20px",
+            width="100%",
+        ),
+        width="100%",
+        background="white",
+        border="1px solid rgba(0, 0, 0, 0.1)",
+        box_shadow="0 4px 12px rgba(0,0,0,0.1)",
+        margin_bottom="30px",
+    )
+
+
+def _college_emission_section() -> rx.Component:
+    """단과대 1인당 평균 배출량 순위 (최근 7일) + 내 단과대 일별 추이 (최근 14일)"""
+    return rx.card(
+        rx.vstack(
+            rx.heading("단과대 탄소 배출 순위 (최근 7일)", size="6", color="#333333"),
+            rx.text("탄소 입력 1회당 평균 배출량이 적을수록 높은 순위입니다.", size="3", color="gray.600"),
+            rx.cond(
+                AppState.college_emission_ranking.length() > 0,
+                rx.table.root(
+                    rx.table.header(
+                        rx.table.row(
+                            rx.table.column_header_cell("순위", width="80px"),
+                            rx.table.column_header_cell("단과대", width="200px"),
+                            rx.table.column_header_cell("1인당 평균"),
+                            rx.table.column_header_cell("입력 수"),
+                            rx.table.column_header_cell("총 배출량"),
+                        ),
+                    ),
+                    rx.table.body(
+                        rx.foreach(
+                            AppState.college_emission_ranking,
+                            lambda record: rx.table.row(
+                                rx.table.cell(rx.text(record["rank"], size="4", color="#333333", font_weight="bold")),
+                                rx.table.cell(
+                                    rx.text(
+                                        record["college"],
+                                        size="4",
+                                        color=rx.cond(record["college"] == AppState.current_user_college, "#4DAB75", "#333333"),
+                                        font_weight="bold",
+                                    ),
+                                ),
+                                rx.table.cell(rx.text(f"{record['per_capita']}kg", size="4", color="#4DAB75", font_weight="bold")),
+                                rx.table.cell(rx.text(f"{record['active_users']}회", size="4", color="#333333")),
+                                rx.table.cell(rx.text(f"{record['total_emission']}kg", size="3", color="gray.600")),
+                            ),
+                        ),
+                    ),
+                    width="100%",
+                ),
+                rx.text("최근 7일간 탄소 입력 기록이 없습니다.", size="4", color="gray.600"),
+            ),
+            rx.cond(
+                AppState.college_emission_trend.length() > 0,
+                rx.vstack(
+                    rx.text(f"{AppState.current_user_college} 최근 14일 1인당 평균 배출량", size="4", color="#333333", font_weight="bold"),
+                    rx.flex(
+                        rx.foreach(
+                            AppState.college_emission_trend,
+                            lambda point: rx.vstack(
+                                rx.text(point["date"], size="1", color="gray.600"),
+                                rx.text(f"{point['per_capita']}kg", size="2", color="#333333", font_weight="bold"),
+                                rx.text(f"{point['active_users']}명", size="1", color="gray.600"),
+                                align="center",
+                                spacing="1",
+                                padding="6px",
+                                border="1px solid rgba(0, 0, 0, 0.1)",
+                                border_radius="8px",
+                            ),
+                        ),
+                        wrap="wrap",
+                        gap="6px",
+                    ),
+                    spacing="2",
+                    width="100%",
+                    padding_top="10px",
+                    border_top="1px solid rgba(0, 0, 0, 0.1)",
+                ),
+            ),
+            spacing="4",
+            padding="20px",
+            width="100%",
+        ),
+        width="100%",
+        background="white",
+        border="1px solid rgba(0, 0, 0, 0.1)",
+        box_shadow="0 4px 12px rgba(0,0,0,0.1)",
+        margin_bottom="30px",
+    )
+
+
 def ranking_page() -> rx.Component:
     """저번주 대결 결과 랭킹 페이지"""
     return rx.cond(
@@ -167,6 +458,7 @@ def ranking_page() -> rx.Component:
                                 ),
                                 width="100%",
                             ),
+                            _my_ranking_section(),
                             spacing="3",
                             width="100%",
                         ),
@@ -187,6 +479,12 @@ def ranking_page() -> rx.Component:
                         box_shadow="0 4px 12px rgba(0,0,0,0.1)",
                         margin_bottom="30px",
                     ),
+
+                    # 기간별 랭킹 섹션 (이번 주/이번 달)
+                    _window_ranking_section(),
+
+                    # 단과대 탄소 배출 순위 섹션 (최근 7일)
+                    _college_emission_section(),
             
                     # 저번주 대결 결과 섹션
                     rx.heading("지난주 배틀 결과", size="6", color="#333333", margin_bottom="15px"),
@@ -293,6 +591,30 @@ def ranking_page() -> rx.Component:
                         ),
                     ),
 
+                    # 단과대 전적 섹션 (이번 시즌 / 전체 기간)
+                    rx.heading("단과대 전적", size="6", color="#333333", margin_bottom="15px"),
+                    rx.card(
+                        rx.tabs.root(
+                            rx.tabs.list(
+                                rx.tabs.trigger(AppState.season_name, value="season"),
+                                rx.tabs.trigger("전체 기간", value="all"),
+                            ),
+                            rx.tabs.content(_standings_table(AppState.college_standings), value="season", padding_top="15px"),
+                            rx.tabs.content(_standings_table(AppState.college_standings_all), value="all", padding_top="15px"),
+                            default_value="season",
+                            width="100%",
+                        ),
+                        width="100%",
+                        padding="20px",
+                        background="white",
+                        border="1px solid rgba(0, 0, 0, 0.1)",
+                        box_shadow="0 4px 12px rgba(0,0,0,0.1)",
+                    ),
+
+                    # 지난 대결 기록 섹션 (주 단위 페이지, 더 보기)
+                    rx.heading("지난 대결 기록", size="6", color="#333333", margin_bottom="15px"),
+                    _archive_section(),
+
                     spacing="6",
                     align="center",
                     padding="40px 20px",
@@ -0,0 +1,251 @@
+"""
+대항전 기록(Archive)과 단과대 전적(College Record) 모듈
+
+- 지난 대결 목록: 종료된 대결을 주(start_date) 단위 커서로 페이지 조회합니다.
+  battle (status, start_date) 인덱스로 커서 이전 N주만 읽으므로 기록이 쌓여도 페이지 비용이 같습니다.
+- 단과대 전적: collegerecord 테이블에 (시즌, 단과대)별 승/패/무와 득실점을 누적합니다.
+  정산(settle_battle)이 같은 트랜잭션에서 record_result()로 갱신하므로
+  순위표는 단과대 수만큼의 행만 읽습니다 (전체 기간은 season='ALL').
+
+시즌은 학기 기준입니다: 3~8월 = "YYYY-1", 9~2월 = "YYYY-2" (1~2월은 전년도 2학기).
+
+사용 예:
+    python -m ecojourney.service.battle_archive standings        # 이번 시즌 순위
+    python -m ecojourney.service.battle_archive standings ALL    # 전체 기간 순위
+    python -m ecojourney.service.battle_archive rebuild          # 종료된 대결로 전적 재계산
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+import logging
+
+from sqlalchemy import delete, insert, select
+
+from ..models import Battle, CollegeRecord
+
+logger = logging.getLogger(__name__)
+
+# 전체 기간 전적의 시즌 키
+ALL_SEASON = "ALL"
+
+# 기록 페이지당 주 수
+DEFAULT_ARCHIVE_WEEKS = 4
+
+_battle = Battle.__table__
+_record = CollegeRecord.__table__
+
+
+def season_of(target_date: date) -> str:
+    """날짜가 속한 시즌 (학기) 키"""
+    if 3 <= target_date.month <= 8:
+        return f"{target_date.year}-1"
+    if target_date.month >= 9:
+        return f"{target_date.year}-2"
+    return f"{target_date.year - 1}-2"
+
+
+def season_label(season: str) -> str:
+    """시즌 키 → 화면 표시용 이름"""
+    if season == ALL_SEASON:
+        return "전체"
+    year, term = season.split("-")
+    return f"{year}년 {term}학기"
+
+
+def _result_rows(college_a: str, college_b: str, score_a: int, score_b: int, winner: Optional[str], start_date: date) -> List[Dict[str, Any]]:
+    """대결 1건 → 단과대/시즌별 전적 증분 행 (2팀 × (해당 시즌, 전체) = 4행)"""
+    rows = []
+    for college, scored, conceded in ((college_a, score_a, score_b), (college_b, score_b, score_a)):
+        for season in (season_of(start_date), ALL_SEASON):
+            rows.append({
+                "season": season,
+                "college": college,
+                "battles": 1,
+                "wins": 1 if winner == college else 0,
+                "losses": 1 if winner is not None and winner != college else 0,
+                "draws": 1 if winner is None else 0,
+                "points_for": scored,
+                "points_against": conceded,
+            })
+    return rows
+
+
+def record_result(
+    session,
+    college_a: str,
+    college_b: str,
+    score_a: int,
+    score_b: int,
+    winner: Optional[str],
+    start_date: date,
+) -> None:
+    """
+    정산된 대결 1건을 단과대 전적에 반영 (UPSERT 1회, 커밋은 호출자가 수행)
+
+    settle_battle의 상태 가드 안에서 호출되므로 같은 대결이 두 번 반영되지 않습니다.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+    now = datetime.now()
+    statement = upsert(_record).values([
+        dict(row, updated_at=now)
+        for row in _result_rows(college_a, college_b, score_a, score_b, winner, start_date)
+    ])
+    counters = ("battles", "wins", "losses", "draws", "points_for", "points_against")
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[_record.c.season, _record.c.college],
+            set_={
+                **{name: _record.c[name] + statement.excluded[name] for name in counters},
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    )
+
+
+def rebuild_records(session) -> int:
+    """
+    종료된 모든 대결로 단과대 전적 재계산 (백필/점검용, 커밋은 호출자가 수행)
+
+    Returns:
+        저장된 전적 행 수
+    """
+    totals: Dict[tuple, Dict[str, int]] = defaultdict(
+        lambda: {"battles": 0, "wins": 0, "losses": 0, "draws": 0, "points_for": 0, "points_against": 0}
+    )
+    for battle in session.execute(
+        select(
+            _battle.c.college_a, _battle.c.college_b, _battle.c.score_a, _battle.c.score_b,
+            _battle.c.winner, _battle.c.start_date,
+        ).where(_battle.c.status == "FINISHED")
+    ):
+        for row in _result_rows(*battle):
+            total = totals[(row["season"], row["college"])]
+            for name in total:
+                total[name] += row[name]
+
+    session.execute(delete(_record))
+    now = datetime.now()
+    if totals:
+        session.execute(
+            insert(_record),
+            [
+                dict(counts, season=season, college=college, updated_at=now)
+                for (season, college), counts in totals.items()
+            ],
+        )
+    return len(totals)
+
+
+def get_standings(session, season: str = ALL_SEASON) -> List[Dict[str, Any]]:
+    """
+    시즌별 단과대 순위 (collegerecord 행만 조회)
+
+    정렬: 승 → 무 → 득실차 → 득점 → 단과대 이름
+    """
+    rows = session.execute(
+        select(
+            _record.c.college, _record.c.battles, _record.c.wins, _record.c.losses, _record.c.draws,
+            _record.c.points_for, _record.c.points_against,
+        ).where(_record.c.season == season)
+    ).all()
+    rows = sorted(
+        rows,
+        key=lambda r: (-r.wins, -r.draws, -(r.points_for - r.points_against), -r.points_for, r.college),
+    )
+    return [
+        {
+            "rank": rank,
+            "college": r.college,
+            "battles": r.battles,
+            "wins": r.wins,
+            "losses": r.losses,
+            "draws": r.draws,
+            "points_for": r.points_for,
+            "points_against": r.points_against,
+            "win_rate": round(r.wins * 100 / r.battles) if r.battles else 0,
+        }
+        for rank, r in enumerate(rows, start=1)
+    ]
+
+
+def get_archive_page(session, before: Optional[date] = None, weeks: int = DEFAULT_ARCHIVE_WEEKS) -> Dict[str, Any]:
+    """
+    종료된 대결 기록 한 페이지 (주 단위 커서, 쿼리 2회)
+
+    Args:
+        before: 이 날짜 이전에 시작한 주만 조회 (이전 페이지의 next_cursor, 생략 시 최신 주부터)
+        weeks: 페이지당 주 수
+
+    Returns:
+        {"battles": [{"week", "college_a", "college_b", "score_a", "score_b", "winner", "start_date", "end_date"}, ...],
+         "next_cursor": 다음 페이지의 before 값 (마지막 페이지면 None)}
+    """
+    finished = _battle.c.status == "FINISHED"
+    week_query = select(_battle.c.start_date).where(finished).distinct()
+    if before is not None:
+        week_query = week_query.where(_battle.c.start_date < before)
+    week_dates = list(
+        session.execute(week_query.order_by(_battle.c.start_date.desc()).limit(weeks + 1)).scalars()
+    )
+    if not week_dates:
+        return {"battles": [], "next_cursor": None}
+
+    page_weeks = week_dates[:weeks]
+    rows = session.execute(
+        select(
+            _battle.c.id, _battle.c.college_a, _battle.c.college_b, _battle.c.score_a, _battle.c.score_b,
+            _battle.c.winner, _battle.c.start_date, _battle.c.end_date,
+        )
+        .where(
+            finished,
+            _battle.c.start_date >= page_weeks[-1],
+            _battle.c.start_date <= page_weeks[0],
+        )
+        .order_by(_battle.c.start_date.desc(), _battle.c.id)
+    ).all()
+
+    return {
+        "battles": [
+            {
+                "week": season_label(season_of(row.start_date)) + f" {row.start_date.strftime('%m/%d')} 주",
+                "college_a": row.college_a,
+                "college_b": row.college_b,
+                "score_a": row.score_a,
+                "score_b": row.score_b,
+                "winner": row.winner,
+                "start_date": row.start_date.strftime("%Y-%m-%d") if row.start_date else "",
+                "end_date": row.end_date.strftime("%Y-%m-%d") if row.end_date else "",
+            }
+            for row in rows
+        ],
+        "next_cursor": page_weeks[-1] if len(week_dates) > weeks else None,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    from sqlmodel import Session
+    from ..db.write_queue import create_writer_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "standings"
+    engine = create_writer_engine()
+    if command == "standings":
+        season = sys.argv[2] if len(sys.argv) > 2 else season_of(date.today())
+        with Session(engine) as session:
+            standings = get_standings(session, season)
+        print(f"{season_label(season)} 순위")
+        for s in standings:
+            print(f"{s['rank']:>3}. {s['college']}: {s['wins']}승 {s['draws']}무 {s['losses']}패 (득 {s['points_for']} / 실 {s['points_against']})")
+    elif command == "rebuild":
+        with Session(engine) as session:
+            rows = rebuild_records(session)
+            session.commit()
+        print(f"✅ 단과대 전적 {rows}행 재계산")
+    else:
+        print("사용법: python -m ecojourney.service.battle_archive [standings [시즌]|rebuild]")
+        sys.exit(1)
@@ -0,0 +1,261 @@
+"""
+대항전 베팅(Bet Placement) 모듈
+
+베팅 1건을 Python의 읽기-수정-쓰기 없이 조건부 SQL 문으로 처리합니다.
+
+1) 대결 상태 확인: SELECT ... FOR SHARE (PostgreSQL)
+   → 베팅끼리는 서로 막지 않고, 정산(UPDATE battle)이 시작되면 이후 베팅은 종료된 대결로 거절
+2) 사용자 행 잠금(SELECT ... FOR UPDATE) 후 하루 한 번 제한 확인 → 같은 사용자의 동시 요청만 직렬화
+3) 잔액 차감: UPDATE user SET current_points = current_points - :bet WHERE current_points >= :bet
+4) 참가 내역(battleparticipant)/포인트 로그 INSERT
+5) 점수: battlescoreshard의 임의 샤드 1행만 UPSERT로 증가 (battle 행은 갱신하지 않음)
+
+현재 점수 = Battle.score_a/score_b + 팀별 샤드 합계 (get_live_scores)
+fold_scores()가 샤드 합계를 Battle 행에 합치며, 주기 작업(battle_rollover)과 정산 시 실행됩니다.
+
+스트레스 테스트:
+    python -m ecojourney.service.battle_bets_bench
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+import random
+
+from sqlalchemy import case, delete, func, select, update
+
+from ..models import Battle, BattleParticipant, BattleScoreShard, PointsLog, User
+from .points_ledger import apply_points
+
+logger = logging.getLogger(__name__)
+
+# 팀별 샤드 수 (동시에 증가시킬 수 있는 행 수)
+SCORE_SHARDS = 16
+
+_battle = Battle.__table__
+_participant = BattleParticipant.__table__
+_shard = BattleScoreShard.__table__
+
+
+def battle_side(college_a: str, college_b: str, college: Optional[str]) -> Optional[str]:
+    """단과대가 속한 팀 ('A', 'B', 대결 팀이 아니면 None)"""
+    if college == college_a:
+        return "A"
+    if college == college_b:
+        return "B"
+    return None
+
+
+def add_score(session, battle_id: int, side: str, amount: int, shard: Optional[int] = None) -> None:
+    """팀 점수 증가 (샤드 1행 UPSERT, 커밋은 호출자가 수행)"""
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    statement = insert(_shard).values(
+        battle_id=battle_id,
+        side=side,
+        shard=random.randrange(SCORE_SHARDS) if shard is None else shard,
+        score=amount,
+    )
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[_shard.c.battle_id, _shard.c.side, _shard.c.shard],
+            set_={"score": _shard.c.score + statement.excluded.score},
+        )
+    )
+
+
+def get_live_scores(session, battle_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+    """
+    대결별 현재 점수 (Battle 행 + 샤드 합계, 쿼리 1회)
+
+    Returns:
+        {battle_id: (score_a, score_b)}
+    """
+    shard_a = func.coalesce(func.sum(case((_shard.c.side == "A", _shard.c.score), else_=0)), 0)
+    shard_b = func.coalesce(func.sum(case((_shard.c.side == "B", _shard.c.score), else_=0)), 0)
+    rows = session.execute(
+        select(_battle.c.id, _battle.c.score_a, _battle.c.score_b, shard_a, shard_b)
+        .select_from(_battle.outerjoin(_shard, _shard.c.battle_id == _battle.c.id))
+        .where(_battle.c.id.in_(list(battle_ids)))
+        .group_by(_battle.c.id, _battle.c.score_a, _battle.c.score_b)
+    ).all()
+    return {
+        battle_id: (int(score_a) + int(extra_a), int(score_b) + int(extra_b))
+        for battle_id, score_a, score_b, extra_a, extra_b in rows
+    }
+
+
+def fold_scores(session, battle_ids: Optional[Iterable[int]] = None, skip_locked: bool = False) -> int:
+    """
+    샤드 합계를 Battle 행에 합치고 샤드 행 삭제 (커밋은 호출자가 수행)
+
+    대상 battle 행을 먼저 잠가(베팅의 공유 잠금과 같은 순서) 교착을 피하고,
+    DELETE ... RETURNING으로 삭제한 값만 더하므로 fold 도중 들어온 베팅은
+    잠금 해제 후 새 샤드 행으로 남아 다음 fold에 포함됩니다.
+
+    Args:
+        battle_ids: 대상 대결 (생략 시 샤드가 있는 모든 대결)
+        skip_locked: True이면 베팅 중인(잠긴) 대결은 건너뜀 (주기 작업용, PostgreSQL)
+            쓰기 큐는 여러 대결의 베팅을 한 트랜잭션으로 묶으므로 잠금 순서가 정해져 있지 않아
+            기다리면 교착이 생길 수 있음. 샤드는 팀별 최대 16행이라 다음 주기로 미뤄도 무방함
+
+    Returns:
+        점수가 갱신된 대결 수
+    """
+    targets = select(_battle.c.id).order_by(_battle.c.id).with_for_update(skip_locked=skip_locked)
+    if battle_ids is not None:
+        targets = targets.where(_battle.c.id.in_(list(battle_ids)))
+    else:
+        targets = targets.where(_battle.c.id.in_(select(_shard.c.battle_id).distinct()))
+    locked = list(session.execute(targets).scalars().all())
+    if not locked:
+        return 0
+
+    totals: Dict[int, Dict[str, int]] = defaultdict(lambda: {"A": 0, "B": 0})
+    for battle_id, side, score in session.execute(
+        delete(_shard)
+        .where(_shard.c.battle_id.in_(locked))
+        .returning(_shard.c.battle_id, _shard.c.side, _shard.c.score)
+    ).all():
+        totals[battle_id][side] += score
+
+    for battle_id, sides in totals.items():
+        session.execute(
+            update(_battle)
+            .where(_battle.c.id == battle_id)
+            .values(score_a=_battle.c.score_a + sides["A"], score_b=_battle.c.score_b + sides["B"])
+        )
+    return len(totals)
+
+
+def place_bet(
+    session,
+    battle_id: int,
+    student_id: str,
+    college: Optional[str],
+    bet_amount: int,
+    description: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> Tuple[Optional[str], Optional[int], Optional[Dict[str, Any]]]:
+    """
+    대결 베팅 (커밋은 호출자가 수행, 쓰기 큐 작업으로 실행)
+
+    Args:
+        session: SQLModel Session
+        battle_id: 대결 ID
+        student_id: 학번
+        college: 베팅한 사용자의 단과대 (점수를 올릴 팀)
+        bet_amount: 베팅 포인트
+        description: 원장/포인트 로그 설명
+        now: 참가 시각 (생략 시 현재 시각, 시뮬레이터가 가상 시각을 넘길 때 사용)
+
+    Returns:
+        (오류 메시지, 베팅 후 잔액, 참가 후 누적 정보)
+        누적 정보: {"student_id", "nickname", "bet_amount"(누적 합계), "first_id", "joins"}
+    """
+    # 정산과의 경합 방지: 베팅끼리는 공유 잠금, 정산의 상태 UPDATE와만 충돌
+    battle = session.execute(
+        select(_battle.c.college_a, _battle.c.college_b, _battle.c.status)
+        .where(_battle.c.id == battle_id)
+        .with_for_update(read=True)
+    ).first()
+    if battle is None or battle.status != "ACTIVE":
+        return "진행 중인 대결이 아닙니다.", None, None
+
+    # 같은 사용자의 동시 베팅 직렬화 (사용자 행 잠금, 다른 사용자의 베팅과는 경합 없음)
+    if session.execute(
+        select(User.id).where(User.student_id == student_id).with_for_update()
+    ).first() is None:
+        return "사용자를 찾을 수 없습니다.", None, None
+
+    # 오늘 날짜에 이미 참가했는지 확인 (하루 한 번 제한)
+    now = now or datetime.now()
+    today = now.date()
+    day_start = datetime.combine(today, datetime.min.time())
+    if session.execute(
+        select(_participant.c.id).where(
+            _participant.c.battle_id == battle_id,
+            _participant.c.student_id == student_id,
+            _participant.c.joined_at >= day_start,
+            _participant.c.joined_at < day_start + timedelta(days=1),
+        ).limit(1)
+    ).first():
+        return "오늘은 이미 참가하셨습니다. 하루에 한 번만 참가할 수 있습니다.", None, None
+
+    # 포인트 차감 (잔액이 충분할 때만 차감하는 조건부 UPDATE, 원장 기록 포함)
+    new_balance = apply_points(
+        session,
+        student_id,
+        -bet_amount,
+        source="battle_participation",
+        description=description,
+        require_sufficient=True,
+    )
+    if new_balance is None:
+        return "보유 포인트가 부족합니다.", None, None
+
+    # 포인트 차감 로그 기록 (음수)
+    session.add(PointsLog(
+        student_id=student_id,
+        log_date=today,
+        points=-bet_amount,
+        source="battle_participation",
+        description=description,
+        created_at=now,
+    ))
+    # 참가 내역 추가
+    session.add(BattleParticipant(
+        battle_id=battle_id,
+        student_id=student_id,
+        bet_amount=bet_amount,
+        reward_amount=0,
+        joined_at=now,
+    ))
+
+    # 팀 점수 증가 (샤드 카운터)
+    side = battle_side(battle.college_a, battle.college_b, college)
+    if side is not None:
+        add_score(session, battle_id, side, bet_amount)
+
+    # 현황판 캐시 갱신용 누적 정보 (battle_id, student_id 인덱스 조회 1회)
+    session.flush()
+    standing = session.execute(
+        select(
+            User.nickname,
+            func.sum(_participant.c.bet_amount),
+            func.min(_participant.c.id),
+            func.count(_participant.c.id),
+        )
+        .select_from(_participant)
+        .join(User, User.student_id == _participant.c.student_id)
+        .where(_participant.c.battle_id == battle_id, _participant.c.student_id == student_id)
+        .group_by(User.nickname)
+    ).first()
+    return None, new_balance, {
+        "student_id": student_id,
+        "nickname": standing[0],
+        "bet_amount": int(standing[1]),
+        "first_id": int(standing[2]),
+        "joins": int(standing[3]),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    from sqlmodel import Session
+    from ..db.write_queue import create_writer_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "fold"
+    if command == "fold":
+        engine = create_writer_engine()
+        with Session(engine) as session:
+            folded = fold_scores(session)
+            session.commit()
+        print(f"✅ 점수 샤드 fold: 대결 {folded}건")
+    else:
+        print("사용법: python -m ecojourney.service.battle_bets [fold]")
+        sys.exit(1)
@@ -0,0 +1,213 @@
+"""
+대항전 베팅 동시성 스트레스 테스트
+
+임시 DB(기본 SQLite, --db-url로 PostgreSQL 지정 가능)에 사용자 N명과 대결 1건을 만들고
+여러 스레드가 동시에 place_bet()을 호출하는 동안 fold_scores()를 주기적으로 실행합니다.
+종료 후 다음을 확인하여 갱신 손실(lost update)이 없는지 검증합니다.
+
+- 팀별 최종 점수 == 팀별 참가 내역(battleparticipant) 베팅 합계
+- 사용자 잔액 합계 == 초기 잔액 합계 - 베팅 합계, 음수 잔액 없음
+- 사용자별 잔액 == 최신 원장 잔액
+
+SQLite는 쓰기 잠금이 하나뿐이라 스레드가 많으면 일부 요청이 busy timeout("database is locked")으로
+errors에 집계될 수 있습니다 (해당 요청은 전체 롤백, 앱에서는 단일 쓰기 큐가 직렬화함).
+
+--legacy를 지정하면 기존 방식(battle 행을 읽어 Python에서 점수를 더한 뒤 저장)과 비교합니다.
+(PostgreSQL처럼 동시에 쓰기가 가능한 DB에서 점수 손실이 발생함을 보여줌)
+
+사용 예:
+    python -m ecojourney.service.battle_bets_bench
+    python -m ecojourney.service.battle_bets_bench --db-url postgresql://localhost/eco_bench --workers 32 --legacy
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import case, func, insert
+from sqlmodel import Session, SQLModel, select
+
+from ..db.write_queue import create_writer_engine
+from ..models import Battle, BattleParticipant, PointsLedger, User
+from .battle_bets import fold_scores, get_live_scores, place_bet
+
+COLLEGES = ["인문대학", "경영대학"]
+
+
+def _populate(engine, users: int) -> int:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {
+                    "student_id": f"bench{i}",
+                    "password": "x",
+                    "nickname": f"bench{i}",
+                    "college": COLLEGES[i % 2],
+                    # 일부 사용자는 잔액 부족으로 거절되도록 적게 지급
+                    "current_points": 50 if i % 10 == 0 else 1000,
+                    "created_at": now,
+                }
+                for i in range(users)
+            ],
+        )
+        return conn.execute(
+            insert(Battle.__table__).values(
+                start_date=date.today(),
+                end_date=date.today(),
+                college_a=COLLEGES[0],
+                college_b=COLLEGES[1],
+                score_a=0,
+                score_b=0,
+                status="ACTIVE",
+                created_at=now,
+            )
+        ).inserted_primary_key[0]
+
+
+def _legacy_bet(session, battle_id: int, college: str, bet_amount: int) -> None:
+    """기존 방식: battle 행을 읽어 Python에서 점수를 더한 뒤 저장"""
+    battle = session.get(Battle, battle_id)
+    if battle.college_a == college:
+        battle.score_a += bet_amount
+    elif battle.college_b == college:
+        battle.score_b += bet_amount
+    session.add(battle)
+
+
+def _run(engine, battle_id: int, users: int, workers: int, legacy: bool) -> Dict[str, float]:
+    rnd = random.Random(7)
+    bets = [(f"bench{i}", COLLEGES[i % 2], rnd.randint(10, 100)) for i in range(users)]
+    # 같은 사용자의 중복 요청(하루 한 번 제한 + 잔액 조건 확인)
+    bets += [bets[i] for i in range(0, users, 7)]
+    rnd.shuffle(bets)
+
+    counts = {"ok": 0, "rejected": 0, "errors": 0, "ok_total": 0}
+    lock = threading.Lock()
+
+    def _bet(args) -> None:
+        student_id, college, amount = args
+        try:
+            with Session(engine) as session:
+                if legacy:
+                    _legacy_bet(session, battle_id, college, amount)
+                    error = None
+                else:
+                    error, _, _ = place_bet(session, battle_id, student_id, college, amount, "bench")
+                session.commit()
+            with lock:
+                counts["rejected" if error else "ok"] += 1
+                if not error:
+                    counts["ok_total"] += amount
+        except Exception:
+            with lock:
+                counts["errors"] += 1
+
+    stop = threading.Event()
+
+    def _fold_loop() -> None:
+        while not stop.is_set():
+            with Session(engine) as session:
+                fold_scores(session, [battle_id])
+                session.commit()
+            time.sleep(0.01)
+
+    folder = threading.Thread(target=_fold_loop)
+    if not legacy:
+        folder.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_bet, bets))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if not legacy:
+        folder.join()
+    counts["bets_per_s"] = round(len(bets) / elapsed)
+    return counts
+
+
+def _check(engine, battle_id: int, users: int, legacy: bool) -> Dict[str, object]:
+    with Session(engine) as session:
+        if not legacy:
+            fold_scores(session, [battle_id])
+            session.commit()
+        score_a, score_b = get_live_scores(session, [battle_id])[battle_id]
+
+        if legacy:
+            # 기존 방식 비교는 점수만 확인 (참가 내역/잔액은 기록하지 않음)
+            return {"score_a": score_a, "score_b": score_b}
+
+        side_totals = dict(
+            session.exec(
+                select(User.college, func.sum(BattleParticipant.bet_amount))
+                .join(User, User.student_id == BattleParticipant.student_id)
+                .where(BattleParticipant.battle_id == battle_id)
+                .group_by(User.college)
+            ).all()
+        )
+        balance_total, negative = session.exec(
+            select(
+                func.sum(User.current_points),
+                func.sum(case((User.current_points < 0, 1), else_=0)),
+            )
+        ).one()
+        bet_total = session.exec(select(func.sum(BattleParticipant.bet_amount))).one() or 0
+        initial_total = sum(50 if i % 10 == 0 else 1000 for i in range(users))
+
+        latest = (
+            select(PointsLedger.student_id, func.max(PointsLedger.id).label("ledger_id"))
+            .group_by(PointsLedger.student_id)
+            .subquery()
+        )
+        ledger_mismatch = session.exec(
+            select(func.count())
+            .select_from(User)
+            .join(latest, latest.c.student_id == User.student_id)
+            .join(PointsLedger, PointsLedger.id == latest.c.ledger_id)
+            .where(PointsLedger.balance_after != User.current_points)
+        ).one()
+
+    return {
+        "score_a": score_a,
+        "score_b": score_b,
+        "scores_match": (score_a, score_b) == (side_totals.get(COLLEGES[0], 0), side_totals.get(COLLEGES[1], 0)),
+        "balance_match": balance_total == initial_total - bet_total,
+        "negative_balances": int(negative or 0),
+        "ledger_mismatch": ledger_mismatch,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대항전 베팅 동시성 스트레스 테스트")
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--db-url", default=None, help="생략 시 임시 SQLite 파일 (기존 데이터는 삭제됨)")
+    parser.add_argument("--legacy", action="store_true", help="기존 읽기-수정-쓰기 방식도 실행하여 비교")
+    args = parser.parse_args()
+
+    db_url = args.db_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_writer_engine(db_url)
+
+    modes = [False, True] if args.legacy else [False]
+    for legacy in modes:
+        label = "legacy" if legacy else "atomic"
+        battle_id = _populate(engine, args.users)
+        result = _run(engine, battle_id, args.users, args.workers, legacy)
+        result.update(_check(engine, battle_id, args.users, legacy))
+        # 성공한 베팅 합계 중 점수에 반영되지 않은 양
+        result["lost"] = result["ok_total"] - result["score_a"] - result["score_b"]
+        print(f"[{label:6}] " + ", ".join(f"{k}={v}" for k, v in result.items()))
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
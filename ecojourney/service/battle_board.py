@@ -0,0 +1,103 @@
+"""
+대항전 현황판(Battle Board) 조회 모듈
+
+/battle 페이지의 팀별 참가자 수와 베팅 상위 N명을 참가자 수와 관계없이
+SQL 1회로 조회합니다.
+
+1) 참가자 ⋈ 사용자 조인 + 학번별 GROUP BY로 베팅 합계 집계
+2) 윈도 함수로 단과대별 순위(ROW_NUMBER)와 고유 참가자 수(COUNT) 계산
+3) 순위가 N 이하인 행만 반환 → 결과는 최대 2N행
+
+battleparticipant (battle_id, student_id) 인덱스로 대결별 참가 내역만 읽고,
+user (student_id) 인덱스로 사용자를 조인합니다.
+
+집계 규칙 (기존과 동일):
+- 팀 소속은 참가 시점이 아닌 현재 사용자 단과대 기준
+- 사용자 정보가 없는 참가자는 어느 팀에도 포함하지 않음
+- 동점이면 먼저 참가한 학번이 상위
+"""
+
+from typing import Any, Dict, List
+import logging
+
+from sqlalchemy import func, select
+
+from ..models import BattleParticipant, User
+
+logger = logging.getLogger(__name__)
+
+_participant = BattleParticipant.__table__
+_user = User.__table__
+
+DEFAULT_TOP_N = 5
+
+
+def get_battle_board(session, battle_id: int, college_a: str, college_b: str, top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """
+    팀별 참가자 수와 베팅 상위 N명 조회 (쿼리 1회, 읽기 전용)
+
+    Args:
+        session: SQLModel Session (비동기 세션은 run_sync로 호출)
+        battle_id: 대결 ID
+        college_a: A팀 단과대
+        college_b: B팀 단과대
+        top_n: 팀별 상위 인원 수
+
+    Returns:
+        {"participants_a", "participants_b", "top_a", "top_b"}
+        top_*: [{"student_id", "nickname", "bet_amount", "rank", "first_id"}, ...]
+        (first_id: 학번의 첫 참가 행 ID, 동점 순서 비교용)
+    """
+    per_student = (
+        select(
+            _participant.c.student_id.label("student_id"),
+            _user.c.nickname.label("nickname"),
+            _user.c.college.label("college"),
+            func.sum(_participant.c.bet_amount).label("bet_amount"),
+            func.min(_participant.c.id).label("first_id"),
+        )
+        .join_from(_participant, _user, _user.c.student_id == _participant.c.student_id)
+        .where(
+            _participant.c.battle_id == battle_id,
+            _user.c.college.in_([college_a, college_b]),
+        )
+        .group_by(_participant.c.student_id, _user.c.nickname, _user.c.college)
+        .subquery()
+    )
+    ranked = select(
+        per_student.c.student_id,
+        per_student.c.first_id,
+        per_student.c.nickname,
+        per_student.c.college,
+        per_student.c.bet_amount,
+        func.row_number().over(
+            partition_by=per_student.c.college,
+            order_by=(per_student.c.bet_amount.desc(), per_student.c.first_id),
+        ).label("rank"),
+        func.count().over(partition_by=per_student.c.college).label("side_count"),
+    ).subquery()
+
+    rows = session.execute(
+        select(ranked)
+        .where(ranked.c.rank <= top_n)
+        .order_by(ranked.c.college, ranked.c.rank)
+    ).all()
+
+    counts = {college_a: 0, college_b: 0}
+    tops: Dict[str, List[Dict[str, Any]]] = {college_a: [], college_b: []}
+    for row in rows:
+        counts[row.college] = int(row.side_count)
+        tops[row.college].append({
+            "student_id": row.student_id,
+            "nickname": row.nickname,
+            "bet_amount": int(row.bet_amount),
+            "rank": int(row.rank),
+            "first_id": int(row.first_id),
+        })
+
+    return {
+        "participants_a": counts[college_a],
+        "participants_b": counts[college_b],
+        "top_a": tops[college_a],
+        "top_b": tops[college_b],
+    }
@@ -0,0 +1,139 @@
+"""
+대항전 실시간 점수 (Live Scores)
+
+/battle 페이지를 보고 있는 클라이언트에 점수 변경을 서버에서 밀어줍니다.
+
+- 프로세스당 폴링 작업 1개가 구독 중인 대결들의 현재 점수(get_live_scores)를
+  주기마다(기본 1초) 쿼리 1회로 읽고, 바뀐 대결이 있으면 대기 중인 구독자를 모두 깨웁니다.
+- DB 조회 비용은 시청자 수가 아니라 대결 수(워커당 주기마다 1회)에 비례하며,
+  한 주기 안의 여러 베팅은 하나의 변경으로 합쳐져 전달됩니다.
+- 구독자가 없으면 폴링 작업은 종료되고, 다음 구독 때 다시 시작됩니다.
+
+사용 예 (Reflex 백그라운드 이벤트, BattleState.watch_battle_scores):
+    async with aclosing(get_live_hub().watch(battle_id)) as updates:
+        async for scores in updates:
+            ...
+
+여러 워커로 실행하면 워커마다 폴링 작업이 1개씩 실행됩니다.
+"""
+
+from typing import AsyncIterator, Dict, Optional, Tuple
+import asyncio
+import logging
+import os
+
+from .battle_bets import get_live_scores
+
+logger = logging.getLogger(__name__)
+
+# 점수 확인 주기(초) / 변경이 없을 때 구독자에게 None을 돌려주는 간격(초, 연결 확인용)
+DEFAULT_INTERVAL = 1.0
+DEFAULT_HEARTBEAT = 30.0
+
+Scores = Tuple[int, int]
+
+
+class LiveScoreHub:
+    """대결별 점수 변경 알림 (프로세스 내 구독자 공유)"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._watchers: Dict[int, int] = {}
+        self._scores: Dict[int, Scores] = {}
+        self._condition: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+        self.polls = 0
+
+    def _subscribe(self, battle_id: int) -> None:
+        if not self._watchers:
+            # 대기 중인 구독자가 없을 때만 교체 (현재 이벤트 루프에 생성)
+            self._condition = asyncio.Condition()
+        self._watchers[battle_id] = self._watchers.get(battle_id, 0) + 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _unsubscribe(self, battle_id: int) -> None:
+        remaining = self._watchers.get(battle_id, 0) - 1
+        if remaining > 0:
+            self._watchers[battle_id] = remaining
+        else:
+            # 다음 구독자는 새로 읽은 점수부터 받음
+            self._watchers.pop(battle_id, None)
+            self._scores.pop(battle_id, None)
+
+    async def _fetch(self, battle_ids) -> Dict[int, Scores]:
+        """현재 점수 조회 (쿼리 1회)"""
+        from ..db.async_session import async_session
+
+        async with async_session() as session:
+            return await session.run_sync(get_live_scores, battle_ids)
+
+    async def _run(self) -> None:
+        """구독 중인 대결이 있는 동안 주기마다 점수를 읽어 바뀐 대결을 알림"""
+        while self._watchers:
+            try:
+                scores = await self._fetch(list(self._watchers))
+                self.polls += 1
+            except Exception as e:
+                logger.warning(f"실시간 점수 조회 실패: {e}")
+                scores = {}
+
+            changed = {
+                battle_id: value
+                for battle_id, value in scores.items()
+                if battle_id in self._watchers and self._scores.get(battle_id) != value
+            }
+            if changed:
+                async with self._condition:
+                    self._scores.update(changed)
+                    self._condition.notify_all()
+            await asyncio.sleep(self.interval)
+        self._task = None
+
+    async def watch(self, battle_id: int, heartbeat: float = DEFAULT_HEARTBEAT) -> AsyncIterator[Optional[Scores]]:
+        """
+        대결 점수 구독 (async generator)
+
+        점수가 바뀔 때마다 (score_a, score_b)를, heartbeat초 동안 변경이 없으면 None을 돌려줍니다.
+        반복을 멈추면 구독이 해제되도록 contextlib.aclosing()으로 감싸서 사용합니다.
+        """
+        self._subscribe(battle_id)
+        condition = self._condition
+        seen: Optional[Scores] = None
+        try:
+            while True:
+                async with condition:
+                    try:
+                        await asyncio.wait_for(
+                            condition.wait_for(lambda: self._scores.get(battle_id) not in (None, seen)),
+                            heartbeat,
+                        )
+                    except asyncio.TimeoutError:
+                        scores = None
+                    else:
+                        scores = seen = self._scores[battle_id]
+                yield scores
+        finally:
+            self._unsubscribe(battle_id)
+
+
+def is_client_connected(token: str) -> bool:
+    """Reflex 클라이언트(탭)가 이 워커에 연결되어 있는지 (확인할 수 없으면 True)"""
+    try:
+        from reflex.utils.prerequisites import get_app
+
+        namespace = get_app().app.event_namespace
+        return namespace is None or token in namespace.token_to_sid
+    except Exception:
+        return True
+
+
+_hub: Optional[LiveScoreHub] = None
+
+
+def get_live_hub() -> LiveScoreHub:
+    """프로세스 전역 실시간 점수 허브 (주기: ECOJOURNEY_LIVE_SCORE_INTERVAL, 기본 1초)"""
+    global _hub
+    if _hub is None:
+        _hub = LiveScoreHub(float(os.getenv("ECOJOURNEY_LIVE_SCORE_INTERVAL", DEFAULT_INTERVAL)))
+    return _hub
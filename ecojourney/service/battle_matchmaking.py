@@ -0,0 +1,242 @@
+"""
+대항전 매칭(Matchmaking) 모듈
+
+주간 대결의 단과대 짝을 무작위 대신 최근 전력이 비슷한 단과대끼리,
+최근에 만난 상대는 피하도록 정합니다.
+
+1) 전력 조회 (집계 쿼리 1회): 사용자가 있는 단과대별 인원 수 ⟕ 최근 N주(기본 8주) 대결의 팀 점수 평균
+   - 대결 기록이 적은 단과대는 인원 수 × 전체 1인당 평균 점수를 사전값으로 섞어 추정
+2) 최근 대결 짝 조회 (쿼리 1회): 같은 기간의 (college_a, college_b, 시작일)
+3) 짝 비용 = |log(1 + 전력 A) - log(1 + 전력 B)| + 재대결 벌점 (최근일수록 큼)
+4) 전력 순으로 정렬해 이웃끼리 짝지은 뒤, 가까운 짝 사이에서 상대를 바꿔 비용이 줄면 교환 (국소 개선)
+5) 단과대 수가 홀수이면 최근 대결 수가 가장 많은(쉰 적이 없는) 단과대가 한 주 쉼(bye)
+
+단과대 수가 수백 개여도 O(n × 창 크기)라 수 ms 안에 끝납니다.
+
+사용 예:
+    python -m ecojourney.service.battle_matchmaking          # 이번 주 매칭 미리보기 (DB 변경 없음)
+    python -m ecojourney.service.battle_matchmaking bench 500
+"""
+
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+import logging
+import math
+
+from sqlalchemy import func, literal, select, union_all
+
+from ..models import Battle, User
+
+logger = logging.getLogger(__name__)
+
+# 전력/재대결 기록을 보는 기간(주)
+HISTORY_WEEKS = 8
+
+# 재대결 벌점 (지난주 상대 = REMATCH_PENALTY, HISTORY_WEEKS 전이면 0에 가까움)
+REMATCH_PENALTY = 2.0
+
+# 사전값 가중치 (대결 기록 몇 주 분량으로 취급할지)
+PRIOR_WEIGHT = 1.0
+
+# 국소 개선 시 비교할 이웃 짝 수
+SWAP_WINDOW = 4
+
+_battle = Battle.__table__
+_user = User.__table__
+
+
+def college_strengths(session, since: date, colleges: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    단과대별 인원 수와 최근 전력 (집계 쿼리 1회)
+
+    Args:
+        since: 이 날짜 이후 시작한 대결만 집계
+        colleges: 대상 단과대 (생략 시 사용자가 있는 모든 단과대)
+
+    Returns:
+        {college: {"members", "battles", "avg_score", "rating"}}
+    """
+    members = (
+        select(_user.c.college.label("college"), func.count().label("members"))
+        .where(_user.c.college.is_not(None))
+        .group_by(_user.c.college)
+    )
+    if colleges is not None:
+        members = members.where(_user.c.college.in_(list(colleges)))
+    members = members.subquery()
+
+    recent = (_battle.c.start_date >= since) & (_battle.c.status == "FINISHED")
+    sides = union_all(
+        select(_battle.c.college_a.label("college"), _battle.c.score_a.label("score")).where(recent),
+        select(_battle.c.college_b.label("college"), _battle.c.score_b.label("score")).where(recent),
+    ).subquery()
+    history = (
+        select(
+            sides.c.college,
+            func.count().label("battles"),
+            func.avg(sides.c.score).label("avg_score"),
+        )
+        .group_by(sides.c.college)
+        .subquery()
+    )
+
+    rows = session.execute(
+        select(
+            members.c.college,
+            members.c.members,
+            func.coalesce(history.c.battles, literal(0)),
+            func.coalesce(history.c.avg_score, literal(0)),
+        ).select_from(members.outerjoin(history, history.c.college == members.c.college))
+    ).all()
+
+    stats = {
+        college: {"members": int(count), "battles": int(battles), "avg_score": float(avg_score)}
+        for college, count, battles, avg_score in rows
+    }
+
+    # 기록이 있는 단과대의 1인당 평균 점수로 사전값 계산
+    scored = [s for s in stats.values() if s["battles"]]
+    per_member = (
+        sum(s["avg_score"] for s in scored) / sum(s["members"] for s in scored)
+        if scored and sum(s["members"] for s in scored)
+        else 1.0
+    )
+    for s in stats.values():
+        prior = s["members"] * per_member
+        s["rating"] = (s["battles"] * s["avg_score"] + PRIOR_WEIGHT * prior) / (s["battles"] + PRIOR_WEIGHT)
+    return stats
+
+
+def recent_pairings(session, since: date, today: date) -> Dict[FrozenSet[str], int]:
+    """최근 대결 짝 → 몇 주 전인지 (가장 최근 기준, 쿼리 1회)"""
+    weeks_ago: Dict[FrozenSet[str], int] = {}
+    for college_a, college_b, start_date in session.execute(
+        select(_battle.c.college_a, _battle.c.college_b, _battle.c.start_date).where(_battle.c.start_date >= since)
+    ):
+        pair = frozenset((college_a, college_b))
+        ago = max((today - start_date).days // 7, 0)
+        weeks_ago[pair] = min(ago, weeks_ago.get(pair, ago))
+    return weeks_ago
+
+
+def pair_cost(
+    a: str,
+    b: str,
+    ratings: Dict[str, float],
+    history: Dict[FrozenSet[str], int],
+) -> float:
+    """짝 비용 (전력 차이 + 재대결 벌점)"""
+    cost = abs(math.log1p(ratings[a]) - math.log1p(ratings[b]))
+    ago = history.get(frozenset((a, b)))
+    if ago is not None:
+        cost += REMATCH_PENALTY * max(HISTORY_WEEKS - ago, 0) / HISTORY_WEEKS
+    return cost
+
+
+def make_pairings(
+    ratings: Dict[str, float],
+    history: Optional[Dict[FrozenSet[str], int]] = None,
+    played: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """
+    전력과 재대결 기록으로 짝 결정 (DB 없이 계산, 같은 입력이면 같은 결과)
+
+    Args:
+        ratings: {college: 전력}
+        history: {frozenset((a, b)): 몇 주 전}
+        played: {college: 최근 대결 수} (홀수일 때 쉴 단과대 선택)
+
+    Returns:
+        ([(college_a, college_b), ...], 쉬는 단과대 또는 None)
+    """
+    history = history or {}
+    played = played or {}
+    colleges = sorted(ratings, key=lambda c: (ratings[c], c))
+
+    bye = None
+    if len(colleges) % 2:
+        # 최근 대결이 가장 많은 단과대 (동률이면 가장 약한 단과대)
+        index = max(range(len(colleges)), key=lambda i: (played.get(colleges[i], 0), -i))
+        bye = colleges.pop(index)
+
+    logs = {college: math.log1p(rating) for college, rating in ratings.items()}
+    # 재대결 벌점은 기록이 있는 짝만 계산
+    penalties = {pair: REMATCH_PENALTY * max(HISTORY_WEEKS - ago, 0) / HISTORY_WEEKS for pair, ago in history.items()}
+
+    def cost(a: str, b: str) -> float:
+        base = abs(logs[a] - logs[b])
+        return base + penalties.get(frozenset((a, b)), 0.0) if penalties else base
+
+    pairs = [[colleges[i], colleges[i + 1]] for i in range(0, len(colleges), 2)]
+
+    # 국소 개선: 가까운 두 짝 (a, b), (c, d)를 (a, c)(b, d) 또는 (a, d)(b, c)로 바꿔 비용이 줄면 교환
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(pairs)):
+            for j in range(i + 1, min(i + 1 + SWAP_WINDOW, len(pairs))):
+                (a, b), (c, d) = pairs[i], pairs[j]
+                current = cost(a, b) + cost(c, d)
+                best = None
+                for candidate in (([a, c], [b, d]), ([a, d], [b, c])):
+                    total = cost(*candidate[0]) + cost(*candidate[1])
+                    if total < current - 1e-9:
+                        current, best = total, candidate
+                if best is not None:
+                    pairs[i], pairs[j] = best
+                    improved = True
+
+    return [tuple(pair) for pair in pairs], bye
+
+
+def plan_matches(session, today: date, colleges: Optional[Iterable[str]] = None) -> Tuple[List[Tuple[str, str]], Optional[str], Dict[str, Dict[str, float]]]:
+    """
+    이번 주 매칭 계획 (쿼리 2회, DB 변경 없음)
+
+    Returns:
+        (짝 목록, 쉬는 단과대, 단과대별 전력)
+    """
+    since = today - timedelta(weeks=HISTORY_WEEKS)
+    stats = college_strengths(session, since, colleges)
+    history = recent_pairings(session, since, today)
+    pairs, bye = make_pairings(
+        {college: s["rating"] for college, s in stats.items()},
+        history,
+        {college: s["battles"] for college, s in stats.items()},
+    )
+    return pairs, bye, stats
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "preview"
+    if command == "preview":
+        from sqlmodel import Session
+        from ..db.engine import get_engine
+        from .battle_rollover import COLLEGES, week_bounds
+
+        monday, _ = week_bounds()
+        with Session(get_engine()) as session:
+            pairs, bye, stats = plan_matches(session, monday, COLLEGES)
+        ratings = {college: s["rating"] for college, s in stats.items()}
+        for a, b in pairs:
+            print(f"{a} ({ratings[a]:.0f}) vs {b} ({ratings[b]:.0f})")
+        if bye:
+            print(f"휴식: {bye}")
+    elif command == "bench":
+        n = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+        rnd = random.Random(1)
+        ratings = {f"college{i}": rnd.lognormvariate(8, 1) for i in range(n)}
+        names = list(ratings)
+        history = {frozenset(rnd.sample(names, 2)): rnd.randrange(HISTORY_WEEKS) for _ in range(n * 4)}
+        started = time.perf_counter()
+        pairs, bye = make_pairings(ratings, history)
+        elapsed = (time.perf_counter() - started) * 1000
+        total = sum(pair_cost(a, b, ratings, history) for a, b in pairs)
+        print(f"단과대 {n}개: 짝 {len(pairs)}개, 휴식 {bye}, 총 비용 {total:.2f}, {elapsed:.1f}ms")
+    else:
+        print("사용법: python -m ecojourney.service.battle_matchmaking [preview|bench [단과대 수]]")
+        sys.exit(1)
@@ -0,0 +1,259 @@
+"""
+주간 대항전 교체(Rollover) 작업
+
+매주 월요일 지난 대결을 정산하고 이번 주 대결을 만드는 작업을 페이지 요청 경로가 아닌
+별도 작업으로 실행합니다. /battle 페이지 로드는 조회만 합니다.
+
+- 실행 시 잠금을 잡고(SQLite: BEGIN IMMEDIATE, PostgreSQL: advisory lock)
+  이번 주 대결 존재 여부를 다시 확인하므로 여러 프로세스/cron이 동시에 실행해도 한 번만 처리됩니다.
+- 이번 주 이전에 시작한 ACTIVE 대결을 모두 정산합니다 (실행을 놓친 주가 있어도 함께 처리).
+- 앱 프로세스 안에서는 lifespan 작업이 시작 시 1회, 이후 매시/월요일 0시에 실행합니다.
+  같은 주기로 대결 점수 샤드를 battle 행에 합칩니다(fold).
+  (ECOJOURNEY_BATTLE_ROLLOVER=off이면 비활성화하고 cron으로만 실행)
+
+사용 예:
+    python -m ecojourney.service.battle_rollover          # 이번 주 교체 실행 (cron: 5 0 * * 1)
+    python -m ecojourney.service.battle_rollover status   # 이번 주 대결 조회
+"""
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from ..models import Battle
+from .battle_bets import fold_scores, get_live_scores
+from .battle_matchmaking import plan_matches
+from .battle_settlement import settle_battle
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL advisory lock 키 (임의의 고정값)
+_PG_LOCK_KEY = 720_039
+
+# 단과대 목록
+COLLEGES = [
+    "인문대학",
+    "사회과학대학",
+    "경영대학",
+    "자연과학대학",
+    "의과대학",
+    "간호대학",
+    "글로벌융합대학",
+    "미디어스쿨",
+    "반도체·디스플레이스쿨",
+    "정보과학대학",
+    "미래융합스쿨",
+    "산학협력특성화대학",
+    "일송자유교양대학",
+    "자기설계융합전공"
+]
+
+# 앱 내 스케줄러의 최대 대기 시간(초) (시계 변경 등에 대비해 주기적으로 다시 확인)
+_MAX_SLEEP = 3600
+
+
+def week_bounds(target_date: Optional[date] = None) -> Tuple[date, date]:
+    """주어진 날짜가 속한 주의 월요일과 일요일 반환"""
+    if target_date is None:
+        target_date = date.today()
+    monday = target_date - timedelta(days=target_date.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+def _lock(session) -> None:
+    """교체 작업 잠금 (트랜잭션 종료 시 해제)"""
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PG_LOCK_KEY})
+    # SQLite는 쓰기 엔진의 BEGIN IMMEDIATE가 DB 전체 쓰기 잠금 역할을 함
+
+
+def has_current_battles(session, monday: date) -> bool:
+    """이번 주 ACTIVE 대결 존재 여부"""
+    return session.exec(
+        select(Battle.id).where(Battle.start_date == monday, Battle.status == "ACTIVE")
+    ).first() is not None
+
+
+def is_rollover_done(session, monday: date) -> bool:
+    """이번 주 대결이 있고 정산할 지난 대결이 없으면 True (정산 실패로 남은 대결은 다음 실행 때 재시도)"""
+    pending = session.exec(
+        select(Battle.id).where(Battle.start_date < monday, Battle.status == "ACTIVE")
+    ).first()
+    return pending is None and has_current_battles(session, monday)
+
+
+def settle_previous_battles(session, monday: date) -> List[int]:
+    """
+    이번 주 이전에 시작한 ACTIVE 대결 정산 (대결별 SAVEPOINT, commit은 호출자가 수행)
+
+    Returns:
+        정산된 대결 ID 목록
+    """
+    battle_ids = session.exec(
+        select(Battle.id).where(Battle.start_date < monday, Battle.status == "ACTIVE")
+    ).all()
+
+    settled: List[int] = []
+    for battle_id in battle_ids:
+        savepoint = session.begin_nested()
+        try:
+            # 참가자 수와 관계없이 고정된 수의 SQL 문으로 정산 (이미 정산된 대결이면 None)
+            result = settle_battle(session, battle_id)
+            # 상태 업데이트와 보상 분배가 함께 반영되도록 SAVEPOINT 단위로 확정
+            savepoint.commit()
+            if result:
+                settled.append(battle_id)
+                logger.info(f"대결 종료 처리 완료: Battle {battle_id}, 승자: {result['winner']}")
+        except Exception as e:
+            # 예외 발생 시 롤백하여 배틀 상태와 보상 분배가 모두 취소되도록 함
+            savepoint.rollback()
+            logger.error(f"대결 종료 처리 오류: Battle {battle_id}: {e}", exc_info=True)
+    return settled
+
+
+def create_battles(session, start_date: date, end_date: date) -> int:
+    """
+    새 대결 생성 (전력 기반 매칭, commit은 호출자가 수행)
+
+    Returns:
+        생성된 대결 수
+    """
+    # 실제 사용자가 있는 단과대만 대상 (최근 전력이 비슷하고 최근에 만나지 않은 상대끼리 짝)
+    pairs, bye, _ = plan_matches(session, start_date, COLLEGES)
+    if not pairs:
+        logger.warning("대결을 생성할 충분한 단과대가 없습니다.")
+        return 0
+
+    now = datetime.now()
+    for college_a, college_b in pairs:
+        session.add(
+            Battle(
+                start_date=start_date,
+                end_date=end_date,
+                college_a=college_a,
+                college_b=college_b,
+                score_a=0,
+                score_b=0,
+                status="ACTIVE",
+                created_at=now,
+            )
+        )
+
+    logger.info(f"새 대결 {len(pairs)}개 생성 완료" + (f" (휴식: {bye})" if bye else ""))
+    return len(pairs)
+
+
+def run_rollover(engine=None, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    주간 교체 실행 (지난 대결 정산 + 이번 주 대결 생성, 트랜잭션 1개)
+
+    Returns:
+        {"week": 이번 주 월요일, "settled": 정산된 대결 ID 목록, "created": 생성된 대결 수}
+        이미 처리된 주이면 settled=[], created=0
+    """
+    if engine is None:
+        from ..db.write_queue import create_writer_engine
+        engine = create_writer_engine()
+
+    monday, sunday = week_bounds(today)
+    result: Dict[str, Any] = {"week": monday, "settled": [], "created": 0}
+
+    with Session(engine) as session:
+        # 잠금 없이 먼저 확인 (대부분의 실행은 여기서 종료)
+        if is_rollover_done(session, monday):
+            return result
+        session.rollback()
+
+        with session.begin():
+            _lock(session)
+            # 잠금을 잡은 뒤 다시 확인 (다른 프로세스가 먼저 처리했을 수 있음)
+            result["settled"] = settle_previous_battles(session, monday)
+            if not has_current_battles(session, monday):
+                result["created"] = create_battles(session, monday, sunday)
+
+    logger.info(f"주간 대결 교체 완료: {result}")
+    return result
+
+
+def fold_active_scores(engine) -> int:
+    """진행 중인 대결의 점수 샤드를 battle 행에 합침 (주기 실행용, 트랜잭션 1개, 베팅 중인 대결은 다음 주기로)"""
+    with Session(engine) as session:
+        battle_ids = session.exec(select(Battle.id).where(Battle.status == "ACTIVE")).all()
+        folded = fold_scores(session, battle_ids, skip_locked=True) if battle_ids else 0
+        session.commit()
+    return folded
+
+
+def _seconds_until_next_week(now: Optional[datetime] = None) -> float:
+    now = now or datetime.now()
+    next_monday = datetime.combine(week_bounds(now.date())[0] + timedelta(days=7), datetime.min.time())
+    return max((next_monday - now).total_seconds(), 1.0)
+
+
+async def _rollover_loop() -> None:
+    from ..db.write_queue import create_writer_engine
+    from .scoreboard_cache import invalidate_scoreboards
+
+    loop = asyncio.get_running_loop()
+    engine = create_writer_engine()
+    while True:
+        try:
+            result = await loop.run_in_executor(None, run_rollover, engine)
+            if result["settled"]:
+                # 정산된 대결의 현황판 캐시 삭제
+                await invalidate_scoreboards(result["settled"])
+            await loop.run_in_executor(None, fold_active_scores, engine)
+        except Exception as e:
+            logger.error(f"주간 대결 교체 오류: {e}", exc_info=True)
+        await asyncio.sleep(min(_seconds_until_next_week(), _MAX_SLEEP))
+
+
+@asynccontextmanager
+async def battle_rollover_lifespan():
+    """앱 수명주기 작업: 주간 대결 교체 스케줄러 (app.register_lifespan_task로 등록)"""
+    if os.getenv("ECOJOURNEY_BATTLE_ROLLOVER", "on").lower() in ("off", "0", "false"):
+        yield
+        return
+
+    task = asyncio.create_task(_rollover_loop())
+    try:
+        yield
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+if __name__ == "__main__":
+    import sys
+    from ..db.write_queue import create_writer_engine
+    from .scoreboard_cache import invalidate_scoreboards
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    engine = create_writer_engine()
+    if command == "run":
+        done = run_rollover(engine)
+        if done["settled"]:
+            # Redis 캐시를 쓰는 경우 워커들이 공유하는 항목도 삭제 (메모리 캐시는 TTL로 만료)
+            asyncio.run(invalidate_scoreboards(done["settled"]))
+        print(f"✅ {done['week']} 주: 정산 {len(done['settled'])}건, 새 대결 {done['created']}건")
+    elif command == "status":
+        monday, _ = week_bounds()
+        with Session(engine) as session:
+            battles = session.exec(select(Battle).where(Battle.start_date == monday)).all()
+            scores = get_live_scores(session, [battle.id for battle in battles])
+        for battle in battles:
+            score_a, score_b = scores[battle.id]
+            print(f"Battle {battle.id}: {battle.college_a} {score_a} vs {score_b} {battle.college_b} ({battle.status})")
+        print(f"{monday} 주 대결 {len(battles)}건")
+    else:
+        print("사용법: python -m ecojourney.service.battle_rollover [run|status]")
+        sys.exit(1)
@@ -0,0 +1,217 @@
+"""
+대항전 정산(Settlement) 모듈
+
+주간 대결 종료 시 참가자별 보상을 참가자 수와 관계없이 고정된 수의 SQL 문으로 처리합니다.
+
+1) 상태 가드: UPDATE battle SET status='FINISHED' WHERE id=? AND status='ACTIVE'
+   → 0행이면 이미 정산된 대결이므로 아무것도 하지 않음 (재실행해도 안전)
+   → 이후 들어오는 베팅은 종료된 대결로 거절됨 (battle_bets.place_bet)
+2) 점수 샤드를 battle 행에 합친 뒤(fold) 최종 점수로 승자 기록, 단과대 전적(collegerecord) UPSERT
+3) 참가자 ⋈ 사용자 조인으로 팀별 베팅 합계 집계 (GROUP BY 1회)
+4) battleparticipant.reward_amount 일괄 UPDATE (user와 UPDATE ... FROM 조인, CASE 식)
+5) 사용자 잔액 일괄 UPDATE ... RETURNING + 원장(pointsledger)/포인트 로그(pointslog) INSERT ... SELECT
+   (변동 후 잔액은 commit 이후 개인 포인트 리더보드에 반영)
+
+모든 문장은 호출자의 트랜잭션 안에서 실행되므로(커밋은 호출자가 수행)
+중간에 실패하면 상태 변경과 보상 지급이 함께 취소됩니다.
+
+보상 규칙 (기존과 동일):
+- 승리 팀: 자신의 베팅 + 패배 팀 베팅 합계 × (자신의 베팅 / 승리 팀 베팅 합계), 소수점 버림
+- 패배 팀(상대 팀이 아닌 단과대 포함): 0
+- 무승부: 베팅 반환
+- 사용자 정보가 없는 참가자: reward_amount에 베팅 금액 기록 (지급할 계정이 없으므로 잔액 변동 없음)
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+import logging
+
+from sqlalchemy import BigInteger, case, cast, func, insert, literal, select, update
+
+from ..models import Battle, BattleParticipant, PointsLedger, PointsLog, User
+from .battle_archive import record_result
+from .battle_bets import fold_scores
+from .leaderboard import stage_points
+
+logger = logging.getLogger(__name__)
+
+_battle = Battle.__table__
+_participant = BattleParticipant.__table__
+_user = User.__table__
+_ledger = PointsLedger.__table__
+_points_log = PointsLog.__table__
+
+
+def _decide_winner(score_a: int, score_b: int, college_a: str, college_b: str) -> Optional[str]:
+    if score_a > score_b:
+        return college_a
+    if score_b > score_a:
+        return college_b
+    return None
+
+
+def _side_totals(session, battle_id: int, winner: str) -> Dict[str, int]:
+    """참가자 ⋈ 사용자 조인으로 승리/패배 팀 베팅 합계 집계 (쿼리 1회)"""
+    side = case(
+        (_user.c.student_id.is_(None), "missing"),
+        (_user.c.college == winner, "winner"),
+        else_="loser",
+    )
+    rows = session.execute(
+        select(side.label("side"), func.coalesce(func.sum(_participant.c.bet_amount), 0))
+        .select_from(_participant.outerjoin(_user, _user.c.student_id == _participant.c.student_id))
+        .where(_participant.c.battle_id == battle_id)
+        .group_by(side)
+    ).all()
+    totals = {"winner": 0, "loser": 0, "missing": 0}
+    for name, total in rows:
+        totals[name] = int(total)
+    return totals
+
+
+def _credit_rewards(session, battle_id: int, source: str, description: str, now: datetime) -> int:
+    """
+    참가자별 reward_amount 합계만큼 잔액 증가 + 원장/포인트 로그 기록 (학번별 1행)
+
+    Returns:
+        보상을 받은 사용자 수
+    """
+    credits = (
+        select(
+            _participant.c.student_id.label("student_id"),
+            func.sum(_participant.c.reward_amount).label("amount"),
+        )
+        .where(_participant.c.battle_id == battle_id, _participant.c.reward_amount > 0)
+        .group_by(_participant.c.student_id)
+        .subquery()
+    )
+
+    # 1. 잔액 일괄 증가 (UPDATE ... FROM 집계 서브쿼리, 변동 후 잔액은 commit 후 리더보드에 반영)
+    balances = session.execute(
+        update(_user)
+        .where(_user.c.student_id == credits.c.student_id)
+        .values(current_points=_user.c.current_points + credits.c.amount)
+        .returning(_user.c.student_id, _user.c.current_points)
+    ).all()
+    for student_id, balance in balances:
+        stage_points(session, student_id, balance)
+
+    # 2. 원장: 갱신된 잔액을 그대로 balance_after로 기록
+    session.execute(
+        insert(_ledger).from_select(
+            ["student_id", "delta", "balance_after", "source", "description", "created_at"],
+            select(
+                credits.c.student_id,
+                credits.c.amount,
+                _user.c.current_points,
+                literal(source),
+                literal(description),
+                literal(now),
+            ).join_from(credits, _user, _user.c.student_id == credits.c.student_id),
+        )
+    )
+
+    # 3. 포인트 획득 로그
+    session.execute(
+        insert(_points_log).from_select(
+            ["student_id", "log_date", "points", "source", "description", "created_at"],
+            select(
+                credits.c.student_id,
+                literal(now.date()),
+                credits.c.amount,
+                literal(source),
+                literal(description),
+                literal(now),
+            ).join_from(credits, _user, _user.c.student_id == credits.c.student_id),
+        )
+    )
+    return len(balances)
+
+
+def settle_battle(session, battle_id: int) -> Optional[Dict[str, Any]]:
+    """
+    대결 정산 (커밋은 호출자가 수행)
+
+    Args:
+        session: SQLModel Session
+        battle_id: 대결 ID
+
+    Returns:
+        정산 결과 {"battle_id", "winner", "winner_total", "loser_total", "credited_users"}
+        대결이 없거나 이미 정산된 경우 None
+    """
+    # 멱등성 가드: ACTIVE인 대결만 FINISHED로 바꾸고, 바뀐 경우에만 보상 처리
+    # (battle 행을 잠그므로 진행 중인 베팅이 끝난 뒤 실행되고, 이후 베팅은 거절됨)
+    claimed = session.execute(
+        update(_battle)
+        .where(_battle.c.id == battle_id, _battle.c.status == "ACTIVE")
+        .values(status="FINISHED")
+    ).rowcount
+    if not claimed:
+        logger.info(f"이미 정산된 대결입니다: Battle {battle_id}")
+        return None
+
+    # 점수 샤드를 battle 행에 합친 최종 점수로 승자 결정
+    fold_scores(session, [battle_id])
+    battle = session.execute(
+        select(_battle.c.college_a, _battle.c.college_b, _battle.c.score_a, _battle.c.score_b, _battle.c.start_date)
+        .where(_battle.c.id == battle_id)
+    ).first()
+    winner = _decide_winner(battle.score_a, battle.score_b, battle.college_a, battle.college_b)
+    if winner is not None:
+        session.execute(update(_battle).where(_battle.c.id == battle_id).values(winner=winner))
+    # 단과대 전적(시즌별 + 전체) 누적
+    record_result(
+        session, battle.college_a, battle.college_b, battle.score_a, battle.score_b, winner, battle.start_date
+    )
+
+    matchup = f"{battle.college_a} vs {battle.college_b}"
+    now = datetime.now()
+
+    if winner is None:
+        # 무승부: 모든 참가자 베팅 반환
+        totals = {"winner": 0, "loser": 0}
+        session.execute(
+            update(_participant)
+            .where(_participant.c.battle_id == battle_id)
+            .values(reward_amount=_participant.c.bet_amount)
+        )
+        credited = _credit_rewards(session, battle_id, "battle_draw", f"대항전 무승부 포인트 반환 ({matchup})", now)
+    else:
+        totals = _side_totals(session, battle_id, winner)
+        if totals["winner"] > 0:
+            # 정수 연산으로 비례 분배 (int(loser_total * bet / winner_total)과 동일, 부동소수 오차 없음)
+            # (PostgreSQL INTEGER 오버플로 방지를 위해 BIGINT로 곱셈)
+            winner_reward = _participant.c.bet_amount + (
+                cast(_participant.c.bet_amount, BigInteger) * totals["loser"] // totals["winner"]
+            )
+        else:
+            winner_reward = _participant.c.bet_amount
+        # 사용자와 조인하여 승리 팀만 보상, 그 외 0 (UPDATE ... FROM user)
+        session.execute(
+            update(_participant)
+            .where(_participant.c.battle_id == battle_id, _participant.c.student_id == _user.c.student_id)
+            .values(reward_amount=case((_user.c.college == winner, winner_reward), else_=0))
+        )
+        # 사용자 정보가 없는 참가자는 베팅 금액을 반환 금액으로 기록
+        session.execute(
+            update(_participant)
+            .where(
+                _participant.c.battle_id == battle_id,
+                _participant.c.student_id.not_in(select(_user.c.student_id)),
+            )
+            .values(reward_amount=_participant.c.bet_amount)
+        )
+        if totals["missing"]:
+            logger.warning(f"Battle {battle_id}: 사용자 정보가 없는 참가자의 베팅 {totals['missing']}P는 반환 처리만 기록합니다.")
+        credited = _credit_rewards(session, battle_id, "battle_reward", f"대항전 승리 보상 ({matchup})", now)
+
+    result = {
+        "battle_id": battle_id,
+        "winner": winner,
+        "winner_total": totals["winner"],
+        "loser_total": totals["loser"],
+        "credited_users": credited,
+    }
+    logger.info(f"대결 정산 완료: {result}")
+    return result
@@ -0,0 +1,117 @@
+"""
+대항전 정산 벤치마크
+
+임시 DB(기본 SQLite, --db-url로 PostgreSQL 지정 가능)에 참가자 N명(기본 50,000)의
+대결을 만들고 settle_battle() 실행 시간과 SQL 문 수를 측정합니다.
+같은 대결을 다시 정산하여 멱등성 가드(추가 변경 없음)도 확인합니다.
+
+사용 예:
+    python -m ecojourney.service.battle_settlement_bench
+    python -m ecojourney.service.battle_settlement_bench --participants 200000
+    python -m ecojourney.service.battle_settlement_bench --db-url postgresql://localhost/eco_bench
+"""
+
+from datetime import date, datetime
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from ..db.query_counter import count_queries
+from ..models import Battle, BattleParticipant, PointsLedger, User
+from .battle_settlement import settle_battle
+
+
+def _populate(engine, participants: int, chunk_size: int = 10_000) -> int:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    rnd = random.Random(42)
+    now = datetime.now()
+    colleges = ["인문대학", "경영대학", "정보과학대학"]
+
+    with engine.begin() as conn:
+        for offset in range(0, participants, chunk_size):
+            conn.execute(
+                insert(User.__table__),
+                [
+                    {
+                        "student_id": f"bench{i}",
+                        "password": "x",
+                        "nickname": f"bench{i}",
+                        "college": colleges[i % len(colleges)],
+                        "current_points": 1000,
+                        "created_at": now,
+                    }
+                    for i in range(offset, min(offset + chunk_size, participants))
+                ],
+            )
+        battle_id = conn.execute(
+            insert(Battle.__table__).values(
+                start_date=date.today(),
+                end_date=date.today(),
+                college_a=colleges[0],
+                college_b=colleges[1],
+                score_a=0,
+                score_b=0,
+                status="ACTIVE",
+                created_at=now,
+            )
+        ).inserted_primary_key[0]
+
+        scores = {colleges[0]: 0, colleges[1]: 0}
+        for offset in range(0, participants, chunk_size):
+            rows = []
+            for i in range(offset, min(offset + chunk_size, participants)):
+                bet = rnd.randint(10, 500)
+                scores[colleges[i % len(colleges)]] = scores.get(colleges[i % len(colleges)], 0) + bet
+                rows.append({
+                    "battle_id": battle_id,
+                    "student_id": f"bench{i}",
+                    "bet_amount": bet,
+                    "reward_amount": 0,
+                    "joined_at": now,
+                })
+            conn.execute(insert(BattleParticipant.__table__), rows)
+
+        conn.execute(
+            Battle.__table__.update()
+            .where(Battle.__table__.c.id == battle_id)
+            .values(score_a=scores[colleges[0]], score_b=scores[colleges[1]])
+        )
+    return battle_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대항전 정산 벤치마크")
+    parser.add_argument("--participants", type=int, default=50_000)
+    parser.add_argument("--db-url", default=None, help="생략 시 임시 SQLite 파일 (기존 데이터는 삭제됨)")
+    args = parser.parse_args()
+
+    db_url = args.db_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(db_url, echo=False)
+
+    started = time.perf_counter()
+    battle_id = _populate(engine, args.participants)
+    print(f"[setup ] 참가자 {args.participants}명 생성 {time.perf_counter() - started:.1f}s")
+
+    for label in ("settle", "rerun"):
+        with Session(engine) as session:
+            with count_queries(engine) as counter:
+                started = time.perf_counter()
+                result = settle_battle(session, battle_id)
+                session.commit()
+                elapsed = time.perf_counter() - started
+        print(f"[{label:6}] {elapsed * 1000:.0f}ms, SQL {counter.count}회, 결과 {result}")
+
+    with Session(engine) as session:
+        ledger_rows = session.exec(select(func.count()).select_from(PointsLedger)).one()
+    print(f"[check ] 원장 기록 {ledger_rows}건")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
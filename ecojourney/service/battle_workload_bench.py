@@ -0,0 +1,347 @@
+"""
+대항전 워크로드 시뮬레이터 (주간 부하 벤치마크)
+
+임시 DB(기본 SQLite, --db-url로 PostgreSQL 지정 가능)에 단과대 N개와 사용자 M명을 만들고
+한 주 동안의 대항전 사용 패턴을 앱과 같은 경로로 재생합니다.
+
+1) 주간 교체(run_rollover)로 이번 주 대결 생성
+2) 요일별 참가율(월요일 최대, 주말 감소)과 시간대(점심/저녁 피크)에 따라 베팅 도착 순서 생성
+   - 단과대 규모는 불균등(Zipf), 잔액과 베팅 금액은 소수의 큰 값이 있는 분포
+   - 일부 요청은 중복 클릭(같은 사용자의 동시 요청)으로 재전송
+3) 동시 클라이언트(--clients)가 join_battle과 같은 순서로 실행
+   쓰기 큐(place_bet) → 현황판 캐시 갱신(record_bet) → 페이지 새로고침
+   베팅 사이에는 조회만 하는 페이지 로드(--views-per-bet)가 섞이며,
+   가상 시각이 정시를 지날 때마다 점수 샤드 fold(매시 작업)를 함께 실행
+4) 다음 주 교체(run_rollover)로 정산
+5) 잔액 체크섬: 전체 잔액 합계, (학번, 잔액) 해시, 보존 법칙(초기 - 베팅 + 보상 = 최종) 확인
+
+페이지 로드는 BattleState.load_current_battle과 같은 조회(AsyncSession + 현황판 캐시)를 수행하며
+캐시 미스 시 DB 집계 시간도 따로 측정합니다 (cold_page).
+같은 --seed이면 베팅 결과와 체크섬이 같으므로 --json으로 결과를 쌓아 릴리스 간 회귀를 추적할 수 있습니다.
+
+사용 예:
+    python -m ecojourney.service.battle_workload_bench
+    python -m ecojourney.service.battle_workload_bench --users 50000 --clients 64 --json bench.jsonl
+    python -m ecojourney.service.battle_workload_bench --db-url postgresql://localhost/eco_bench --redis-url redis://localhost
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import func, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, select
+
+from ..db.async_session import async_session, to_async_url
+from ..db.write_queue import WriteQueue, create_writer_engine
+from ..models import Battle, BattleParticipant, User
+from .battle_bets import place_bet
+from .battle_rollover import COLLEGES, fold_active_scores, run_rollover, week_bounds
+from .scoreboard_cache import (
+    LocalScoreboardCache,
+    RedisScoreboardCache,
+    load_scoreboard,
+    record_bet,
+    scoreboard_view,
+    set_scoreboard_cache,
+)
+
+# 요일별 참가율 가중치 (월요일 = 1.0)
+DAY_WEIGHTS = [1.0, 0.8, 0.7, 0.7, 0.6, 0.4, 0.5]
+
+# 베팅 금액 후보와 가중치
+BET_AMOUNTS = [10, 20, 50, 100, 200, 500, 1000]
+BET_WEIGHTS = [20, 25, 25, 15, 8, 5, 2]
+
+# 중복 클릭 비율
+DOUBLE_SUBMIT_RATE = 0.02
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(samples)
+
+    def _at(q: float) -> float:
+        return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)], 2)
+
+    return {"p50": _at(0.50), "p95": _at(0.95), "p99": _at(0.99)}
+
+
+def _populate(engine, colleges: int, users: int, rnd: random.Random, chunk_size: int = 10_000) -> Tuple[List[Tuple[str, str]], int]:
+    """
+    단과대/사용자 생성 (단과대 규모는 Zipf 분포)
+
+    Returns:
+        ([(학번, 단과대), ...], 초기 잔액 합계)
+    """
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    names = COLLEGES[:colleges]
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    now = datetime.now()
+
+    population: List[Tuple[str, str]] = []
+    initial_total = 0
+    with engine.begin() as conn:
+        for offset in range(0, users, chunk_size):
+            rows = []
+            for i in range(offset, min(offset + chunk_size, users)):
+                # 모든 단과대에 최소 1명 배정 후 나머지는 규모 가중치로 배정
+                college = names[i] if i < len(names) else rnd.choices(names, weights)[0]
+                points = min(int(rnd.paretovariate(1.5) * 150), 20_000)
+                population.append((f"sim{i}", college))
+                initial_total += points
+                rows.append({
+                    "student_id": f"sim{i}",
+                    "password": "x",
+                    "nickname": f"sim{i}",
+                    "college": college,
+                    "current_points": points,
+                    "created_at": now,
+                })
+            conn.execute(insert(User.__table__), rows)
+    return population, initial_total
+
+
+def _arrivals(population: List[Tuple[str, str]], monday: date, day: int, rate: float, rnd: random.Random) -> List[Tuple[datetime, str, str, int]]:
+    """하루치 베팅 도착 목록 [(가상 시각, 학번, 단과대, 금액), ...] (시각 순)"""
+    day_start = datetime.combine(monday + timedelta(days=day), datetime.min.time())
+    probability = rate * DAY_WEIGHTS[day]
+    arrivals = []
+    for student_id, college in population:
+        if rnd.random() >= probability:
+            continue
+        # 점심(12:30)/저녁(21:00) 피크 + 낮 시간대 고르게
+        peak = rnd.random()
+        if peak < 0.4:
+            hour = rnd.gauss(12.5, 1.0)
+        elif peak < 0.8:
+            hour = rnd.gauss(21.0, 1.5)
+        else:
+            hour = rnd.uniform(8.0, 24.0)
+        at = day_start + timedelta(hours=min(max(hour, 0.0), 23.99))
+        amount = rnd.choices(BET_AMOUNTS, BET_WEIGHTS)[0]
+        arrivals.append((at, student_id, college, amount))
+        if rnd.random() < DOUBLE_SUBMIT_RATE:
+            arrivals.append((at, student_id, college, amount))
+    arrivals.sort(key=lambda arrival: arrival[0])
+    return arrivals
+
+
+async def _load_page(engine, monday: date, college: str) -> Optional[Dict[str, Any]]:
+    """BattleState.load_current_battle과 같은 조회 (이번 주 대결 목록 → 현황판 캐시)"""
+    async with async_session(engine) as session:
+        battles = (await session.exec(
+            select(Battle.id, Battle.college_a, Battle.college_b).where(
+                Battle.start_date == monday,
+                Battle.status == "ACTIVE",
+            )
+        )).all()
+        for battle_id, college_a, college_b in battles:
+            if college in (college_a, college_b):
+                board = await load_scoreboard(session, battle_id)
+                return scoreboard_view(board)[0] if board is not None else None
+    return None
+
+
+class _Simulation:
+    def __init__(self, writer, reader, population, monday: date, clients: int, views_per_bet: int, rnd: random.Random):
+        self.writer = writer
+        self.reader = reader
+        self.population = population
+        self.monday = monday
+        self.queue = WriteQueue(engine=writer)
+        self.slots = asyncio.Semaphore(clients)
+        self.views_per_bet = views_per_bet
+        self.rnd = rnd
+        self.page_ms: List[float] = []
+        self.counts: Dict[str, int] = {"attempted": 0, "accepted": 0, "errors": 0, "folds": 0}
+        self.rejected: Dict[str, int] = {}
+        self.bet_total = 0
+
+    async def _page(self, college: str) -> None:
+        started = time.perf_counter()
+        await _load_page(self.reader, self.monday, college)
+        self.page_ms.append((time.perf_counter() - started) * 1000)
+
+    async def _join(self, at: datetime, student_id: str, college: str, amount: int, battle_ids: Dict[str, int]) -> None:
+        """join_battle과 같은 순서: 쓰기 큐 → 현황판 캐시 → 페이지 새로고침"""
+        battle_id = battle_ids.get(college)
+        if battle_id is None:
+            # 대결 상대가 없는 단과대(홀수 개)는 조회만
+            await self._page(college)
+            return
+        self.counts["attempted"] += 1
+        try:
+            error, _, standing = await self.queue.submit(
+                lambda session: place_bet(session, battle_id, student_id, college, amount, "simulation", now=at)
+            )
+        except Exception:
+            self.counts["errors"] += 1
+            return
+        if error:
+            self.rejected[error] = self.rejected.get(error, 0) + 1
+            return
+        self.counts["accepted"] += 1
+        self.bet_total += amount
+        await record_bet(battle_id, college, amount, standing)
+        await self._page(college)
+
+    async def _spawn(self, coroutine, tasks: List[asyncio.Task]) -> None:
+        """동시 클라이언트 수만큼만 실행 (빈 자리가 날 때까지 다음 도착을 기다림)"""
+        await self.slots.acquire()
+        task = asyncio.create_task(coroutine)
+        task.add_done_callback(lambda _: self.slots.release())
+        tasks.append(task)
+
+    async def run_day(self, day: int, rate: float, battle_ids: Dict[str, int]) -> Tuple[int, float]:
+        """하루치 베팅/조회 실행 (가상 시각이 정시를 지날 때마다 fold 실행), 반환: (도착 수, 소요 시간)"""
+        arrivals = _arrivals(self.population, self.monday, day, rate, self.rnd)
+        loop = asyncio.get_running_loop()
+        tasks = []
+        folds = []
+        hour = None
+        started = time.perf_counter()
+        for at, student_id, college, amount in arrivals:
+            # 매시 작업과 같이 fold는 한 번에 하나만 실행
+            if hour is not None and at.hour != hour and (not folds or folds[-1].done()):
+                folds.append(loop.run_in_executor(None, fold_active_scores, self.writer))
+            hour = at.hour
+            await self._spawn(self._join(at, student_id, college, amount, battle_ids), tasks)
+            for _ in range(self.views_per_bet):
+                await self._spawn(self._page(self.rnd.choice(self.population)[1]), tasks)
+        await asyncio.gather(*tasks)
+        await asyncio.gather(*folds)
+        self.counts["folds"] += len(folds)
+        return len(arrivals), time.perf_counter() - started
+
+    async def cold_pages(self, samples: int) -> List[float]:
+        """캐시 미스 페이지 로드 (매번 캐시를 비우고 DB에서 현황판 생성)"""
+        cache = LocalScoreboardCache(ttl=0)
+        set_scoreboard_cache(cache)
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            await _load_page(self.reader, self.monday, self.rnd.choice(self.population)[1])
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+
+def _checksum(engine) -> Tuple[int, str, int]:
+    """(잔액 합계, (학번, 잔액) 해시, 보상 합계)"""
+    with Session(engine) as session:
+        digest = hashlib.sha256()
+        total = 0
+        for student_id, points in session.exec(
+            select(User.student_id, User.current_points).order_by(User.student_id)
+        ):
+            digest.update(f"{student_id}:{points}\n".encode())
+            total += points
+        rewards = session.exec(select(func.coalesce(func.sum(BattleParticipant.reward_amount), 0))).one()
+    return total, digest.hexdigest()[:16], int(rewards)
+
+
+async def _simulate(args) -> Dict[str, Any]:
+    rnd = random.Random(args.seed)
+    db_url = args.db_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'simulation.db')}"
+    writer = create_writer_engine(db_url)
+    reader = create_async_engine(to_async_url(db_url))
+    if args.redis_url:
+        set_scoreboard_cache(RedisScoreboardCache(args.redis_url, args.cache_ttl))
+    else:
+        set_scoreboard_cache(LocalScoreboardCache(args.cache_ttl))
+
+    result: Dict[str, Any] = {
+        "dialect": writer.dialect.name,
+        "colleges": args.colleges,
+        "users": args.users,
+        "seed": args.seed,
+    }
+    loop = asyncio.get_running_loop()
+
+    started = time.perf_counter()
+    population, initial_total = _populate(writer, args.colleges, args.users, rnd)
+    monday, _ = week_bounds()
+    rollover = await loop.run_in_executor(None, run_rollover, writer, monday)
+    result["setup_s"] = round(time.perf_counter() - started, 2)
+    result["battles"] = rollover["created"]
+
+    with Session(writer) as session:
+        battle_ids = {}
+        for battle_id, college_a, college_b in session.exec(
+            select(Battle.id, Battle.college_a, Battle.college_b).where(Battle.start_date == monday)
+        ):
+            battle_ids[college_a] = battle_id
+            battle_ids[college_b] = battle_id
+
+    simulation = _Simulation(writer, reader, population, monday, args.clients, args.views_per_bet, rnd)
+    arrivals = 0
+    elapsed = 0.0
+    for day in range(7):
+        day_arrivals, day_elapsed = await simulation.run_day(day, args.rate, battle_ids)
+        arrivals += day_arrivals
+        elapsed += day_elapsed
+        print(f"[day {day}] 요청 {day_arrivals}건, {day_elapsed:.1f}s")
+
+    result.update(simulation.counts)
+    result["rejected"] = sum(simulation.rejected.values())
+    result["rejected_by_reason"] = simulation.rejected
+    result["bets_per_s"] = round(simulation.counts["attempted"] / elapsed, 1) if elapsed else 0.0
+    result["write_batch_avg"] = simulation.queue.get_metrics()["avg_batch_size"]
+    result["page_loads"] = len(simulation.page_ms)
+    result["page_ms"] = _percentiles(simulation.page_ms)
+    result["cold_page_ms"] = _percentiles(await simulation.cold_pages(args.cold_samples))
+
+    # 정산: 다음 주 월요일 교체 실행
+    started = time.perf_counter()
+    settled = await loop.run_in_executor(None, run_rollover, writer, monday + timedelta(days=7))
+    result["settle_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    result["settled"] = len(settled["settled"])
+
+    final_total, digest, rewards = _checksum(writer)
+    result["balance_total"] = final_total
+    result["balance_checksum"] = digest
+    result["balance_conserved"] = final_total == initial_total - simulation.bet_total + rewards
+
+    await reader.dispose()
+    writer.dispose()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대항전 워크로드 시뮬레이터")
+    parser.add_argument("--colleges", type=int, default=len(COLLEGES), help=f"단과대 수 (최대 {len(COLLEGES)})")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--rate", type=float, default=0.3, help="월요일 참가율 (다른 요일은 DAY_WEIGHTS 비율)")
+    parser.add_argument("--clients", type=int, default=32, help="동시 클라이언트 수")
+    parser.add_argument("--views-per-bet", type=int, default=2, help="베팅 1건당 조회만 하는 페이지 로드 수")
+    parser.add_argument("--cold-samples", type=int, default=50, help="캐시 미스 페이지 로드 측정 횟수")
+    parser.add_argument("--cache-ttl", type=int, default=300, help="현황판 캐시 TTL (0이면 캐시 없이 매번 DB 조회)")
+    parser.add_argument("--redis-url", default=None, help="현황판 캐시로 Redis 사용 (생략 시 프로세스 메모리)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db-url", default=None, help="생략 시 임시 SQLite 파일 (기존 데이터는 삭제됨)")
+    parser.add_argument("--json", default=None, help="결과를 JSON 한 줄로 추가할 파일 (릴리스 간 비교용)")
+    args = parser.parse_args()
+    if not 2 <= args.colleges <= len(COLLEGES):
+        parser.error(f"--colleges는 2~{len(COLLEGES)} 사이여야 합니다.")
+
+    result = asyncio.run(_simulate(args))
+    for key, value in result.items():
+        print(f"{key:20} {value}")
+    if args.json:
+        result["recorded_at"] = datetime.now().isoformat(timespec="seconds")
+        with open(args.json, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+탄소 로그 보관(Archive) 모듈
+
+보관 기간(horizon)보다 오래된 CarbonLog를 월 단위로
+1) 날짜 파티션 Parquet 파일(archive/carbonlog/year=YYYY/month=MM/)로 내보내고
+2) 사용자별 월별 집계(CarbonLogMonthly)에 누적한 뒤
+3) 라이브 DB에서 삭제합니다.
+
+라이브 테이블은 최근 데이터만 유지되어 인덱스가 작게 유지되며,
+누적 통계는 월별 집계로, 상세 이력은 사용자가 요청할 때만 Parquet에서 읽습니다.
+
+사용 예:
+    python -m ecojourney.service.carbon_archive archive            # 기본 보관 기간(180일)
+    python -m ecojourney.service.carbon_archive archive 365
+    python -m ecojourney.service.carbon_archive read 20231234
+"""
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+import json
+import logging
+import os
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from ..models import CarbonLog, CarbonLogMonthly
+
+logger = logging.getLogger(__name__)
+
+# 대시보드는 최근 30일, 주간 챌린지는 이번 주만 조회하므로 그보다 짧게 보관할 수 없음
+MIN_HORIZON_DAYS = 35
+DEFAULT_HORIZON_DAYS = int(os.getenv("ECOJOURNEY_ARCHIVE_HORIZON_DAYS", "180"))
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+ARCHIVE_DIR = Path(os.getenv("ECOJOURNEY_ARCHIVE_DIR", str(_PROJECT_ROOT / "archive" / "carbonlog")))
+
+# Parquet 파일 컬럼 (CarbonLog 전체 컬럼, year/month는 디렉터리 파티션)
+_COLUMNS = [
+    "id", "student_id", "log_date", "source", "transport_km", "cup_count", "ac_hours",
+    "activities_json", "total_emission", "points_earned", "ai_feedback", "created_at",
+]
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("id", pa.int64()),
+        ("student_id", pa.string()),
+        ("log_date", pa.date32()),
+        ("source", pa.string()),
+        ("transport_km", pa.float64()),
+        ("cup_count", pa.int64()),
+        ("ac_hours", pa.float64()),
+        ("activities_json", pa.string()),
+        ("total_emission", pa.float64()),
+        ("points_earned", pa.int64()),
+        ("ai_feedback", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _next_month(value: date) -> date:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _partition_dir(archive_dir: Path, month: date) -> Path:
+    return archive_dir / f"year={month.year:04d}" / f"month={month.month:02d}"
+
+
+def _write_parquet(logs: List[CarbonLog], month: date, archive_dir: Path) -> Path:
+    """같은 달의 로그 배치를 Parquet 파일 하나로 기록 (파일명에 id 범위 포함)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = {name: [getattr(log, name) for log in logs] for name in _COLUMNS}
+    table = pa.Table.from_pydict(columns, schema=_schema())
+
+    target_dir = _partition_dir(archive_dir, month)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    path = target_dir / f"part-{logs[0].id}-{logs[-1].id}.parquet"
+    pq.write_table(table, path)
+    return path
+
+
+def _rollup(logs: List[CarbonLog]) -> Dict[tuple, Dict[str, Any]]:
+    """(student_id, source)별 집계 (카테고리 개수는 처음 등장한 순서 유지)"""
+    rollups: Dict[tuple, Dict[str, Any]] = {}
+    for log in logs:
+        key = (log.student_id, log.source or "carbon_input")
+        entry = rollups.setdefault(key, {"log_count": 0, "total_emission": 0.0, "points_earned": 0, "categories": {}})
+        entry["log_count"] += 1
+        entry["total_emission"] += log.total_emission or 0.0
+        if log.points_earned and log.points_earned > 0:
+            entry["points_earned"] += log.points_earned
+        for activity in log.get_activities():
+            category = activity.get("category", "기타")
+            entry["categories"][category] = entry["categories"].get(category, 0) + 1
+    return rollups
+
+
+def _merge_rollups(session, month: date, rollups: Dict[tuple, Dict[str, Any]]) -> None:
+    """월별 집계 행에 누적 (같은 달을 여러 번 보관해도 합산)"""
+    for (student_id, source), entry in rollups.items():
+        row = session.exec(
+            select(CarbonLogMonthly).where(
+                CarbonLogMonthly.student_id == student_id,
+                CarbonLogMonthly.month == month,
+                CarbonLogMonthly.source == source,
+            )
+        ).first()
+        if row is None:
+            row = CarbonLogMonthly(student_id=student_id, month=month, source=source)
+
+        categories = json.loads(row.category_counts_json or "{}")
+        for category, count in entry["categories"].items():
+            categories[category] = categories.get(category, 0) + count
+
+        row.log_count = (row.log_count or 0) + entry["log_count"]
+        row.total_emission = (row.total_emission or 0.0) + entry["total_emission"]
+        row.points_earned = (row.points_earned or 0) + entry["points_earned"]
+        row.category_counts_json = json.dumps(categories, ensure_ascii=False)
+        row.archived_at = datetime.now()
+        session.add(row)
+
+
+def archive_old_logs(
+    session,
+    horizon_days: int = DEFAULT_HORIZON_DAYS,
+    archive_dir: Optional[Path] = None,
+    today: Optional[date] = None,
+    batch_size: int = 5000,
+) -> Dict[str, Any]:
+    """
+    보관 기간보다 오래된 CarbonLog를 월 단위로 보관 (배치별로 commit)
+
+    Args:
+        session: SQLModel Session
+        horizon_days: 라이브 DB에 남길 기간 (일)
+        archive_dir: Parquet 저장 경로 (기본: ARCHIVE_DIR)
+        today: 기준일 (기본: 오늘)
+        batch_size: 한 번에 보관할 최대 행 수 (Parquet 파일 1개)
+
+    Returns:
+        {"cutoff": 기준일, "months": 처리한 월 수, "rows": 보관한 행 수, "files": [파일 경로]}
+    """
+    if horizon_days < MIN_HORIZON_DAYS:
+        raise ValueError(f"보관 기간은 최소 {MIN_HORIZON_DAYS}일 이상이어야 합니다.")
+
+    archive_dir = Path(archive_dir) if archive_dir else ARCHIVE_DIR
+    cutoff = (today or date.today()) - timedelta(days=horizon_days)
+    summary: Dict[str, Any] = {"cutoff": cutoff.isoformat(), "months": 0, "rows": 0, "files": []}
+
+    oldest = session.exec(
+        select(CarbonLog.log_date).where(CarbonLog.log_date < cutoff).order_by(CarbonLog.log_date).limit(1)
+    ).first()
+    if oldest is None:
+        return summary
+
+    month = _month_start(oldest)
+    while month < cutoff:
+        month_end = min(_next_month(month), cutoff)
+        month_rows = 0
+        last_id = 0
+        while True:
+            # 한 달치를 batch_size 단위로 나누어 처리 (메모리/트랜잭션 크기 제한)
+            logs = list(session.exec(
+                select(CarbonLog)
+                .where(CarbonLog.log_date >= month, CarbonLog.log_date < month_end, CarbonLog.id > last_id)
+                .order_by(CarbonLog.id)
+                .limit(batch_size)
+            ).all())
+            if not logs:
+                break
+            last_id = logs[-1].id
+
+            path = _write_parquet(logs, month, archive_dir)
+            try:
+                _merge_rollups(session, month, _rollup(logs))
+                session.exec(delete(CarbonLog).where(CarbonLog.id.in_([log.id for log in logs])))
+                session.commit()
+            except Exception:
+                # DB 반영에 실패하면 파일도 제거하여 다음 실행 때 중복 보관되지 않도록 함
+                session.rollback()
+                path.unlink(missing_ok=True)
+                raise
+            session.expunge_all()
+
+            month_rows += len(logs)
+            summary["files"].append(str(path))
+            logger.info(f"탄소 로그 보관: {month:%Y-%m} {len(logs)}건 -> {path}")
+
+        if month_rows:
+            summary["months"] += 1
+            summary["rows"] += month_rows
+        month = _next_month(month)
+
+    return summary
+
+
+def read_archived_logs(
+    student_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    archive_dir: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """
+    보관된 사용자 로그 조회 (사용자가 요청할 때만 사용, 최신순)
+
+    Args:
+        student_id: 학번
+        start_date: 시작일 (포함, 선택)
+        end_date: 종료일 (포함, 선택)
+        archive_dir: Parquet 저장 경로 (기본: ARCHIVE_DIR)
+    """
+    import pyarrow.dataset as ds
+
+    archive_dir = Path(archive_dir) if archive_dir else ARCHIVE_DIR
+    if not archive_dir.exists():
+        return []
+
+    dataset = ds.dataset(str(archive_dir), format="parquet", partitioning="hive", schema=None)
+    condition = ds.field("student_id") == student_id
+    if start_date:
+        condition = condition & (ds.field("log_date") >= start_date)
+        # 파티션 단위로 먼저 걸러 필요 없는 파일은 열지 않음
+        condition = condition & (
+            (ds.field("year") > start_date.year)
+            | ((ds.field("year") == start_date.year) & (ds.field("month") >= start_date.month))
+        )
+    if end_date:
+        condition = condition & (ds.field("log_date") <= end_date)
+        condition = condition & (
+            (ds.field("year") < end_date.year)
+            | ((ds.field("year") == end_date.year) & (ds.field("month") <= end_date.month))
+        )
+
+    rows = dataset.to_table(columns=_COLUMNS, filter=condition).to_pylist()
+    # 보관 도중 실패 후 재실행된 경우를 대비해 id 기준 중복 제거
+    unique = {row["id"]: row for row in rows}
+    return sorted(unique.values(), key=lambda row: (row["log_date"], row["id"]), reverse=True)
+
+
+def get_monthly_rollups(session, student_id: str, source: Optional[str] = None) -> List[CarbonLogMonthly]:
+    """사용자의 월별 집계 조회 (오래된 달부터)"""
+    statement = select(CarbonLogMonthly).where(CarbonLogMonthly.student_id == student_id)
+    if source:
+        statement = statement.where(CarbonLogMonthly.source == source)
+    return list(session.exec(statement.order_by(CarbonLogMonthly.month)).all())
+
+
+if __name__ == "__main__":
+    import sys
+    from sqlmodel import Session
+    from ..db.write_queue import create_writer_engine
+
+    # 앱의 쓰기와 동시에 실행되어도 잠금 대기하도록 쓰기 엔진 사용 (BEGIN IMMEDIATE)
+    engine = create_writer_engine()
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "archive"
+    if command == "archive":
+        horizon = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_HORIZON_DAYS
+        with Session(engine) as session:
+            result = archive_old_logs(session, horizon)
+        print(f"✅ 보관 완료 (기준일 {result['cutoff']} 이전): {result['months']}개월, {result['rows']}건")
+    elif command == "read" and len(sys.argv) > 2:
+        for row in read_archived_logs(sys.argv[2]):
+            print(f"{row['log_date']} {row['source']} {row['total_emission']:.2f}kg {row['points_earned']}점")
+    else:
+        print("사용법: python -m ecojourney.service.carbon_archive [archive [horizon_days]|read student_id]")
+        sys.exit(1)
@@ -0,0 +1,206 @@
+"""
+탄소 배출 통계 집계 쿼리 모듈
+마이페이지 대시보드/통계용 집계를 DB(SUM/COUNT)에서 수행하여
+사용자 기록 전체를 메모리로 읽지 않도록 합니다.
+"""
+
+from datetime import date
+from typing import Dict, List, Any
+import json
+import logging
+
+from sqlalchemy import func, text
+from sqlmodel import select
+
+from ..models import CarbonLog, CarbonLogMonthly
+
+logger = logging.getLogger(__name__)
+
+
+def get_daily_emission_buckets(session, student_id: str, start_date: date, end_date: date) -> Dict[str, float]:
+    """
+    기간 내 일별 배출량 합계 조회 (log_date 기준 GROUP BY)
+
+    Args:
+        session: SQLModel Session
+        student_id: 학번
+        start_date: 시작일 (포함)
+        end_date: 종료일 (포함)
+
+    Returns:
+        {"YYYY-MM-DD": 배출량 합계} 형태의 딕셔너리 (기록이 있는 날짜만 포함)
+    """
+    statement = (
+        select(CarbonLog.log_date, func.sum(CarbonLog.total_emission))
+        .where(
+            CarbonLog.student_id == student_id,
+            CarbonLog.log_date >= start_date,
+            CarbonLog.log_date <= end_date,
+        )
+        .group_by(CarbonLog.log_date)
+    )
+
+    buckets: Dict[str, float] = {}
+    for log_date, total in session.exec(statement).all():
+        if log_date is None:
+            continue
+        day_key = log_date.strftime("%Y-%m-%d") if hasattr(log_date, "strftime") else str(log_date)
+        buckets[day_key] = float(total or 0.0)
+    return buckets
+
+
+def get_emission_totals(session, student_id: str, source: str = "carbon_input") -> Dict[str, Any]:
+    """
+    사용자 전체 기록의 개수/합계를 집계 쿼리로 조회
+
+    Returns:
+        {"total_logs": int, "total_emission": float}
+    """
+    statement = select(
+        func.count(CarbonLog.id),
+        func.coalesce(func.sum(CarbonLog.total_emission), 0.0),
+    ).where(
+        CarbonLog.student_id == student_id,
+        CarbonLog.source == source,
+    )
+    total_logs, total_emission = session.exec(statement).one()
+
+    # 보관(archive)된 기록은 월별 집계에서 합산
+    archived_logs, archived_emission = session.exec(
+        select(
+            func.coalesce(func.sum(CarbonLogMonthly.log_count), 0),
+            func.coalesce(func.sum(CarbonLogMonthly.total_emission), 0.0),
+        ).where(
+            CarbonLogMonthly.student_id == student_id,
+            CarbonLogMonthly.source == source,
+        )
+    ).one()
+    return {
+        "total_logs": int(total_logs or 0) + int(archived_logs or 0),
+        "total_emission": float(total_emission or 0.0) + float(archived_emission or 0.0),
+    }
+
+
+# 카테고리별 활동 개수 집계 (DB의 JSON 함수 사용)
+# activities_json이 객체 하나인 경우 기존 get_activities()와 동일하게 리스트로 감싸서 처리
+# 정렬은 (로그 id, 항목 위치) 기준 최초 등장 순서 (한 로그의 활동 수는 1000개 미만으로 가정)
+_SQLITE_CATEGORY_SQL = """
+SELECT COALESCE(json_extract(j.value, '$.category'), '기타') AS category,
+       COUNT(*) AS cnt
+FROM carbonlog AS c,
+     json_each(
+         CASE WHEN NOT json_valid(c.activities_json) THEN '[]'
+              WHEN json_type(c.activities_json) = 'object' THEN json_array(json(c.activities_json))
+              WHEN json_type(c.activities_json) = 'array' THEN c.activities_json
+              ELSE '[]'
+         END
+     ) AS j
+WHERE c.student_id = :student_id
+  AND c.source = :source
+  AND j.type = 'object'
+GROUP BY category
+ORDER BY MIN(c.id * 1000 + j.key)
+"""
+
+# PostgreSQL: 잘못된 JSON 행에서 ::jsonb 캐스팅이 실패하지 않도록 pg_input_is_valid(16 이상)로 먼저 검사
+_POSTGRES_CATEGORY_SQL = """
+WITH c AS (
+    SELECT id,
+           CASE WHEN pg_input_is_valid(activities_json, 'jsonb') THEN activities_json::jsonb END AS doc
+    FROM carbonlog
+    WHERE student_id = :student_id
+      AND source = :source
+)
+SELECT COALESCE(j.value ->> 'category', '기타') AS category,
+       COUNT(*) AS cnt
+FROM c
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(c.doc) = 'object' THEN jsonb_build_array(c.doc) ELSE c.doc END
+) WITH ORDINALITY AS j(value, idx)
+WHERE jsonb_typeof(c.doc) IN ('array', 'object')
+  AND jsonb_typeof(j.value) = 'object'
+GROUP BY category
+ORDER BY MIN(c.id * 1000 + j.idx)
+"""
+
+# pg_input_is_valid()가 있는 PostgreSQL 버전
+_POSTGRES_JSON_VALIDATION_VERSION = (16,)
+
+
+def get_category_activity_counts(session, student_id: str, source: str = "carbon_input") -> List[Dict[str, Any]]:
+    """
+    카테고리별 활동 개수 집계
+
+    SQLite/PostgreSQL(16 이상)은 JSON 함수로 DB에서 집계하고,
+    그 외 DB는 activities_json 컬럼만 스트리밍하여 집계합니다.
+    보관(archive)된 기록은 월별 집계의 카테고리 개수를 먼저 합산합니다.
+
+    Returns:
+        [{"name": 카테고리, "count": 개수}, ...] (처음 등장한 순서)
+    """
+    archived = _get_archived_category_counts(session, student_id, source)
+    live = _get_live_category_counts(session, student_id, source)
+    if not archived:
+        return live
+
+    for item in live:
+        archived[item["name"]] = archived.get(item["name"], 0) + item["count"]
+    return [{"name": k, "count": v} for k, v in archived.items()]
+
+
+def _get_archived_category_counts(session, student_id: str, source: str) -> Dict[str, int]:
+    """월별 집계(CarbonLogMonthly)의 카테고리 개수 합산 (오래된 달부터)"""
+    counts: Dict[str, int] = {}
+    rows = session.exec(
+        select(CarbonLogMonthly.category_counts_json)
+        .where(CarbonLogMonthly.student_id == student_id, CarbonLogMonthly.source == source)
+        .order_by(CarbonLogMonthly.month)
+    ).all()
+    for category_counts_json in rows:
+        try:
+            parsed = json.loads(category_counts_json or "{}")
+        except (TypeError, ValueError):
+            continue
+        for category, count in parsed.items():
+            counts[category] = counts.get(category, 0) + int(count)
+    return counts
+
+
+def _get_live_category_counts(session, student_id: str, source: str) -> List[Dict[str, Any]]:
+    """라이브 CarbonLog의 카테고리별 활동 개수 집계"""
+    dialect = session.get_bind().dialect.name
+    params = {"student_id": student_id, "source": source}
+
+    if dialect == "sqlite":
+        rows = session.execute(text(_SQLITE_CATEGORY_SQL), params).all()
+        return [{"name": row[0], "count": int(row[1])} for row in rows]
+    if dialect == "postgresql" and session.get_bind().dialect.server_version_info >= _POSTGRES_JSON_VALIDATION_VERSION:
+        rows = session.execute(text(_POSTGRES_CATEGORY_SQL), params).all()
+        return [{"name": row[0], "count": int(row[1])} for row in rows]
+    return _stream_category_counts(session, student_id, source)
+
+
+def _stream_category_counts(session, student_id: str, source: str) -> List[Dict[str, Any]]:
+    """JSON 함수가 없는 DB용: 전체 행 대신 activities_json 컬럼만 청크 단위로 읽어 집계"""
+    counts: Dict[str, int] = {}
+    statement = (
+        select(CarbonLog.activities_json)
+        .where(CarbonLog.student_id == student_id, CarbonLog.source == source)
+        .order_by(CarbonLog.id)
+        .execution_options(yield_per=500)
+    )
+    for activities_json in session.exec(statement):
+        try:
+            parsed = json.loads(activities_json) if activities_json else []
+        except (TypeError, ValueError):
+            continue
+        if isinstance(parsed, dict):
+            parsed = [parsed]
+        if not isinstance(parsed, list):
+            continue
+        for activity in parsed:
+            if not isinstance(activity, dict):
+                continue
+            category = activity.get("category", "기타")
+            counts[category] = counts.get(category, 0) + 1
+    return [{"name": k, "count": v} for k, v in counts.items()]
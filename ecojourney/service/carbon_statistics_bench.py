@@ -0,0 +1,147 @@
+"""
+탄소 통계 집계 벤치마크
+
+임시 DB(기본 SQLite, --db-url로 PostgreSQL 지정 가능)에 사용자 한 명의 여러 해 기록(기본 5년, 하루 1건)과
+다른 사용자들의 기록을 만들고, 마이페이지 통계 집계를 기존 방식(전체 로그 로드 후 Python 집계)과
+carbon_statistics의 집계 쿼리로 각각 실행해 시간과 SQL 문 수를 비교합니다. 두 결과가 같은지도 확인합니다.
+
+사용 예:
+    python -m ecojourney.service.carbon_statistics_bench
+    python -m ecojourney.service.carbon_statistics_bench --years 10 --others 2000
+    python -m ecojourney.service.carbon_statistics_bench --db-url postgresql://localhost/eco_bench
+"""
+
+from datetime import date, datetime, timedelta
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from ..db.query_counter import count_queries
+from ..models import CarbonLog
+from .carbon_statistics import get_category_activity_counts, get_daily_emission_buckets, get_emission_totals
+
+CATEGORIES = ["교통", "식품", "전기", "의류", "쓰레기", "물"]
+TARGET = "bench-target"
+
+
+def _populate(engine, years: int, others: int, chunk_size: int = 10_000) -> int:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    rnd = random.Random(26)
+    today = date.today()
+    now = datetime.now()
+    days = years * 365
+
+    def rows(student_id: str, count: int):
+        for i in range(count):
+            activities = [
+                {"category": rnd.choice(CATEGORIES), "activity_type": "bench", "value": rnd.randint(1, 10)}
+                for _ in range(rnd.randint(1, 6))
+            ]
+            yield {
+                "student_id": student_id,
+                "log_date": today - timedelta(days=i),
+                "source": "carbon_input",
+                "transport_km": 0.0,
+                "cup_count": 0,
+                "ac_hours": 0.0,
+                "activities_json": json.dumps(activities, ensure_ascii=False),
+                "total_emission": round(rnd.uniform(0.5, 15.0), 2),
+                "points_earned": 0,
+                "created_at": now,
+            }
+
+    total = 0
+    with engine.begin() as conn:
+        batch = []
+        for student_id, count in [(TARGET, days)] + [(f"bench{i}", days // 10) for i in range(others)]:
+            for row in rows(student_id, count):
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    conn.execute(insert(CarbonLog.__table__), batch)
+                    total += len(batch)
+                    batch = []
+        if batch:
+            conn.execute(insert(CarbonLog.__table__), batch)
+            total += len(batch)
+    return total
+
+
+def _legacy(session, today: date):
+    """변경 전 방식: 전체/기간 로그를 모두 읽어 Python에서 집계"""
+    logs = list(session.exec(
+        select(CarbonLog).where(CarbonLog.student_id == TARGET, CarbonLog.source == "carbon_input")
+    ).all())
+    categories = {}
+    for log in logs:
+        for activity in log.get_activities():
+            category = activity.get("category", "기타")
+            categories[category] = categories.get(category, 0) + 1
+    monthly = list(session.exec(
+        select(CarbonLog).where(
+            CarbonLog.student_id == TARGET,
+            CarbonLog.log_date >= today - timedelta(days=30),
+            CarbonLog.log_date <= today,
+        )
+    ).all())
+    buckets = {}
+    for log in monthly:
+        day_key = log.log_date.strftime("%Y-%m-%d")
+        buckets[day_key] = buckets.get(day_key, 0.0) + log.total_emission
+    return len(logs), round(sum(log.total_emission for log in logs), 2), categories, buckets
+
+
+def _aggregated(session, today: date):
+    """carbon_statistics 집계 쿼리"""
+    totals = get_emission_totals(session, TARGET)
+    categories = {item["name"]: item["count"] for item in get_category_activity_counts(session, TARGET)}
+    buckets = get_daily_emission_buckets(session, TARGET, today - timedelta(days=30), today)
+    return totals["total_logs"], round(totals["total_emission"], 2), categories, buckets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="탄소 통계 집계 벤치마크")
+    parser.add_argument("--years", type=int, default=5, help="측정 대상 사용자의 기록 기간(년, 하루 1건)")
+    parser.add_argument("--others", type=int, default=500, help="다른 사용자 수 (각자 기간의 1/10만큼 기록)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db-url", default=None, help="생략 시 임시 SQLite 파일 (기존 데이터는 삭제됨)")
+    args = parser.parse_args()
+
+    db_url = args.db_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(db_url, echo=False)
+
+    started = time.perf_counter()
+    total = _populate(engine, args.years, args.others)
+    print(f"[setup     ] 탄소 기록 {total}건 생성 (대상 사용자 {args.years * 365}건) {time.perf_counter() - started:.1f}s")
+
+    today = date.today()
+    results = {}
+    for label, run in (("legacy", _legacy), ("aggregated", _aggregated)):
+        timings = []
+        for _ in range(args.repeat):
+            with Session(engine) as session:
+                with count_queries(engine) as counter:
+                    started = time.perf_counter()
+                    results[label] = run(session, today)
+                    timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"[{label:10}] 중앙값 {timings[len(timings) // 2] * 1000:.1f}ms, 최대 {timings[-1] * 1000:.1f}ms, SQL {counter.count}회")
+
+    legacy, aggregated = results["legacy"], results["aggregated"]
+    same = (
+        legacy[:3] == aggregated[:3]
+        and legacy[3].keys() == aggregated[3].keys()
+        and all(abs(legacy[3][k] - aggregated[3][k]) < 1e-6 for k in legacy[3])
+    )
+    print(f"[check     ] 결과 일치: {'예' if same else '아니오'}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,482 @@
+"""
+챌린지 규칙 엔진 (Challenge Rules)
+
+챌린지 종류별 분기를 코드에 두지 않고, Challenge 행에 선언한 규칙으로 진행도를 계산합니다.
+
+- 규칙: 트리거 이벤트(trigger_event), 집계 기간(counter_window), 기간 일수(window_days),
+  하루 한 번만 셀지(distinct_days), 목표(goal_value), 보상(reward_points)
+  - daily: 하루 단위 / weekly: 월~일 / rolling: 최근 window_days일 중 기록한 날 수 (하루 한 번만 셈, 최대 62일)
+- 이벤트: 도메인 동작이 쓰기 트랜잭션 안에서 emit()을 호출합니다.
+  활성 규칙은 이벤트 종류별 메모리 인덱스(RuleIndex)로 두므로 해당 이벤트의 규칙 진행도만 조회/갱신합니다.
+  - carbon_logged: 오늘 탄소 입력을 처음 저장 / article_read: 오늘의 아티클 읽기
+  - quiz_solved: 오늘의 OX 퀴즈 정답 / bet_placed: 대항전 베팅
+- 진행도: challengeprogress의 current_value, window_start, day_mask(하루 한 번 규칙의 기록한 날 비트)
+  기간이 바뀌면 다음 이벤트 때 0부터 다시 셉니다. 조회(get_progress)는 같은 계산을 DB에 쓰지 않고 적용합니다.
+- 보상: 목표 달성 시 같은 트랜잭션에서 apply_points(source="challenge") + 챌린지 보상 CarbonLog 기록
+  daily/weekly는 기간당 1회, rolling은 달성 다음 날부터 다시 셉니다.
+
+새 챌린지는 Challenge 행을 추가하면 됩니다 (예: 이번 주 대항전 3회 참여).
+    INSERT INTO challenge (title, type, goal_value, reward_points, is_active, created_at,
+                           trigger_event, counter_window, window_days, distinct_days)
+    VALUES ('이번 주 대항전 3회 참여', 'WEEKLY_BET', 3, 5, TRUE, CURRENT_TIMESTAMP, 'bet_placed', 'weekly', 7, FALSE);
+
+활성 규칙은 RULES_TTL초(기본 60)마다 다시 읽으므로 다른 워커에서 추가한 챌린지도 곧 반영됩니다.
+
+사용 예:
+    python -m ecojourney.service.challenge_rules list
+    python -m ecojourney.service.challenge_rules progress <학번>
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import select
+
+from ..models import CarbonLog, Challenge, ChallengeProgress, StreakRecord
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 종류
+EVENT_CARBON_LOGGED = "carbon_logged"
+EVENT_ARTICLE_READ = "article_read"
+EVENT_QUIZ_SOLVED = "quiz_solved"
+EVENT_BET_PLACED = "bet_placed"
+EVENTS = (EVENT_CARBON_LOGGED, EVENT_ARTICLE_READ, EVENT_QUIZ_SOLVED, EVENT_BET_PLACED)
+
+# 집계 기간
+WINDOW_DAILY = "daily"
+WINDOW_WEEKLY = "weekly"
+WINDOW_ROLLING = "rolling"
+WINDOWS = (WINDOW_DAILY, WINDOW_WEEKLY, WINDOW_ROLLING)
+
+# rolling 규칙 최대 일수 (day_mask 비트 수)
+MAX_ROLLING_DAYS = 62
+
+# 활성 규칙 캐시 유지 시간(초)
+RULES_TTL = float(os.getenv("ECOJOURNEY_CHALLENGE_RULES_TTL", "60"))
+
+# 기본 챌린지 (없으면 생성, 목표/보상/규칙이 다르면 맞춤)
+DEFAULT_CHALLENGES = [
+    {
+        "title": "7일 연속 기록", "type": "WEEKLY_STREAK", "goal_value": 7, "reward_points": 10,
+        "trigger_event": EVENT_CARBON_LOGGED, "counter_window": WINDOW_WEEKLY, "window_days": 7, "distinct_days": True,
+    },
+    {
+        "title": "아티클 읽기", "type": "DAILY_INFO", "goal_value": 1, "reward_points": 1,
+        "trigger_event": EVENT_ARTICLE_READ, "counter_window": WINDOW_DAILY, "window_days": 1, "distinct_days": False,
+    },
+    {
+        "title": "OX 퀴즈 풀기", "type": "DAILY_QUIZ", "goal_value": 1, "reward_points": 1,
+        "trigger_event": EVENT_QUIZ_SOLVED, "counter_window": WINDOW_DAILY, "window_days": 1, "distinct_days": False,
+    },
+]
+
+_RULE_FIELDS = ("goal_value", "reward_points", "type", "trigger_event", "counter_window", "window_days", "distinct_days")
+
+
+@dataclass(frozen=True)
+class ChallengeRule:
+    """활성 챌린지 1개의 규칙"""
+    id: int
+    title: str
+    type: str
+    trigger_event: str
+    counter_window: str
+    window_days: int
+    distinct_days: bool
+    goal_value: int
+    reward_points: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "type": self.type,
+            "trigger_event": self.trigger_event,
+            "counter_window": self.counter_window,
+            "goal_value": self.goal_value,
+            "reward_points": self.reward_points,
+        }
+
+
+@dataclass
+class RuleIndex:
+    """활성 규칙 인덱스 (이벤트 종류 → 규칙)"""
+    rules: Tuple[ChallengeRule, ...] = ()
+    by_event: Dict[str, Tuple[ChallengeRule, ...]] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    def for_event(self, event: str) -> Tuple[ChallengeRule, ...]:
+        return self.by_event.get(event, ())
+
+
+def _to_rule(challenge: Challenge) -> Optional[ChallengeRule]:
+    """Challenge 행 → 규칙 (규칙이 잘못되었으면 None)"""
+    window = challenge.counter_window or WINDOW_DAILY
+    window_days = challenge.window_days or 1
+    if challenge.trigger_event not in EVENTS or window not in WINDOWS:
+        logger.warning(f"챌린지 규칙 무시 (이벤트/기간 오류): {challenge.id} {challenge.title}")
+        return None
+    if window == WINDOW_ROLLING and not 1 <= window_days <= MAX_ROLLING_DAYS:
+        logger.warning(f"챌린지 규칙 무시 (rolling 기간은 1~{MAX_ROLLING_DAYS}일): {challenge.id} {challenge.title}")
+        return None
+    return ChallengeRule(
+        id=challenge.id,
+        title=challenge.title,
+        type=challenge.type,
+        trigger_event=challenge.trigger_event,
+        counter_window=window,
+        window_days=window_days,
+        distinct_days=bool(challenge.distinct_days) or window == WINDOW_ROLLING,
+        goal_value=challenge.goal_value,
+        reward_points=challenge.reward_points,
+    )
+
+
+def load_rule_index(session) -> RuleIndex:
+    """활성 챌린지로 규칙 인덱스 생성 (쿼리 1회)"""
+    challenges = session.execute(
+        select(Challenge).where(Challenge.is_active == True).order_by(Challenge.id)
+    ).scalars().all()
+    rules = tuple(rule for rule in map(_to_rule, challenges) if rule is not None)
+    by_event: Dict[str, List[ChallengeRule]] = {}
+    for rule in rules:
+        by_event.setdefault(rule.trigger_event, []).append(rule)
+    return RuleIndex(
+        rules=rules,
+        by_event={event: tuple(event_rules) for event, event_rules in by_event.items()},
+        loaded_at=time.monotonic(),
+    )
+
+
+_index: Optional[RuleIndex] = None
+_index_lock = threading.Lock()
+_defaults_synced = False
+
+
+def get_rule_index(session) -> RuleIndex:
+    """캐시된 규칙 인덱스 (RULES_TTL이 지났으면 주어진 세션으로 다시 읽음)"""
+    global _index
+    index = _index
+    if index is None or time.monotonic() - index.loaded_at > RULES_TTL:
+        index = load_rule_index(session)
+        with _index_lock:
+            _index = index
+    return index
+
+
+def invalidate_rule_index() -> None:
+    """규칙 캐시 비우기 (챌린지 추가/수정 직후 호출)"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def sync_default_challenges(session) -> int:
+    """
+    기본 챌린지 생성/정정 (커밋은 호출자가 수행)
+
+    Returns:
+        생성/수정한 챌린지 수
+    """
+    titles = [item["title"] for item in DEFAULT_CHALLENGES]
+    existing = {
+        challenge.title: challenge
+        for challenge in session.execute(select(Challenge).where(Challenge.title.in_(titles))).scalars()
+    }
+    changed = 0
+    for item in DEFAULT_CHALLENGES:
+        challenge = existing.get(item["title"])
+        if challenge is None:
+            session.add(Challenge(**item, is_active=True, created_at=datetime.now()))
+            changed += 1
+        elif any(getattr(challenge, name) != item[name] for name in _RULE_FIELDS):
+            for name in _RULE_FIELDS:
+                setattr(challenge, name, item[name])
+            session.add(challenge)
+            changed += 1
+    return changed
+
+
+def ensure_default_challenges(engine) -> None:
+    """프로세스당 한 번 기본 챌린지를 맞추고 규칙 캐시를 비움"""
+    global _defaults_synced
+    if _defaults_synced:
+        return
+    from sqlmodel import Session
+
+    with Session(engine) as session:
+        if sync_default_challenges(session):
+            session.commit()
+            invalidate_rule_index()
+    _defaults_synced = True
+
+
+def window_start_of(rule: ChallengeRule, day: date) -> date:
+    """daily/weekly 규칙에서 날짜가 속한 기간의 시작일"""
+    if rule.counter_window == WINDOW_WEEKLY:
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def _rolling_mask(rule: ChallengeRule, mask: int, anchor: date, day: date) -> int:
+    """rolling 규칙의 day_mask를 anchor 기준에서 day 기준으로 옮김 (기간을 벗어난 날은 버림)"""
+    shift = (day - anchor).days
+    if shift >= rule.window_days:
+        return 0
+    return (mask << shift) & ((1 << rule.window_days) - 1)
+
+
+def _current(rule: ChallengeRule, progress: Optional[ChallengeProgress], today: date) -> Tuple[int, bool, int]:
+    """오늘 기준 (진행값, 완료 여부, day_mask) (DB에 쓰지 않음)"""
+    if progress is None or progress.window_start is None:
+        return 0, False, 0
+    if rule.counter_window == WINDOW_ROLLING:
+        if progress.window_start > today:
+            return 0, False, 0
+        if progress.is_completed:
+            if today > progress.window_start:
+                return 0, False, 0  # 달성 다음 날부터 다시 셈 (_advance와 같음)
+            return rule.goal_value, True, progress.day_mask
+        mask = _rolling_mask(rule, progress.day_mask, progress.window_start, today)
+        return bin(mask).count("1"), False, mask
+    if progress.window_start != window_start_of(rule, today):
+        return 0, False, 0
+    return progress.current_value, progress.is_completed, progress.day_mask
+
+
+def _advance(rule: ChallengeRule, progress: ChallengeProgress, day: date, amount: int) -> bool:
+    """
+    이벤트 1건을 진행도에 반영
+
+    Returns:
+        이번 이벤트로 목표를 달성했으면 True
+    """
+    if rule.counter_window == WINDOW_ROLLING:
+        anchor = progress.window_start
+        if anchor is None or (progress.is_completed and day > anchor):
+            # 첫 이벤트 또는 달성 다음 날부터 다시 셈
+            progress.current_value, progress.is_completed, progress.completed_at = 0, False, None
+            progress.day_mask, progress.window_start = 0, day
+            anchor = day
+        if progress.is_completed:
+            return False
+        if day > anchor:
+            progress.day_mask = _rolling_mask(rule, progress.day_mask, anchor, day)
+            progress.window_start = anchor = day
+        offset = (anchor - day).days
+        if offset >= rule.window_days:
+            return False
+        progress.day_mask |= 1 << offset
+        progress.current_value = bin(progress.day_mask).count("1")
+    else:
+        start = window_start_of(rule, day)
+        if progress.window_start is None or progress.window_start < start:
+            progress.window_start = start
+            progress.current_value, progress.is_completed, progress.completed_at = 0, False, None
+            progress.day_mask = 0
+        elif progress.window_start > start:
+            return False  # 지난 기간의 이벤트
+        if progress.is_completed:
+            return False
+        if rule.distinct_days:
+            bit = 1 << (day - start).days
+            if progress.day_mask & bit:
+                return False
+            progress.day_mask |= bit
+            progress.current_value = bin(progress.day_mask).count("1")
+        else:
+            progress.current_value += amount
+
+    if progress.current_value >= rule.goal_value:
+        progress.is_completed = True
+        progress.completed_at = datetime.now()
+        return True
+    return False
+
+
+def _grant_reward(session, student_id: str, rule: ChallengeRule, day: date) -> Optional[int]:
+    """달성 보상 지급 (원장 + 챌린지 보상 로그, 결과: 지급 후 잔액)"""
+    from .points_ledger import apply_points
+
+    balance = apply_points(
+        session,
+        student_id,
+        rule.reward_points,
+        source="challenge",
+        description=f"챌린지 보상: {rule.title}",
+    )
+    session.add(
+        CarbonLog(
+            student_id=student_id,
+            log_date=day,
+            total_emission=0.0,
+            activities_json="[]",
+            points_earned=rule.reward_points,
+            source="challenge",
+            ai_feedback=f"챌린지 보상: {rule.title}",
+            created_at=datetime.now(),
+        )
+    )
+    return balance
+
+
+def emit(session, student_id: str, event: str, on: Optional[date] = None, amount: int = 1) -> Dict[str, Any]:
+    """
+    도메인 이벤트를 규칙에 반영 (쓰기 트랜잭션 안에서 호출, 커밋은 호출자가 수행)
+
+    해당 이벤트의 규칙이 없으면 쿼리 없이 반환하고, 있으면 그 규칙들의 진행도만 1회 조회합니다.
+
+    Returns:
+        {"completed": [달성한 챌린지 제목, ...], "balance": 보상 지급 후 잔액 (지급 없으면 None)}
+    """
+    result: Dict[str, Any] = {"completed": [], "balance": None}
+    rules = get_rule_index(session).for_event(event)
+    if not rules:
+        return result
+
+    day = on or date.today()
+    progress_by_rule = {
+        progress.challenge_id: progress
+        for progress in session.execute(
+            select(ChallengeProgress).where(
+                ChallengeProgress.student_id == student_id,
+                ChallengeProgress.challenge_id.in_([rule.id for rule in rules]),
+            )
+        ).scalars()
+    }
+    now = datetime.now()
+    for rule in rules:
+        progress = progress_by_rule.get(rule.id)
+        if progress is None:
+            progress = ChallengeProgress(challenge_id=rule.id, student_id=student_id, current_value=0, is_completed=False)
+        if _advance(rule, progress, day, amount):
+            result["completed"].append(rule.title)
+            result["balance"] = _grant_reward(session, student_id, rule, day)
+        progress.last_updated = now
+        session.add(progress)
+    return result
+
+
+def get_progress(session, student_id: str, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    활성 챌린지별 오늘 기준 진행도 (진행도 조회 1회, 규칙은 캐시, DB에 쓰지 않음)
+
+    Returns:
+        [{"challenge_id", "title", "type", "trigger_event", "counter_window", "goal_value", "current_value",
+          "progress_percent", "is_completed", "reward_points"}, ...]
+    """
+    today = today or date.today()
+    rules = get_rule_index(session).rules
+    progress_by_rule = {
+        progress.challenge_id: progress
+        for progress in session.execute(
+            select(ChallengeProgress).where(ChallengeProgress.student_id == student_id)
+        ).scalars()
+    }
+    result = []
+    for rule in rules:
+        current_value, is_completed, _ = _current(rule, progress_by_rule.get(rule.id), today)
+        result.append({
+            "challenge_id": rule.id,
+            "title": rule.title,
+            "type": rule.type,
+            "trigger_event": rule.trigger_event,
+            "counter_window": rule.counter_window,
+            "goal_value": rule.goal_value,
+            "current_value": current_value,
+            "progress_percent": min(current_value / rule.goal_value * 100, 100) if rule.goal_value > 0 else 0,
+            "is_completed": is_completed,
+            "reward_points": rule.reward_points,
+        })
+    return result
+
+
+def migrate_progress_counters(session, today: Optional[date] = None) -> int:
+    """
+    규칙 도입 전 진행도에 집계 기간을 채움 (데이터 보정용, 커밋은 호출자가 수행)
+
+    - daily/weekly: last_updated가 속한 기간을 window_start로 설정 (이번 기간 기록이면 진행값 유지)
+    - 하루 한 번 세는 weekly carbon_logged 규칙: 이번 주 연속 기록(streakrecord) 요일로 진행값을 맞춤
+
+    Returns:
+        수정한 진행도 행 수
+    """
+    today = today or date.today()
+    rules = {rule.id: rule for rule in load_rule_index(session).rules}
+    changed = 0
+    for progress in session.execute(
+        select(ChallengeProgress).where(ChallengeProgress.window_start.is_(None))
+    ).scalars():
+        rule = rules.get(progress.challenge_id)
+        if rule is None or rule.counter_window == WINDOW_ROLLING or progress.last_updated is None:
+            continue
+        progress.window_start = window_start_of(rule, progress.last_updated.date())
+        session.add(progress)
+        changed += 1
+
+    this_monday = today - timedelta(days=today.weekday())
+    weekly_log_rules = [
+        rule for rule in rules.values()
+        if rule.trigger_event == EVENT_CARBON_LOGGED and rule.counter_window == WINDOW_WEEKLY and rule.distinct_days
+    ]
+    if weekly_log_rules:
+        masks = dict(
+            session.execute(
+                select(StreakRecord.student_id, StreakRecord.day_mask).where(StreakRecord.week_start == this_monday)
+            ).all()
+        )
+        existing = {
+            (progress.challenge_id, progress.student_id): progress
+            for progress in session.execute(
+                select(ChallengeProgress).where(
+                    ChallengeProgress.challenge_id.in_([rule.id for rule in weekly_log_rules])
+                )
+            ).scalars()
+        }
+        now = datetime.now()
+        for rule in weekly_log_rules:
+            for student_id, mask in masks.items():
+                progress = existing.get((rule.id, student_id))
+                if progress is None:
+                    progress = ChallengeProgress(challenge_id=rule.id, student_id=student_id, last_updated=now)
+                elif progress.window_start == this_monday and progress.is_completed:
+                    continue
+                progress.window_start = this_monday
+                progress.day_mask = mask
+                progress.current_value = bin(mask).count("1")
+                progress.is_completed = progress.current_value >= rule.goal_value
+                progress.completed_at = now if progress.is_completed else None
+                session.add(progress)
+                changed += 1
+    return changed
+
+
+if __name__ == "__main__":
+    import sys
+    from sqlmodel import Session
+    from ..db.write_queue import create_writer_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    engine = create_writer_engine()
+    if command == "list":
+        with Session(engine) as session:
+            index = load_rule_index(session)
+        for rule in index.rules:
+            days = f" {rule.window_days}일" if rule.counter_window == WINDOW_ROLLING else ""
+            once = ", 하루 1회" if rule.distinct_days else ""
+            print(f"{rule.id:>3}. {rule.title}: {rule.trigger_event} → {rule.counter_window}{days}{once}, 목표 {rule.goal_value}, 보상 {rule.reward_points}점")
+    elif command == "progress" and len(sys.argv) > 2:
+        with Session(engine) as session:
+            progress = get_progress(session, sys.argv[2])
+        for item in progress:
+            status = "완료" if item["is_completed"] else "진행중"
+            print(f"{item['title']}: {item['current_value']} / {item['goal_value']} ({status})")
+    else:
+        print("사용법: python -m ecojourney.service.challenge_rules [list|progress 학번]")
+        sys.exit(1)
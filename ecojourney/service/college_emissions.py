@@ -0,0 +1,291 @@
+"""
+단과대 탄소 배출 집계 (College Emissions)
+
+대항전 점수는 베팅 합계라 실제로 어느 단과대가 적게 배출하는지 알 수 없으므로
+탄소 입력을 단과대/일 단위로 집계해 순위와 추이를 제공합니다.
+
+- 집계: collegeemissiondaily 테이블에 (날짜, 단과대)별 배출량 합계(g)와 입력한 사용자 수를 둡니다.
+- 증분 갱신: 탄소 입력(CarbonLog, source='carbon_input')이 flush될 때(after_flush) 같은 트랜잭션에서
+  UPSERT합니다. 같은 날 기록을 덮어쓰면 이전 배출량을 빼고 새 배출량을 더하며 사용자 수는 그대로입니다.
+  사용자의 단과대는 flush마다 user 테이블에서 한 번에 조회합니다.
+  훅은 register_hooks()로 등록합니다 (앱 설정과 엔진 생성 시 db.session_hooks가 호출).
+- 조회: 순위/추이는 집계 행만 읽으므로 (단과대 수 × 일수)에 비례하며 로그 양과 무관합니다.
+  1인당 평균 = 기간 배출량 합계 / 기간 입력 횟수(사용자·일), 낮을수록 높은 순위입니다.
+
+사용 예:
+    python -m ecojourney.service.college_emissions leaderboard 7
+    python -m ecojourney.service.college_emissions trend 공과대학 14
+    python -m ecojourney.service.college_emissions rebuild     # 남아 있는 CarbonLog로 재계산 (점검용)
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from ..models import CarbonLog, CollegeEmissionDaily, User
+
+logger = logging.getLogger(__name__)
+
+# 순위/추이 기본 기간(일)
+DEFAULT_LEADERBOARD_DAYS = 7
+DEFAULT_TREND_DAYS = 14
+
+_daily = CollegeEmissionDaily.__table__
+_user = User.__table__
+
+
+def emission_grams(total_emission: Optional[float]) -> int:
+    """배출량(kg) → 집계 단위(g)"""
+    return round((total_emission or 0.0) * 1000)
+
+
+def _carbon_input(obj, previous: bool = False) -> Optional[Tuple[str, date, int]]:
+    """탄소 입력 1건의 (학번, 날짜, 배출량 g), 탄소 입력이 아니면 None (previous=True이면 flush 전 DB 값)"""
+    if previous:
+        state = inspect(obj)
+
+        def value(attr):
+            history = state.attrs[attr].history
+            return history.deleted[0] if history.deleted else getattr(obj, attr)
+    else:
+        def value(attr):
+            return getattr(obj, attr)
+
+    if value("source") != "carbon_input" or value("log_date") is None:
+        return None
+    return value("student_id"), value("log_date"), emission_grams(value("total_emission"))
+
+
+def record_emissions(session, contributions: List[Tuple[int, Tuple[str, date, int]]]) -> None:
+    """
+    탄소 입력 증감을 단과대 일별 집계에 반영 (단과대 조회 1회 + UPSERT 1회, 같은 트랜잭션)
+
+    Args:
+        contributions: [(부호, (학번, 날짜, 배출량 g)), ...] (추가 +1, 삭제 -1, 수정은 이전 값 -1 + 새 값 +1)
+    """
+    connection = session.connection()
+    colleges = dict(
+        connection.execute(
+            select(_user.c.student_id, _user.c.college).where(
+                _user.c.student_id.in_({student_id for _, (student_id, _, _) in contributions})
+            )
+        ).all()
+    )
+
+    deltas: Dict[Tuple[date, str], List[int]] = defaultdict(lambda: [0, 0])
+    for sign, (student_id, log_date, grams) in contributions:
+        college = colleges.get(student_id)
+        if not college:
+            continue
+        delta = deltas[(log_date, college)]
+        delta[0] += sign * grams
+        delta[1] += sign
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+    now = datetime.now()
+    statement = upsert(_daily).values([
+        {"log_date": log_date, "college": college, "emission_g": grams, "active_users": users, "updated_at": now}
+        for (log_date, college), (grams, users) in deltas.items()
+    ])
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[_daily.c.log_date, _daily.c.college],
+            set_={
+                "emission_g": _daily.c.emission_g + statement.excluded.emission_g,
+                "active_users": _daily.c.active_users + statement.excluded.active_users,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    )
+
+
+def _aggregate_emissions(session, flush_context) -> None:
+    """flush된 탄소 입력 추가/수정/삭제를 단과대 일별 집계에 반영"""
+    contributions = []
+    for obj in session.new:
+        if isinstance(obj, CarbonLog):
+            contributions.append((1, _carbon_input(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, CarbonLog) and session.is_modified(obj):
+            contributions.append((-1, _carbon_input(obj, previous=True)))
+            contributions.append((1, _carbon_input(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, CarbonLog):
+            contributions.append((-1, _carbon_input(obj, previous=True)))
+
+    contributions = [(sign, value) for sign, value in contributions if value is not None]
+    if contributions:
+        record_emissions(session, contributions)
+
+
+def register_hooks() -> None:
+    """Session after_flush 훅 등록 (db.session_hooks에서 호출, 여러 번 호출해도 한 번만 등록)"""
+    if not event.contains(Session, "after_flush", _aggregate_emissions):
+        event.listen(Session, "after_flush", _aggregate_emissions)
+
+
+def _per_capita_kg(grams: int, users: int) -> float:
+    return round(grams / users / 1000, 2) if users else 0.0
+
+
+def get_college_leaderboard(
+    session,
+    end: Optional[date] = None,
+    days: int = DEFAULT_LEADERBOARD_DAYS,
+) -> List[Dict[str, Any]]:
+    """
+    기간 내 단과대별 1인당 평균 배출량 순위 (집계 행만 조회, 쿼리 1회)
+
+    Args:
+        end: 마지막 날 (포함, 기본: 오늘)
+        days: 기간(일)
+
+    Returns:
+        [{"rank", "college", "per_capita"(kg/인·일), "total_emission"(kg), "active_users"(사용자·일)}, ...]
+        (1인당 평균이 낮은 순, 입력이 없는 단과대는 제외)
+    """
+    end = end or date.today()
+    rows = session.execute(
+        select(
+            _daily.c.college,
+            func.sum(_daily.c.emission_g),
+            func.sum(_daily.c.active_users),
+        )
+        .where(_daily.c.log_date > end - timedelta(days=days), _daily.c.log_date <= end)
+        .group_by(_daily.c.college)
+    ).all()
+    rows = sorted(
+        ((college, int(grams), int(users)) for college, grams, users in rows if users),
+        key=lambda r: (r[1] / r[2], r[0]),
+    )
+    return [
+        {
+            "rank": rank,
+            "college": college,
+            "per_capita": _per_capita_kg(grams, users),
+            "total_emission": round(grams / 1000, 1),
+            "active_users": users,
+        }
+        for rank, (college, grams, users) in enumerate(rows, start=1)
+    ]
+
+
+def get_college_trend(
+    session,
+    college: str,
+    end: Optional[date] = None,
+    days: int = DEFAULT_TREND_DAYS,
+) -> List[Dict[str, Any]]:
+    """
+    단과대 일별 추이 (집계 행만 조회, 쿼리 1회, 입력이 없는 날은 0)
+
+    Returns:
+        [{"date": "YYYY-MM-DD", "total_emission"(kg), "active_users", "per_capita"(kg/인)}, ...] (날짜 오름차순)
+    """
+    end = end or date.today()
+    start = end - timedelta(days=days - 1)
+    by_date = {
+        log_date: (int(grams), int(users))
+        for log_date, grams, users in session.execute(
+            select(_daily.c.log_date, _daily.c.emission_g, _daily.c.active_users).where(
+                _daily.c.log_date >= start, _daily.c.log_date <= end, _daily.c.college == college
+            )
+        )
+    }
+    trend = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        grams, users = by_date.get(day, (0, 0))
+        trend.append({
+            "date": day.isoformat(),
+            "total_emission": round(grams / 1000, 1),
+            "active_users": users,
+            "per_capita": _per_capita_kg(grams, users),
+        })
+    return trend
+
+
+def rebuild_emissions(session) -> int:
+    """
+    남아 있는 CarbonLog로 단과대 일별 집계 재계산 (백필/점검용, 커밋은 호출자가 수행)
+
+    보관(archive)되어 CarbonLog에서 삭제된 날짜의 집계는 그대로 둡니다.
+
+    Returns:
+        저장된 집계 행 수
+    """
+    since = session.execute(
+        select(func.min(CarbonLog.log_date)).where(CarbonLog.source == "carbon_input")
+    ).scalar()
+    if since is None:
+        return 0
+
+    totals = session.execute(
+        select(
+            CarbonLog.log_date,
+            _user.c.college,
+            CarbonLog.total_emission,
+        )
+        .join(_user, _user.c.student_id == CarbonLog.student_id)
+        .where(CarbonLog.source == "carbon_input")
+    ).all()
+    aggregates: Dict[Tuple[date, str], List[int]] = defaultdict(lambda: [0, 0])
+    for log_date, college, total_emission in totals:
+        if not college:
+            continue
+        aggregate = aggregates[(log_date, college)]
+        aggregate[0] += emission_grams(total_emission)
+        aggregate[1] += 1
+
+    session.execute(delete(_daily).where(_daily.c.log_date >= since))
+    now = datetime.now()
+    if aggregates:
+        session.execute(
+            insert(_daily),
+            [
+                {"log_date": log_date, "college": college, "emission_g": grams, "active_users": users, "updated_at": now}
+                for (log_date, college), (grams, users) in aggregates.items()
+            ],
+        )
+    return len(aggregates)
+
+
+if __name__ == "__main__":
+    import sys
+    from sqlmodel import Session as SQLModelSession
+    from ..db.write_queue import create_writer_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "leaderboard"
+    engine = create_writer_engine()
+    if command == "leaderboard":
+        days = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LEADERBOARD_DAYS
+        with SQLModelSession(engine) as session:
+            ranking = get_college_leaderboard(session, days=days)
+        print(f"최근 {days}일 단과대 1인당 평균 배출량 순위")
+        for r in ranking:
+            print(f"{r['rank']:>3}. {r['college']}: {r['per_capita']}kg (입력 {r['active_users']}회, 합계 {r['total_emission']}kg)")
+    elif command == "trend" and len(sys.argv) > 2:
+        days = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_TREND_DAYS
+        with SQLModelSession(engine) as session:
+            trend = get_college_trend(session, sys.argv[2], days=days)
+        for point in trend:
+            print(f"{point['date']}: 1인당 {point['per_capita']}kg ({point['active_users']}명, 합계 {point['total_emission']}kg)")
+    elif command == "rebuild":
+        with SQLModelSession(engine) as session:
+            rows = rebuild_emissions(session)
+            session.commit()
+        print(f"✅ 단과대 일별 배출량 집계 {rows}행 재계산")
+    else:
+        print("사용법: python -m ecojourney.service.college_emissions [leaderboard [일수]|trend 단과대 [일수]|rebuild]")
+        sys.exit(1)
@@ -0,0 +1,219 @@
+"""
+오늘의 콘텐츠 (Daily Content)
+
+정보 글 페이지의 오늘의 아티클과 OX 퀴즈를 데이터 파일 카탈로그에서 고릅니다.
+
+- 카탈로그: ecojourney/data/daily_content.json (ECOJOURNEY_DAILY_CONTENT_PATH로 다른 파일 지정 가능)
+  {"articles": [{"id", "title", "body"}, ...], "quizzes": [{"id", "question", "answer": "O"|"X"}, ...]}
+  프로세스당 한 번 읽고 검증합니다 (id 중복, 빈 값, 잘못된 정답은 제외하고 경고).
+- 순환 일정: 항목 수 n개를 한 주기(n일)로 보고, 주기마다 고정 시드로 섞은 순서를 미리 계산합니다.
+  한 주기 안에서는 같은 항목이 다시 나오지 않고, 주기 경계에서도 최소 간격(MIN_REPEAT_GAP일, 항목 수의 1/3 이하) 안에는 다시 나오지 않습니다.
+  시드가 날짜/주기로만 정해지므로 여러 워커가 같은 날 같은 항목을 고릅니다.
+  주기 순서는 주기가 바뀔 때만 다시 계산하므로 항목이 수천 개여도 하루 조회는 O(1)입니다.
+- 오늘의 선택: 프로세스 전체에서 하나를 캐시해 모든 세션이 공유하고, 날짜가 바뀌면(자정) 다시 고릅니다.
+
+사용 예:
+    python -m ecojourney.service.daily_content check          # 카탈로그 검증
+    python -m ecojourney.service.daily_content schedule 14    # 오늘부터 14일 일정
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import random
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 기본 카탈로그 파일
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "daily_content.json"
+
+# 순환 일정 기준일 (이 날부터 주기를 셈)
+SCHEDULE_EPOCH = date(2025, 1, 1)
+
+# 주기 경계에서 같은 항목이 다시 나오기까지 최소 간격(일, 항목 수의 1/3 이하로 줄어듦)
+MIN_REPEAT_GAP = 7
+
+QUIZ_ANSWERS = ("O", "X")
+
+
+@dataclass(frozen=True)
+class ContentCatalog:
+    """아티클/퀴즈 카탈로그"""
+    articles: Tuple[Dict[str, str], ...]
+    quizzes: Tuple[Dict[str, str], ...]
+
+
+def _valid_items(items: List[Dict[str, Any]], kind: str, fields: Tuple[str, ...]) -> Tuple[Dict[str, str], ...]:
+    """필수 값이 있고 id가 겹치지 않는 항목만 남김"""
+    seen = set()
+    valid = []
+    for item in items:
+        item_id = str(item.get("id", "")).strip()
+        values = {name: str(item.get(name, "")).strip() for name in fields}
+        if not item_id or not all(values.values()):
+            logger.warning(f"오늘의 콘텐츠 {kind} 항목 제외 (빈 값): {item_id or item}")
+            continue
+        if item_id in seen:
+            logger.warning(f"오늘의 콘텐츠 {kind} 항목 제외 (id 중복): {item_id}")
+            continue
+        if kind == "quizzes" and values["answer"] not in QUIZ_ANSWERS:
+            logger.warning(f"오늘의 콘텐츠 퀴즈 제외 (정답은 O/X): {item_id}")
+            continue
+        seen.add(item_id)
+        valid.append({"id": item_id, **values})
+    return tuple(valid)
+
+
+def load_catalog(path: Optional[Path] = None) -> ContentCatalog:
+    """카탈로그 파일 읽기 + 검증 (아티클/퀴즈가 하나도 없으면 ValueError)"""
+    path = Path(path or os.getenv("ECOJOURNEY_DAILY_CONTENT_PATH") or DEFAULT_CATALOG_PATH)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    catalog = ContentCatalog(
+        articles=_valid_items(data.get("articles", []), "articles", ("title", "body")),
+        quizzes=_valid_items(data.get("quizzes", []), "quizzes", ("question", "answer")),
+    )
+    if not catalog.articles or not catalog.quizzes:
+        raise ValueError(f"오늘의 콘텐츠 카탈로그에 아티클과 퀴즈가 모두 있어야 합니다: {path}")
+    return catalog
+
+
+class RotationSchedule:
+    """
+    n개 항목의 순환 일정 (주기마다 섞은 순서, 주기 안에서 반복 없음)
+
+    순서는 (이름, 주기 번호)로 시드를 정하므로 프로세스와 무관하게 같습니다.
+    """
+
+    def __init__(self, size: int, name: str, epoch: date = SCHEDULE_EPOCH):
+        self.size = size
+        self.name = name
+        self.epoch = epoch
+        self._orders: Dict[int, List[int]] = {}
+
+    def _shuffled(self, cycle: int) -> List[int]:
+        order = list(range(self.size))
+        if self.size > 2:  # 2개 이하는 번갈아 내면 반복이 없음
+            random.Random(f"{self.name}:{cycle}").shuffle(order)
+        return order
+
+    def order(self, cycle: int) -> List[int]:
+        """
+        주기의 항목 순서 (이전 주기 끝부분의 항목이 다음 주기 앞부분에 다시 나오지 않음)
+
+        앞부분(gap개)에 이전 주기 마지막 gap개 항목이 있으면 가운데 구간의 항목과 맞바꿉니다.
+        gap ≤ n/3이라 가운데 구간에 바꿀 항목이 항상 있고, 끝부분은 섞은 결과 그대로이므로
+        이전 주기를 다시 계산하지 않고 그 주기의 섞은 결과만 봅니다. 최근 2개 주기만 보관합니다.
+        """
+        order = self._orders.get(cycle)
+        if order is None:
+            order = self._shuffled(cycle)
+            gap = min(MIN_REPEAT_GAP, self.size // 3)
+            if gap:
+                previous_tail = set(self._shuffled(cycle - 1)[-gap:])
+                middle = (i for i in range(gap, self.size - gap) if order[i] not in previous_tail)
+                for head in range(gap):
+                    if order[head] in previous_tail:
+                        swap = next(middle)
+                        order[head], order[swap] = order[swap], order[head]
+            self._orders[cycle] = order
+            for old in [c for c in self._orders if c < cycle - 1]:
+                del self._orders[old]
+        return order
+
+    def index_for(self, day: date) -> int:
+        """날짜의 항목 번호"""
+        cycle, position = divmod((day - self.epoch).days, self.size)
+        return self.order(cycle)[position]
+
+
+class DailyContentProvider:
+    """카탈로그 + 순환 일정 + 오늘의 선택 캐시 (프로세스 전체 공유)"""
+
+    def __init__(self, catalog: ContentCatalog):
+        self.catalog = catalog
+        self.article_schedule = RotationSchedule(len(catalog.articles), "article")
+        self.quiz_schedule = RotationSchedule(len(catalog.quizzes), "quiz")
+        self._lock = threading.Lock()
+        self._cached: Optional[Tuple[date, Dict[str, Any]]] = None
+
+    def select(self, day: date) -> Dict[str, Any]:
+        """날짜의 아티클과 퀴즈 (캐시 없이 계산)"""
+        article = self.catalog.articles[self.article_schedule.index_for(day)]
+        quiz = self.catalog.quizzes[self.quiz_schedule.index_for(day)]
+        return {
+            "date": day,
+            "article_id": article["id"],
+            "info_title": article["title"],
+            "info_body": article["body"],
+            "quiz_id": quiz["id"],
+            "quiz_question": quiz["question"],
+            "quiz_answer": quiz["answer"],
+        }
+
+    def today(self, day: Optional[date] = None) -> Dict[str, Any]:
+        """오늘의 선택 (날짜가 바뀔 때까지 모든 세션이 같은 값을 공유)"""
+        day = day or date.today()
+        cached = self._cached
+        if cached is not None and cached[0] == day:
+            return cached[1]
+        with self._lock:
+            if self._cached is None or self._cached[0] != day:
+                self._cached = (day, self.select(day))
+            return self._cached[1]
+
+
+_provider: Optional[DailyContentProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> DailyContentProvider:
+    """카탈로그를 한 번 읽어 만든 공유 제공자"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = DailyContentProvider(load_catalog())
+    return _provider
+
+
+def reload_catalog(path: Optional[Path] = None) -> DailyContentProvider:
+    """카탈로그 다시 읽기 (파일 교체 후 호출, 오늘의 선택도 새로 계산)"""
+    global _provider
+    provider = DailyContentProvider(load_catalog(path))
+    with _provider_lock:
+        _provider = provider
+    return provider
+
+
+def get_daily_content(day: Optional[date] = None) -> Dict[str, Any]:
+    """
+    오늘의 아티클과 OX 퀴즈
+
+    Returns:
+        {"date", "article_id", "info_title", "info_body", "quiz_id", "quiz_question", "quiz_answer"}
+    """
+    return get_provider().today(day)
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    if command == "check":
+        catalog = load_catalog()
+        print(f"✅ 아티클 {len(catalog.articles)}개, 퀴즈 {len(catalog.quizzes)}개")
+    elif command == "schedule":
+        days = int(sys.argv[2]) if len(sys.argv) > 2 else 14
+        provider = get_provider()
+        for offset in range(days):
+            content = provider.select(date.today() + timedelta(days=offset))
+            print(f"{content['date']}: [{content['article_id']}] {content['info_title']} / [{content['quiz_id']}] {content['quiz_question']} ({content['quiz_answer']})")
+    else:
+        print("사용법: python -m ecojourney.service.daily_content [check|schedule [일수]]")
+        sys.exit(1)
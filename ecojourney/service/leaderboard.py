@@ -0,0 +1,741 @@
+"""
+개인 포인트 리더보드 (Leaderboard)
+
+사용자별 current_points를 정렬된 구조로 유지해 상위 N명, 내 순위, 내 주변 순위를
+DB 정렬(ORDER BY current_points) 없이 O(log n)으로 조회합니다.
+
+- 정렬 기준: 포인트 내림차순, 동점이면 학번 오름차순 (순위는 1부터, 동점자도 서로 다른 순위)
+- 갱신: 포인트를 바꾸는 쓰기(apply_points, 대결 보상 지급, 회원가입)가 stage_points()로
+  변동 후 잔액을 세션에 기록해 두고, 트랜잭션 commit 이후 리더보드에 반영합니다.
+  롤백되거나 쓰기 큐에서 실패한 작업(SAVEPOINT 롤백)의 값은 버려집니다.
+  Redis 백엔드는 commit 경로(이벤트 루프의 run_sync 포함)에서 네트워크 호출을 하지 않도록
+  전용 스레드가 모아서 반영합니다 (같은 학번은 마지막 값만, flush_published()로 반영 대기).
+- 재구성: 앱 시작 시 user 테이블로 다시 만들고, 주기마다(기본 600초) DB와 비교해 어긋난 항목을 고칩니다.
+  리더보드가 비어 있으면 첫 조회 때 만듭니다.
+- 여러 리더보드: 전체 기간 포인트(ALL_TIME) 외에 이름별 리더보드를 둘 수 있습니다
+  (주간/월간 랭킹은 service/ranking_windows.py, 이름 예: "points:W2026-10-19").
+
+백엔드 (프로세스당 1개):
+- ECOJOURNEY_LEADERBOARD_REDIS_URL → rxconfig.redis_url(REFLEX_REDIS_URL) 순으로 Redis URL이 있으면
+  Redis sorted set (여러 워커가 공유, score = -포인트라 동점은 학번 오름차순, 키: ecojourney:leaderboard:<이름>)
+- 없으면 프로세스 메모리의 인덱스 skip list (단일 워커용, 다른 워커의 변경은 주기 점검 때 반영)
+
+리더보드 오류는 로그만 남기며 포인트 쓰기를 실패시키지 않습니다.
+
+사용 예:
+    python -m ecojourney.service.leaderboard top 20
+    python -m ecojourney.service.leaderboard rank 2024123456
+    python -m ecojourney.service.leaderboard check          # DB와 비교 (불일치 항목 출력)
+    python -m ecojourney.service.leaderboard rebuild
+    python -m ecojourney.service.leaderboard bench 100000
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import atexit
+import logging
+import os
+import random
+import threading
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from ..models import User
+
+logger = logging.getLogger(__name__)
+
+# 주기 점검 간격(초)
+DEFAULT_CHECK_INTERVAL = 600
+KEY_PREFIX = "ecojourney:leaderboard:"
+
+# 전체 기간 포인트 리더보드 이름
+ALL_TIME = "points"
+
+# skip list 최대 높이 / 다음 층으로 올라갈 확률 (4^16 ≈ 43억 명까지 O(log n) 유지)
+_MAX_LEVEL = 16
+_P = 0.25
+
+_PENDING_KEY = "leaderboard_pending"
+
+_user = User.__table__
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * level
+        # width[i]: next[i]까지 0층에서 몇 칸 떨어져 있는지 (순위 계산용)
+        self.width: List[int] = [1] * level
+
+
+class RankedSkipList:
+    """
+    순위 조회가 가능한 skip list (indexable skip list)
+
+    키는 서로 달라야 하며 오름차순으로 정렬됩니다.
+    삽입/삭제/순위/N번째 조회 모두 평균 O(log n)입니다.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self._nil = _Node(None, 0)
+        self._head = _Node(None, _MAX_LEVEL)
+        self._head.next = [self._nil] * _MAX_LEVEL
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _level(self) -> int:
+        level = 1
+        while level < _MAX_LEVEL and self._random.random() < _P:
+            level += 1
+        return level
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable, seed: Optional[int] = None) -> "RankedSkipList":
+        """정렬된 키로 한 번에 생성 (O(n))"""
+        ranking = cls(seed)
+        last = [ranking._head] * _MAX_LEVEL
+        last_position = [0] * _MAX_LEVEL
+        position = 0
+        for key in keys:
+            position += 1
+            node = _Node(key, ranking._level())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_position[level]
+                last[level], last_position[level] = node, position
+        for level in range(_MAX_LEVEL):
+            last[level].next[level] = ranking._nil
+            last[level].width[level] = position + 1 - last_position[level]
+        ranking._size = position
+        return ranking
+
+    def insert(self, key) -> None:
+        chain = [self._head] * _MAX_LEVEL
+        steps = [0] * _MAX_LEVEL
+        node = self._head
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.next[level] is not self._nil and node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        new = _Node(key, self._level())
+        distance = 0
+        for level in range(len(new.next)):
+            previous = chain[level]
+            new.next[level] = previous.next[level]
+            previous.next[level] = new
+            new.width[level] = previous.width[level] - distance
+            previous.width[level] = distance + 1
+            distance += steps[level]
+        for level in range(len(new.next), _MAX_LEVEL):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key) -> bool:
+        chain = [self._head] * _MAX_LEVEL
+        node = self._head
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.next[level] is not self._nil and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is self._nil or target.key != key:
+            return False
+        for level in range(len(target.next)):
+            previous = chain[level]
+            previous.width[level] += target.width[level] - 1
+            previous.next[level] = target.next[level]
+        for level in range(len(target.next), _MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self._size -= 1
+        return True
+
+    def rank(self, key) -> Optional[int]:
+        """키의 순위 (0부터, 없으면 None)"""
+        position = 0
+        node = self._head
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.next[level] is not self._nil and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        node = node.next[0]
+        return position if node is not self._nil and node.key == key else None
+
+    def slice(self, start: int, stop: int) -> list:
+        """순위 start 이상 stop 미만의 키 (O(log n + 개수))"""
+        start, stop = max(start, 0), min(stop, self._size)
+        if start >= stop:
+            return []
+        node = self._head
+        remaining = start + 1
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        keys = []
+        for _ in range(stop - start):
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class LocalLeaderboard:
+    """프로세스 메모리 리더보드 (단일 워커/테스트용)"""
+
+    def __init__(self):
+        self._points: Dict[str, int] = {}
+        self._ranking = RankedSkipList()
+        self._lock = threading.Lock()
+        self._ready = False
+        # 재구성 중(begin_rebuild ~ replace)에 들어온 변경 (DB 스냅샷보다 최신일 수 있음)
+        self._recent: Optional[Dict[str, Optional[int]]] = None
+
+    def _set_locked(self, student_id: str, points: Optional[int]) -> None:
+        old = self._points.get(student_id)
+        if old == points:
+            return
+        if old is not None:
+            self._ranking.remove((-old, student_id))
+            del self._points[student_id]
+        if points is not None:
+            self._ranking.insert((-points, student_id))
+            self._points[student_id] = points
+
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def update(self, points: Dict[str, int]) -> None:
+        with self._lock:
+            for student_id, value in points.items():
+                self._set_locked(student_id, value)
+                if self._recent is not None:
+                    self._recent[student_id] = value
+
+    def remove(self, student_ids: Iterable[str]) -> None:
+        with self._lock:
+            for student_id in student_ids:
+                self._set_locked(student_id, None)
+                if self._recent is not None:
+                    self._recent[student_id] = None
+
+    def begin_rebuild(self) -> None:
+        with self._lock:
+            self._recent = {}
+
+    def replace(self, points: Dict[str, int]) -> None:
+        """전체 교체 (begin_rebuild 이후 들어온 변경은 유지)"""
+        with self._lock:
+            merged = dict(points)
+            for student_id, value in (self._recent or {}).items():
+                if value is None:
+                    merged.pop(student_id, None)
+                else:
+                    merged[student_id] = value
+            self._points = merged
+            self._ranking = RankedSkipList.from_sorted(sorted((-value, sid) for sid, value in merged.items()))
+            self._recent = None
+            self._ready = True
+
+    def size(self) -> int:
+        return len(self._ranking)
+
+    def rank(self, student_id: str) -> Optional[Tuple[int, int]]:
+        """(순위(1부터), 포인트), 없으면 None"""
+        with self._lock:
+            points = self._points.get(student_id)
+            if points is None:
+                return None
+            return self._ranking.rank((-points, student_id)) + 1, points
+
+    def range(self, start: int, stop: int) -> List[Tuple[str, int]]:
+        """순위(0부터) start 이상 stop 미만의 [(학번, 포인트), ...]"""
+        with self._lock:
+            return [(sid, -negative) for negative, sid in self._ranking.slice(start, stop)]
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._points)
+
+
+class RedisLeaderboard:
+    """Redis sorted set 리더보드 (여러 워커가 공유, score = -포인트, ttl이 있으면 갱신할 때마다 만료 연장)"""
+
+    def __init__(self, redis_url: str, key: str = KEY_PREFIX + ALL_TIME, ttl: Optional[int] = None):
+        from redis import Redis
+
+        self.key = key
+        self.ttl = ttl
+        self._client = Redis.from_url(redis_url, decode_responses=True)
+
+    def is_ready(self) -> bool:
+        return bool(self._client.exists(self.key))
+
+    def update(self, points: Dict[str, int]) -> None:
+        if not points:
+            return
+        pipe = self._client.pipeline(transaction=False)
+        pipe.zadd(self.key, {student_id: -value for student_id, value in points.items()})
+        if self.ttl:
+            pipe.expire(self.key, self.ttl)
+        pipe.execute()
+
+    def remove(self, student_ids: Iterable[str]) -> None:
+        student_ids = list(student_ids)
+        if student_ids:
+            self._client.zrem(self.key, *student_ids)
+
+    def begin_rebuild(self) -> None:
+        pass
+
+    def replace(self, points: Dict[str, int], chunk: int = 5000) -> None:
+        """임시 키에 채운 뒤 RENAME으로 교체 (조회 중인 워커는 이전 값 또는 새 값 전체를 봄)"""
+        staging = f"{self.key}:rebuild"
+        items = list(points.items())
+        pipe = self._client.pipeline(transaction=False)
+        pipe.delete(staging)
+        for offset in range(0, len(items), chunk):
+            pipe.zadd(staging, {student_id: -value for student_id, value in items[offset:offset + chunk]})
+        pipe.execute()
+        if items:
+            self._client.rename(staging, self.key)
+            if self.ttl:
+                self._client.expire(self.key, self.ttl)
+        else:
+            self._client.delete(self.key)
+
+    def size(self) -> int:
+        return self._client.zcard(self.key)
+
+    def rank(self, student_id: str) -> Optional[Tuple[int, int]]:
+        pipe = self._client.pipeline(transaction=False)
+        pipe.zrank(self.key, student_id)
+        pipe.zscore(self.key, student_id)
+        rank, score = pipe.execute()
+        if rank is None or score is None:
+            return None
+        return rank + 1, -int(score)
+
+    def range(self, start: int, stop: int) -> List[Tuple[str, int]]:
+        start = max(start, 0)
+        if start >= stop:
+            return []
+        return [
+            (student_id, -int(score))
+            for student_id, score in self._client.zrange(self.key, start, stop - 1, withscores=True)
+        ]
+
+    def snapshot(self) -> Dict[str, int]:
+        return {student_id: -int(score) for student_id, score in self._client.zrange(self.key, 0, -1, withscores=True)}
+
+
+_leaderboards: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_redis_url() -> Optional[str]:
+    """리더보드용 Redis URL (ECOJOURNEY_LEADERBOARD_REDIS_URL → rxconfig.redis_url, 없으면 None)"""
+    override = os.getenv("ECOJOURNEY_LEADERBOARD_REDIS_URL")
+    if override:
+        return override
+    from reflex.config import get_config
+
+    return get_config().redis_url
+
+
+def get_leaderboard(name: str = ALL_TIME, ttl: Optional[int] = None):
+    """
+    프로세스 전역 리더보드 (이름별, 최초 호출 시 백엔드 선택)
+
+    Args:
+        name: 리더보드 이름 (기본: 전체 기간 포인트)
+        ttl: Redis 키 만료 시간(초, 기간 리더보드용). 메모리 백엔드는 drop_leaderboard()로 정리
+    """
+    leaderboard = _leaderboards.get(name)
+    if leaderboard is None:
+        with _registry_lock:
+            leaderboard = _leaderboards.get(name)
+            if leaderboard is None:
+                redis_url = get_redis_url()
+                leaderboard = RedisLeaderboard(redis_url, KEY_PREFIX + name, ttl) if redis_url else LocalLeaderboard()
+                _leaderboards[name] = leaderboard
+                logger.info(f"리더보드 {name}: {type(leaderboard).__name__}")
+    return leaderboard
+
+
+def set_leaderboard(leaderboard, name: str = ALL_TIME) -> None:
+    """리더보드 교체 (테스트에서 LocalLeaderboard 주입 등, None이면 다음 호출 때 다시 선택)"""
+    with _registry_lock:
+        if leaderboard is None:
+            _leaderboards.pop(name, None)
+        else:
+            _leaderboards[name] = leaderboard
+
+
+def drop_leaderboard(name: str) -> None:
+    """지난 기간 리더보드를 프로세스에서 제거 (Redis 키는 ttl로 만료)"""
+    with _registry_lock:
+        _leaderboards.pop(name, None)
+
+
+# -----------------------------------------------------------------------------
+# 쓰기 연동: commit된 변경만 반영
+# -----------------------------------------------------------------------------
+def stage_points(session, student_id: str, points: int, name: str = ALL_TIME) -> None:
+    """
+    변동 후 값을 세션에 기록 (트랜잭션 commit 이후 리더보드에 반영, 롤백되면 버림)
+
+    Args:
+        session: SQLModel Session (비동기 세션은 run_sync 안의 동기 세션)
+        student_id: 학번
+        points: 변동 후 값 (전체 기간 리더보드는 current_points)
+        name: 리더보드 이름
+    """
+    transaction = session.get_nested_transaction() or session.get_transaction()
+    session.info.setdefault(_PENDING_KEY, []).append((transaction, name, student_id, points))
+
+
+def _within(transaction, ancestor) -> bool:
+    if transaction is None:
+        # 트랜잭션 시작 전에 기록된 값은 가장 바깥 트랜잭션에 속함
+        return ancestor.parent is None
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session, previous_transaction) -> None:
+    """롤백된 트랜잭션(SAVEPOINT 포함) 안에서 기록된 값 버림"""
+    pending = session.info.get(_PENDING_KEY)
+    if pending:
+        session.info[_PENDING_KEY] = [
+            entry for entry in pending if not _within(entry[0], previous_transaction)
+        ]
+
+
+def _apply_updates(boards: Dict[str, Dict[str, int]]) -> None:
+    """리더보드별로 값 반영 (실패는 로그만, 주기 점검 때 DB 값으로 맞춰짐)"""
+    for name, points in boards.items():
+        try:
+            get_leaderboard(name).update(points)
+        except Exception as e:
+            logger.warning(f"리더보드 {name} 갱신 실패 ({len(points)}명, 다음 점검 때 반영): {e}")
+
+
+class _Publisher:
+    """
+    commit된 값을 Redis 리더보드에 반영하는 전용 스레드
+
+    반영 전까지 쌓인 값은 리더보드/학번별 마지막 값만 남기므로 Redis가 느리거나 끊겨도
+    대기 중인 값은 사용자 수를 넘지 않습니다.
+    """
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, boards: Dict[str, Dict[str, int]]) -> None:
+        with self._changed:
+            for name, points in boards.items():
+                self._pending.setdefault(name, {}).update(points)
+            if self._thread is None or not self._thread.is_alive():
+                if self._thread is None:
+                    # CLI처럼 commit 직후 종료하는 프로세스도 남은 값을 반영하고 끝나도록
+                    atexit.register(self.flush, 5.0)
+                self._thread = threading.Thread(target=self._run, name="leaderboard-publisher", daemon=True)
+                self._thread.start()
+            self._changed.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._changed:
+                self._busy = False
+                self._changed.notify_all()
+                self._changed.wait_for(lambda: self._pending)
+                boards, self._pending = self._pending, {}
+                self._busy = True
+            _apply_updates(boards)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """대기 중인 값이 모두 반영될 때까지 대기 (시간 초과면 False)"""
+        with self._changed:
+            return self._changed.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+
+_publisher = _Publisher()
+
+
+def flush_published(timeout: Optional[float] = 5.0) -> bool:
+    """commit 이후 넘긴 리더보드 갱신이 반영될 때까지 대기 (CLI 종료 전, 테스트용)"""
+    return _publisher.flush(timeout)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session) -> None:
+    """
+    commit된 값을 리더보드별로 반영 (같은 학번은 마지막 값)
+
+    프로세스 메모리 리더보드는 바로 반영하고, Redis 리더보드는 전용 스레드로 넘깁니다.
+    """
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    boards: Dict[str, Dict[str, int]] = {}
+    for _, name, student_id, value in pending:
+        boards.setdefault(name, {})[student_id] = value
+    if get_redis_url():
+        _publisher.submit(boards)
+    else:
+        _apply_updates(boards)
+
+
+# -----------------------------------------------------------------------------
+# 재구성 / 점검
+# -----------------------------------------------------------------------------
+def load_points(session) -> Dict[str, int]:
+    """user 테이블의 학번별 current_points (쿼리 1회)"""
+    return {
+        student_id: int(points or 0)
+        for student_id, points in session.execute(select(_user.c.student_id, _user.c.current_points))
+    }
+
+
+def rebuild_leaderboard(session, leaderboard=None, load: Callable[[Any], Dict[str, int]] = load_points) -> int:
+    """
+    DB 값으로 리더보드 전체 재구성
+
+    Args:
+        load: 학번별 값을 읽는 함수 (기본: user 테이블의 current_points)
+
+    Returns:
+        리더보드 사용자 수
+    """
+    leaderboard = leaderboard or get_leaderboard()
+    leaderboard.begin_rebuild()
+    points = load(session)
+    leaderboard.replace(points)
+    logger.info(f"리더보드 재구성: {len(points)}명")
+    return len(points)
+
+
+def check_leaderboard(
+    session,
+    leaderboard=None,
+    repair: bool = False,
+    load: Callable[[Any], Dict[str, int]] = load_points,
+) -> List[Dict[str, Any]]:
+    """
+    리더보드와 DB 값 비교
+
+    Args:
+        repair: True이면 어긋난 항목을 DB 값으로 고침
+        load: 학번별 값을 읽는 함수 (기본: user 테이블의 current_points)
+
+    Returns:
+        불일치 목록 [{"student_id", "expected"(DB), "actual"(리더보드, 없으면 None)}, ...]
+    """
+    leaderboard = leaderboard or get_leaderboard()
+    # 리더보드를 먼저 읽어야 그 사이의 변경이 DB 쪽에 포함됨 (DB 값이 더 최신)
+    actual = leaderboard.snapshot()
+    expected = load(session)
+
+    issues = [
+        {"student_id": student_id, "expected": points, "actual": actual.get(student_id)}
+        for student_id, points in expected.items()
+        if actual.get(student_id) != points
+    ]
+    issues.extend(
+        {"student_id": student_id, "expected": None, "actual": points}
+        for student_id, points in actual.items()
+        if student_id not in expected
+    )
+    if repair and issues:
+        leaderboard.update({i["student_id"]: i["expected"] for i in issues if i["expected"] is not None})
+        leaderboard.remove(i["student_id"] for i in issues if i["expected"] is None)
+        logger.warning(f"리더보드 불일치 {len(issues)}건 수정")
+    return issues
+
+
+# -----------------------------------------------------------------------------
+# 조회
+# -----------------------------------------------------------------------------
+def _with_profiles(session, entries: List[Tuple[int, str, int]]) -> List[Dict[str, Any]]:
+    """[(순위, 학번, 포인트)] → 닉네임/단과대를 붙인 화면용 목록 (쿼리 1회)"""
+    if not entries:
+        return []
+    profiles = {
+        student_id: (nickname, college)
+        for student_id, nickname, college in session.execute(
+            select(_user.c.student_id, _user.c.nickname, _user.c.college)
+            .where(_user.c.student_id.in_({student_id for _, student_id, _ in entries}))
+        )
+    }
+    return [
+        {
+            "rank": rank,
+            "student_id": student_id,
+            "nickname": profiles.get(student_id, (student_id, ""))[0],
+            "college": profiles.get(student_id, (student_id, ""))[1],
+            "points": points,
+        }
+        for rank, student_id, points in entries
+    ]
+
+
+def get_rankings(
+    session,
+    student_id: Optional[str] = None,
+    top_n: int = 10,
+    neighbors: int = 2,
+    leaderboard=None,
+    load: Callable[[Any], Dict[str, int]] = load_points,
+) -> Dict[str, Any]:
+    """
+    개인 포인트 랭킹 (상위 N명 + 내 순위 + 내 앞뒤 neighbors명, 비동기 세션은 run_sync로 호출)
+
+    Args:
+        leaderboard: 조회할 리더보드 (기본: 전체 기간 포인트)
+        load: 리더보드가 비어 있을 때 재구성에 쓸 함수
+
+    Returns:
+        {"top": [{"rank", "student_id", "nickname", "college", "points"}, ...],
+         "me": 내 항목 또는 None, "around": 내 주변 항목 목록, "total": 전체 인원}
+    """
+    leaderboard = leaderboard or get_leaderboard()
+    if not leaderboard.is_ready():
+        rebuild_leaderboard(session, leaderboard, load)
+
+    entries = [(rank, sid, points) for rank, (sid, points) in enumerate(leaderboard.range(0, top_n), start=1)]
+    around: List[Tuple[int, str, int]] = []
+    mine = leaderboard.rank(student_id) if student_id else None
+    if mine is not None:
+        start = max(mine[0] - 1 - neighbors, 0)
+        around = [
+            (rank, sid, points)
+            for rank, (sid, points) in enumerate(leaderboard.range(start, mine[0] + neighbors), start=start + 1)
+        ]
+
+    profiles = {e["student_id"]: e for e in _with_profiles(session, entries + around)}
+    return {
+        "top": [profiles[sid] for _, sid, _ in entries],
+        "me": profiles[student_id] if mine is not None else None,
+        "around": [profiles[sid] for _, sid, _ in around],
+        "total": leaderboard.size(),
+    }
+
+
+# -----------------------------------------------------------------------------
+# 앱 수명주기: 시작 시 재구성 + 주기 점검
+# -----------------------------------------------------------------------------
+def _rebuild_with_engine() -> int:
+    from sqlmodel import Session as SQLModelSession
+    from ..db.engine import get_engine
+
+    with SQLModelSession(get_engine()) as session:
+        return rebuild_leaderboard(session)
+
+
+def _check_with_engine() -> int:
+    from sqlmodel import Session as SQLModelSession
+    from ..db.engine import get_engine
+    from .ranking_windows import check_windows
+
+    with SQLModelSession(get_engine()) as session:
+        return len(check_leaderboard(session, repair=True)) + len(check_windows(session, repair=True))
+
+
+async def _check_loop(interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await loop.run_in_executor(None, _check_with_engine)
+        except Exception as e:
+            logger.error(f"리더보드 점검 오류: {e}", exc_info=True)
+
+
+@asynccontextmanager
+async def leaderboard_lifespan():
+    """앱 수명주기 작업: 시작 시 리더보드 재구성 + 주기 점검 (app.register_lifespan_task로 등록)"""
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, _rebuild_with_engine)
+    except Exception as e:
+        logger.error(f"리더보드 재구성 오류 (첫 조회 때 다시 시도): {e}", exc_info=True)
+
+    task = asyncio.create_task(
+        _check_loop(float(os.getenv("ECOJOURNEY_LEADERBOARD_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL)))
+    )
+    try:
+        yield
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from sqlmodel import Session as SQLModelSession
+    from ..db.engine import get_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "top"
+    if command == "bench":
+        n = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+        rnd = random.Random(1)
+        board = LocalLeaderboard()
+        started = time.perf_counter()
+        board.replace({f"{i:010d}": rnd.randrange(100000) for i in range(n)})
+        built = (time.perf_counter() - started) * 1000
+        ids = [f"{rnd.randrange(n):010d}" for _ in range(10000)]
+        started = time.perf_counter()
+        for sid in ids:
+            board.update({sid: rnd.randrange(100000)})
+        updated = (time.perf_counter() - started) * 1e6 / len(ids)
+        started = time.perf_counter()
+        for sid in ids:
+            rank, _ = board.rank(sid)
+            board.range(max(rank - 3, 0), rank + 2)
+        queried = (time.perf_counter() - started) * 1e6 / len(ids)
+        print(f"{n}명: 재구성 {built:.0f}ms, 갱신 {updated:.1f}µs/건, 순위+주변 조회 {queried:.1f}µs/건")
+        sys.exit(0)
+
+    with SQLModelSession(get_engine()) as session:
+        if command == "top":
+            count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+            for entry in get_rankings(session, top_n=count)["top"]:
+                print(f"{entry['rank']:>4}. {entry['nickname']} ({entry['college']}): {entry['points']:,}점")
+        elif command == "rank" and len(sys.argv) > 2:
+            result = get_rankings(session, sys.argv[2], top_n=0)
+            if result["me"] is None:
+                print(f"{sys.argv[2]}: 리더보드에 없음")
+            for entry in result["around"]:
+                marker = "▶" if entry["student_id"] == sys.argv[2] else " "
+                print(f"{marker}{entry['rank']:>4}. {entry['nickname']}: {entry['points']:,}점")
+            print(f"전체 {result['total']}명")
+        elif command == "check":
+            get_rankings(session, top_n=0)
+            found = check_leaderboard(session)
+            for issue in found:
+                print(issue)
+            print(f"리더보드 점검 완료: 불일치 {len(found)}건")
+        elif command == "rebuild":
+            print(f"✅ 리더보드 재구성: {rebuild_leaderboard(session)}명")
+        else:
+            print("사용법: python -m ecojourney.service.leaderboard [top [N]|rank 학번|check|rebuild|bench [인원]]")
+            sys.exit(1)
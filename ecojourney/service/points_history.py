@@ -0,0 +1,218 @@
+"""
+포인트 변동 내역 조회 모듈
+CarbonLog / PointsLog / MileageRequest 세 테이블을 UNION ALL로 합쳐
+시간 역순 키셋(커서) 페이지네이션으로 한 페이지씩만 조회합니다.
+"""
+
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+from sqlalchemy import and_, or_, cast, func, literal, null, union_all, Date, Integer, String
+from sqlmodel import select
+
+from ..models import CarbonLog, PointsLog, MileageRequest
+
+logger = logging.getLogger(__name__)
+
+# 같은 시각의 행 정렬 순서를 고정하기 위한 출처 구분값
+KIND_CARBON = 0
+KIND_POINTS = 1
+KIND_MILEAGE = 2
+
+# PointsLog 중 CarbonLog에서 이미 표시되는 항목 (중복 방지용 필터)
+_DUPLICATE_DESCRIPTION_PREFIX = "탄소 배출 리포트 저장"
+
+
+def encode_cursor(created_at: datetime, kind: int, row_id: int) -> str:
+    """페이지 커서 문자열 생성 (created_at|kind|id)"""
+    return f"{created_at.isoformat()}|{kind}|{row_id}"
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int, int]]:
+    """페이지 커서 문자열 파싱 (형식이 잘못되면 None)"""
+    try:
+        created_at, kind, row_id = cursor.split("|")
+        return datetime.fromisoformat(created_at), int(kind), int(row_id)
+    except (ValueError, AttributeError):
+        return None
+
+
+def _before_cursor(created_col, id_col, kind: int, cursor: Tuple[datetime, int, int]):
+    """(created_at, kind, id) < cursor 조건을 출처별 상수 kind에 맞춰 인덱스 친화적으로 전개"""
+    cursor_created_at, cursor_kind, cursor_id = cursor
+    if kind < cursor_kind:
+        return created_col <= cursor_created_at
+    if kind > cursor_kind:
+        return created_col < cursor_created_at
+    return or_(
+        created_col < cursor_created_at,
+        and_(created_col == cursor_created_at, id_col < cursor_id),
+    )
+
+
+def fetch_points_history_page(
+    session,
+    student_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    포인트 변동 내역 한 페이지 조회 (최신순)
+
+    각 출처별 쿼리는 (student_id, 시각) 인덱스를 따라 최대 limit + 1건만 읽고,
+    UNION ALL 결과를 다시 정렬하여 limit건을 반환합니다.
+
+    Args:
+        session: SQLModel Session
+        student_id: 학번
+        cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+        limit: 페이지 크기
+
+    Returns:
+        (내역 리스트, 다음 페이지 커서 또는 None)
+    """
+    position = decode_cursor(cursor) if cursor else None
+    fetch_size = limit + 1
+
+    # 1. CarbonLog 포인트 획득 내역 (양수만)
+    carbon_filters = [CarbonLog.student_id == student_id, CarbonLog.points_earned > 0]
+    if position:
+        carbon_filters.append(_before_cursor(CarbonLog.created_at, CarbonLog.id, KIND_CARBON, position))
+    carbon_q = (
+        select(
+            CarbonLog.created_at.label("created_at"),
+            literal(KIND_CARBON, Integer).label("kind"),
+            CarbonLog.id.label("row_id"),
+            CarbonLog.log_date.label("log_date"),
+            CarbonLog.points_earned.label("points"),
+            func.coalesce(CarbonLog.source, "carbon_input").label("source"),
+            CarbonLog.ai_feedback.label("description"),
+            cast(null(), Integer).label("extra"),
+        )
+        .where(*carbon_filters)
+        .order_by(CarbonLog.created_at.desc(), CarbonLog.id.desc())
+        .limit(fetch_size)
+        .subquery()
+    )
+
+    # 2. PointsLog 포인트 변동 내역 (양수/음수 모두)
+    points_filters = [
+        PointsLog.student_id == student_id,
+        func.coalesce(func.nullif(PointsLog.description, ""), PointsLog.source, "").not_like(
+            f"{_DUPLICATE_DESCRIPTION_PREFIX}%"
+        ),
+    ]
+    if position:
+        points_filters.append(_before_cursor(PointsLog.created_at, PointsLog.id, KIND_POINTS, position))
+    points_q = (
+        select(
+            PointsLog.created_at.label("created_at"),
+            literal(KIND_POINTS, Integer).label("kind"),
+            PointsLog.id.label("row_id"),
+            PointsLog.log_date.label("log_date"),
+            PointsLog.points.label("points"),
+            PointsLog.source.label("source"),
+            PointsLog.description.label("description"),
+            cast(null(), Integer).label("extra"),
+        )
+        .where(*points_filters)
+        .order_by(PointsLog.created_at.desc(), PointsLog.id.desc())
+        .limit(fetch_size)
+        .subquery()
+    )
+
+    # 3. 마일리지 환산 내역 (포인트 차감)
+    mileage_filters = [MileageRequest.student_id == student_id, MileageRequest.status == "APPROVED"]
+    if position:
+        mileage_filters.append(
+            _before_cursor(MileageRequest.processed_at, MileageRequest.id, KIND_MILEAGE, position)
+        )
+    mileage_q = (
+        select(
+            MileageRequest.processed_at.label("created_at"),
+            literal(KIND_MILEAGE, Integer).label("kind"),
+            MileageRequest.id.label("row_id"),
+            cast(null(), Date).label("log_date"),
+            (-MileageRequest.request_points).label("points"),
+            literal("mileage_conversion", String).label("source"),
+            cast(null(), String).label("description"),
+            MileageRequest.converted_mileage.label("extra"),
+        )
+        .where(*mileage_filters)
+        .order_by(MileageRequest.processed_at.desc(), MileageRequest.id.desc())
+        .limit(fetch_size)
+        .subquery()
+    )
+
+    combined = union_all(
+        select(carbon_q),
+        select(points_q),
+        select(mileage_q),
+    ).subquery()
+    statement = (
+        select(combined)
+        .order_by(combined.c.created_at.desc(), combined.c.kind.desc(), combined.c.row_id.desc())
+        .limit(fetch_size)
+    )
+    rows = session.execute(statement).all()
+
+    items = [_to_item(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit and rows[limit - 1].created_at is not None:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(_as_datetime(last.created_at), last.kind, last.row_id)
+    return items, next_cursor
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    """UNION 결과의 시각 컬럼을 datetime으로 변환 (DB에 따라 문자열로 반환될 수 있음)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _format_date(value) -> str:
+    if value is None:
+        return ""
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+def _to_item(row) -> Dict[str, Any]:
+    """UNION 결과 행을 화면 표시용 딕셔너리로 변환 (기존 load_points_log 형식 유지)"""
+    created_at = _as_datetime(row.created_at)
+    points = row.points or 0
+
+    if row.kind == KIND_CARBON:
+        description = "탄소배출 기록" if row.source == "carbon_input" else "챌린지 보상"
+        if row.description:
+            description = row.description
+        return {
+            "date": _format_date(row.log_date),
+            "points": points,
+            "is_positive": True,  # CarbonLog는 항상 양수
+            "source": row.source,
+            "description": description,
+            "created_at": created_at,
+        }
+
+    if row.kind == KIND_POINTS:
+        return {
+            "date": _format_date(row.log_date) if row.log_date else _format_date(created_at),
+            "points": points,
+            "is_positive": points > 0,
+            "source": row.source,
+            "description": row.description or row.source or "포인트 변동",
+            "created_at": created_at,
+        }
+
+    return {
+        "date": _format_date(created_at),
+        "points": points,
+        "is_positive": False,  # 마일리지 환산은 항상 음수
+        "source": "mileage_conversion",
+        "description": f"마일리지 환산 ({-points}점 → {row.extra} 마일리지)",
+        "created_at": created_at,
+    }
@@ -0,0 +1,266 @@
+"""
+포인트 원장(Points Ledger) 모듈
+
+모든 포인트 변동은 apply_points()를 통해
+1) User.current_points 원자적 갱신 (UPDATE ... RETURNING)
+2) 변동 후 잔액을 포함한 원장 행 추가
+를 같은 트랜잭션에서 수행하고, commit 이후 개인 포인트 리더보드(leaderboard)에 잔액을 반영합니다.
+
+잔액 조회는 최신 원장 1건(또는 User.current_points)만 읽으므로 O(1)이며,
+전체 이력 재계산은 오프라인 정합성 검사(reconcile)에서만 수행합니다.
+
+사용 예:
+    python -m ecojourney.service.points_ledger snapshot
+    python -m ecojourney.service.points_ledger reconcile
+"""
+
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+import logging
+
+from sqlalchemy import func, update
+from sqlmodel import select
+
+from ..models import User, PointsLedger, PointsSnapshot, CarbonLog, CarbonLogMonthly, PointsLog, MileageRequest
+from .leaderboard import stage_points
+
+logger = logging.getLogger(__name__)
+
+
+def apply_points(
+    session,
+    student_id: str,
+    delta: int,
+    source: str,
+    description: Optional[str] = None,
+    require_sufficient: bool = False,
+) -> Optional[int]:
+    """
+    포인트 변동 반영 + 원장 기록 (커밋은 호출자가 수행)
+
+    Args:
+        session: SQLModel Session
+        student_id: 학번
+        delta: 변동량 (획득: 양수, 차감: 음수)
+        source: 변동 출처
+        description: 설명
+        require_sufficient: True이면 잔액이 부족할 때 차감하지 않음
+
+    Returns:
+        변동 후 잔액. 사용자가 없거나 잔액이 부족하면 None
+    """
+    statement = (
+        update(User)
+        .where(User.student_id == student_id)
+        .values(current_points=User.current_points + delta)
+        .returning(User.current_points)
+    )
+    if require_sufficient and delta < 0:
+        # 잔액 확인과 차감을 한 문장으로 처리하여 동시 요청 시 lost update 방지
+        statement = statement.where(User.current_points >= -delta)
+
+    balance = session.execute(statement).scalar_one_or_none()
+    if balance is None:
+        return None
+    # commit 이후 개인 포인트 리더보드에 반영 (롤백되면 버림)
+    stage_points(session, student_id, balance)
+
+    if delta != 0:
+        session.add(
+            PointsLedger(
+                student_id=student_id,
+                delta=delta,
+                balance_after=balance,
+                source=source,
+                description=description,
+                created_at=datetime.now(),
+            )
+        )
+    return balance
+
+
+def get_balance(session, student_id: str) -> int:
+    """
+    현재 잔액 조회 (최신 원장 1건, 원장이 없으면 User.current_points)
+    읽기 전용이며 DB에 쓰지 않습니다.
+    """
+    balance = session.exec(
+        select(PointsLedger.balance_after)
+        .where(PointsLedger.student_id == student_id)
+        .order_by(PointsLedger.id.desc())
+        .limit(1)
+    ).first()
+    if balance is not None:
+        return balance
+
+    current_points = session.exec(
+        select(User.current_points).where(User.student_id == student_id)
+    ).first()
+    return current_points or 0
+
+
+def take_snapshots(session) -> int:
+    """
+    사용자별 최신 원장 잔액을 스냅샷으로 저장 (주기 실행용, 커밋 포함)
+    마지막 스냅샷 이후 원장 변동이 있는 사용자만 저장합니다.
+
+    Returns:
+        생성된 스냅샷 수
+    """
+    latest_ledger = (
+        select(PointsLedger.student_id, func.max(PointsLedger.id).label("ledger_id"))
+        .group_by(PointsLedger.student_id)
+        .subquery()
+    )
+    latest_snapshot = (
+        select(PointsSnapshot.student_id, func.max(PointsSnapshot.ledger_id).label("ledger_id"))
+        .group_by(PointsSnapshot.student_id)
+        .subquery()
+    )
+    rows = session.exec(
+        select(PointsLedger.student_id, PointsLedger.id, PointsLedger.balance_after)
+        .join(latest_ledger, PointsLedger.id == latest_ledger.c.ledger_id)
+        .outerjoin(latest_snapshot, latest_snapshot.c.student_id == PointsLedger.student_id)
+        .where(
+            (latest_snapshot.c.ledger_id.is_(None))
+            | (latest_snapshot.c.ledger_id < PointsLedger.id)
+        )
+    ).all()
+
+    now = datetime.now()
+    for student_id, ledger_id, balance in rows:
+        session.add(
+            PointsSnapshot(
+                student_id=student_id,
+                balance=balance,
+                ledger_id=ledger_id,
+                created_at=now,
+            )
+        )
+    session.commit()
+    logger.info(f"포인트 스냅샷 {len(rows)}건 생성")
+    return len(rows)
+
+
+def _legacy_history_total(session, student_id: str) -> int:
+    """기존 방식(CarbonLog + 보관된 월별 집계 + PointsLog - 마일리지 환산) 이력 합계"""
+    carbon_total = session.exec(
+        select(func.coalesce(func.sum(CarbonLog.points_earned), 0)).where(
+            CarbonLog.student_id == student_id,
+            CarbonLog.points_earned > 0,
+        )
+    ).one()
+    # 보관(archive)된 CarbonLog의 양수 포인트 합계
+    archived_total = session.exec(
+        select(func.coalesce(func.sum(CarbonLogMonthly.points_earned), 0)).where(
+            CarbonLogMonthly.student_id == student_id
+        )
+    ).one()
+    points_total = session.exec(
+        select(func.coalesce(func.sum(PointsLog.points), 0)).where(
+            PointsLog.student_id == student_id
+        )
+    ).one()
+    mileage_total = session.exec(
+        select(func.coalesce(func.sum(MileageRequest.request_points), 0)).where(
+            MileageRequest.student_id == student_id,
+            MileageRequest.status == "APPROVED",
+        )
+    ).one()
+    return int(carbon_total) + int(archived_total) + int(points_total) - int(mileage_total)
+
+
+def reconcile(session, student_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    오프라인 정합성 검사 (읽기 전용)
+
+    사용자별로 다음을 확인하고 불일치 항목을 반환합니다.
+    - ledger_chain: 원장 각 행의 balance_after == 직전 balance_after + delta
+    - snapshot: 최신 스냅샷 잔액 + 이후 원장 delta 합계 == 최신 원장 잔액
+    - user_balance: User.current_points == 최신 원장 잔액
+    - legacy_history: 기존 이력 테이블 합계와의 차이 (참고용)
+    """
+    statement = select(User.student_id, User.current_points)
+    if student_id:
+        statement = statement.where(User.student_id == student_id)
+    users = session.exec(statement).all()
+
+    issues: List[Dict[str, Any]] = []
+    for sid, current_points in users:
+        entries = session.exec(
+            select(PointsLedger.id, PointsLedger.delta, PointsLedger.balance_after)
+            .where(PointsLedger.student_id == sid)
+            .order_by(PointsLedger.id)
+        ).all()
+
+        previous = None
+        for ledger_id, delta, balance_after in entries:
+            if previous is not None and previous + delta != balance_after:
+                issues.append({
+                    "student_id": sid,
+                    "check": "ledger_chain",
+                    "ledger_id": ledger_id,
+                    "expected": previous + delta,
+                    "actual": balance_after,
+                })
+            previous = balance_after
+
+        ledger_balance = previous if previous is not None else current_points
+
+        snapshot = session.exec(
+            select(PointsSnapshot)
+            .where(PointsSnapshot.student_id == sid)
+            .order_by(PointsSnapshot.ledger_id.desc())
+            .limit(1)
+        ).first()
+        if snapshot:
+            after_snapshot = sum(delta for ledger_id, delta, _ in entries if ledger_id > snapshot.ledger_id)
+            if snapshot.balance + after_snapshot != ledger_balance:
+                issues.append({
+                    "student_id": sid,
+                    "check": "snapshot",
+                    "ledger_id": snapshot.ledger_id,
+                    "expected": snapshot.balance + after_snapshot,
+                    "actual": ledger_balance,
+                })
+
+        if current_points != ledger_balance:
+            issues.append({
+                "student_id": sid,
+                "check": "user_balance",
+                "expected": ledger_balance,
+                "actual": current_points,
+            })
+
+        legacy_total = _legacy_history_total(session, sid)
+        if legacy_total != ledger_balance:
+            issues.append({
+                "student_id": sid,
+                "check": "legacy_history",
+                "expected": ledger_balance,
+                "actual": legacy_total,
+            })
+
+    return issues
+
+
+if __name__ == "__main__":
+    import sys
+    from sqlmodel import Session
+    from ..db.engine import get_engine
+
+    engine = get_engine()
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "reconcile"
+    with Session(engine) as session:
+        if command == "snapshot":
+            count = take_snapshots(session)
+            print(f"✅ 스냅샷 {count}건 생성")
+        elif command == "reconcile":
+            found = reconcile(session, sys.argv[2] if len(sys.argv) > 2 else None)
+            for issue in found:
+                print(issue)
+            print(f"정합성 검사 완료: 불일치 {len(found)}건")
+        else:
+            print("사용법: python -m ecojourney.service.points_ledger [snapshot|reconcile [student_id]]")
+            sys.exit(1)
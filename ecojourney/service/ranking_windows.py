@@ -0,0 +1,355 @@
+"""
+기간별(주간/월간) 랭킹 (Ranking Windows)
+
+전체 기간 포인트만으로는 오래 사용한 사용자를 따라잡을 수 없으므로
+이번 주/이번 달의 획득 포인트와 탄소 절감량 랭킹을 따로 제공합니다.
+
+- 기간 버킷: rankingcounter 테이블에 (기간, 학번)별 누적값을 둡니다.
+  기간 키는 주 "W" + 월요일 날짜, 월 "M" + 연월이며 달력 기준(월~일, 1일~말일)입니다.
+- 증분 갱신: CarbonLog/PointsLog가 flush될 때(after_flush) 같은 트랜잭션에서
+  해당 주/월 버킷을 UPSERT하고, 갱신된 값을 commit 이후 기간별 리더보드(leaderboard)에 반영합니다.
+  훅은 register_hooks()로 등록합니다 (앱 설정과 엔진 생성 시 db.session_hooks가 호출).
+  CarbonLog 수정/삭제는 이전 값을 빼고 새 값을 더합니다.
+- 만료: 기간이 바뀌면 새 버킷/새 리더보드에 쌓이므로 지난 값을 빼는 재계산이 없습니다 (O(1)).
+  지난 기간 리더보드는 메모리에서 제거되고, Redis 키는 TTL로 만료됩니다.
+- 조회: 리더보드에서 상위 N명/내 순위를 읽으며, 리더보드가 비어 있으면 해당 기간 버킷 행만 읽어 만듭니다.
+
+집계 기준:
+- 획득 포인트: CarbonLog.points_earned(탄소 입력, 챌린지 보상) + PointsLog의 양수 포인트
+  (대항전 베팅/보상/반환은 포인트 이동이므로 제외)
+- 탄소 절감량: 탄소 입력(carbon_input) 기록별 max(평균 일일 배출량 - 배출량, 0), g 단위 정수
+
+사용 예:
+    python -m ecojourney.service.ranking_windows top week points
+    python -m ecojourney.service.ranking_windows top month reduction
+    python -m ecojourney.service.ranking_windows rebuild    # 이번 주/이번 달 버킷을 원본 로그로 재계산 (점검용)
+
+버킷을 재계산하면 실행 중인 앱의 리더보드는 다음 주기 점검(leaderboard_lifespan) 때 맞춰집니다.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import threading
+
+from sqlalchemy import delete, event, inspect, insert, select
+from sqlalchemy.orm import Session
+
+from ..models import CarbonLog, PointsLog, RankingCounter
+from .average_data import TOTAL_AVERAGE_DAILY
+from .leaderboard import (
+    check_leaderboard,
+    drop_leaderboard,
+    get_leaderboard,
+    get_rankings,
+    stage_points,
+)
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = ("week", "month")
+METRICS = ("points", "reduction")
+
+# 포인트 이동이라 획득 포인트에서 제외하는 PointsLog 출처
+TRANSFER_SOURCES = frozenset({"battle_participation", "battle_reward", "battle_draw"})
+
+# 기간 리더보드의 Redis 키 만료 시간(초, 기간 길이 + 여유)
+_WINDOW_TTL = {"week": 14 * 86400, "month": 40 * 86400}
+
+_counter = RankingCounter.__table__
+
+# (metric, window) → 현재 리더보드 이름 (기간이 바뀌면 이전 리더보드 제거)
+_current: Dict[Tuple[str, str], str] = {}
+_current_lock = threading.Lock()
+
+
+def period_key(window: str, day: date) -> str:
+    """날짜가 속한 기간 버킷 키"""
+    if window == "week":
+        return f"W{(day - timedelta(days=day.weekday())).isoformat()}"
+    return f"M{day:%Y-%m}"
+
+
+def period_label(window: str, day: date) -> str:
+    """기간 표시 이름"""
+    if window == "week":
+        monday = day - timedelta(days=day.weekday())
+        return f"{monday:%m/%d} ~ {monday + timedelta(days=6):%m/%d}"
+    return f"{day.year}년 {day.month}월"
+
+
+def board_name(metric: str, period: str) -> str:
+    return f"{metric}:{period}"
+
+
+def reduction_grams(source: Optional[str], total_emission: Optional[float]) -> int:
+    """탄소 입력 1건의 절감량 (평균 일일 배출량 대비, g)"""
+    if source != "carbon_input" or total_emission is None:
+        return 0
+    return max(round((TOTAL_AVERAGE_DAILY - total_emission) * 1000), 0)
+
+
+def _carbon_contribution(student_id, log_date, source, points_earned, total_emission) -> Tuple[str, date, int, int]:
+    return student_id, log_date, points_earned or 0, reduction_grams(source, total_emission)
+
+
+def _points_contribution(student_id, log_date, source, points) -> Tuple[str, date, int, int]:
+    earned = points if points and points > 0 and source not in TRANSFER_SOURCES else 0
+    return student_id, log_date, earned, 0
+
+
+def _contribution(obj, previous: bool = False) -> Optional[Tuple[str, date, int, int]]:
+    """CarbonLog/PointsLog 행 1건의 (학번, 날짜, 포인트, 절감량) (previous=True이면 flush 전 DB 값)"""
+    if previous:
+        state = inspect(obj)
+
+        def value(attr):
+            history = state.attrs[attr].history
+            return history.deleted[0] if history.deleted else getattr(obj, attr)
+    else:
+        def value(attr):
+            return getattr(obj, attr)
+
+    if isinstance(obj, CarbonLog):
+        return _carbon_contribution(
+            value("student_id"), value("log_date"), value("source"), value("points_earned"), value("total_emission")
+        )
+    if isinstance(obj, PointsLog):
+        return _points_contribution(value("student_id"), value("log_date"), value("source"), value("points"))
+    return None
+
+
+def _period_deltas(contributions) -> Dict[Tuple[str, str], List[int]]:
+    """[(부호, (학번, 날짜, 포인트, 절감량)), ...] → {(기간, 학번): [포인트, 절감량]}"""
+    deltas: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0])
+    for sign, (student_id, log_date, points, reduction) in contributions:
+        if not (points or reduction) or log_date is None:
+            continue
+        for window in WINDOWS:
+            delta = deltas[(period_key(window, log_date), student_id)]
+            delta[0] += sign * points
+            delta[1] += sign * reduction
+    return {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+
+
+def _window_board(metric: str, window: str, period: str):
+    """기간 리더보드 (더 최근 기간이 등장하면 이전 기간 리더보드 제거, 지난 기간이면 None)"""
+    name = board_name(metric, period)
+    with _current_lock:
+        current = _current.get((metric, window))
+        if current is not None and current != name:
+            if name < current:
+                return None
+            drop_leaderboard(current)
+        _current[(metric, window)] = name
+    return get_leaderboard(name, _WINDOW_TTL[window])
+
+
+def record_activity(session, deltas: Dict[Tuple[str, str], List[int]]) -> None:
+    """
+    기간 버킷 증분 UPSERT (한 문장) + 갱신된 값을 commit 이후 기간 리더보드에 반영
+
+    Args:
+        deltas: {(기간, 학번): [포인트 증분, 절감량 증분]}
+    """
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+    now = datetime.now()
+    statement = upsert(_counter).values([
+        {"period": period, "student_id": student_id, "points": points, "reduction_g": reduction, "updated_at": now}
+        for (period, student_id), (points, reduction) in deltas.items()
+    ])
+    rows = connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[_counter.c.period, _counter.c.student_id],
+            set_={
+                "points": _counter.c.points + statement.excluded.points,
+                "reduction_g": _counter.c.reduction_g + statement.excluded.reduction_g,
+                "updated_at": statement.excluded.updated_at,
+            },
+        ).returning(_counter.c.period, _counter.c.student_id, _counter.c.points, _counter.c.reduction_g)
+    ).all()
+
+    for period, student_id, points, reduction in rows:
+        window = "week" if period.startswith("W") else "month"
+        for metric, value in (("points", points), ("reduction", reduction)):
+            if _window_board(metric, window, period) is not None:
+                stage_points(session, student_id, value, board_name(metric, period))
+
+
+def _count_activity(session, flush_context) -> None:
+    """flush된 CarbonLog/PointsLog 추가/수정/삭제를 기간 버킷에 반영 (같은 트랜잭션)"""
+    contributions = []
+    for obj in session.new:
+        if isinstance(obj, (CarbonLog, PointsLog)):
+            contributions.append((1, _contribution(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, (CarbonLog, PointsLog)) and session.is_modified(obj):
+            contributions.append((-1, _contribution(obj, previous=True)))
+            contributions.append((1, _contribution(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, (CarbonLog, PointsLog)):
+            contributions.append((-1, _contribution(obj, previous=True)))
+    if not contributions:
+        return
+
+    deltas = _period_deltas(contributions)
+    if deltas:
+        record_activity(session, deltas)
+
+
+def register_hooks() -> None:
+    """Session after_flush 훅 등록 (db.session_hooks에서 호출, 여러 번 호출해도 한 번만 등록)"""
+    if not event.contains(Session, "after_flush", _count_activity):
+        event.listen(Session, "after_flush", _count_activity)
+
+
+# -----------------------------------------------------------------------------
+# 조회 / 재구성
+# -----------------------------------------------------------------------------
+def load_window(session, metric: str, period: str) -> Dict[str, int]:
+    """기간 버킷의 학번별 값 (쿼리 1회, 해당 기간 행만)"""
+    column = _counter.c.points if metric == "points" else _counter.c.reduction_g
+    return {
+        student_id: int(value)
+        for student_id, value in session.execute(
+            select(_counter.c.student_id, column).where(_counter.c.period == period)
+        )
+    }
+
+
+def format_value(metric: str, value: int) -> str:
+    """랭킹 값 표시 문자열"""
+    if metric == "points":
+        return f"{value:,}점"
+    return f"{value / 1000:,.1f}kg"
+
+
+def get_window_rankings(
+    session,
+    metric: str,
+    window: str,
+    student_id: Optional[str] = None,
+    top_n: int = 10,
+    neighbors: int = 2,
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    기간별 랭킹 (상위 N명 + 내 순위 + 내 앞뒤 neighbors명, 비동기 세션은 run_sync로 호출)
+
+    Args:
+        metric: "points"(획득 포인트) 또는 "reduction"(탄소 절감량, g)
+        window: "week" 또는 "month"
+
+    Returns:
+        leaderboard.get_rankings()와 같은 형식 + 항목별 "value"(표시 문자열), "label"(기간 이름)
+    """
+    today = today or date.today()
+    period = period_key(window, today)
+    rankings = get_rankings(
+        session,
+        student_id,
+        top_n,
+        neighbors,
+        leaderboard=_window_board(metric, window, period),
+        load=partial(load_window, metric=metric, period=period),
+    )
+    for entry in rankings["top"] + rankings["around"] + ([rankings["me"]] if rankings["me"] else []):
+        entry["value"] = format_value(metric, entry["points"])
+    rankings["label"] = period_label(window, today)
+    return rankings
+
+
+def rebuild_windows(session, today: Optional[date] = None) -> int:
+    """
+    이번 주/이번 달 버킷을 원본 로그로 다시 계산 (백필/점검용, 커밋은 호출자가 수행)
+
+    지난 기간 버킷은 랭킹에 쓰이지 않으므로 건드리지 않습니다.
+
+    Returns:
+        저장된 버킷 행 수
+    """
+    today = today or date.today()
+    periods = {period_key(window, today) for window in WINDOWS}
+    since = min(today - timedelta(days=today.weekday()), today.replace(day=1))
+
+    contributions = [
+        (1, _carbon_contribution(*row))
+        for row in session.execute(
+            select(
+                CarbonLog.student_id, CarbonLog.log_date, CarbonLog.source,
+                CarbonLog.points_earned, CarbonLog.total_emission,
+            ).where(CarbonLog.log_date >= since)
+        )
+    ]
+    contributions.extend(
+        (1, _points_contribution(*row))
+        for row in session.execute(
+            select(PointsLog.student_id, PointsLog.log_date, PointsLog.source, PointsLog.points)
+            .where(PointsLog.log_date >= since)
+        )
+    )
+    deltas = {key: delta for key, delta in _period_deltas(contributions).items() if key[0] in periods}
+
+    session.execute(delete(_counter).where(_counter.c.period.in_(periods)))
+    now = datetime.now()
+    if deltas:
+        session.execute(
+            insert(_counter),
+            [
+                {"period": period, "student_id": student_id, "points": points, "reduction_g": reduction, "updated_at": now}
+                for (period, student_id), (points, reduction) in deltas.items()
+            ],
+        )
+    return len(deltas)
+
+
+def check_windows(session, repair: bool = False, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """이번 주/이번 달 리더보드와 버킷 비교 (만들어진 리더보드만, repair=True이면 버킷 값으로 고침)"""
+    today = today or date.today()
+    issues: List[Dict[str, Any]] = []
+    for window in WINDOWS:
+        period = period_key(window, today)
+        for metric in METRICS:
+            leaderboard = _window_board(metric, window, period)
+            if leaderboard is None or not leaderboard.is_ready():
+                continue
+            found = check_leaderboard(
+                session, leaderboard, repair, load=partial(load_window, metric=metric, period=period)
+            )
+            issues.extend(dict(issue, board=board_name(metric, period)) for issue in found)
+    return issues
+
+
+if __name__ == "__main__":
+    import sys
+    from sqlmodel import Session as SQLModelSession
+    from ..db.write_queue import create_writer_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "top"
+    engine = create_writer_engine()
+    if command == "top":
+        window = sys.argv[2] if len(sys.argv) > 2 else "week"
+        metric = sys.argv[3] if len(sys.argv) > 3 else "points"
+        if window not in WINDOWS or metric not in METRICS:
+            print("사용법: python -m ecojourney.service.ranking_windows top [week|month] [points|reduction]")
+            sys.exit(1)
+        with SQLModelSession(engine) as session:
+            rankings = get_window_rankings(session, metric, window)
+        print(f"{rankings['label']} {'획득 포인트' if metric == 'points' else '탄소 절감량'} 랭킹")
+        for entry in rankings["top"]:
+            print(f"{entry['rank']:>4}. {entry['nickname']} ({entry['college']}): {entry['value']}")
+    elif command == "rebuild":
+        with SQLModelSession(engine) as session:
+            rows = rebuild_windows(session)
+            session.commit()
+        print(f"✅ 이번 주/이번 달 버킷 {rows}행 재계산")
+    else:
+        print("사용법: python -m ecojourney.service.ranking_windows [top [week|month] [points|reduction]|rebuild]")
+        sys.exit(1)
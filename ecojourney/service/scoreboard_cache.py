@@ -0,0 +1,356 @@
+"""
+대항전 현황판 캐시 (Scoreboard Cache)
+
+현황판(점수, 팀별 참가자 수, 베팅 상위 N명)은 join_battle로만 바뀌므로
+대결 ID별로 캐시해 두고 페이지 조회 시 DB 집계를 생략합니다.
+
+- 조회: 캐시 미스일 때만 build_scoreboard()로 DB에서 만들어 저장 (lazy rebuild)
+- 참가(write-through): 쓰기 큐 commit 이후 apply_bet()으로 캐시 항목을 증분 갱신
+  (캐시에 없는 대결은 건너뛰고 다음 조회 때 새로 만듦)
+- 정산: 종료된 대결 항목을 무효화
+- 세대(generation): 대결별 카운터로, 참가 반영/무효화 때마다 1 증가합니다.
+  조회는 DB 집계 전에 세대를 읽고, 저장 시 세대가 그대로일 때만 저장합니다.
+  (집계 중 참가가 commit되면 캐시에 항목이 없어 증분 갱신이 건너뛰어지므로,
+  참가 이전 현황판이 TTL 동안 남지 않도록 이번 조회 결과는 저장하지 않음)
+- TTL(기본 300초)이 지나면 항목이 만료되어 join_battle 밖의 변경(관리 작업, 가져오기 등)도 반영됩니다.
+
+백엔드 (프로세스당 1개):
+- ECOJOURNEY_SCOREBOARD_REDIS_URL → rxconfig.redis_url(REFLEX_REDIS_URL) 순으로 Redis URL이 있으면 Redis
+  (여러 워커가 같은 캐시를 공유, WATCH/MULTI로 갱신 충돌 방지)
+- 없으면 프로세스 메모리 (단일 워커/테스트용)
+
+캐시 오류는 로그만 남기고 DB 조회로 대체하므로 Redis 장애가 페이지 오류로 이어지지 않습니다.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import copy
+import json
+import logging
+import os
+import threading
+import time
+
+from .battle_bets import get_live_scores
+from .battle_board import DEFAULT_TOP_N, get_battle_board
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+KEY_PREFIX = "ecojourney:scoreboard:"
+# Redis 세대 키 유지 시간(초): 진행 중인 조회(DB 집계)보다 충분히 길게 유지 (만료되면 0부터 다시 셈)
+GENERATION_TTL = 86400
+
+Scoreboard = Dict[str, Any]
+
+
+def build_scoreboard(session, battle_id: int, top_n: int = DEFAULT_TOP_N) -> Optional[Scoreboard]:
+    """
+    DB에서 현황판 생성 (대결 1건 + 현황판 집계 + 현재 점수, 쿼리 3회, 비동기 세션은 run_sync로 호출)
+
+    Returns:
+        캐시에 저장할 현황판 dict, 대결이 없으면 None
+    """
+    from sqlalchemy import select
+
+    from ..models import Battle
+
+    battle = session.execute(
+        select(
+            Battle.id, Battle.college_a, Battle.college_b, Battle.score_a, Battle.score_b,
+            Battle.start_date, Battle.end_date,
+        ).where(Battle.id == battle_id)
+    ).first()
+    if battle is None:
+        return None
+
+    board = get_battle_board(session, battle.id, battle.college_a, battle.college_b, top_n)
+    # 점수는 battle 행 + 아직 합쳐지지 않은 샤드 증분
+    score_a, score_b = get_live_scores(session, [battle.id])[battle.id]
+    return {
+        "id": battle.id,
+        "college_a": battle.college_a,
+        "college_b": battle.college_b,
+        "score_a": score_a,
+        "score_b": score_b,
+        "participants_a": board["participants_a"],
+        "participants_b": board["participants_b"],
+        "start_date": battle.start_date.strftime("%Y-%m-%d") if battle.start_date else "",
+        "end_date": battle.end_date.strftime("%Y-%m-%d") if battle.end_date else "",
+        "top_n": top_n,
+        "top_a": board["top_a"],
+        "top_b": board["top_b"],
+    }
+
+
+def apply_bet(
+    board: Scoreboard,
+    college: str,
+    bet_amount: int,
+    standing: Dict[str, Any],
+) -> Scoreboard:
+    """
+    참가 1건을 현황판에 반영 (증분 갱신, 새 dict 반환)
+
+    Args:
+        board: 현황판
+        college: 참가자 단과대
+        bet_amount: 이번 베팅 금액
+        standing: 참가 후 해당 학번의 누적 정보
+            {"student_id", "nickname", "bet_amount"(누적 합계), "first_id", "joins"(참가 횟수)}
+
+    학번별 누적 베팅은 늘어나기만 하므로 새 상위 N명은 (기존 상위 N명 ∪ 참가자) 안에서 결정됩니다.
+    """
+    if college == board["college_a"]:
+        side = "a"
+    elif college == board["college_b"]:
+        side = "b"
+    else:
+        return board
+
+    board = copy.deepcopy(board)
+    board[f"score_{side}"] += bet_amount
+    if standing["joins"] == 1:
+        board[f"participants_{side}"] += 1
+
+    entries = [e for e in board[f"top_{side}"] if e["student_id"] != standing["student_id"]]
+    entries.append({
+        "student_id": standing["student_id"],
+        "nickname": standing["nickname"],
+        "bet_amount": standing["bet_amount"],
+        "first_id": standing["first_id"],
+    })
+    entries.sort(key=lambda e: (-e["bet_amount"], e["first_id"]))
+    top_n = board.get("top_n", DEFAULT_TOP_N)
+    board[f"top_{side}"] = [dict(e, rank=rank) for rank, e in enumerate(entries[:top_n], 1)]
+    return board
+
+
+def scoreboard_view(board: Scoreboard) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """현황판 → (current_battle, college_a_participants, college_b_participants) 화면용 값"""
+    battle = {
+        key: board[key]
+        for key in (
+            "id", "college_a", "college_b", "score_a", "score_b",
+            "participants_a", "participants_b", "start_date", "end_date",
+        )
+    }
+
+    def _top(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {"student_id": e["student_id"], "nickname": e["nickname"], "bet_amount": e["bet_amount"], "rank": e["rank"]}
+            for e in entries
+        ]
+
+    return battle, _top(board["top_a"]), _top(board["top_b"])
+
+
+class LocalScoreboardCache:
+    """프로세스 메모리 캐시 (단일 워커/테스트용)"""
+
+    def __init__(self, ttl: int = DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[float, Scoreboard]] = {}
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _get_locked(self, battle_id: int) -> Optional[Scoreboard]:
+        entry = self._entries.get(battle_id)
+        if entry is None:
+            return None
+        expires_at, board = entry
+        if expires_at < time.monotonic():
+            del self._entries[battle_id]
+            return None
+        return board
+
+    async def get(self, battle_id: int) -> Optional[Scoreboard]:
+        with self._lock:
+            board = self._get_locked(battle_id)
+            return copy.deepcopy(board) if board is not None else None
+
+    async def generation(self, battle_id: int) -> int:
+        with self._lock:
+            return self._generations.get(battle_id, 0)
+
+    async def set(self, battle_id: int, board: Scoreboard, generation: Optional[int] = None) -> bool:
+        """항목 저장 (generation을 주면 세대가 그대로일 때만 저장, 저장 여부 반환)"""
+        with self._lock:
+            if generation is not None and self._generations.get(battle_id, 0) != generation:
+                return False
+            self._entries[battle_id] = (time.monotonic() + self.ttl, copy.deepcopy(board))
+            return True
+
+    async def update(self, battle_id: int, func: Callable[[Scoreboard], Scoreboard]) -> Optional[Scoreboard]:
+        """세대를 올리고, 캐시된 항목이 있을 때만 func(board)로 교체 (만료 시각은 유지)"""
+        with self._lock:
+            self._generations[battle_id] = self._generations.get(battle_id, 0) + 1
+            board = self._get_locked(battle_id)
+            if board is None:
+                return None
+            board = func(copy.deepcopy(board))
+            self._entries[battle_id] = (self._entries[battle_id][0], board)
+            return copy.deepcopy(board)
+
+    async def invalidate(self, battle_ids: Iterable[int]) -> None:
+        with self._lock:
+            for battle_id in battle_ids:
+                self._generations[battle_id] = self._generations.get(battle_id, 0) + 1
+                self._entries.pop(battle_id, None)
+
+
+class RedisScoreboardCache:
+    """Redis 캐시 (여러 워커가 공유, 값은 JSON)"""
+
+    def __init__(self, redis_url: str, ttl: int = DEFAULT_TTL):
+        from redis.asyncio import Redis
+
+        self.ttl = ttl
+        self._client = Redis.from_url(redis_url)
+
+    @staticmethod
+    def _key(battle_id: int) -> str:
+        return f"{KEY_PREFIX}{battle_id}"
+
+    @staticmethod
+    def _generation_key(battle_id: int) -> str:
+        return f"{KEY_PREFIX}{battle_id}:generation"
+
+    async def get(self, battle_id: int) -> Optional[Scoreboard]:
+        raw = await self._client.get(self._key(battle_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def generation(self, battle_id: int) -> int:
+        raw = await self._client.get(self._generation_key(battle_id))
+        return int(raw) if raw is not None else 0
+
+    async def set(self, battle_id: int, board: Scoreboard, generation: Optional[int] = None) -> bool:
+        """항목 저장 (generation을 주면 WATCH로 세대가 그대로일 때만 저장, 저장 여부 반환)"""
+        from redis.exceptions import WatchError
+
+        value = json.dumps(board, ensure_ascii=False)
+        if generation is None:
+            await self._client.set(self._key(battle_id), value, ex=self.ttl)
+            return True
+
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(self._generation_key(battle_id))
+                raw = await pipe.get(self._generation_key(battle_id))
+                if (int(raw) if raw is not None else 0) != generation:
+                    return False
+                pipe.multi()
+                pipe.set(self._key(battle_id), value, ex=self.ttl)
+                await pipe.execute()
+                return True
+            except WatchError:
+                # 확인 후 저장 전에 참가 반영/무효화로 세대가 바뀜
+                return False
+
+    async def update(self, battle_id: int, func: Callable[[Scoreboard], Scoreboard]) -> Optional[Scoreboard]:
+        """세대를 올리고, 캐시된 항목이 있을 때만 func(board)로 교체 (WATCH로 다른 워커와의 동시 갱신 시 재시도)"""
+        from redis.exceptions import WatchError
+
+        key = self._key(battle_id)
+        generation_key = self._generation_key(battle_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    board = func(json.loads(raw)) if raw is not None else None
+                    pipe.multi()
+                    pipe.incr(generation_key)
+                    pipe.expire(generation_key, GENERATION_TTL)
+                    if board is not None:
+                        pipe.set(key, json.dumps(board, ensure_ascii=False), keepttl=True)
+                    await pipe.execute()
+                    return board
+                except WatchError:
+                    continue
+
+    async def invalidate(self, battle_ids: Iterable[int]) -> None:
+        battle_ids = list(battle_ids)
+        if not battle_ids:
+            return
+        async with self._client.pipeline(transaction=True) as pipe:
+            for battle_id in battle_ids:
+                pipe.incr(self._generation_key(battle_id))
+                pipe.expire(self._generation_key(battle_id), GENERATION_TTL)
+            pipe.delete(*[self._key(battle_id) for battle_id in battle_ids])
+            await pipe.execute()
+
+
+_cache = None
+
+
+def get_redis_url() -> Optional[str]:
+    """현황판 캐시용 Redis URL (ECOJOURNEY_SCOREBOARD_REDIS_URL → rxconfig.redis_url, 없으면 None)"""
+    override = os.getenv("ECOJOURNEY_SCOREBOARD_REDIS_URL")
+    if override:
+        return override
+    from reflex.config import get_config
+
+    return get_config().redis_url
+
+
+def get_scoreboard_cache():
+    """프로세스 전역 현황판 캐시 (최초 호출 시 백엔드 선택)"""
+    global _cache
+    if _cache is None:
+        ttl = int(os.getenv("ECOJOURNEY_SCOREBOARD_TTL", DEFAULT_TTL))
+        redis_url = get_redis_url()
+        _cache = RedisScoreboardCache(redis_url, ttl) if redis_url else LocalScoreboardCache(ttl)
+        logger.info(f"대항전 현황판 캐시: {type(_cache).__name__} (TTL {ttl}s)")
+    return _cache
+
+
+def set_scoreboard_cache(cache) -> None:
+    """현황판 캐시 교체 (테스트에서 LocalScoreboardCache 주입 등, None이면 다음 호출 때 다시 선택)"""
+    global _cache
+    _cache = cache
+
+
+async def load_scoreboard(session, battle_id: int) -> Optional[Scoreboard]:
+    """
+    현황판 조회 (캐시 → 미스 시 DB에서 생성 후 저장)
+
+    Args:
+        session: AsyncSession
+        battle_id: 대결 ID
+    """
+    cache = get_scoreboard_cache()
+    generation = None
+    try:
+        board = await cache.get(battle_id)
+        if board is not None:
+            return board
+        # DB 집계 전에 세대를 읽어 두고, 집계 중 참가가 반영되었으면 저장하지 않음
+        generation = await cache.generation(battle_id)
+    except Exception as e:
+        logger.warning(f"현황판 캐시 조회 실패 (DB 조회로 대체): {e}")
+
+    board = await session.run_sync(build_scoreboard, battle_id)
+    if board is not None and generation is not None:
+        try:
+            await cache.set(battle_id, board, generation)
+        except Exception as e:
+            logger.warning(f"현황판 캐시 저장 실패: {e}")
+    return board
+
+
+async def record_bet(battle_id: int, college: str, bet_amount: int, standing: Dict[str, Any]) -> None:
+    """참가 commit 이후 현황판 캐시에 반영 (write-through + 세대 증가, 실패 시 항목 무효화)"""
+    cache = get_scoreboard_cache()
+    try:
+        await cache.update(battle_id, lambda board: apply_bet(board, college, bet_amount, standing))
+    except Exception as e:
+        logger.warning(f"현황판 캐시 갱신 실패 (항목 무효화): {e}")
+        await invalidate_scoreboards([battle_id])
+
+
+async def invalidate_scoreboards(battle_ids: Iterable[int]) -> None:
+    """현황판 캐시 항목 삭제 (정산 후 등, 다음 조회 때 DB에서 다시 생성)"""
+    try:
+        await get_scoreboard_cache().invalidate(list(battle_ids))
+    except Exception as e:
+        logger.warning(f"현황판 캐시 무효화 실패: {e}")
@@ -0,0 +1,318 @@
+"""
+탄소 입력 연속 기록 (Streaks)
+
+주간 챌린지("7일 연속 기록")와 마이페이지가 조회할 때마다 이번 주 CarbonLog를 다시 세지 않도록
+사용자별 연속 기록을 streakrecord 테이블 1행으로 유지합니다.
+
+- 저장 형태: 이번 주(week_start, 월요일) 기록 요일 7비트(day_mask, 월=1 ... 일=64),
+  마지막 기록 날짜까지의 현재 연속 일수(current_streak), 최장 연속 일수(best_streak)
+- 증분 갱신: 탄소 입력(CarbonLog, source='carbon_input')이 flush될 때(after_flush) 같은 트랜잭션에서
+  UPSERT 1회로 O(1) 갱신합니다 (조건식이 DB 안에서 계산되므로 동시에 저장해도 어긋나지 않음).
+  훅은 register_hooks()로 등록합니다 (앱 설정과 엔진 생성 시 db.session_hooks가 호출).
+  - 같은 날 다시 저장(덮어쓰기): 변화 없음
+  - 마지막 기록 다음 날: 연속 +1, 하루 이상 비면 1부터 다시 시작
+  - 새 주의 기록: day_mask를 그 요일 비트로 초기화
+- 예외 경로: 과거 날짜 기록, 날짜/출처 수정, 삭제는 드물기 때문에 해당 사용자의 탄소 입력 날짜만 읽어 다시 계산합니다.
+  최장 연속 일수는 보관(archive)된 로그를 잃지 않도록 줄어들지 않습니다.
+- 조회: get_streak()이 1행만 읽고, 마지막 기록이 어제보다 이전이면 현재 연속 일수는 0으로 봅니다.
+
+사용 예:
+    python -m ecojourney.service.streaks show <학번>
+    python -m ecojourney.service.streaks rebuild    # 탄소 입력 로그로 전체 재계산 (점검용)
+"""
+
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from sqlalchemy import case, event, inspect, select
+from sqlalchemy.orm import Session
+
+from ..models import CarbonLog, StreakRecord
+
+logger = logging.getLogger(__name__)
+
+_streak = StreakRecord.__table__
+_carbon = CarbonLog.__table__
+
+
+def week_start_of(day: date) -> date:
+    """날짜가 속한 주의 월요일"""
+    return day - timedelta(days=day.weekday())
+
+
+def day_bit(day: date) -> int:
+    """요일 비트 (월=1, 화=2, ... 일=64)"""
+    return 1 << day.weekday()
+
+
+def compute_streak(days: Iterable[date]) -> Dict[str, Any]:
+    """
+    기록 날짜들로 연속 기록 계산 (재계산/백필용)
+
+    Returns:
+        {"week_start", "day_mask", "current_streak", "best_streak", "last_log_date"} (마지막 기록이 속한 주 기준)
+    """
+    days = sorted(set(days))
+    best = current = 0
+    previous = None
+    for day in days:
+        current = current + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        best = max(best, current)
+        previous = day
+    last = days[-1]
+    week_start = week_start_of(last)
+    mask = 0
+    for day in days:
+        if day >= week_start:
+            mask |= day_bit(day)
+    return {
+        "week_start": week_start,
+        "day_mask": mask,
+        "current_streak": current,
+        "best_streak": best,
+        "last_log_date": last,
+    }
+
+
+def _insert_for(connection):
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    return upsert
+
+
+def record_day(connection, student_id: str, log_date: date) -> Optional[date]:
+    """
+    탄소 입력 1일을 연속 기록에 반영 (UPSERT 1회, O(1))
+
+    Returns:
+        반영 후 last_log_date (log_date보다 늦으면 과거 날짜 기록이므로 호출자가 재계산)
+    """
+    upsert = _insert_for(connection)
+    yesterday = log_date - timedelta(days=1)
+    week_start = week_start_of(log_date)
+    bit = day_bit(log_date)
+    t = _streak.c
+
+    next_current = case(
+        (t.last_log_date == yesterday, t.current_streak + 1),
+        (t.last_log_date.is_(None) | (t.last_log_date < yesterday), 1),
+        else_=t.current_streak,
+    )
+    statement = upsert(_streak).values(
+        student_id=student_id,
+        week_start=week_start,
+        day_mask=bit,
+        current_streak=1,
+        best_streak=1,
+        last_log_date=log_date,
+        updated_at=datetime.now(),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[t.student_id],
+        set_={
+            "day_mask": case(
+                (t.week_start == week_start, t.day_mask.op("|")(bit)),
+                (t.week_start < week_start, bit),
+                else_=t.day_mask,
+            ),
+            "week_start": case((t.week_start < week_start, week_start), else_=t.week_start),
+            "current_streak": next_current,
+            "best_streak": case((next_current > t.best_streak, next_current), else_=t.best_streak),
+            "last_log_date": case(
+                (t.last_log_date.is_(None) | (t.last_log_date < log_date), log_date),
+                else_=t.last_log_date,
+            ),
+            "updated_at": statement.excluded.updated_at,
+        },
+    ).returning(t.last_log_date)
+    return connection.execute(statement).scalar()
+
+
+def _write_streaks(connection, rows: List[Dict[str, Any]]) -> None:
+    """재계산한 연속 기록 저장 (최장 연속 일수는 기존 값보다 줄이지 않음)"""
+    upsert = _insert_for(connection)
+    statement = upsert(_streak).values(rows)
+    t = _streak.c
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[t.student_id],
+            set_={
+                "week_start": statement.excluded.week_start,
+                "day_mask": statement.excluded.day_mask,
+                "current_streak": statement.excluded.current_streak,
+                "best_streak": case(
+                    (statement.excluded.best_streak > t.best_streak, statement.excluded.best_streak),
+                    else_=t.best_streak,
+                ),
+                "last_log_date": statement.excluded.last_log_date,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    )
+
+
+def _log_days(connection, student_ids: Optional[Iterable[str]] = None) -> Dict[str, List[date]]:
+    """학번별 탄소 입력 날짜 (오름차순)"""
+    query = select(_carbon.c.student_id, _carbon.c.log_date).where(
+        _carbon.c.source == "carbon_input", _carbon.c.log_date.is_not(None)
+    )
+    if student_ids is not None:
+        query = query.where(_carbon.c.student_id.in_(list(student_ids)))
+    rows = connection.execute(query.distinct().order_by(_carbon.c.student_id, _carbon.c.log_date)).all()
+    return {student_id: [day for _, day in group] for student_id, group in groupby(rows, key=lambda r: r[0])}
+
+
+def recompute_streaks(connection, student_ids: Iterable[str]) -> None:
+    """사용자들의 연속 기록을 탄소 입력 날짜로 다시 계산 (기록이 모두 사라진 사용자는 연속 일수 0)"""
+    student_ids = set(student_ids)
+    days_by_student = _log_days(connection, student_ids)
+    now = datetime.now()
+    rows = []
+    for student_id in student_ids:
+        days = days_by_student.get(student_id)
+        if days:
+            rows.append(dict(compute_streak(days), student_id=student_id, updated_at=now))
+        else:
+            rows.append({
+                "student_id": student_id,
+                "week_start": week_start_of(date.today()),
+                "day_mask": 0,
+                "current_streak": 0,
+                "best_streak": 0,
+                "last_log_date": None,
+                "updated_at": now,
+            })
+    if rows:
+        _write_streaks(connection, rows)
+
+
+def _previous(obj, attr: str):
+    """flush 전 DB 값 (변경되지 않았으면 현재 값)"""
+    history = inspect(obj).attrs[attr].history
+    return history.deleted[0] if history.deleted else getattr(obj, attr)
+
+
+def _log_key(obj, previous: bool = False) -> Optional[Tuple[str, date]]:
+    """탄소 입력이면 (학번, 날짜), 아니면 None"""
+    value = (lambda attr: _previous(obj, attr)) if previous else (lambda attr: getattr(obj, attr))
+    if value("source") != "carbon_input" or value("log_date") is None:
+        return None
+    return value("student_id"), value("log_date")
+
+
+def _track_streaks(session, flush_context) -> None:
+    """flush된 탄소 입력을 연속 기록에 반영 (새 기록은 O(1), 수정/삭제는 해당 사용자만 재계산)"""
+    recorded: List[Tuple[str, date]] = []
+    recompute = set()
+    for obj in session.new:
+        if isinstance(obj, CarbonLog):
+            key = _log_key(obj)
+            if key is not None:
+                recorded.append(key)
+    for obj in session.dirty:
+        if isinstance(obj, CarbonLog) and session.is_modified(obj):
+            before, after = _log_key(obj, previous=True), _log_key(obj)
+            if before == after:
+                continue  # 같은 날 덮어쓰기
+            if before is None:
+                recorded.append(after)
+            else:
+                recompute.add(before[0])
+                if after is not None:
+                    recompute.add(after[0])
+    for obj in session.deleted:
+        if isinstance(obj, CarbonLog):
+            key = _log_key(obj, previous=True)
+            if key is not None:
+                recompute.add(key[0])
+
+    if not recorded and not recompute:
+        return
+    connection = session.connection()
+    for student_id, log_date in sorted(recorded, key=lambda key: key[1]):
+        if student_id in recompute:
+            continue
+        last_log_date = record_day(connection, student_id, log_date)
+        if last_log_date is not None and last_log_date > log_date:
+            recompute.add(student_id)  # 과거 날짜 기록
+    if recompute:
+        recompute_streaks(connection, recompute)
+
+
+def register_hooks() -> None:
+    """Session after_flush 훅 등록 (db.session_hooks에서 호출, 여러 번 호출해도 한 번만 등록)"""
+    if not event.contains(Session, "after_flush", _track_streaks):
+        event.listen(Session, "after_flush", _track_streaks)
+
+
+def get_streak(session, student_id: str, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    연속 기록 조회 (1행 조회, 로그를 읽지 않음)
+
+    Returns:
+        {"week_days": 이번 주 기록 일수, "day_mask": 이번 주 기록 요일 비트,
+         "current_streak": 오늘/어제까지 이어진 연속 일수 (끊겼으면 0), "best_streak": 최장 연속 일수}
+    """
+    today = today or date.today()
+    row = session.execute(
+        select(
+            _streak.c.week_start, _streak.c.day_mask, _streak.c.current_streak,
+            _streak.c.best_streak, _streak.c.last_log_date,
+        ).where(_streak.c.student_id == student_id)
+    ).first()
+    if row is None:
+        return {"week_days": 0, "day_mask": 0, "current_streak": 0, "best_streak": 0}
+
+    mask = row.day_mask if row.week_start == week_start_of(today) else 0
+    alive = row.last_log_date is not None and row.last_log_date >= today - timedelta(days=1)
+    return {
+        "week_days": bin(mask).count("1"),
+        "day_mask": mask,
+        "current_streak": row.current_streak if alive else 0,
+        "best_streak": row.best_streak,
+    }
+
+
+def rebuild_streaks(session) -> int:
+    """
+    탄소 입력 로그로 전체 사용자 연속 기록 재계산 (백필/점검용, 커밋은 호출자가 수행)
+
+    Returns:
+        저장된 연속 기록 행 수
+    """
+    connection = session.connection()
+    days_by_student = _log_days(connection)
+    now = datetime.now()
+    rows = [
+        dict(compute_streak(days), student_id=student_id, updated_at=now)
+        for student_id, days in days_by_student.items()
+    ]
+    if rows:
+        _write_streaks(connection, rows)
+    return len(rows)
+
+
+if __name__ == "__main__":
+    import sys
+    from sqlmodel import Session as SQLModelSession
+    from ..db.write_queue import create_writer_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    engine = create_writer_engine()
+    if command == "show" and len(sys.argv) > 2:
+        with SQLModelSession(engine) as session:
+            streak = get_streak(session, sys.argv[2])
+        days = "".join(day if streak["day_mask"] & (1 << i) else "·" for i, day in enumerate("월화수목금토일"))
+        print(f"이번 주 {days} ({streak['week_days']}일), 연속 {streak['current_streak']}일, 최장 {streak['best_streak']}일")
+    elif command == "rebuild":
+        with SQLModelSession(engine) as session:
+            rows = rebuild_streaks(session)
+            session.commit()
+        print(f"✅ 연속 기록 {rows}행 재계산")
+    else:
+        print("사용법: python -m ecojourney.service.streaks [show 학번|rebuild]")
+        sys.exit(1)
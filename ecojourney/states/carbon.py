@@ -23,6 +23,8 @@ class CarbonState(AuthState):
     is_saving: bool = False
     is_save_success: bool = False
     saved_logs_history: List[Dict[str, Any]] = []
+    archived_logs_history: List[Dict[str, Any]] = []  # 보관(archive)된 오래된 로그 (요청 시에만 조회)
+    archived_logs_loaded: bool = False  # 보관 로그를 불러왔는지 (마이페이지 "오래된 기록 불러오기")
     has_today_log: bool = False  # 오늘 날짜에 저장된 로그가 있는지
     
     # 정책/혜택 후보 (LLM은 이 목록 안에서만 선택)
@@ -1168,13 +1170,9 @@ class CarbonState(AuthState):
             # all_activities를 JSON으로 변환
             activities_json = json.dumps(self.all_activities, ensure_ascii=False, default=str)
             
-            # 오늘 날짜의 기존 로그 확인 (SQLModel Session 사용)
-            from sqlmodel import Session, create_engine, select
-            import os
-            
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
+            # 오늘 날짜의 기존 로그 확인 (비동기 세션 사용, 이벤트 루프를 막지 않음)
+            from sqlmodel import select
+            from ..db.async_session import async_session
             
             today = date.today()
             
@@ -1186,27 +1184,15 @@ class CarbonState(AuthState):
             if not self.is_report_calculated:
                 await self.calculate_report()
             
-            with Session(engine) as session:
-                # 과거 챌린지 로그(source가 잘못된 경우)를 정정하여 덮어쓰기 방지
-                try:
-                    session.exec(
-                        text(
-                            "UPDATE carbonlog "
-                            "SET source = 'challenge' "
-                            "WHERE (source IS NULL OR source = 'carbon_input') "
-                            "AND ai_feedback LIKE '챌린지 보상:%'"
-                        )
-                    )
-                    session.commit()
-                except Exception as mig_err:
-                    logger.error(f"[저장] 챌린지 로그 소스 수정 오류: {mig_err}")
-                
-                stmt = select(CarbonLog).where(
+            # 과거 챌린지 로그의 source 정정은 db/data_repairs.py의 1회성 보정으로 이동
+            # (저장 경로에서는 본인 데이터만 조회/수정)
+            async with async_session() as session:
+                stmt = select(CarbonLog.id).where(
                     CarbonLog.student_id == self.current_user_id,
                     CarbonLog.log_date == today,
                     CarbonLog.source == "carbon_input"
                 )
-                existing_log = session.exec(stmt).first()
+                existing_log = (await session.exec(stmt)).first()
                 is_new_log = existing_log is None
                 # 오늘 날짜 탄소 입력 로그 존재 여부 상태 반영
                 self.has_today_log = not is_new_log
@@ -1217,20 +1203,53 @@ class CarbonState(AuthState):
             # 포인트 계산 (한 번만 계산)
             points_earned = await self._calculate_points(total_emission)
             
-            with Session(engine) as session:
-                # 사용자 조회
-                user_stmt = select(User).where(User.student_id == self.current_user_id)
-                user = session.exec(user_stmt).first()
+            # 포인트 획득 이유 설명 생성 (포인트가 있을 때만)
+            description = "환경 친화적 활동"
+            if points_earned > 0:
+                reasons = []
+                if self.total_saved_emission > 0:
+                    reasons.append(f"절약량 {self.total_saved_emission}kg")
+                # 빈티지 제품 사용 확인
+                vintage_count = sum(
+                    int(act.get("value", 0))
+                    for act in self.all_activities
+                    if act.get("category") == "의류"
+                    and (
+                        act.get("sub_category") == "빈티지"
+                        or act.get("subcategory") == "빈티지"
+                        or act.get("sub") == "빈티지"
+                    )
+                )
+                if vintage_count > 0:
+                    reasons.append(f"빈티지 제품 {vintage_count}개")
+                # 평균보다 낮은 배출량 확인
+                from ..service.average_data import get_total_average
+
+                avg_emission = get_total_average()
+                if total_emission < avg_emission:
+                    diff = avg_emission - total_emission
+                    reasons.append(f"평균보다 {diff:.1f}kg 낮음")
                 
-                if not user:
-                    self.save_message = "❌ 사용자 정보를 찾을 수 없습니다."
-                    self.is_save_success = False
-                    logger.error(f"탄소 로그 저장 오류: 사용자 {self.current_user_id}를 찾을 수 없음")
-                    return
+                description = ", ".join(reasons) if reasons else "환경 친화적 활동"
+            
+            from ..db.write_queue import submit_write
+            from ..service.points_ledger import apply_points
+            from ..service.challenge_rules import EVENT_CARBON_LOGGED, emit
+            
+            student_id = self.current_user_id
+            
+            def _save(session):
+                """오늘 로그 생성/수정 + 포인트 반영 (쓰기 큐에서 실행, 결과: (사용자 존재 여부, 잔액))"""
+                # 사용자 조회
+                user_exists = session.exec(
+                    select(User.id).where(User.student_id == student_id)
+                ).first()
+                if user_exists is None:
+                    return False, None
                 
                 # 오늘 탄소 입력 로그 조회 (같은 세션에서, source 필터)
                 log_stmt = select(CarbonLog).where(
-                    CarbonLog.student_id == self.current_user_id,
+                    CarbonLog.student_id == student_id,
                     CarbonLog.log_date == today,
                     CarbonLog.source == "carbon_input"
                 )
@@ -1239,7 +1258,8 @@ class CarbonState(AuthState):
                 # 기존 포인트 저장 (로그 업데이트 전)
                 old_points = log.points_earned if log and log.points_earned else 0
                 
-                # 로그 생성 또는 업데이트
+                # 로그 생성 또는 업데이트 (오늘 처음 저장하면 챌린지 이벤트 발생)
+                first_log_today = log is None
                 if log:
                     log.transport_km = transport_km
                     log.ac_hours = ac_hours
@@ -1250,7 +1270,7 @@ class CarbonState(AuthState):
                     log.source = "carbon_input"
                 else:
                     log = CarbonLog(
-                        student_id=self.current_user_id,
+                        student_id=student_id,
                         log_date=today,
                         transport_km=transport_km,
                         ac_hours=ac_hours,
@@ -1264,59 +1284,42 @@ class CarbonState(AuthState):
                 
                 session.add(log)
                 
-                # 사용자 포인트 업데이트 (같은 세션에서)
-                if is_new_log:
-                    # 새로운 로그: 포인트 추가
-                    user.current_points += points_earned
-                else:
-                    # 기존 로그 업데이트: 기존 포인트를 빼고 새 포인트 추가
-                    user.current_points = user.current_points - old_points + points_earned
-                
-                self.current_user_points = user.current_points
-                session.add(user)
-                
-                # 포인트 획득 이유 설명 생성 (포인트가 있을 때만)
-                description = "환경 친화적 활동"
-                if points_earned > 0:
-                    reasons = []
-                    if self.total_saved_emission > 0:
-                        reasons.append(f"절약량 {self.total_saved_emission}kg")
-                    # 빈티지 제품 사용 확인
-                    vintage_count = sum(
-                        int(act.get("value", 0))
-                        for act in self.all_activities
-                        if act.get("category") == "의류"
-                        and (
-                            act.get("sub_category") == "빈티지"
-                            or act.get("subcategory") == "빈티지"
-                            or act.get("sub") == "빈티지"
-                        )
-                    )
-                    if vintage_count > 0:
-                        reasons.append(f"빈티지 제품 {vintage_count}개")
-                    # 평균보다 낮은 배출량 확인
-                    from ..service.average_data import get_total_average
-
-                    avg_emission = get_total_average()
-                    if total_emission < avg_emission:
-                        diff = avg_emission - total_emission
-                        reasons.append(f"평균보다 {diff:.1f}kg 낮음")
-                    
-                    description = ", ".join(reasons) if reasons else "환경 친화적 활동"
-                
-                # 한 번에 commit
-                session.commit()
-                session.refresh(log)
-                session.refresh(user)
-                
-                if points_earned > 0:
-                    # 포인트 획득 이유 메시지 생성 (위에서 생성한 description 재사용)
-                    self.save_message = f"✅ 저장 완료! {description}으로 {points_earned}점을 획득했습니다."
-                else:
-                    self.save_message = "✅ 저장 완료!"
+                # 사용자 포인트 업데이트 (같은 트랜잭션에서, 원장 기록 포함)
+                # 새로운 로그: 포인트 추가 / 기존 로그 업데이트: 기존 포인트를 빼고 새 포인트 추가
+                new_balance = apply_points(
+                    session,
+                    student_id,
+                    points_earned - old_points,
+                    source="carbon_input",
+                    description="탄소배출 기록" if is_new_log else "탄소배출 기록 수정",
+                )
                 
-                self.is_save_success = True
-                self.has_today_log = True  # 저장 완료 후 오늘 날짜 로그 존재 표시
+                # 챌린지 규칙 반영 (같은 트랜잭션, 달성 시 보상 포함)
+                if first_log_today:
+                    challenge_result = emit(session, student_id, EVENT_CARBON_LOGGED, today)
+                    if challenge_result["balance"] is not None:
+                        new_balance = challenge_result["balance"]
+                return True, new_balance
+            
+            # 모든 쓰기는 단일 쓰기 큐를 통해 직렬화 (commit 완료 후 결과 반환)
+            user_found, new_balance = await submit_write(_save)
+            if not user_found:
+                self.save_message = "❌ 사용자 정보를 찾을 수 없습니다."
+                self.is_save_success = False
+                self.is_saving = False
+                logger.error(f"탄소 로그 저장 오류: 사용자 {self.current_user_id}를 찾을 수 없음")
+                return
+            if new_balance is not None:
+                self.current_user_points = new_balance
+            
+            if points_earned > 0:
+                # 포인트 획득 이유 메시지 생성 (위에서 생성한 description 재사용)
+                self.save_message = f"✅ 저장 완료! {description}으로 {points_earned}점을 획득했습니다."
+            else:
+                self.save_message = "✅ 저장 완료!"
+            
+            self.is_save_success = True
+            self.has_today_log = True  # 저장 완료 후 오늘 날짜 로그 존재 표시
             
             self.is_saving = False
             
@@ -1326,14 +1329,13 @@ class CarbonState(AuthState):
             # 저장 성공 시 마이페이지 데이터 새로고침 (포인트 로그 업데이트)
             if self.is_save_success:
                 try:
-                    # 주간 챌린지 진행도 업데이트는 ChallengeState에서 오버라이드된 save_carbon_log_to_db에서 처리됨
+                    # 챌린지 진행도(carbon_logged 이벤트)는 위 저장 트랜잭션에서 반영됨
 
                     # 사용자 포인트 정보 새로고침
-                    with Session(engine) as session:
-                        user_stmt = select(User).where(User.student_id == self.current_user_id)
-                        user = session.exec(user_stmt).first()
-                        if user:
-                            self.current_user_points = user.current_points
+                    from ..service.points_ledger import get_balance
+                    
+                    async with async_session() as session:
+                        self.current_user_points = await session.run_sync(get_balance, self.current_user_id)
                     
                     # ChallengeState의 load_mypage_data 호출하여 포인트 로그 등 새로고침
                     # AppState는 ChallengeState이므로 self를 통해 호출 가능
@@ -1362,6 +1364,37 @@ class CarbonState(AuthState):
         """저장된 로그 이력을 불러옵니다."""
         self.saved_logs_history = await self.get_saved_logs_history(limit=10)
     
+    async def load_archived_logs_history(self):
+        """보관된(오래된) 로그 이력을 불러옵니다. 라이브 DB가 아닌 Parquet 보관 파일에서 읽습니다."""
+        if not self.is_logged_in or not self.current_user_id:
+            self.archived_logs_history = []
+            self.archived_logs_loaded = False
+            return
+        
+        try:
+            import asyncio
+            from functools import partial
+            from ..service.carbon_archive import read_archived_logs
+            
+            # 파일 읽기는 이벤트 루프를 막지 않도록 스레드에서 실행
+            rows = await asyncio.get_running_loop().run_in_executor(
+                None, partial(read_archived_logs, self.current_user_id)
+            )
+            self.archived_logs_history = [
+                {
+                    "log_date": row["log_date"].strftime("%Y-%m-%d") if row["log_date"] else "",
+                    "source": row["source"],
+                    "total_emission": round(row["total_emission"] or 0.0, 2),
+                    "points_earned": row["points_earned"] or 0,
+                    "activities_count": len(CarbonLog(activities_json=row["activities_json"] or "[]").get_activities()),
+                }
+                for row in rows
+            ]
+            self.archived_logs_loaded = True
+        except Exception as e:
+            logger.error(f"보관 로그 이력 조회 오류: {e}", exc_info=True)
+            self.archived_logs_history = []
+    
     async def load_saved_activities(self):
         """저장된 입력 데이터를 불러옵니다. 오늘 날짜의 데이터를 불러옵니다."""
         if not self.is_logged_in or not self.current_user_id:
@@ -1433,24 +1466,15 @@ class CarbonState(AuthState):
             }
         
         try:
-            from ..models import CarbonLog
-            from sqlmodel import Session, create_engine, select
-            import os
-            
-            # SQLModel Session을 직접 사용하여 조회
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
-            
-            logs = []
-            with Session(engine) as session:
-                statement = select(CarbonLog).where(
-                    CarbonLog.student_id == self.current_user_id,
-                    CarbonLog.source == "carbon_input"
-                )
-                logs = list(session.exec(statement).all())
+            from ..db.async_session import async_session
+            from ..service.carbon_statistics import get_emission_totals, get_category_activity_counts
+            
+            # 개수/합계는 집계 쿼리로, 카테고리 분포는 JSON 집계 쿼리로 조회 (전체 로그 로드 없음)
+            async with async_session() as session:
+                totals = await session.run_sync(get_emission_totals, self.current_user_id)
+                category_counts = await session.run_sync(get_category_activity_counts, self.current_user_id)
             
-            if not logs:
+            if totals["total_logs"] == 0:
                 return {
                     "total_logs": 0,
                     "total_emission": 0.0,
@@ -1460,37 +1484,18 @@ class CarbonState(AuthState):
                 }
             
             # 통계 계산
-            total_logs = len(logs)
-            total_emission = sum(log.total_emission for log in logs)
+            total_logs = totals["total_logs"]
+            total_emission = totals["total_emission"]
             average_daily_emission = total_emission / total_logs if total_logs > 0 else 0.0
+            total_activities = sum(item["count"] for item in category_counts)
             
-            # 카테고리별 통계
-            category_breakdown = {}
-            total_activities = 0
-            
-            for log in logs:
-                activities = log.get_activities()
-                total_activities += len(activities)
-                
-                for activity in activities:
-                    # activity가 딕셔너리인지 확인
-                    if not isinstance(activity, dict):
-                        # 디버그 로그 제거 (배포용)
-                        pass
-                        continue
-                    
-                    category = activity.get("category", "기타")
-                    if category not in category_breakdown:
-                        category_breakdown[category] = 0
-                    category_breakdown[category] += 1
-            
-            # Dict를 리스트로 변환하고 비율 계산 (Reflex foreach에서 사용하기 위해)
+            # 리스트로 변환하고 비율 계산 (Reflex foreach에서 사용하기 위해)
             category_list = []
-            for k, v in category_breakdown.items():
-                percent = (v / total_activities * 100) if total_activities > 0 else 0
+            for item in category_counts:
+                percent = (item["count"] / total_activities * 100) if total_activities > 0 else 0
                 category_list.append({
-                    "name": k,
-                    "count": v,
+                    "name": item["name"],
+                    "count": item["count"],
                     "percent": round(percent, 1)
                 })
             
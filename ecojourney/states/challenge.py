@@ -4,11 +4,9 @@
 
 import reflex as rx
 from typing import List, Dict, Any, Optional
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 import logging
-import random
 from .mileage import MileageState
-from ..models import Challenge, ChallengeProgress, User
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +23,8 @@ class ChallengeState(MileageState):
     daily_quiz_question: str = ""
     daily_quiz_answer: str = ""
     daily_content_date: Optional[date] = None
+    current_streak: int = 0  # 오늘/어제까지 이어진 탄소 입력 연속 일수
+    best_streak: int = 0  # 최장 연속 일수
     
     # 탄소 통계 개별 변수 (Reflex에서 Dict 접근 제한 때문에 분리)
     carbon_total_logs: int = 0
@@ -40,414 +40,99 @@ class ChallengeState(MileageState):
     monthly_daily_data: List[Dict[str, Any]] = []  # 한달 일별 배출량 데이터
     
     def ensure_default_challenges(self):
-        """필수 기본 챌린지(주간/일일) 생성"""
+        """필수 기본 챌린지(주간/일일) 생성 (프로세스당 한 번, service/challenge_rules.py의 기본 규칙)"""
         try:
-            from sqlmodel import Session, create_engine, select
-            import os
+            from ..db.engine import get_engine
+            from ..service.challenge_rules import ensure_default_challenges
 
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
-
-            # 보상/목표 기본값 정의
-            default_challenges = [
-                {"title": "7일 연속 기록", "type": "WEEKLY_STREAK", "goal_value": 7, "reward_points": 10},
-                {"title": "아티클 읽기", "type": "DAILY_INFO", "goal_value": 1, "reward_points": 1},
-                {"title": "OX 퀴즈 풀기", "type": "DAILY_QUIZ", "goal_value": 1, "reward_points": 1},
-            ]
-
-            with Session(engine) as session:
-                titles = [item["title"] for item in default_challenges]
-                existing = session.exec(select(Challenge).where(Challenge.title.in_(titles))).all()
-                existing_map = {c.title: c for c in existing}
-
-                created = 0
-                for item in default_challenges:
-                    existing_ch = existing_map.get(item["title"])
-                    if existing_ch:
-                        updated = False
-                        if existing_ch.reward_points != item["reward_points"]:
-                            existing_ch.reward_points = item["reward_points"]
-                            updated = True
-                        if existing_ch.goal_value != item["goal_value"]:
-                            existing_ch.goal_value = item["goal_value"]
-                            updated = True
-                        if existing_ch.type != item["type"]:
-                            existing_ch.type = item["type"]
-                            updated = True
-                        if updated:
-                            session.add(existing_ch)
-                            created += 1  # reuse counter for commit trigger
-                    else:
-                        ch = Challenge(
-                            title=item["title"],
-                            type=item["type"],
-                            goal_value=item["goal_value"],
-                            reward_points=item["reward_points"],
-                            is_active=True,
-                            created_at=datetime.now()
-                        )
-                        session.add(ch)
-                        created += 1
-                if created:
-                    session.commit()
+            ensure_default_challenges(get_engine())
         except Exception as e:
             logger.error(f"기본 챌린지 생성 오류: {e}", exc_info=True)
 
     def load_active_challenges(self):
-        """활성화된 챌린지 목록 로드"""
+        """활성화된 챌린지 목록 로드 (규칙 인덱스 캐시, 만료 시에만 조회)"""
         try:
             self.ensure_default_challenges()
 
-            from sqlmodel import Session, create_engine, select
-            import os
-            
-            # SQLModel Session을 직접 사용하여 조회
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
-            
-            challenges = []
-            with Session(engine) as session:
-                statement = select(Challenge).where(Challenge.is_active == True)
-                challenges = list(session.exec(statement).all())
-            
-            self.active_challenges = [
-                {
-                    "id": ch.id,
-                    "title": ch.title,
-                    "type": ch.type,
-                    "goal_value": ch.goal_value,
-                    "reward_points": ch.reward_points
-                }
-                for ch in challenges
-            ]
+            from sqlmodel import Session
+            from ..db.engine import get_engine
+            from ..service.challenge_rules import get_rule_index
+
+            with Session(get_engine()) as session:
+                index = get_rule_index(session)
+            self.active_challenges = [rule.to_dict() for rule in index.rules]
         except Exception as e:
             logger.error(f"챌린지 로드 오류: {e}", exc_info=True)
 
     async def load_daily_content(self):
-        """매일 하나의 정보글과 OX 퀴즈를 날짜 기반 랜덤으로 선택"""
+        """오늘의 정보글과 OX 퀴즈 (카탈로그 순환 일정에서 선택, 프로세스 전체가 날짜별로 공유)"""
         today = date.today()
         if self.daily_content_date == today and self.daily_info_title and self.daily_quiz_question:
             return
 
-        info_items = [
-            {
-                "title": "해양 플라스틱 오염",
-                "body": "전 세계 바다에는 이미 1억 5천만 톤의 플라스틱이 떠다니고 있고, 매년 800만 톤 이상이 새로 유입됩니다.",
-            },
-            {
-                "title": "미세플라스틱의 역습",
-                "body": "우리는 일주일마다 신용카드 한 장 무게만큼 미세플라스틱을 섭취하고 있습니다.",
-            },
-            {
-                "title": "음식물 쓰레기와 메탄",
-                "body": "음식물 쓰레기는 매립되면 CO₂보다 28배 강한 메탄가스를 배출합니다.",
-            },
-            {
-                "title": "패스트패션의 그림자",
-                "body": "패스트패션은 전 세계 탄소 배출의 10% 이상을 차지하며, 옷 한 벌에 수천 리터의 물이 쓰입니다.",
-            },
-            {
-                "title": "자동차 배출량",
-                "body": "자동차는 1km 이동할 때 약 120~200g CO₂를 배출합니다.",
-            },
-            {
-                "title": "지구 온난화 현실",
-                "body": "산업혁명 이후 지구 평균기온은 약 1.1℃ 상승했고, 이 변화가 폭염·폭우·산불을 더 자주 만듭니다.",
-            },
-            {
-                "title": "전기의 탄소 발자국",
-                "body": "우리가 쓰는 전기의 상당수는 여전히 화석연료 발전소에서 생산됩니다.",
-            },
-            {
-                "title": "뜨거운 물 사용의 비용",
-                "body": "뜨거운 물 1분 사용은 약 1.3kg CO₂ 배출과 비슷한 에너지를 소비합니다.",
-            },
-            {
-                "title": "쓰레기 매립지의 한계",
-                "body": "전 세계 주요 도시의 매립지는 포화 상태이며, 쓰레기는 더 이상 ‘버리면 끝’이 아닙니다.",
-            },
-            {
-                "title": "소고기의 탄소 발자국",
-                "body": "소고기 1kg 생산은 약 27kg CO₂를 배출해 자동차로 113km 주행한 것과 비슷합니다.",
-            },
-        ]
-
-        quiz_items = [
-            {"q": "물은 받을 때보다 틀어놓을 때가 더 많이 낭비된다.", "a": "O"},
-            {"q": "사용하지 않는 전등을 끄는 것만으로도 탄소를 줄일 수 있다.", "a": "O"},
-            {"q": "플라스틱을 재활용하면 새로 만드는 것보다 에너지가 더 든다.", "a": "X"},
-            {"q": "가까운 거리를 걸어가면 탄소 배출을 줄일 수 있다.", "a": "O"},
-            {"q": "음식물을 남겨도 환경에 큰 영향은 없다.", "a": "X"},
-            {"q": "엘리베이터 대신 계단을 이용하면 탄소 배출을 줄일 수 있다.", "a": "O"},
-            {"q": "샤워 시간을 조금만 줄여도 탄소가 줄어든다.", "a": "O"},
-            {"q": "텀블러를 쓰는 것보다 일회용 컵을 쓰는 것이 환경에 더 좋다.", "a": "X"},
-            {"q": "재활용은 분리만 잘하면 누구나 쉽게 실천할 수 있다.", "a": "O"},
-            {"q": "방을 환기할 때는 잠깐 열어두는 것이 에너지 낭비를 줄인다.", "a": "O"},
-            {"q": "에어컨 온도를 1℃만 올려도 전기 사용량이 줄어든다.", "a": "O"},
-            {"q": "자동차 혼자 타는 것보다 함께 타는 것이 탄소 배출을 줄인다.", "a": "O"},
-            {"q": "배달 음식을 시키는 것은 환경에 전혀 영향이 없다.", "a": "X"},
-            {"q": "분리배출할 때 라벨이나 내용물을 제거하는 것이 재활용률을 높인다.", "a": "O"},
-            {"q": "물을 데우는 것보다 찬물 사용이 탄소 배출을 줄인다.", "a": "O"},
-        ]
-
-        seed_val = today.toordinal()
-        rng = random.Random(seed_val)
-        info = rng.choice(info_items)
-        quiz = rng.choice(quiz_items)
-
-        self.daily_info_title = info["title"]
-        self.daily_info_body = info["body"]
-        self.daily_quiz_question = quiz["q"]
-        self.daily_quiz_answer = quiz["a"]
-        self.daily_content_date = today
-    
-    async def update_challenge_progress(self, challenge_id: int, increment: int = 1):
-        """챌린지 진행도 업데이트 (일일/주간 리셋 포함)"""
-        if not self.is_logged_in:
-            return
-        
         try:
-            from sqlmodel import Session, create_engine, select
-            import os
-
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
-
-            today = date.today()
-            this_monday = today - timedelta(days=today.weekday())
+            from ..service.daily_content import get_daily_content
 
-            with Session(engine) as session:
-                # 챌린지 조회
-                challenge = session.exec(
-                    select(Challenge).where(Challenge.id == challenge_id)
-                ).first()
-                if not challenge:
-                    return
-
-                # 진행도 조회 또는 생성
-                progress = session.exec(
-                    select(ChallengeProgress).where(
-                        ChallengeProgress.challenge_id == challenge_id,
-                        ChallengeProgress.student_id == self.current_user_id
-                    )
-                ).first()
-                
-                is_new_progress = False
-                if not progress:
-                    is_new_progress = True
-                    progress = ChallengeProgress(
-                        challenge_id=challenge_id,
-                        student_id=self.current_user_id,
-                        current_value=0,
-                        is_completed=False,
-                        last_updated=datetime.now() - timedelta(days=1),  # 어제로 설정하여 첫 기록 가능하도록
-                    )
-
-                # last_updated가 없거나 None이면 강제로 초기화 (오래된 날짜로 설정해 첫 기록이 가능하도록)
-                last_updated_date = progress.last_updated.date() if progress.last_updated else None
-                if last_updated_date is None:
-                    last_updated_date = (datetime.now() - timedelta(days=1)).date()
-                    progress.last_updated = datetime.combine(last_updated_date, datetime.min.time())
-
-                # 일일 챌린지는 날짜가 바뀌면 리셋
-                if challenge.type in ["DAILY_INFO", "DAILY_QUIZ"]:
-                    if last_updated_date != today:
-                        progress.current_value = 0
-                        progress.is_completed = False
-                        progress.completed_at = None
+            content = get_daily_content(today)
+        except Exception as e:
+            logger.error(f"오늘의 콘텐츠 로드 오류: {e}", exc_info=True)
+            return
 
-                # 주간 챌린지는 주가 바뀌면 리셋
-                if challenge.type == "WEEKLY_STREAK":
-                    if last_updated_date < this_monday:
-                        progress.current_value = 0
-                        progress.is_completed = False
-                        progress.completed_at = None
-                    # 같은 날 이미 기록했으면 진행도 증가하지 않음 (하루에 한 번만 카운트)
-                    # 단, 새로 생성된 진행도는 제외 (is_new_progress가 True이면 진행도 증가)
-                    elif not is_new_progress and last_updated_date == today:
-                        return
+        self.daily_info_title = content["info_title"]
+        self.daily_info_body = content["info_body"]
+        self.daily_quiz_question = content["quiz_question"]
+        self.daily_quiz_answer = content["quiz_answer"]
+        self.daily_content_date = today
 
-                # 이미 완료된 챌린지는 업데이트하지 않음
-                if progress.is_completed:
-                    return
+    async def _emit_challenge_event(self, event: str) -> List[str]:
+        """
+        챌린지 이벤트 반영 (쓰기 큐에서 해당 이벤트의 규칙 진행도만 갱신 + 달성 보상 지급)
 
-                # 진행도 업데이트
-                old_value = progress.current_value
-                progress.current_value += increment
-                progress.last_updated = datetime.now()
+        Returns:
+            이번 이벤트로 달성한 챌린지 제목 목록
+        """
+        if not self.is_logged_in:
+            return []
 
-                # 챌린지 목표 달성 확인
-                if progress.current_value >= challenge.goal_value:
-                    progress.is_completed = True
-                    progress.completed_at = datetime.now()
-                    
-                    # 보상 지급
-                    user = session.exec(
-                        select(User).where(User.student_id == self.current_user_id)
-                    ).first()
-                    if user:
-                        user.current_points += challenge.reward_points
-                        self.current_user_points = user.current_points
-                        session.add(user)
-                    
-                    # 포인트 로그 기록 (챌린지 출처)
-                    try:
-                        from ..models import CarbonLog
-                        log_entry = CarbonLog(
-                            student_id=self.current_user_id,
-                            log_date=today,
-                            total_emission=0.0,
-                            activities_json="[]",
-                            points_earned=challenge.reward_points,
-                            source="challenge",
-                            ai_feedback=f"챌린지 보상: {challenge.title}",
-                            created_at=datetime.now()
-                        )
-                        session.add(log_entry)
-                    except Exception as log_error:
-                        logger.error(f"챌린지 포인트 로그 생성 오류: {log_error}", exc_info=True)
+        from ..db.write_queue import submit_write
+        from ..service.challenge_rules import emit
 
-                # 진행도 저장 (세션 커밋)
-                session.add(progress)
-                session.commit()
-                session.refresh(progress)
+        student_id = self.current_user_id
+        self.ensure_default_challenges()
+        # 모든 쓰기는 단일 쓰기 큐를 통해 직렬화
+        result = await submit_write(lambda session: emit(session, student_id, event))
+        if result["balance"] is not None:
+            self.current_user_points = result["balance"]
+        return result["completed"]
 
-        except Exception as e:
-            logger.error(f"챌린지 진행도 업데이트 오류: {e}", exc_info=True)
-    
     def load_user_challenge_progress(self):
-        """사용자의 챌린지 진행도 로드"""
+        """사용자의 챌린지 진행도 로드 (진행도 1회 조회, 규칙은 캐시에서 계산, DB에 쓰지 않음)"""
         if not self.is_logged_in or not self.current_user_id:
             self.user_challenge_progress = []
             return
 
         try:
-            # 활성화된 챌린지 로드
-            self.load_active_challenges()
-            
-            # 사용자의 진행도 조회 (SQLModel Session 직접 사용)
-            from sqlmodel import Session, create_engine, select
-            import os
-            
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
-            
+            self.ensure_default_challenges()
+
+            from sqlmodel import Session
+            from ..db.engine import get_engine
+            from ..service.challenge_rules import get_progress
+            from ..service.streaks import get_streak
+
             today = date.today()
-            this_monday = today - timedelta(days=today.weekday())
-            
-            with Session(engine) as session:
-                statement = select(ChallengeProgress).where(
-                    ChallengeProgress.student_id == self.current_user_id
-                )
-                all_progress = list(session.exec(statement).all())
+            with Session(get_engine()) as session:
+                self.user_challenge_progress = get_progress(session, self.current_user_id, today)
+                # 마이페이지 연속 기록 (1행 조회)
+                streak = get_streak(session, self.current_user_id, today)
+                self.current_streak = streak["current_streak"]
+                self.best_streak = streak["best_streak"]
 
-                # 챌린지 정보와 진행도 결합
-                progress_dict = {p.challenge_id: p for p in all_progress}
-                
-                result = []
-                for challenge in self.active_challenges:
-                    challenge_id = challenge["id"]
-                    progress = progress_dict.get(challenge_id)
-                    
-                    # 주간 연속 기록용: 이번 주 기록 일수 재계산 (CarbonLog 기준)
-                    weekly_streak_value = 0
-                    if challenge["type"] == "WEEKLY_STREAK":
-                        from ..models import CarbonLog  # 지연 import
-                        weekly_logs = list(
-                            session.exec(
-                                select(CarbonLog).where(
-                                    CarbonLog.student_id == self.current_user_id,
-                                    CarbonLog.log_date >= this_monday,
-                                    CarbonLog.log_date <= today,
-                                    CarbonLog.source == "carbon_input",
-                                )
-                            ).all()
-                        )
-                        distinct_days = {log.log_date for log in weekly_logs if log.log_date}
-                        weekly_streak_value = len(distinct_days)
-                    
-                    if progress:
-                        # 일일/주간 리셋 처리 (UI 조회 시점에도 적용)
-                        last_updated_date = progress.last_updated.date() if progress.last_updated else None
-                        if last_updated_date is None:
-                            last_updated_date = (datetime.now() - timedelta(days=1)).date()
-                            progress.last_updated = datetime.combine(last_updated_date, datetime.min.time())
-                        
-                        if challenge["type"] in ["DAILY_INFO", "DAILY_QUIZ"]:
-                            if last_updated_date != today:
-                                progress.current_value = 0
-                                progress.is_completed = False
-                                progress.completed_at = None
-                                progress.last_updated = datetime.now()
-                                session.add(progress)
-                                session.commit()
-                                session.refresh(progress)
-                        
-                        if challenge["type"] == "WEEKLY_STREAK":
-                            if last_updated_date and last_updated_date < this_monday:
-                                # 주가 바뀐 경우 0부터 다시 시작
-                                progress.current_value = 0
-                                progress.is_completed = False
-                                progress.completed_at = None
-                                progress.last_updated = datetime.now()
-                            # CarbonLog 기준으로 이번 주 연속 기록 일수 재계산
-                            progress.current_value = weekly_streak_value
-                            if progress.current_value >= challenge["goal_value"]:
-                                progress.is_completed = True
-                            session.add(progress)
-                            session.commit()
-                            session.refresh(progress)
-                        
-                        progress_percent = (
-                            progress.current_value / challenge["goal_value"] * 100
-                            if challenge["goal_value"] > 0
-                            else 0
-                        )
-                        result.append(
-                            {
-                                "challenge_id": challenge_id,
-                                "title": challenge["title"],
-                                "type": challenge["type"],
-                                "goal_value": challenge["goal_value"],
-                                "current_value": progress.current_value,
-                                "progress_percent": min(progress_percent, 100),
-                                "is_completed": progress.is_completed,
-                                "reward_points": challenge["reward_points"],
-                            }
-                        )
-                    else:
-                        # 진행도가 없으면, WEEKLY_STREAK는 이번 주 기록 일수로 초기화
-                        current_value = weekly_streak_value if challenge["type"] == "WEEKLY_STREAK" else 0
-                        progress_percent = (
-                            current_value / challenge["goal_value"] * 100
-                            if challenge["goal_value"] > 0
-                            else 0
-                        )
-                        result.append(
-                            {
-                                "challenge_id": challenge_id,
-                                "title": challenge["title"],
-                                "type": challenge["type"],
-                                "goal_value": challenge["goal_value"],
-                                "current_value": current_value,
-                                "progress_percent": min(progress_percent, 100),
-                                "is_completed": False,
-                                "reward_points": challenge["reward_points"],
-                            }
-                        )
-                
-                self.user_challenge_progress = result
-            
         except Exception as e:
             logger.error(f"사용자 챌린지 진행도 로드 오류: {e}")
             self.user_challenge_progress = []
 
     async def complete_daily_info(self):
-        """일일 챌린지 - 정보 글 읽기 완료 처리"""
+        """일일 챌린지 - 정보 글 읽기 완료 처리 (article_read 이벤트)"""
         if not self.is_logged_in:
             self.challenge_message = "로그인 후 이용해주세요."
             return
@@ -459,13 +144,9 @@ class ChallengeState(MileageState):
 
         self.challenge_message = ""
         try:
-            self.ensure_default_challenges()
-            self.load_active_challenges()
-            challenge = next((c for c in self.active_challenges if c["type"] == "DAILY_INFO"), None)
-            if not challenge:
-                self.challenge_message = "챌린지를 불러올 수 없습니다."
-                return
-            await self.update_challenge_progress(challenge["id"], 1)
+            from ..service.challenge_rules import EVENT_ARTICLE_READ
+
+            await self._emit_challenge_event(EVENT_ARTICLE_READ)
             self.article_read_today = True  # 상태 업데이트
             self.challenge_message = "아티클 읽기 완료! 포인트가 적립됩니다."
             self.load_user_challenge_progress()
@@ -473,31 +154,29 @@ class ChallengeState(MileageState):
             self.challenge_message = f"아티클 읽기 처리 중 오류: {e}"
             logger.error(self.challenge_message, exc_info=True)
 
-    async def _complete_daily_quiz_with_answer(self, is_correct: bool):
-        """일일 챌린지 - OX 퀴즈 완료 처리 (내부 메서드)
+    def _quiz_answer_is_o(self) -> bool:
+        """오늘 퀴즈의 정답이 O인지 (콘텐츠를 불러오기 전 기본 문제의 정답은 O)"""
+        return self.daily_quiz_answer != "X"
+
+    async def _complete_daily_quiz_with_answer(self, answer_o: bool):
+        """일일 챌린지 - OX 퀴즈 완료 처리 (내부 메서드, 정답이면 quiz_solved 이벤트)
         
         Args:
-            is_correct: 사용자가 선택한 답이 정답인지 여부 (True: O, False: X)
+            answer_o: 사용자가 선택한 답 (True: O, False: X)
         """
         if not self.is_logged_in:
             self.challenge_message = "로그인 후 이용해주세요."
             return
         self.challenge_message = ""
         try:
-            # 정답 확인: "지구 온난화를 막기 위해서는 일회용품 사용을 줄여야 한다"의 정답은 O(True)
-            correct_answer = True  # O가 정답
-            
-            if is_correct != correct_answer:
+            # 정답 확인: 오늘의 퀴즈 정답(daily_quiz_answer)과 비교
+            if answer_o != self._quiz_answer_is_o():
                 self.challenge_message = "틀렸습니다. 다시 시도해주세요."
                 return
             
-            self.ensure_default_challenges()
-            self.load_active_challenges()
-            challenge = next((c for c in self.active_challenges if c["type"] == "DAILY_QUIZ"), None)
-            if not challenge:
-                self.challenge_message = "챌린지를 불러올 수 없습니다."
-                return
-            await self.update_challenge_progress(challenge["id"], 1)
+            from ..service.challenge_rules import EVENT_QUIZ_SOLVED
+
+            await self._emit_challenge_event(EVENT_QUIZ_SOLVED)
             self.challenge_message = "정답입니다! OX 퀴즈 완료! 포인트가 적립되었습니다."
             self.load_user_challenge_progress()
         except Exception as e:
@@ -514,213 +193,84 @@ class ChallengeState(MileageState):
 
     async def complete_daily_quiz(self):
         """일일 챌린지 - 정답 처리 (기존 API 호환용)"""
-        await self._complete_daily_quiz_with_answer(True)
-
-    async def mark_daily_record(self):
-        """주간 챌린지 - 7일 연속 기록 진행도 업데이트"""
-        if not self.is_logged_in:
-            return
-        
-        try:
-            self.ensure_default_challenges()
-            self.load_active_challenges()
-            
-            challenge = next((c for c in self.active_challenges if c["type"] == "WEEKLY_STREAK"), None)
-            if not challenge:
-                return
+        await self._complete_daily_quiz_with_answer(self._quiz_answer_is_o())
 
-            await self.update_challenge_progress(challenge["id"], 1)
-            
-            await self.load_user_challenge_progress()
-        except Exception as e:
-            logger.error(f"주간 챌린지 업데이트 오류: {e}", exc_info=True)
-    
     # 포인트 로그 관련 변수
     points_log: List[Dict[str, Any]] = []
     displayed_points_log: List[Dict[str, Any]] = []  # 화면에 표시할 포인트 로그
-    points_log_display_limit: int = 10  # 표시할 포인트 로그 개수
-    
+    points_log_page_size: int = 10  # 한 번에 불러올 포인트 로그 개수
+    points_log_cursor: str = ""  # 다음 페이지 커서 (마지막으로 불러온 항목 위치)
+    points_log_has_more: bool = False  # 더 불러올 내역이 있는지 여부
+
+    def _fetch_points_log_page(self, cursor: Optional[str]):
+        """포인트 변동 내역 한 페이지 조회 (DB에서 UNION ALL + 키셋 페이지네이션)"""
+        from ..service.points_history import fetch_points_history_page
+        from sqlmodel import Session
+        from ..db.engine import get_engine
+
+        engine = get_engine()
+
+        with Session(engine) as session:
+            items, next_cursor = fetch_points_history_page(
+                session,
+                self.current_user_id,
+                cursor=cursor,
+                limit=self.points_log_page_size,
+            )
+        self.points_log_cursor = next_cursor or ""
+        self.points_log_has_more = next_cursor is not None
+        return items
+
     def load_more_points_log(self):
-        """포인트 로그 더보기 (10개씩 추가)"""
-        self.points_log_display_limit += 10
-        # 표시할 로그 업데이트 (양수/음수 모두 포함)
-        self.displayed_points_log = self.points_log[:self.points_log_display_limit] if self.points_log else []
-    
+        """포인트 로그 더보기 (다음 10개를 DB에서 추가 조회)"""
+        if not self.is_logged_in or not self.current_user_id or not self.points_log_has_more:
+            return
+
+        try:
+            items = self._fetch_points_log_page(self.points_log_cursor)
+            self.points_log = self.points_log + items
+            self.displayed_points_log = self.points_log
+        except Exception as e:
+            logger.error(f"포인트 로그 더보기 오류: {e}", exc_info=True)
+
     def load_points_log(self):
-        """포인트 변동 내역 로드 (획득/차감 모두 포함)"""
+        """포인트 변동 내역 첫 페이지 로드 (획득/차감 모두 포함, 최신순)"""
+        self.points_log_cursor = ""
+        self.points_log_has_more = False
         if not self.is_logged_in or not self.current_user_id:
             self.points_log = []
+            self.displayed_points_log = []
             return
 
         try:
-            from ..models import CarbonLog, PointsLog
-            from sqlmodel import Session, create_engine, select, desc, union_all
-            from sqlalchemy import text
-            import os
-
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
-
-            with Session(engine) as session:
-                result = []
-                
-                # 1. CarbonLog에서 포인트 획득 내역 (양수만)
-                carbon_logs = session.exec(
-                    select(CarbonLog).where(
-                        CarbonLog.student_id == self.current_user_id,
-                        CarbonLog.points_earned > 0
-                    ).order_by(desc(CarbonLog.log_date), desc(CarbonLog.created_at))
-                ).all()
-                
-                for log in carbon_logs:
-                    source = getattr(log, "source", None) or "carbon_input"
-                    description = "탄소배출 기록" if source == "carbon_input" else "챌린지 보상"
-                    if log.ai_feedback:
-                        description = log.ai_feedback
-                    points = log.points_earned
-                    result.append({
-                        "date": log.log_date.strftime("%Y-%m-%d") if log.log_date else "",
-                        "points": points,
-                        "is_positive": True,  # CarbonLog는 항상 양수
-                        "source": source,
-                        "description": description,
-                        "created_at": log.created_at if hasattr(log, "created_at") else None
-                    })
-                
-                # 2. PointsLog에서 모든 포인트 변동 내역 (양수/음수 모두)
-                points_logs = session.exec(
-                    select(PointsLog).where(
-                        PointsLog.student_id == self.current_user_id
-                    ).order_by(desc(PointsLog.created_at))
-                ).all()
-                
-                for log in points_logs:
-                    points = log.points
-                    # "탄소 배출 리포트 저장"으로 시작하는 description은 필터링 (중복 방지)
-                    description = log.description or log.source or "포인트 변동"
-                    if description and description.startswith("탄소 배출 리포트 저장"):
-                        continue  # 이 항목은 건너뛰기 (CarbonLog에서 이미 표시됨)
-                    # 양수/음수 모두 포함 (0은 제외하지 않음)
-                    result.append({
-                        "date": log.log_date.strftime("%Y-%m-%d") if log.log_date else (log.created_at.strftime("%Y-%m-%d") if hasattr(log, "created_at") and log.created_at else ""),
-                        "points": points,
-                        "is_positive": points > 0,  # 양수/음수 플래그
-                        "source": log.source,
-                        "description": description,
-                        "created_at": log.created_at if hasattr(log, "created_at") else None
-                    })
-                
-                # 3. 마일리지 환산 내역 (포인트 차감)
-                from ..models import MileageRequest
-                mileage_requests = session.exec(
-                    select(MileageRequest).where(
-                        MileageRequest.student_id == self.current_user_id,
-                        MileageRequest.status == "APPROVED"
-                    ).order_by(desc(MileageRequest.processed_at))
-                ).all()
-                
-                for req in mileage_requests:
-                    points = -req.request_points  # 음수로 표시
-                    result.append({
-                        "date": req.processed_at.strftime("%Y-%m-%d") if req.processed_at else "",
-                        "points": points,
-                        "is_positive": False,  # 마일리지 환산은 항상 음수
-                        "source": "mileage_conversion",
-                        "description": f"마일리지 환산 ({req.request_points}점 → {req.converted_mileage} 마일리지)",
-                        "created_at": req.processed_at if req.processed_at else None
-                    })
-                
-                # created_at 기준으로 정렬 (최신순)
-                result.sort(key=lambda x: x.get("created_at") or datetime.min, reverse=True)
-                
-                self.points_log = result
-                # 초기 표시 로그 설정 (최근 10개)
-                self.points_log_display_limit = 10
-                self.displayed_points_log = result[:10] if result else []
-
+            self.points_log = self._fetch_points_log_page(None)
+            self.displayed_points_log = self.points_log
         except Exception as e:
             logger.error(f"포인트 로그 로드 오류: {e}", exc_info=True)
             self.points_log = []
+            self.displayed_points_log = []
     
     async def load_mypage_data(self):
         """마이페이지 모든 데이터 로드"""
+        # 보관된 지난 기록은 "오래된 기록 불러오기"를 누를 때만 조회 (다른 사용자의 이전 결과가 남지 않도록 비움)
+        self.archived_logs_history = []
+        self.archived_logs_loaded = False
         if not self.is_logged_in or not self.current_user_id:
             return
         
         try:
-            # 사용자 포인트 정보 새로고침 - 모든 포인트 로그를 합산하여 총 포인트 계산
-            from ..models import User, CarbonLog, PointsLog, MileageRequest
-            from sqlmodel import Session, create_engine, select
-            import os
+            # 사용자 포인트 정보 새로고침 - 원장의 최신 잔액을 읽기만 함 (O(1), DB 쓰기 없음)
+            # 이력 합계와의 정합성은 points_ledger.reconcile()로 오프라인 검사
+            from ..service.points_ledger import get_balance
+            from sqlmodel import Session
+            from ..db.engine import get_engine
             
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
+            engine = get_engine()
             
             with Session(engine) as session:
-                user_stmt = select(User).where(User.student_id == self.current_user_id)
-                user = session.exec(user_stmt).first()
-                if user:
-                    # 포인트 로그를 합산하여 총 포인트 계산
-                    total_points = 0
-                    
-                    # 1. CarbonLog에서 획득한 포인트 합산
-                    carbon_logs = session.exec(
-                        select(CarbonLog).where(
-                            CarbonLog.student_id == self.current_user_id,
-                            CarbonLog.points_earned > 0
-                        )
-                    ).all()
-                    for log in carbon_logs:
-                        total_points += log.points_earned
-                    
-                    # 2. PointsLog에서 모든 포인트 변동 합산
-                    points_logs = session.exec(
-                        select(PointsLog).where(
-                            PointsLog.student_id == self.current_user_id
-                        )
-                    ).all()
-                    for log in points_logs:
-                        total_points += log.points
-                    
-                    # 3. 마일리지 환산으로 차감된 포인트 빼기
-                    mileage_requests = session.exec(
-                        select(MileageRequest).where(
-                            MileageRequest.student_id == self.current_user_id,
-                            MileageRequest.status == "APPROVED"
-                        )
-                    ).all()
-                    for req in mileage_requests:
-                        total_points -= req.request_points
-                    
-                    # 계산된 총 포인트를 사용자 포인트로 설정
-                    self.current_user_points = max(0, total_points)  # 음수 방지
-                    
-                    # DB의 current_points도 업데이트 (동기화)
-                    if user.current_points != self.current_user_points:
-                        user.current_points = self.current_user_points
-                        session.add(user)
-                        session.commit()
+                self.current_user_points = get_balance(session, self.current_user_id)
         except Exception as e:
             logger.error(f"사용자 포인트 새로고침 오류: {e}", exc_info=True)
-            # 오류 발생 시 DB 값 사용
-            try:
-                from ..models import User
-                from sqlmodel import Session, create_engine, select
-                import os
-                
-                db_path = os.path.join(os.getcwd(), "reflex.db")
-                db_url = f"sqlite:///{db_path}"
-                engine = create_engine(db_url, echo=False)
-                
-                with Session(engine) as session:
-                    user_stmt = select(User).where(User.student_id == self.current_user_id)
-                    user = session.exec(user_stmt).first()
-                    if user:
-                        self.current_user_points = user.current_points
-            except:
-                pass
         
         try:
             # 챌린지 진행도 로드
@@ -769,17 +319,16 @@ class ChallengeState(MileageState):
             self.monthly_daily_data = []
     
     async def save_carbon_log_to_db(self):
-        """탄소 로그 저장 후 주간 챌린지 진행도 업데이트"""
+        """탄소 로그 저장 후 챌린지 진행도 새로고침 (carbon_logged 이벤트는 저장 트랜잭션에서 반영됨)"""
         # 부모 클래스(CarbonState)의 내부 헬퍼 메서드를 직접 호출
         await self._save_carbon_log_to_db_internal()
         
-        # 저장 성공 시 주간 챌린지 진행도 업데이트
         if self.is_save_success:
             try:
-                await self.mark_daily_record()
+                self.load_user_challenge_progress()
             except Exception as e:
-                # 저장 자체는 성공했으므로, 챌린지 업데이트 실패는 부수 실패로 처리
-                logger.error(f"[ChallengeState] 주간 챌린지 업데이트 실패: {e}", exc_info=True)
+                # 저장 자체는 성공했으므로, 진행도 새로고침 실패는 부수 실패로 처리
+                logger.error(f"[ChallengeState] 챌린지 진행도 새로고침 실패: {e}", exc_info=True)
     
     def load_dashboard_statistics(self):
         """대시보드 통계 데이터 로드 (이번주/한달 배출량)"""
@@ -791,13 +340,10 @@ class ChallengeState(MileageState):
             return
         
         try:
-            from ..models import CarbonLog
-            from sqlmodel import Session, create_engine, select
-            import os
+            from sqlmodel import Session
+            from ..db.engine import get_engine
             
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
+            engine = get_engine()
             
             today = date.today()
             # 이번주 월요일 계산
@@ -805,33 +351,24 @@ class ChallengeState(MileageState):
             # 한달 전 날짜 계산
             one_month_ago = today - timedelta(days=30)
             
+            from ..service.carbon_statistics import get_daily_emission_buckets
+            
+            # 한달(today-30 ~ today) 일별 합계를 한 번의 GROUP BY 쿼리로 조회
+            # 이번주(월요일 ~ today)는 항상 이 범위에 포함되므로 같은 버킷을 재사용
             with Session(engine) as session:
-                # 이번주 로그 조회
-                weekly_stmt = select(CarbonLog).where(
-                    CarbonLog.student_id == self.current_user_id,
-                    CarbonLog.log_date >= this_monday,
-                    CarbonLog.log_date <= today
+                monthly_daily_dict = get_daily_emission_buckets(
+                    session, self.current_user_id, one_month_ago, today
                 )
-                weekly_logs = list(session.exec(weekly_stmt).all())
-                
-                # 한달 로그 조회
-                monthly_stmt = select(CarbonLog).where(
-                    CarbonLog.student_id == self.current_user_id,
-                    CarbonLog.log_date >= one_month_ago,
-                    CarbonLog.log_date <= today
-                )
-                monthly_logs = list(session.exec(monthly_stmt).all())
             
-            # 이번주 통계 계산
-            self.weekly_emission = round(sum(log.total_emission for log in weekly_logs), 2)
+            this_monday_key = this_monday.strftime("%Y-%m-%d")
+            weekly_daily_dict = {
+                day_key: emission
+                for day_key, emission in monthly_daily_dict.items()
+                if day_key >= this_monday_key
+            }
             
-            # 이번주 일별 데이터 생성
-            weekly_daily_dict = {}
-            for log in weekly_logs:
-                day_key = log.log_date.strftime("%Y-%m-%d")
-                if day_key not in weekly_daily_dict:
-                    weekly_daily_dict[day_key] = 0.0
-                weekly_daily_dict[day_key] += log.total_emission
+            # 이번주 통계 계산
+            self.weekly_emission = round(sum(weekly_daily_dict.values()), 2)
             
             # 이번주 최대 배출량 계산 (그래프 높이 정규화용)
             max_weekly_emission = max(weekly_daily_dict.values()) if weekly_daily_dict else 1.0
@@ -863,15 +400,7 @@ class ChallengeState(MileageState):
                 })
             
             # 한달 통계 계산
-            self.monthly_emission = round(sum(log.total_emission for log in monthly_logs), 2)
-            
-            # 한달 일별 데이터 생성 (최근 30일)
-            monthly_daily_dict = {}
-            for log in monthly_logs:
-                day_key = log.log_date.strftime("%Y-%m-%d")
-                if day_key not in monthly_daily_dict:
-                    monthly_daily_dict[day_key] = 0.0
-                monthly_daily_dict[day_key] += log.total_emission
+            self.monthly_emission = round(sum(monthly_daily_dict.values()), 2)
             
             # 한달 최대 배출량 계산 (그래프 높이 정규화용)
             max_monthly_emission = max(monthly_daily_dict.values()) if monthly_daily_dict else 1.0
@@ -995,7 +524,7 @@ class ChallengeState(MileageState):
         self.article_modal_open = False
 
     async def load_quiz_state(self):
-        """퀴즈 및 아티클 상태 로드 (오늘 이미 완료했는지 확인)"""
+        """퀴즈 및 아티클 상태 로드 (오늘 이미 완료했는지 확인, 진행도 1회 조회)"""
         if not self.is_logged_in or not self.current_user_id:
             self.quiz_answered = False
             self.quiz_is_correct = False
@@ -1003,74 +532,24 @@ class ChallengeState(MileageState):
             return
 
         try:
-            from sqlmodel import Session, create_engine, select
-            import os
+            from sqlmodel import Session
+            from ..db.engine import get_engine
+            from ..service.challenge_rules import EVENT_ARTICLE_READ, EVENT_QUIZ_SOLVED, WINDOW_DAILY, get_progress
 
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
-
-            today = date.today()
-
-            # 챌린지 로드
             self.ensure_default_challenges()
-            self.load_active_challenges()
-
-            quiz_challenge = next((c for c in self.active_challenges if c["type"] == "DAILY_QUIZ"), None)
-            info_challenge = next((c for c in self.active_challenges if c["type"] == "DAILY_INFO"), None)
-
-            with Session(engine) as session:
-                # DAILY_QUIZ 진행도 조회
-                if quiz_challenge:
-                    quiz_progress = session.exec(
-                        select(ChallengeProgress).where(
-                            ChallengeProgress.challenge_id == quiz_challenge["id"],
-                            ChallengeProgress.student_id == self.current_user_id
-                        )
-                    ).first()
-
-                    if quiz_progress and quiz_progress.last_updated:
-                        last_updated_date = quiz_progress.last_updated.date()
-                        if last_updated_date == today:
-                            # 오늘 날짜로 기록이 있고, 정답을 맞춘 경우에만 완료로 표시
-                            # 오답인 경우는 데이터베이스에 기록되지 않으므로, is_completed가 True인 경우만 완료로 처리
-                            if quiz_progress.is_completed:
-                                self.quiz_answered = True
-                                self.quiz_is_correct = True
-                            else:
-                                # is_completed가 False인 경우는 오래된 기록이거나 오류 상태
-                                # 오늘 날짜지만 완료되지 않은 경우는 초기화
-                                self.quiz_answered = False
-                                self.quiz_is_correct = False
-                        else:
-                            self.quiz_answered = False
-                            self.quiz_is_correct = False
-                    else:
-                        self.quiz_answered = False
-                        self.quiz_is_correct = False
-                else:
-                    self.quiz_answered = False
-                    self.quiz_is_correct = False
-
-                # DAILY_INFO 진행도 조회
-                if info_challenge:
-                    info_progress = session.exec(
-                        select(ChallengeProgress).where(
-                            ChallengeProgress.challenge_id == info_challenge["id"],
-                            ChallengeProgress.student_id == self.current_user_id
-                        )
-                    ).first()
+            with Session(get_engine()) as session:
+                progress = get_progress(session, self.current_user_id)
+
+            def completed_today(event: str) -> bool:
+                # 오답은 기록되지 않으므로 오늘 기간의 일일 규칙을 달성한 경우만 완료
+                return any(
+                    item["is_completed"]
+                    for item in progress
+                    if item["trigger_event"] == event and item["counter_window"] == WINDOW_DAILY
+                )
 
-                    if info_progress and info_progress.last_updated:
-                        last_updated_date = info_progress.last_updated.date()
-                        if last_updated_date == today and info_progress.is_completed:
-                            self.article_read_today = True
-                        else:
-                            self.article_read_today = False
-                    else:
-                        self.article_read_today = False
-                else:
-                    self.article_read_today = False
+            self.quiz_answered = self.quiz_is_correct = completed_today(EVENT_QUIZ_SOLVED)
+            self.article_read_today = completed_today(EVENT_ARTICLE_READ)
 
         except Exception as e:
             logger.error(f"챌린지 상태 로드 오류: {e}", exc_info=True)
@@ -1078,8 +557,8 @@ class ChallengeState(MileageState):
             self.quiz_is_correct = False
             self.article_read_today = False
 
-    async def answer_quiz(self, is_correct: bool):
-        """퀴즈 답변 처리 (정답: True, 오답: False)"""
+    async def answer_quiz(self, answer_o: bool):
+        """퀴즈 답변 처리 (O: True, X: False, 오늘의 퀴즈 정답과 비교)"""
         if not self.is_logged_in:
             self.challenge_message = "로그인 후 이용해주세요."
             return
@@ -1090,7 +569,7 @@ class ChallengeState(MileageState):
             return
 
         # 정답인 경우에만 상태를 완료로 기록
-        if is_correct:
+        if answer_o == self._quiz_answer_is_o():
             self.quiz_answered = True
             self.quiz_is_correct = True
             await self.complete_daily_quiz()
@@ -47,41 +47,51 @@ class MileageState(BattleState):
             return
 
         try:
-            from sqlmodel import Session, create_engine, select
-            import os
+            from sqlmodel import select
+            from ..db.write_queue import submit_write
+            from ..service.points_ledger import apply_points
             
             # 환산 비율: 포인트 1000점 = 비컴 마일리지 10점 (100:1 비율)
             # 즉, 포인트 1000점당 마일리지 10점
             converted_mileage = (self.mileage_request_points // 1000) * 10
+            student_id = self.current_user_id
+            request_points = self.mileage_request_points
             
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
-            
-            with Session(engine) as session:
-                # 사용자 조회 및 포인트 차감
-                user = session.exec(
-                    select(User).where(User.student_id == self.current_user_id)
-                ).first()
-                
-                if not user:
-                    self.mileage_error_message = "사용자를 찾을 수 없습니다."
-                    return
-                
-                user.current_points -= self.mileage_request_points
-                self.current_user_points = user.current_points
-                session.add(user)
+            def _convert(session):
+                """포인트 차감 + 환산 신청 기록 (쓰기 큐에서 실행, 결과: (오류 메시지, 잔액))"""
+                # 잔액이 충분할 때만 차감 (원장 기록 포함, 사용자가 없으면 None)
+                new_balance = apply_points(
+                    session,
+                    student_id,
+                    -request_points,
+                    source="mileage_conversion",
+                    description=f"마일리지 환산 ({request_points}점 → {converted_mileage} 마일리지)",
+                    require_sufficient=True,
+                )
+                if new_balance is None:
+                    user_exists = session.exec(
+                        select(User.id).where(User.student_id == student_id)
+                    ).first()
+                    if user_exists is None:
+                        return "사용자를 찾을 수 없습니다.", None
+                    return "보유 포인트가 부족합니다.", None
                 
                 # 환산 신청 기록 (자동 승인)
-                request = MileageRequest(
-                    student_id=self.current_user_id,
-                    request_points=self.mileage_request_points,
+                session.add(MileageRequest(
+                    student_id=student_id,
+                    request_points=request_points,
                     converted_mileage=converted_mileage,
                     status="APPROVED",  # 자동 승인
                     processed_at=datetime.now()
-                )
-                session.add(request)
-                session.commit()
+                ))
+                return None, new_balance
+            
+            # 모든 쓰기는 단일 쓰기 큐를 통해 직렬화 (commit은 큐에서 배치로 수행)
+            error_message, new_balance = await submit_write(_convert)
+            if error_message:
+                self.mileage_error_message = error_message
+                return
+            self.current_user_points = new_balance
             
             # 환산 내역 로그에 추가
             await self.load_mileage_conversion_logs()
@@ -108,12 +118,10 @@ class MileageState(BattleState):
             return
         
         try:
-            from sqlmodel import Session, create_engine, select, desc
-            import os
+            from sqlmodel import Session, select, desc
+            from ..db.engine import get_engine
             
-            db_path = os.path.join(os.getcwd(), "reflex.db")
-            db_url = f"sqlite:///{db_path}"
-            engine = create_engine(db_url, echo=False)
+            engine = get_engine()
             
             with Session(engine) as session:
                 statement = select(MileageRequest).where(
@@ -0,0 +1,75 @@
+"""
+테스트 공통 fixture
+
+DB 테스트는 SQLite(임시 파일)와 로컬 PostgreSQL에서 모두 실행합니다.
+
+- PostgreSQL: ECOJOURNEY_TEST_POSTGRES_URL(관리자 권한 URL)이 있으면 그 서버를,
+  없으면 pgserver 패키지가 설치된 경우 임시 디렉터리에 로컬 서버를 띄워 사용합니다.
+  둘 다 없으면 PostgreSQL 테스트는 건너뜁니다.
+- 테스트마다 새 DB(SQLite 파일 / PostgreSQL database)를 만들고 스키마를 생성합니다.
+
+실행:
+    python -m pytest -q
+    ECOJOURNEY_TEST_POSTGRES_URL=postgresql://postgres@localhost/postgres python -m pytest -q
+"""
+
+import os
+import tempfile
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+BACKENDS = ["sqlite", "postgresql"]
+
+
+@pytest.fixture(scope="session")
+def postgres_admin_url():
+    """PostgreSQL 관리자 URL (사용할 수 없으면 테스트 건너뜀)"""
+    url = os.getenv("ECOJOURNEY_TEST_POSTGRES_URL")
+    if url:
+        return url
+    try:
+        import pgserver
+    except ImportError:
+        pytest.skip("PostgreSQL 없음 (ECOJOURNEY_TEST_POSTGRES_URL 또는 pgserver 필요)")
+    data_dir = os.getenv("ECOJOURNEY_TEST_PGDATA") or os.path.join(tempfile.gettempdir(), "ecojourney-test-pgdata")
+    server = pgserver.get_server(data_dir, cleanup_mode=None)
+    return server.get_uri()
+
+
+@pytest.fixture(params=BACKENDS)
+def db_url(request, tmp_path):
+    """테스트 전용 빈 DB URL (SQLite 파일 / PostgreSQL 새 database)"""
+    if request.param == "sqlite":
+        yield f"sqlite:///{tmp_path / 'test.db'}"
+        return
+
+    admin_url = request.getfixturevalue("postgres_admin_url")
+    name = f"eco_test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(admin_url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE DATABASE "{name}"'))
+    try:
+        yield make_url(admin_url).set(database=name).render_as_string(hide_password=False)
+    finally:
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        admin.dispose()
+
+
+@pytest.fixture
+def engine(db_url):
+    """스키마를 만든 동기 엔진 (앱과 같은 Session 훅 등록)"""
+    from sqlmodel import SQLModel
+
+    from ecojourney import models  # noqa: F401  (테이블 메타데이터 등록)
+    from ecojourney.db.session_hooks import register_session_hooks
+
+    register_session_hooks()
+
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,136 @@
+"""동시 베팅(쓰기 큐 경유)에서 잔액/팀 점수/원장이 갱신 손실 없이 맞는지 확인"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from ecojourney.db.write_queue import WriteQueue, create_writer_engine
+from ecojourney.models import Battle, BattleParticipant, BattleScoreShard, PointsLedger, PointsLog, User
+from ecojourney.service.battle_bets import fold_scores, get_live_scores, place_bet
+from ecojourney.service.points_ledger import apply_points, reconcile
+
+COLLEGES = ["공과대학", "경영대학", "사범대학"]  # 세 번째 단과대는 대결 팀이 아님 (점수 없음)
+USERS = 60
+START_POINTS = 100
+
+
+def _setup(engine) -> int:
+    with Session(engine) as session:
+        for i in range(USERS):
+            session.add(User(
+                student_id=f"u{i}",
+                password="h",
+                nickname=f"사용자{i}",
+                college=COLLEGES[i % 3],
+                current_points=0,
+            ))
+        session.flush()
+        for i in range(USERS):
+            apply_points(session, f"u{i}", START_POINTS, source="test")
+        battle = Battle(
+            start_date=date.today(),
+            end_date=date.today(),
+            college_a=COLLEGES[0],
+            college_b=COLLEGES[1],
+            status="ACTIVE",
+            created_at=datetime.now(),
+        )
+        session.add(battle)
+        session.commit()
+        return battle.id
+
+
+def test_concurrent_bets_keep_balances_scores_and_ledger(engine, db_url):
+    battle_id = _setup(engine)
+    rnd = random.Random(40)
+    bets = [(f"u{i}", COLLEGES[i % 3], rnd.randint(10, 60)) for i in range(USERS)]
+    # 같은 사용자의 중복 요청 (하루 한 번 제한) + 잔액보다 큰 베팅
+    bets += [(sid, college, 5) for sid, college, _ in bets[::4]]
+    bets += [("u1", COLLEGES[1], START_POINTS + 1)]
+    rnd.shuffle(bets)
+
+    # 워커 2개(쓰기 큐 2개)가 같은 DB에 쓰는 동안 주기 작업처럼 샤드를 계속 fold
+    writers = [create_writer_engine(db_url) for _ in range(2)]
+    queues = [WriteQueue(writer, max_batch=8) for writer in writers]
+    stop = threading.Event()
+
+    def _fold_loop() -> None:
+        while not stop.is_set():
+            with Session(writers[0]) as session:
+                fold_scores(session, skip_locked=True)
+                session.commit()
+            time.sleep(0.005)
+
+    async def _bet(index, student_id, college, amount):
+        queue = queues[index % len(queues)]
+        error, balance, _ = await queue.submit(
+            lambda session: place_bet(session, battle_id, student_id, college, amount, "test")
+        )
+        return student_id, college, amount, error, balance
+
+    async def _run():
+        results = await asyncio.gather(*(_bet(i, *bet) for i, bet in enumerate(bets)), return_exceptions=True)
+        # 큐 워커를 직접 멈춤 (asyncio.run 종료 시 취소 대기에 의존하지 않음)
+        for queue in queues:
+            queue._worker.cancel()
+        await asyncio.gather(*(queue._worker for queue in queues), return_exceptions=True)
+        return results
+
+    folder = threading.Thread(target=_fold_loop)
+    folder.start()
+    try:
+        results = asyncio.run(_run())
+    finally:
+        stop.set()
+        folder.join()
+        for queue in queues:
+            queue._executor.shutdown()
+
+    assert [r for r in results if isinstance(r, Exception)] == []
+    accepted = [r for r in results if r[3] is None]
+    # 사용자당 정확히 1건만 성공 (중복 요청/잔액 초과는 거절)
+    assert sorted(sid for sid, *_ in accepted) == sorted(f"u{i}" for i in range(USERS))
+    assert all(amount <= START_POINTS for _, _, amount, _, _ in accepted)
+    bet_by_user = {sid: amount for sid, _, amount, _, _ in accepted}
+    assert all(balance == START_POINTS - bet_by_user[sid] for sid, _, _, _, balance in accepted)
+
+    team_totals = Counter()
+    for _, college, amount, _, _ in accepted:
+        if college in COLLEGES[:2]:
+            team_totals["A" if college == COLLEGES[0] else "B"] += amount
+    expected_scores = (team_totals["A"], team_totals["B"])
+
+    with Session(engine) as session:
+        balances = dict(session.execute(select(User.student_id, User.current_points)).all())
+        assert balances == {sid: START_POINTS - amount for sid, amount in bet_by_user.items()}
+
+        # 샤드가 남아 있어도 현재 점수 = Battle 행 + 샤드 합계
+        assert get_live_scores(session, [battle_id])[battle_id] == expected_scores
+
+        ledger = session.execute(
+            select(PointsLedger.student_id, PointsLedger.delta)
+            .where(PointsLedger.source == "battle_participation")
+        ).all()
+        assert sorted(ledger) == sorted((sid, -amount) for sid, amount in bet_by_user.items())
+        assert {issue["check"] for issue in reconcile(session)} <= {"legacy_history"}
+
+        participants = session.execute(
+            select(BattleParticipant.student_id, BattleParticipant.bet_amount)
+        ).all()
+        assert sorted(participants) == sorted(bet_by_user.items())
+        assert session.execute(select(func.sum(PointsLog.points))).scalar() == -sum(bet_by_user.values())
+
+        fold_scores(session, [battle_id])
+        session.commit()
+        battle = session.get(Battle, battle_id)
+        assert (battle.score_a, battle.score_b) == expected_scores
+        assert session.execute(select(func.count()).select_from(BattleScoreShard)).scalar() == 0
+
+    for writer in writers:
+        writer.dispose()
@@ -0,0 +1,137 @@
+"""
+대결 정산(settle_battle): 보상 금액이 기존 규칙과 같고, 잔액/원장/포인트 로그가 맞으며, 두 번째 정산은 아무것도 하지 않음
+
+- 승리: 자신의 베팅 + int(패배 팀 베팅 합계 × 자신의 베팅 / 승리 팀 베팅 합계) (기존 부동소수 식과 비교)
+- 무승부: 베팅 반환
+- 사용자 정보가 없는 참가자: reward_amount에만 베팅 금액 기록 (지급 없음)
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from ecojourney.models import Battle, BattleParticipant, PointsLedger, PointsLog, User
+from ecojourney.service.battle_bets import place_bet
+from ecojourney.service.battle_settlement import settle_battle
+from ecojourney.service.points_ledger import apply_points, reconcile
+
+COLLEGE_A, COLLEGE_B, COLLEGE_C = "공과대학", "경영대학", "사범대학"  # C는 대결 팀이 아님
+START_POINTS = 100
+
+
+def _setup(engine, bets) -> int:
+    """사용자 생성 + 베팅(place_bet), 사용자 정보가 없는 참가자 1명 추가"""
+    with Session(engine) as session:
+        for student_id, college, _ in bets:
+            session.add(User(student_id=student_id, password="h", nickname=student_id, college=college, current_points=0))
+        session.flush()
+        for student_id, _, _ in bets:
+            apply_points(session, student_id, START_POINTS, source="test")
+        battle = Battle(
+            start_date=date.today(),
+            end_date=date.today(),
+            college_a=COLLEGE_A,
+            college_b=COLLEGE_B,
+            status="ACTIVE",
+            created_at=datetime.now(),
+        )
+        session.add(battle)
+        session.flush()
+        for student_id, college, amount in bets:
+            error, _, _ = place_bet(session, battle.id, student_id, college, amount, "test")
+            assert error is None
+        session.add(BattleParticipant(battle_id=battle.id, student_id="ghost", bet_amount=30, joined_at=datetime.now()))
+        session.commit()
+        return battle.id
+
+
+def _state(session, battle_id):
+    balances = dict(session.execute(select(User.student_id, User.current_points)).all())
+    rewards = dict(
+        session.execute(
+            select(BattleParticipant.student_id, BattleParticipant.reward_amount)
+            .where(BattleParticipant.battle_id == battle_id)
+        ).all()
+    )
+    ledger = session.execute(select(func.count()).select_from(PointsLedger)).scalar()
+    logs = session.execute(select(func.count()).select_from(PointsLog)).scalar()
+    return balances, rewards, ledger, logs
+
+
+def _assert_history_matches(session, source, credited):
+    """정산 원장/포인트 로그가 지급액과 같고, 원장 잔액이 사용자 잔액과 일치"""
+    ledger = session.execute(
+        select(PointsLedger.student_id, PointsLedger.delta, PointsLedger.balance_after)
+        .where(PointsLedger.source == source)
+    ).all()
+    balances = dict(session.execute(select(User.student_id, User.current_points)).all())
+    assert sorted((sid, delta) for sid, delta, _ in ledger) == sorted(credited.items())
+    assert all(balance_after == balances[sid] for sid, _, balance_after in ledger)
+    logs = session.execute(select(PointsLog.student_id, PointsLog.points).where(PointsLog.source == source)).all()
+    assert sorted(logs) == sorted(credited.items())
+    assert {issue["check"] for issue in reconcile(session)} <= {"legacy_history"}
+
+
+def test_winner_rewards_match_legacy_formula(engine):
+    bets = [
+        ("a1", COLLEGE_A, 37), ("a2", COLLEGE_A, 23), ("a3", COLLEGE_A, 50),
+        ("b1", COLLEGE_B, 41), ("b2", COLLEGE_B, 19),
+        ("c1", COLLEGE_C, 13),
+    ]
+    battle_id = _setup(engine, bets)
+
+    winner_total = sum(amount for _, college, amount in bets if college == COLLEGE_A)
+    loser_total = sum(amount for _, college, amount in bets if college != COLLEGE_A)
+    # 기존 정산 코드의 식 (states/battle.py)
+    legacy = {
+        sid: int(loser_total * (amount / winner_total)) + amount
+        for sid, college, amount in bets if college == COLLEGE_A
+    }
+
+    with Session(engine) as session:
+        result = settle_battle(session, battle_id)
+        session.commit()
+    assert result == {
+        "battle_id": battle_id,
+        "winner": COLLEGE_A,
+        "winner_total": winner_total,
+        "loser_total": loser_total,
+        "credited_users": len(legacy),
+    }
+
+    with Session(engine) as session:
+        battle = session.get(Battle, battle_id)
+        assert (battle.status, battle.winner, battle.score_a, battle.score_b) == ("FINISHED", COLLEGE_A, 110, 60)
+        balances, rewards, ledger, logs = _state(session, battle_id)
+        assert rewards == {**{sid: 0 for sid, _, _ in bets}, **legacy, "ghost": 30}
+        assert balances == {sid: START_POINTS - amount + legacy.get(sid, 0) for sid, _, amount in bets}
+        assert "ghost" not in balances
+        _assert_history_matches(session, "battle_reward", legacy)
+
+        # 두 번째 정산은 None, 추가 지급/기록 없음
+        assert settle_battle(session, battle_id) is None
+        session.commit()
+        assert _state(session, battle_id) == (balances, rewards, ledger, logs)
+
+
+def test_draw_refunds_bets(engine):
+    bets = [("a1", COLLEGE_A, 40), ("a2", COLLEGE_A, 20), ("b1", COLLEGE_B, 60), ("c1", COLLEGE_C, 15)]
+    battle_id = _setup(engine, bets)
+
+    with Session(engine) as session:
+        result = settle_battle(session, battle_id)
+        session.commit()
+    assert (result["winner"], result["credited_users"]) == (None, len(bets))
+
+    with Session(engine) as session:
+        battle = session.get(Battle, battle_id)
+        assert (battle.status, battle.winner, battle.score_a, battle.score_b) == ("FINISHED", None, 60, 60)
+        balances, rewards, ledger, logs = _state(session, battle_id)
+        assert rewards == {**{sid: amount for sid, _, amount in bets}, "ghost": 30}
+        assert balances == {sid: START_POINTS for sid, _, _ in bets}
+        _assert_history_matches(session, "battle_draw", {sid: amount for sid, _, amount in bets})
+
+        assert settle_battle(session, battle_id) is None
+        session.commit()
+        assert _state(session, battle_id) == (balances, rewards, ledger, logs)
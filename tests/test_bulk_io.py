@@ -0,0 +1,91 @@
+"""대량 가져오기 후 파생 데이터(원장/집계/카운터)가 데이터와 맞는지 확인"""
+
+import csv
+from datetime import date, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from ecojourney.db.bulk_io import BulkImportError, import_table
+from ecojourney.db.write_queue import create_writer_engine
+from ecojourney.models import CollegeEmissionDaily, PointsLedger, RankingCounter, StreakRecord
+from ecojourney.service.leaderboard import get_leaderboard
+from ecojourney.service.points_ledger import reconcile
+from ecojourney.service.ranking_windows import period_key
+
+TODAY = date.today()
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+@pytest.fixture
+def writer(engine, db_url):
+    writer = create_writer_engine(db_url)
+    yield writer
+    writer.dispose()
+
+
+def _import_users(writer, tmp_path):
+    users = _write_csv(tmp_path / "user.csv", [
+        {"student_id": "b1", "password": "h", "nickname": "가", "college": "공과대학", "current_points": 120},
+        {"student_id": "b2", "password": "h", "nickname": "나", "college": "경영대학", "current_points": 0},
+    ])
+    return import_table(writer, "user", users)
+
+
+def test_user_import_records_opening_balances(writer, tmp_path):
+    assert _import_users(writer, tmp_path) == 2
+    with Session(writer) as session:
+        ledger = session.exec(select(PointsLedger)).all()
+        assert [(row.student_id, row.delta, row.balance_after, row.source) for row in ledger] == [
+            ("b1", 120, 120, "bulk_import")
+        ]
+        checks = {issue["check"] for issue in reconcile(session)}
+    assert not checks & {"ledger_chain", "user_balance"}
+    assert get_leaderboard().rank("b1") == (1, 120)
+
+
+def test_carbonlog_import_rebuilds_counters(writer, tmp_path):
+    _import_users(writer, tmp_path)
+    logs = _write_csv(tmp_path / "carbonlog.csv", [
+        {"student_id": "b1", "log_date": (TODAY - timedelta(days=i)).isoformat(), "source": "carbon_input",
+         "activities_json": "[]", "total_emission": 2.5, "points_earned": 10}
+        for i in range(3)
+    ])
+    assert import_table(writer, "carbonlog", logs) == 3
+
+    with Session(writer) as session:
+        streak = session.exec(select(StreakRecord).where(StreakRecord.student_id == "b1")).one()
+        assert (streak.current_streak, streak.last_log_date) == (3, TODAY)
+        emission = session.exec(
+            select(CollegeEmissionDaily).where(CollegeEmissionDaily.log_date == TODAY)
+        ).one()
+        assert (emission.college, emission.emission_g, emission.active_users) == ("공과대학", 2500, 1)
+        counter = session.exec(
+            select(RankingCounter).where(
+                RankingCounter.period == period_key("month", TODAY), RankingCounter.student_id == "b1"
+            )
+        ).one()
+        expected_days = min(3, TODAY.day)
+        assert counter.points == 10 * expected_days
+        # 로그의 포인트는 이력이므로 잔액(원장)에는 더하지 않음
+        assert session.exec(select(PointsLedger.balance_after).order_by(PointsLedger.id.desc())).first() == 120
+
+
+def test_failed_import_still_rebuilds_committed_batches(writer, tmp_path):
+    _import_users(writer, tmp_path)
+    rows = [
+        {"student_id": "b2", "log_date": TODAY.isoformat(), "source": "carbon_input", "total_emission": 1.0},
+        {"student_id": "b2", "log_date": "not a date", "source": "carbon_input", "total_emission": 1.0},
+    ]
+    logs = _write_csv(tmp_path / "carbonlog.csv", rows)
+    with pytest.raises(BulkImportError):
+        import_table(writer, "carbonlog", logs, chunk_size=1)
+    with Session(writer) as session:
+        assert session.exec(select(StreakRecord.current_streak).where(StreakRecord.student_id == "b2")).one() == 1
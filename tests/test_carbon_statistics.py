@@ -0,0 +1,115 @@
+"""carbon_statistics 집계가 기존 Python 집계(전체 로그 로드)와 같은 결과인지 확인"""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from ecojourney.models import CarbonLog
+from ecojourney.service import carbon_statistics
+from ecojourney.service.carbon_statistics import (
+    get_category_activity_counts,
+    get_daily_emission_buckets,
+    get_emission_totals,
+)
+
+TODAY = date(2026, 10, 19)
+
+ACTIVITY_SHAPES = [
+    [{"category": "교통", "activity_type": "버스"}, {"category": "식품", "activity_type": "소고기"}],
+    {"category": "전기", "activity_type": "에어컨"},  # 객체 하나
+    [{"activity_type": "분류 없음"}],  # category 없음 → 기타
+    [{"category": "교통"}, "문자열", 3, None, {"category": "의류"}],  # 객체가 아닌 항목은 제외
+    "[]",
+    "",
+    "not json",
+    "null",
+    "42",
+    [{"category": "식품"}] * 3,
+]
+
+
+def _activities_json(shape) -> str:
+    return shape if isinstance(shape, str) else json.dumps(shape, ensure_ascii=False)
+
+
+@pytest.fixture
+def logs(engine):
+    rows = []
+    for i in range(120):
+        for student_id in ("u1", "u2"):
+            rows.append(CarbonLog(
+                student_id=student_id,
+                log_date=TODAY - timedelta(days=i // 2),
+                source="challenge" if i % 7 == 0 else "carbon_input",
+                activities_json=_activities_json(ACTIVITY_SHAPES[(i + len(student_id)) % len(ACTIVITY_SHAPES)]),
+                total_emission=round(0.37 * (i % 11) + 0.01, 2),
+            ))
+    with Session(engine) as session:
+        session.add_all(rows)
+        session.commit()
+    return engine
+
+
+def _legacy_logs(session, student_id, source="carbon_input"):
+    return list(session.exec(
+        select(CarbonLog).where(CarbonLog.student_id == student_id, CarbonLog.source == source).order_by(CarbonLog.id)
+    ).all())
+
+
+def _legacy_categories(logs):
+    """변경 전 get_carbon_statistics의 카테고리 집계"""
+    breakdown = {}
+    for log in logs:
+        for activity in log.get_activities():
+            category = activity.get("category", "기타")
+            breakdown[category] = breakdown.get(category, 0) + 1
+    return [{"name": k, "count": v} for k, v in breakdown.items()]
+
+
+def _legacy_buckets(session, student_id, start, end):
+    """변경 전 load_dashboard_statistics의 일별 합계"""
+    buckets = {}
+    for log in session.exec(
+        select(CarbonLog).where(
+            CarbonLog.student_id == student_id, CarbonLog.log_date >= start, CarbonLog.log_date <= end
+        )
+    ).all():
+        day_key = log.log_date.strftime("%Y-%m-%d")
+        buckets[day_key] = buckets.get(day_key, 0.0) + log.total_emission
+    return buckets
+
+
+@pytest.mark.parametrize("student_id", ["u1", "u2", "nobody"])
+def test_category_counts_match_python_aggregation(logs, student_id):
+    with Session(logs) as session:
+        expected = _legacy_categories(_legacy_logs(session, student_id))
+        assert get_category_activity_counts(session, student_id) == expected
+        assert carbon_statistics._stream_category_counts(session, student_id, "carbon_input") == expected
+
+
+def test_category_counts_for_other_source(logs):
+    with Session(logs) as session:
+        expected = _legacy_categories(_legacy_logs(session, "u1", "challenge"))
+        assert get_category_activity_counts(session, "u1", "challenge") == expected
+
+
+@pytest.mark.parametrize("student_id", ["u1", "nobody"])
+def test_totals_match_python_aggregation(logs, student_id):
+    with Session(logs) as session:
+        legacy = _legacy_logs(session, student_id)
+        totals = get_emission_totals(session, student_id)
+    assert totals["total_logs"] == len(legacy)
+    assert totals["total_emission"] == pytest.approx(sum(log.total_emission for log in legacy))
+
+
+@pytest.mark.parametrize("days", [0, 6, 30])
+def test_daily_buckets_match_python_aggregation(logs, days):
+    start = TODAY - timedelta(days=days)
+    with Session(logs) as session:
+        expected = _legacy_buckets(session, "u1", start, TODAY)
+        buckets = get_daily_emission_buckets(session, "u1", start, TODAY)
+    assert buckets.keys() == expected.keys()
+    for day_key, emission in expected.items():
+        assert buckets[day_key] == pytest.approx(emission)
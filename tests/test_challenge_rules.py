@@ -0,0 +1,98 @@
+"""챌린지 규칙: daily / weekly / rolling 기간별 진행도(emit)와 오늘 기준 조회(get_progress)"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from ecojourney.models import Challenge, User
+from ecojourney.service.challenge_rules import (
+    EVENT_ARTICLE_READ,
+    EVENT_BET_PLACED,
+    EVENT_CARBON_LOGGED,
+    WINDOW_DAILY,
+    WINDOW_ROLLING,
+    WINDOW_WEEKLY,
+    emit,
+    get_progress,
+    invalidate_rule_index,
+)
+
+MONDAY = date(2026, 10, 19)
+
+RULES = {
+    "daily": dict(trigger_event=EVENT_ARTICLE_READ, counter_window=WINDOW_DAILY, window_days=1, distinct_days=False, goal_value=1),
+    "weekly": dict(trigger_event=EVENT_CARBON_LOGGED, counter_window=WINDOW_WEEKLY, window_days=7, distinct_days=True, goal_value=3),
+    "rolling": dict(trigger_event=EVENT_BET_PLACED, counter_window=WINDOW_ROLLING, window_days=3, distinct_days=True, goal_value=2),
+}
+
+
+@pytest.fixture
+def rules(engine):
+    with Session(engine) as session:
+        session.add(User(student_id="s1", password="x", nickname="n1", college="공과대학", current_points=0))
+        for title, rule in RULES.items():
+            session.add(Challenge(title=title, type=title.upper(), reward_points=10, is_active=True, created_at=datetime.now(), **rule))
+        session.commit()
+    invalidate_rule_index()
+    yield engine
+    invalidate_rule_index()
+
+
+def _emit(engine, event, day):
+    with Session(engine) as session:
+        result = emit(session, "s1", event, on=day)
+        session.commit()
+    return result["completed"]
+
+
+def _progress(engine, title, day):
+    with Session(engine) as session:
+        item = next(item for item in get_progress(session, "s1", day) if item["title"] == title)
+    return item["current_value"], item["is_completed"]
+
+
+def _balance(engine):
+    with Session(engine) as session:
+        return session.exec(select(User.current_points).where(User.student_id == "s1")).one()
+
+
+def test_daily_window(rules):
+    assert _emit(rules, EVENT_ARTICLE_READ, MONDAY) == ["daily"]
+    assert _emit(rules, EVENT_ARTICLE_READ, MONDAY) == []
+    assert _progress(rules, "daily", MONDAY) == (1, True)
+    # 다음 날은 새 기간
+    assert _progress(rules, "daily", MONDAY + timedelta(days=1)) == (0, False)
+    assert _emit(rules, EVENT_ARTICLE_READ, MONDAY + timedelta(days=1)) == ["daily"]
+    assert _balance(rules) == 20
+
+
+def test_weekly_window_counts_distinct_days(rules):
+    assert _emit(rules, EVENT_CARBON_LOGGED, MONDAY) == []
+    assert _emit(rules, EVENT_CARBON_LOGGED, MONDAY) == []
+    assert _emit(rules, EVENT_CARBON_LOGGED, MONDAY + timedelta(days=1)) == []
+    assert _progress(rules, "weekly", MONDAY + timedelta(days=1)) == (2, False)
+    assert _emit(rules, EVENT_CARBON_LOGGED, MONDAY + timedelta(days=3)) == ["weekly"]
+    assert _emit(rules, EVENT_CARBON_LOGGED, MONDAY + timedelta(days=4)) == []
+    # 같은 주(일요일)까지 완료, 다음 주 월요일부터 다시 셈
+    assert _progress(rules, "weekly", MONDAY + timedelta(days=6)) == (3, True)
+    assert _progress(rules, "weekly", MONDAY + timedelta(days=7)) == (0, False)
+    assert _balance(rules) == 10
+
+
+def test_rolling_window(rules):
+    assert _emit(rules, EVENT_BET_PLACED, MONDAY) == []
+    assert _emit(rules, EVENT_BET_PLACED, MONDAY + timedelta(days=2)) == ["rolling"]
+    assert _progress(rules, "rolling", MONDAY + timedelta(days=2)) == (2, True)
+    # 달성 다음 날부터는 다른 이벤트가 없어도 0부터 다시 셈
+    assert _progress(rules, "rolling", MONDAY + timedelta(days=3)) == (0, False)
+    assert _progress(rules, "rolling", MONDAY + timedelta(days=10)) == (0, False)
+
+    assert _emit(rules, EVENT_BET_PLACED, MONDAY + timedelta(days=3)) == []
+    assert _progress(rules, "rolling", MONDAY + timedelta(days=3)) == (1, False)
+    # 기간(3일)을 벗어난 날은 빠짐
+    assert _emit(rules, EVENT_BET_PLACED, MONDAY + timedelta(days=6)) == []
+    assert _progress(rules, "rolling", MONDAY + timedelta(days=6)) == (1, False)
+    assert _progress(rules, "rolling", MONDAY + timedelta(days=8)) == (1, False)
+    assert _progress(rules, "rolling", MONDAY + timedelta(days=9)) == (0, False)
+    assert _balance(rules) == 10
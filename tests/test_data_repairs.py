@@ -0,0 +1,48 @@
+"""데이터 보정 실행기: 스키마는 alembic으로만 만들고, 보정은 한 번만 적용"""
+
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import Session
+
+from ecojourney.db.data_repairs import SchemaNotReadyError, get_applied_ids, get_repairs, run_pending_repairs
+from ecojourney.db.write_queue import create_writer_engine
+from ecojourney.models import CollegeEmissionDaily, CollegeRecord, RankingCounter, StreakRecord
+
+# 보정이 쓰는, 마이그레이션으로 추가된 테이블
+MIGRATED_TABLES = [CollegeRecord, RankingCounter, CollegeEmissionDaily, StreakRecord]
+
+
+def test_missing_schema_fails_without_creating_tables(db_url):
+    engine = create_writer_engine(db_url)
+    try:
+        with pytest.raises(SchemaNotReadyError, match="alembic upgrade head"):
+            run_pending_repairs(engine)
+        assert inspect(engine).get_table_names() == []
+    finally:
+        engine.dispose()
+
+
+def test_repairs_apply_once(engine, db_url):
+    writer = create_writer_engine(db_url)
+    try:
+        assert run_pending_repairs(writer) == [repair.repair_id for repair in get_repairs()]
+        assert run_pending_repairs(writer) == []
+        with Session(writer) as session:
+            assert set(get_applied_ids(session)) == {repair.repair_id for repair in get_repairs()}
+    finally:
+        writer.dispose()
+
+
+@pytest.mark.parametrize("model", MIGRATED_TABLES, ids=lambda model: model.__tablename__)
+def test_missing_repair_table_fails_without_creating_it(engine, db_url, model):
+    model.__table__.drop(engine)
+    writer = create_writer_engine(db_url)
+    try:
+        with pytest.raises(SchemaNotReadyError, match=model.__tablename__):
+            run_pending_repairs(writer)
+        assert not inspect(writer).has_table(model.__tablename__)
+        # 필요한 테이블이 없으면 다른 보정도 적용하지 않음
+        with Session(writer) as session:
+            assert get_applied_ids(session) == {}
+    finally:
+        writer.dispose()
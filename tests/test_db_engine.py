@@ -0,0 +1,179 @@
+"""
+DB URL 설정(db/engine.py)과 설정된 DB를 쓰는 경로(check_database, auth_service) 테스트
+
+- get_database_url: rxconfig.db_url, REFLEX_DB_URL 환경변수 우선, 둘 다 없을 때 기본값
+- check_database / auth_service: REFLEX_DB_URL로 테스트 DB를 지정해 SQLite와 PostgreSQL에서 실행
+- 스키마가 없으면 테이블을 만들지 않고 SchemaNotReadyError (테이블은 alembic으로만 생성)
+- init_db(SQLite): 기본 스키마 + BASE_REVISION 기록 후 alembic upgrade head까지 실행되는지
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from reflex.config import get_config
+from sqlalchemy import create_engine, inspect
+
+from ecojourney.db import BASE_DIR
+from ecojourney.db.engine import (
+    DEFAULT_DB_URL,
+    SchemaNotReadyError,
+    check_database,
+    get_database_url,
+    get_engine,
+    is_sqlite,
+)
+
+
+@pytest.fixture
+def config_env(monkeypatch):
+    """환경변수/작업 디렉터리를 바꾼 뒤 설정을 다시 읽고, 끝나면 원래 설정으로 되돌림"""
+    monkeypatch.delenv("REFLEX_DB_URL", raising=False)
+    yield monkeypatch
+    monkeypatch.undo()
+    get_config(reload=True)
+
+
+@pytest.fixture
+def empty_db(db_url, config_env):
+    """REFLEX_DB_URL로 테스트 DB(빈 DB)를 설정된 DB로 지정"""
+    import reflex.model
+
+    config_env.setenv("REFLEX_DB_URL", db_url)
+    get_config(reload=True)
+    yield db_url
+    engine = reflex.model._ENGINE.pop(db_url, None)
+    if engine is not None:
+        engine.dispose()
+
+
+@pytest.fixture
+def configured_db(engine, empty_db):
+    """스키마를 만든 테스트 DB를 설정된 DB로 지정"""
+    return empty_db
+
+
+def _alembic(db_url, *args):
+    """테스트 DB에 alembic 명령 실행"""
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BASE_DIR,
+        env={**os.environ, "REFLEX_DB_URL": db_url},
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_database_url_from_rxconfig(config_env, tmp_path):
+    (tmp_path / "rxconfig.py").write_text(
+        'import reflex as rx\n'
+        'config = rx.Config(app_name="ecojourney", db_url="sqlite:///from_rxconfig.db")\n',
+        encoding="utf-8",
+    )
+    config_env.chdir(tmp_path)
+    get_config(reload=True)
+
+    assert get_database_url() == "sqlite:///from_rxconfig.db"
+
+
+def test_database_url_env_overrides_rxconfig(config_env):
+    config_env.setenv("REFLEX_DB_URL", "postgresql://eco@db.internal:5432/ecojourney")
+    get_config(reload=True)
+
+    assert get_database_url() == "postgresql://eco@db.internal:5432/ecojourney"
+    assert not is_sqlite()
+
+
+def test_database_url_default(config_env):
+    config_env.setattr(get_config(), "db_url", None)
+
+    assert get_database_url() == DEFAULT_DB_URL
+    assert is_sqlite()
+
+
+def test_check_database(configured_db):
+    result = check_database()
+
+    assert result["dialect"] == ("sqlite" if is_sqlite(configured_db) else "postgresql")
+    assert result["tables"] == {"user": 0, "carbonlog": 0, "battle": 0, "pointsledger": 0}
+    # 같은 URL이면 rx.session()과 같은 공용 엔진
+    assert get_engine() is get_engine(configured_db)
+
+
+def test_missing_schema_fails_without_creating_tables(empty_db, config_env):
+    from ecojourney.ai.services import auth_service
+
+    config_env.setattr(auth_service, "_db_ready", False)
+    with pytest.raises(SchemaNotReadyError, match="alembic upgrade head"):
+        check_database()
+    with pytest.raises(SchemaNotReadyError, match="alembic upgrade head"):
+        auth_service.verify_user("s1", "pw-1234")
+    assert inspect(get_engine()).get_table_names() == []
+
+
+def test_init_db_then_alembic_upgrade(tmp_path, config_env):
+    """init_db(SQLite)는 기본 스키마만 만들고, 로그인/가입 경로는 테이블을 만들지 않아 alembic upgrade head가 성공"""
+    from ecojourney.ai.services import auth_service
+    from ecojourney.db.init_db import BASE_REVISION, init_db
+
+    db_url = f"sqlite:///{tmp_path / 'init.db'}"
+    config_env.setenv("REFLEX_DB_URL", db_url)
+    get_config(reload=True)
+    config_env.setattr(auth_service, "_db_ready", False)
+
+    init_db()
+    engine = create_engine(db_url)
+    try:
+        tables = set(inspect(engine).get_table_names())
+        assert {"user", "carbonlog", "battle", "pointslog", "alembic_version"} <= tables
+        # 마이그레이션으로 추가된 테이블은 만들지 않음
+        assert "pointsledger" not in tables
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT version_num FROM alembic_version").scalar() == BASE_REVISION
+
+        with pytest.raises(SchemaNotReadyError, match="pointsledger"):
+            auth_service.verify_user("s1", "pw-1234")
+        assert set(inspect(engine).get_table_names()) == tables
+    finally:
+        engine.dispose()
+
+    result = _alembic(db_url, "upgrade", "head")
+    assert result.returncode == 0, result.stderr
+    assert not auth_service.verify_user("s1", "pw-1234")
+    check_database()
+    get_engine(db_url).dispose()
+
+
+def test_auth_service_signup_login(configured_db, config_env):
+    from ecojourney.ai.services import auth_service
+    from ecojourney.schemas.user import UserCreate
+    from ecojourney.service.leaderboard import get_leaderboard
+
+    config_env.setattr(auth_service, "_db_ready", False)
+    payload = UserCreate(student_id="s1", password="pw-1234", nickname="에코", college="공과대학")
+    auth_service.create_user(payload)
+
+    assert auth_service.verify_user("s1", "pw-1234")
+    assert not auth_service.verify_user("s1", "wrong")
+    assert not auth_service.verify_user("nobody", "pw-1234")
+
+    user = auth_service.get_user("s1")
+    assert (user.student_id, user.nickname, user.college, user.current_points) == ("s1", "에코", "공과대학", 0)
+    assert auth_service.get_user("nobody") is None
+    assert auth_service._get_user_row("s1")["password"] == auth_service._hash_password("pw-1234")
+    assert get_leaderboard().rank("s1") is not None
+
+    with pytest.raises(sqlite3.IntegrityError, match="닉네임"):
+        auth_service.create_user(payload.model_copy(update={"student_id": "s2"}))
+    with pytest.raises(sqlite3.IntegrityError, match="학번"):
+        auth_service.create_user(payload.model_copy(update={"nickname": "다른닉네임"}))
+
+    conn = auth_service.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM "user"')
+        assert cursor.fetchone()[0] == 1
+    finally:
+        conn.close()
@@ -0,0 +1,76 @@
+"""commit된 포인트만 리더보드에 반영되고, Redis 백엔드 반영은 commit 경로를 막지 않는지 확인"""
+
+import threading
+import time
+
+import pytest
+from sqlmodel import Session
+
+from ecojourney.service import leaderboard
+from ecojourney.service.leaderboard import LocalLeaderboard, flush_published, set_leaderboard, stage_points
+
+
+class SlowBoard(LocalLeaderboard):
+    """네트워크 왕복이 느린 Redis 리더보드 대역 (반영한 스레드 기록)"""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.threads = []
+
+    def update(self, points):
+        time.sleep(self.delay)
+        self.threads.append(threading.current_thread().name)
+        super().update(points)
+
+
+@pytest.fixture
+def board(monkeypatch):
+    monkeypatch.setattr(leaderboard, "get_redis_url", lambda: "redis://leaderboard.test")
+    board = SlowBoard(delay=0.3)
+    set_leaderboard(board, "test")
+    yield board
+    flush_published()
+    set_leaderboard(None, "test")
+
+
+def test_redis_updates_leave_commit_path(engine, board):
+    with Session(engine) as session:
+        stage_points(session, "s1", 10, name="test")
+        stage_points(session, "s1", 30, name="test")
+        stage_points(session, "s2", 20, name="test")
+        started = time.perf_counter()
+        session.commit()
+        assert time.perf_counter() - started < board.delay
+
+    assert flush_published()
+    assert board.snapshot() == {"s1": 30, "s2": 20}
+    assert board.threads == ["leaderboard-publisher"]
+
+
+def test_rolled_back_values_are_not_published(engine, board):
+    with Session(engine) as session:
+        stage_points(session, "s1", 10, name="test")
+        savepoint = session.begin_nested()
+        stage_points(session, "s2", 99, name="test")
+        savepoint.rollback()
+        session.commit()
+
+        stage_points(session, "s3", 50, name="test")
+        session.rollback()
+
+    assert flush_published()
+    assert board.snapshot() == {"s1": 10}
+
+
+def test_local_board_updates_inline(engine, monkeypatch):
+    monkeypatch.setattr(leaderboard, "get_redis_url", lambda: None)
+    board = LocalLeaderboard()
+    set_leaderboard(board, "test")
+    try:
+        with Session(engine) as session:
+            stage_points(session, "s1", 10, name="test")
+            session.commit()
+        assert board.rank("s1") == (1, 10)
+    finally:
+        set_leaderboard(None, "test")
@@ -0,0 +1,97 @@
+"""이벤트 핸들러가 실행하는 조회의 SQL 문 수 고정 (assert_query_count)"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlmodel import Session
+
+from ecojourney.db.query_counter import assert_query_count
+from ecojourney.models import Battle, BattleParticipant, CarbonLog, User
+from ecojourney.service.battle_board import get_battle_board
+from ecojourney.service.carbon_statistics import (
+    get_category_activity_counts,
+    get_daily_emission_buckets,
+    get_emission_totals,
+)
+from ecojourney.service.challenge_rules import (
+    EVENT_ARTICLE_READ,
+    emit,
+    get_progress,
+    get_rule_index,
+    invalidate_rule_index,
+    sync_default_challenges,
+)
+from ecojourney.service.points_history import fetch_points_history_page
+from ecojourney.service.streaks import get_streak
+
+TODAY = date(2026, 10, 19)
+
+
+@pytest.fixture
+def seeded(engine):
+    now = datetime.now()
+    with Session(engine) as session:
+        for i, college in enumerate(["공과대학", "공과대학", "경영대학"]):
+            session.add(User(student_id=f"s{i}", password="x", nickname=f"n{i}", college=college, current_points=100, created_at=now))
+        session.add(CarbonLog(student_id="s0", log_date=TODAY, activities_json='[{"category": "교통"}]', total_emission=1.5, points_earned=10, created_at=now))
+        battle = Battle(start_date=TODAY, end_date=TODAY, college_a="공과대학", college_b="경영대학", created_at=now)
+        session.add(battle)
+        session.flush()
+        for i in range(3):
+            session.add(BattleParticipant(battle_id=battle.id, student_id=f"s{i}", bet_amount=10 * (i + 1), joined_at=now))
+        sync_default_challenges(session)
+        session.commit()
+        battle_id = battle.id
+    invalidate_rule_index()
+    with Session(engine) as session:
+        get_rule_index(session)  # 규칙 캐시를 미리 채움 (핸들러는 TTL 동안 캐시를 씀)
+    yield engine, battle_id
+    invalidate_rule_index()
+
+
+def test_mypage_progress_and_streak(seeded):
+    engine, _ = seeded
+    with Session(engine) as session:
+        with assert_query_count(engine, 1):
+            progress = get_progress(session, "s0", TODAY)
+        assert len(progress) == 3
+        with assert_query_count(engine, 1):
+            get_streak(session, "s0", TODAY)
+
+
+def test_mypage_dashboard_and_statistics(seeded):
+    engine, _ = seeded
+    with Session(engine) as session:
+        with assert_query_count(engine, 1):
+            assert get_daily_emission_buckets(session, "s0", TODAY, TODAY) == {TODAY.isoformat(): 1.5}
+        with assert_query_count(engine, 2):
+            assert get_emission_totals(session, "s0")["total_logs"] == 1
+        with assert_query_count(engine, 2):
+            assert get_category_activity_counts(session, "s0") == [{"name": "교통", "count": 1}]
+
+
+def test_points_history_page(seeded):
+    engine, _ = seeded
+    with Session(engine) as session:
+        with assert_query_count(engine, 1):
+            items, _ = fetch_points_history_page(session, "s0")
+        assert len(items) == 1
+
+
+def test_battle_board(seeded):
+    engine, battle_id = seeded
+    with Session(engine) as session:
+        with assert_query_count(engine, 1):
+            board = get_battle_board(session, battle_id, "공과대학", "경영대학")
+        assert board["participants_a"] == 2 and board["participants_b"] == 1
+
+
+def test_challenge_event(seeded):
+    engine, _ = seeded
+    with Session(engine) as session:
+        with assert_query_count(engine, 0):
+            assert emit(session, "s0", "unknown_event", on=TODAY)["completed"] == []
+        # 진행도 조회 1회 + 달성 보상 잔액 갱신(UPDATE ... RETURNING) 1회, 나머지는 커밋 때 flush
+        with assert_query_count(engine, 2):
+            assert emit(session, "s0", EVENT_ARTICLE_READ, on=TODAY)["completed"] == ["아티클 읽기"]
+        session.rollback()
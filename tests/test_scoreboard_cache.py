@@ -0,0 +1,128 @@
+"""
+대항전 현황판 캐시: 조회(DB 집계) 중 참가가 commit되면 집계 결과(참가 이전)를 캐시에 저장하지 않음
+
+- 메모리 캐시는 항상, Redis 캐시는 ECOJOURNEY_TEST_REDIS_URL이 있을 때만 실행합니다.
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from ecojourney.service import scoreboard_cache
+from ecojourney.service.scoreboard_cache import (
+    LocalScoreboardCache,
+    RedisScoreboardCache,
+    invalidate_scoreboards,
+    load_scoreboard,
+    record_bet,
+)
+
+COLLEGE_A, COLLEGE_B = "공과대학", "경영대학"
+
+
+@pytest.fixture(params=["local", "redis"])
+def cache(request, monkeypatch):
+    if request.param == "local":
+        cache = LocalScoreboardCache()
+    else:
+        redis_url = os.getenv("ECOJOURNEY_TEST_REDIS_URL")
+        if not redis_url:
+            pytest.skip("Redis 없음 (ECOJOURNEY_TEST_REDIS_URL 필요)")
+        # 테스트마다 다른 키를 쓰도록 접두어 변경
+        monkeypatch.setattr(scoreboard_cache, "KEY_PREFIX", f"ecojourney:test:{uuid.uuid4().hex}:")
+        cache = RedisScoreboardCache(redis_url)
+    monkeypatch.setattr(scoreboard_cache, "_cache", cache)
+    return cache
+
+
+def _board(battle_id: int, score_a: int = 0, top_a=()) -> dict:
+    return {
+        "id": battle_id,
+        "college_a": COLLEGE_A,
+        "college_b": COLLEGE_B,
+        "score_a": score_a,
+        "score_b": 0,
+        "participants_a": len(top_a),
+        "participants_b": 0,
+        "start_date": "2026-10-19",
+        "end_date": "2026-10-25",
+        "top_n": 5,
+        "top_a": list(top_a),
+        "top_b": [],
+    }
+
+
+def _standing(student_id: str, bet_amount: int, first_id: int) -> dict:
+    return {"student_id": student_id, "nickname": student_id, "bet_amount": bet_amount, "first_id": first_id, "joins": 1}
+
+
+class _Session:
+    """build_scoreboard 대신 정해진 현황판을 돌려주는 AsyncSession 흉내 (집계 중 실행할 작업 지정 가능)"""
+
+    def __init__(self, board, during_build=None):
+        self.board = board
+        self.during_build = during_build
+        self.builds = 0
+
+    async def run_sync(self, func, battle_id):
+        self.builds += 1
+        if self.during_build is not None:
+            await self.during_build()
+        return self.board
+
+
+def test_bet_during_rebuild_is_not_overwritten(cache):
+    async def _run():
+        # 조회가 DB에서 참가 이전 현황판을 읽는 사이 참가 commit + record_bet (캐시 항목 없음 → 증분 갱신 건너뜀)
+        async def _bet():
+            await record_bet(1, COLLEGE_A, 10, _standing("u1", 10, 1))
+
+        stale = _Session(_board(1), during_build=_bet)
+        assert (await load_scoreboard(stale, 1))["score_a"] == 0
+        # 참가 이전 현황판은 캐시에 저장되지 않음
+        assert await cache.get(1) is None
+
+        # 다음 조회는 DB에서 새로 만들고 저장, 이후 참가는 증분 반영
+        entry = {"student_id": "u1", "nickname": "u1", "bet_amount": 10, "first_id": 1, "rank": 1}
+        fresh = _Session(_board(1, score_a=10, top_a=[entry]))
+        assert (await load_scoreboard(fresh, 1))["score_a"] == 10
+        await record_bet(1, COLLEGE_A, 5, _standing("u2", 5, 2))
+        board = await load_scoreboard(_Session(None), 1)
+        assert board["score_a"] == 15
+        assert [e["student_id"] for e in board["top_a"]] == ["u1", "u2"]
+        assert fresh.builds == 1
+
+    asyncio.run(_run())
+
+
+def test_rebuild_without_bets_is_cached(cache):
+    async def _run():
+        session = _Session(_board(2, score_a=3))
+        assert (await load_scoreboard(session, 2))["score_a"] == 3
+        assert (await load_scoreboard(session, 2))["score_a"] == 3
+        assert session.builds == 1
+
+        # 다른 대결의 참가는 이 대결의 저장을 막지 않음
+        async def _other_bet():
+            await record_bet(3, COLLEGE_A, 10, _standing("u1", 10, 1))
+
+        await invalidate_scoreboards([2])
+        racing = _Session(_board(2, score_a=3), during_build=_other_bet)
+        await load_scoreboard(racing, 2)
+        assert (await cache.get(2))["score_a"] == 3
+
+    asyncio.run(_run())
+
+
+def test_invalidate_during_rebuild_is_not_overwritten(cache):
+    async def _run():
+        # 정산 무효화가 집계 중에 일어나면 종료 이전 현황판을 저장하지 않음
+        async def _settle():
+            await invalidate_scoreboards([4])
+
+        await load_scoreboard(_Session(_board(4), during_build=_settle), 4)
+        assert await cache.get(4) is None
+
+    asyncio.run(_run())
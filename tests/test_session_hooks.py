@@ -0,0 +1,67 @@
+"""Session 훅이 명시적 등록(register_hooks)으로 한 번만 붙고, 등록 후 flush가 파생 집계를 갱신하는지 확인"""
+
+import importlib
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+
+from ecojourney.models import CarbonLog, CollegeEmissionDaily, RankingCounter, User
+from ecojourney.service.ranking_windows import period_key
+from ecojourney.service.streaks import get_streak
+
+# (모듈, after_flush 훅 함수 이름)
+HOOKS = [
+    ("ecojourney.service.ranking_windows", "_count_activity"),
+    ("ecojourney.service.college_emissions", "_aggregate_emissions"),
+    ("ecojourney.service.streaks", "_track_streaks"),
+]
+
+
+@pytest.fixture
+def reregistered_hooks():
+    """훅을 떼어낸 뒤 모듈의 register_hooks()를 두 번 호출해 다시 등록"""
+    modules = [(importlib.import_module(module), name) for module, name in HOOKS]
+    for module, name in modules:
+        hook = getattr(module, name)
+        if event.contains(OrmSession, "after_flush", hook):
+            event.remove(OrmSession, "after_flush", hook)
+        assert not event.contains(OrmSession, "after_flush", hook)
+    for module, _ in modules:
+        module.register_hooks()
+        module.register_hooks()
+    for module, name in modules:
+        assert event.contains(OrmSession, "after_flush", getattr(module, name))
+
+
+def test_carbon_log_flush_updates_derived_tables_once(engine, reregistered_hooks):
+    today = date.today()
+    with Session(engine) as session:
+        session.add(User(student_id="h1", password="h", nickname="훅", college="공과대학"))
+        session.add(CarbonLog(
+            student_id="h1",
+            log_date=today,
+            source="carbon_input",
+            activities_json="[]",
+            total_emission=1.0,
+            points_earned=15,
+            created_at=datetime.now(),
+        ))
+        session.commit()
+
+        # 훅이 두 번 등록되었다면 30점이 됨
+        counters = session.exec(
+            select(RankingCounter.period, RankingCounter.points).where(RankingCounter.student_id == "h1")
+        ).all()
+        assert sorted(counters) == sorted([(period_key("week", today), 15), (period_key("month", today), 15)])
+
+        emissions = session.exec(
+            select(CollegeEmissionDaily.log_date, CollegeEmissionDaily.college,
+                   CollegeEmissionDaily.emission_g, CollegeEmissionDaily.active_users)
+        ).all()
+        assert emissions == [(today, "공과대학", 1000, 1)]
+
+        streak = get_streak(session, "h1", today=today)
+        assert (streak["week_days"], streak["current_streak"], streak["best_streak"]) == (1, 1, 1)
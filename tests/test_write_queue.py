@@ -0,0 +1,93 @@
+"""쓰기 큐: 재실행 트랜잭션의 commit이 실패해도 앞서 commit된 작업의 결과는 유지"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlmodel import Session
+
+from ecojourney.db import write_queue
+from ecojourney.db.write_queue import WriteQueue, create_writer_engine
+from ecojourney.models import User
+from ecojourney.service.points_ledger import apply_points
+
+
+class _Deadlock(Exception):
+    """PostgreSQL 교착 오류 흉내 (SQLSTATE 40P01)"""
+
+    class orig:
+        pgcode = "40P01"
+
+
+class _FailingSecondCommit(Session):
+    """두 번째 트랜잭션(재실행)의 commit만 실패시키는 Session"""
+
+    commits = 0
+
+    def commit(self):
+        type(self).commits += 1
+        if type(self).commits == 2:
+            raise RuntimeError("commit 실패")
+        super().commit()
+
+
+def test_retry_commit_failure_keeps_committed_outcomes(engine, db_url, monkeypatch):
+    with Session(engine) as session:
+        for student_id in ("u1", "u2"):
+            session.add(User(student_id=student_id, password="h", nickname=student_id, college="공과대학"))
+        session.commit()
+
+    calls = []
+
+    def _first(session):
+        return apply_points(session, "u1", 10, source="test")
+
+    def _deadlocks_once(session):
+        calls.append(1)
+        if len(calls) == 1:
+            raise _Deadlock("deadlock detected")
+        return apply_points(session, "u2", 10, source="test")
+
+    monkeypatch.setattr(_FailingSecondCommit, "commits", 0)
+    monkeypatch.setattr(write_queue, "Session", _FailingSecondCommit)
+    writer = create_writer_engine(db_url)
+    queue = WriteQueue(writer)
+
+    async def _run():
+        results = await asyncio.gather(queue.submit(_first), queue.submit(_deadlocks_once), return_exceptions=True)
+        queue._worker.cancel()
+        await asyncio.gather(queue._worker, return_exceptions=True)
+        return results
+
+    try:
+        first, retried = asyncio.run(_run())
+    finally:
+        queue._executor.shutdown()
+        writer.dispose()
+
+    # 첫 트랜잭션에서 commit된 작업은 성공, 재실행 트랜잭션의 작업만 실패
+    assert first == 10
+    assert isinstance(retried, RuntimeError)
+    assert (queue.metrics.completed, queue.metrics.failed, queue.metrics.retries) == (1, 1, 1)
+    with Session(engine) as session:
+        balances = dict(session.execute(select(User.student_id, User.current_points)).all())
+    assert balances == {"u1": 10, "u2": 0}
+
+
+def test_first_commit_failure_fails_batch(engine, db_url, monkeypatch):
+    class _FailingCommit(Session):
+        def commit(self):
+            raise RuntimeError("commit 실패")
+
+    monkeypatch.setattr(write_queue, "Session", _FailingCommit)
+    writer = create_writer_engine(db_url)
+    queue = WriteQueue(writer)
+    try:
+        outcomes, _ = queue._execute_batch([lambda session: 1, lambda session: 2])
+    finally:
+        queue._executor.shutdown()
+        writer.dispose()
+
+    assert [ok for ok, _ in outcomes] == [False, False]
+    with pytest.raises(RuntimeError, match="commit 실패"):
+        raise outcomes[0][1]